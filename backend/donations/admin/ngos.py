@@ -15,6 +15,7 @@ from django.urls import path, reverse, reverse_lazy
 from django.utils import timezone
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
+from django_q.tasks import async_task
 from unfold.admin import ModelAdmin, StackedInline, TabularInline
 from unfold.contrib.filters.admin import SingleNumericFilter
 from unfold.decorators import action
@@ -23,7 +24,9 @@ from unfold.widgets import UnfoldAdminSelectWidget
 from donations.admin.common import CommonCauseFields, span_external, span_internal
 from donations.models.ngos import Cause, Ngo
 from donations.workers.check_organization import cult_registry_check_organizations
-from donations.workers.update_organization import update_organization
+from donations.workers.render_forms import regenerate_prefilled_forms
+from donations.workers.update_organization import sync_organizations
+from redirectioneaza.common.async_wrapper import async_wrapper
 from users.models import User
 
 logger = logging.getLogger(__name__)
@@ -215,7 +218,7 @@ class NgoAdmin(ModelAdmin):
         "update_from_ngohub_sync",
     )
 
-    actions_list = ("remove_prefilled_forms",)
+    actions_list = ("remove_prefilled_forms", "regenerate_prefilled_forms")
 
     fieldsets = (
         (
@@ -366,7 +369,8 @@ class NgoAdmin(ModelAdmin):
         if request.user.is_superuser:
             return super().get_queryset(request)
 
-        return Ngo.active.all()
+        # the changelist shows the slug of the main cause
+        return Ngo.active.with_main_cause()
 
     def get_list_display(self, request: HttpRequest):
         if request.user.is_superuser:
@@ -486,9 +490,7 @@ class NgoAdmin(ModelAdmin):
     def update_from_ngohub_sync(self, request: HttpRequest, queryset: QuerySet[Ngo]):
         show_errors: bool = True
 
-        task_results = []
-        for ngo in queryset:
-            task_results.append(update_organization(ngo.pk, update_method="sync"))
+        task_results = sync_organizations(queryset.values_list("pk", flat=True)).results
 
         message = "NGO Update Results: | "
         for result in task_results:
@@ -506,8 +508,7 @@ class NgoAdmin(ModelAdmin):
 
     @action(description=_("Update from NGO Hub asynchronously"))
     def update_from_ngohub_async(self, request: HttpRequest, queryset: QuerySet[Ngo]):
-        for ngo in queryset:
-            update_organization(ngo.pk, update_method="async")
+        async_task(sync_organizations, list(queryset.values_list("pk", flat=True)))
 
         self.message_user(request, _("NGOs are being updated from NGO Hub."))
 
@@ -563,3 +564,27 @@ class NgoAdmin(ModelAdmin):
 
     def has_remove_forms_permission(self, request: HttpRequest, object_id=None):
         return request.user.is_superuser
+
+    @action(
+        description=_("Regenerate prefilled forms"),
+        url_path="regenerate-forms",
+        permissions=["regenerate_forms"],
+    )
+    def regenerate_prefilled_forms(self, request: HttpRequest):
+        result: dict | str = async_wrapper(regenerate_prefilled_forms)
+
+        if not isinstance(result, dict):
+            # the forms are regenerated by a task
+            self.message_user(request, _("The prefilled forms of all the causes are being regenerated."))
+        else:
+            result_message = f"Total of {result['rendered']} prefilled forms regenerated."
+            if result["failed"]:
+                failed_ids: str = ", ".join(str(cause_id) for cause_id in result["failed"])
+                self.message_user(request, f"{result_message} Failed causes: {failed_ids}", level="ERROR")
+            else:
+                self.message_user(request, result_message, level="SUCCESS")
+
+        return redirect(reverse_lazy("admin:donations_ngo_changelist"))
+
+    def has_regenerate_forms_permission(self, request: HttpRequest, object_id=None):
+        return request.user.is_superuser
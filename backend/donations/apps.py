@@ -6,3 +6,7 @@ class DonationsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "donations"
     verbose_name = _("Donations")
+
+    def ready(self):
+        # the receivers of the live counters
+        from donations import signals  # noqa: F401
@@ -0,0 +1,128 @@
+import random
+import string
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import IO
+
+from django.core.management import BaseCommand
+from django.utils import timezone
+from faker import Faker
+
+import redirectioneaza.settings.locations
+from donations.models.ngos import Cause, Ngo
+from donations.views.download_donations.build_xml import build_xml, write_xml
+from donations.views.download_donations.records import DonationRecord
+from donations.views.download_donations.zip_members import ZipArchiveWriter
+
+fake = Faker("ro_RO")
+
+
+class Command(BaseCommand):
+    help = "Benchmark the time and memory needed to write the ANAF XML files, with and without streaming."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--donors",
+            nargs="+",
+            type=int,
+            help="The numbers of donors in an XML file",
+            default=[10_000],
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            help="How many times each XML file is written when measuring the time",
+            default=3,
+        )
+
+    def handle(self, *args, **options):
+        donors_counts: list[int] = options["donors"]
+        repeat: int = max(1, options["repeat"])
+
+        cause = self._build_cause()
+
+        for donors_count in sorted(donors_counts):
+            records = self._build_records(cause, donors_count)
+
+            for writer_name, writer in (("tree", self._write_tree), ("stream", self._write_stream)):
+                elapsed = min(self._time_writer(writer, cause, records) for _ in range(repeat))
+                peak_memory = self._trace_writer(writer, cause, records)
+
+                self.stdout.write(
+                    f"{donors_count:>7} donors | {writer_name:>6} | "
+                    f"{elapsed:>7.2f}s | {donors_count / elapsed:>9.1f} donors/s | "
+                    f"{peak_memory / 1024 / 1024:>8.1f} MiB peak"
+                )
+
+        self.stdout.write(self.style.SUCCESS("Done!"))
+
+    @staticmethod
+    def _write_tree(handler: IO[bytes], cause: Cause, records: list[DonationRecord]):
+        xml_element_tree = build_xml(
+            xml_index=1, cause=cause, redirections=records, cnp_idx={}, timestamp=timezone.now()
+        )
+        xml_element_tree.write(handler, encoding="utf-8", xml_declaration=True, method="xml")
+
+    @staticmethod
+    def _write_stream(handler: IO[bytes], cause: Cause, records: list[DonationRecord]):
+        write_xml(handler, xml_index=1, cause=cause, redirections=records, cnp_idx={}, timestamp=timezone.now())
+
+    @staticmethod
+    def _write_to_zip(writer: Callable, cause: Cause, records: list[DonationRecord]):
+        with tempfile.TemporaryFile() as zip_file:
+            with ZipArchiveWriter(zip_file) as zip_archive:
+                with zip_archive.open("xml/d230.xml", mode="w") as handler:
+                    writer(handler, cause, records)
+
+    def _time_writer(self, writer: Callable, cause: Cause, records: list[DonationRecord]) -> float:
+        start = time.perf_counter()
+        self._write_to_zip(writer, cause, records)
+
+        return time.perf_counter() - start
+
+    def _trace_writer(self, writer: Callable, cause: Cause, records: list[DonationRecord]) -> int:
+        tracemalloc.start()
+        try:
+            self._write_to_zip(writer, cause, records)
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return peak_memory
+
+    @staticmethod
+    def _build_cause() -> Cause:
+        ngo = Ngo(
+            name=fake.company(),
+            registration_number="".join(random.choices(string.digits, k=8)),
+            address=fake.street_address(),
+            locality=fake.city(),
+            county=random.choice(redirectioneaza.settings.locations.COUNTIES_WITH_SECTORS_LIST),
+        )
+
+        return Cause(ngo=ngo, name=ngo.name, bank_account=fake.iban())
+
+    @staticmethod
+    def _build_records(cause: Cause, count: int) -> list[DonationRecord]:
+        return [
+            DonationRecord(
+                pk=pk,
+                date_created=timezone.now(),
+                last_name=fake.last_name(),
+                first_name=fake.first_name(),
+                initial=random.choice(string.ascii_uppercase),
+                cnp=fake.ssn(),
+                phone=fake.phone_number(),
+                email=fake.email(),
+                county=cause.ngo.county,
+                city=fake.city(),
+                address={"full_address": fake.address()},
+                two_years=random.random() < 0.5,
+                ngo_registration_number=cause.ngo.registration_number,
+                ngo_name=cause.ngo.name,
+                bank_account=cause.bank_account,
+            )
+            for pk in range(1, count + 1)
+        ]
@@ -0,0 +1,92 @@
+import time
+from collections.abc import Callable
+
+from django.core.management import BaseCommand
+from faker import Faker
+
+from donations.models.donors import DecryptedDonorData, Donor
+
+fake = Faker("ro_RO")
+
+
+class Command(BaseCommand):
+    help = "Benchmark the decryption of the donors' personal data, one field at a time and in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--donors",
+            type=int,
+            help="The number of donors to decrypt",
+            default=50_000,
+        )
+        parser.add_argument(
+            "--workers",
+            nargs="+",
+            type=int,
+            help="The numbers of pool workers to compare, for both threads and processes",
+            default=[2, 4],
+        )
+
+    def handle(self, *args, **options):
+        donors_count: int = options["donors"]
+        workers_counts: list[int] = options["workers"]
+
+        self.stdout.write(f"Encrypting {donors_count} donors")
+        donors: list[Donor] = self._build_donors(donors_count)
+        rows: list[tuple[int, str, str]] = [
+            (index, donor.encrypted_cnp, donor.encrypted_address) for index, donor in enumerate(donors)
+        ]
+
+        expected: list[tuple[str, dict]] = self._time("field by field", donors_count, lambda: _decrypt_fields(donors))
+
+        batched = self._time("decrypt_many", donors_count, lambda: Donor.decrypt_many(donors))
+        self._check(expected, batched)
+
+        self._time("memoized", donors_count, lambda: Donor.decrypt_many(donors))
+
+        for use_processes in (False, True):
+            for workers_count in workers_counts:
+                pooled = self._time(
+                    f"{workers_count} {'processes' if use_processes else 'threads'}",
+                    donors_count,
+                    lambda: Donor.decrypt_many(rows, workers_count=workers_count, use_processes=use_processes),
+                )
+                self._check(expected, pooled)
+
+        self.stdout.write(self.style.SUCCESS("Done!"))
+
+    def _time(self, name: str, donors_count: int, function: Callable[[], list]) -> list:
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(f"{name:>16} | {elapsed:>7.2f}s | {donors_count / elapsed:>10.1f} donors/s")
+
+        return result
+
+    def _check(self, expected: list[tuple[str, dict]], decrypted: list[DecryptedDonorData]):
+        if [(data.cnp, data.address) for data in decrypted] != expected:
+            self.stdout.write(self.style.ERROR("The batch decryption differs from the field by field one"))
+
+    @staticmethod
+    def _build_donors(donors_count: int) -> list[Donor]:
+        donors: list[Donor] = []
+        for _ in range(donors_count):
+            donor = Donor()
+            donor.set_cnp(fake.ssn())
+            donor.set_address_helper(
+                street_name=fake.street_name(),
+                street_number=fake.building_number(),
+                street_bl=fake.building_number(),
+                street_ap=fake.building_number(),
+            )
+
+            donors.append(donor)
+
+        return donors
+
+
+def _decrypt_fields(donors: list[Donor]) -> list[tuple[str, dict]]:
+    return [
+        (Donor.decrypt_cnp(donor.encrypted_cnp), Donor.decrypt_address(donor.encrypted_address)) for donor in donors
+    ]
@@ -0,0 +1,221 @@
+import random
+import string
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import BaseCommand
+from django.test import override_settings
+from faker import Faker
+
+import redirectioneaza.settings.locations
+from donations.models.donors import Donor, archive_member_cache_path
+from donations.models.jobs import Job
+from donations.models.ngos import Cause, Ngo
+from donations.pdf import create_full_pdf
+from donations.views.download_donations.main import download_donations_job
+from donations.views.download_donations.pdf_fetch import open_file
+from donations.views.download_donations.records import DonationRecord
+
+fake = Faker("ro_RO")
+
+BENCHMARK_PDF_PATH = "benchmark/donation-forms/form.pdf"
+
+
+def _delayed_open_file(latency_seconds: float):
+    def delayed_open_file(donation: DonationRecord):
+        time.sleep(latency_seconds)
+
+        return open_file(donation)
+
+    return delayed_open_file
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the generation of the redirection forms archive, with a simulated storage latency. "
+        "The benchmark data is committed, so the archive processes can read it, and removed at the end. "
+        "With the members cache enabled, every job is timed with an empty and with a full cache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            help="The numbers of donations to benchmark with",
+            default=[1_000, 10_000, 50_000],
+        )
+        parser.add_argument(
+            "--workers",
+            nargs="+",
+            type=int,
+            help="The numbers of parallel file reads to compare",
+            default=[1, settings.FORMS_DOWNLOAD_WORKERS_COUNT],
+        )
+        parser.add_argument(
+            "--processes",
+            nargs="+",
+            type=int,
+            help="The numbers of archive processes to compare",
+            default=[settings.FORMS_DOWNLOAD_PROCESSES_COUNT],
+        )
+        parser.add_argument(
+            "--latency-ms",
+            type=int,
+            help="The simulated latency of the storage for every file (only simulated in the main process)",
+            default=20,
+        )
+
+    def handle(self, *args, **options):
+        sizes: list[int] = options["sizes"]
+        workers_counts: list[int] = options["workers"]
+        processes_counts: list[int] = options["processes"]
+        latency_seconds: float = options["latency_ms"] / 1000
+
+        self.stdout.write(
+            f"Benchmarking archive jobs for {sizes} donations with {workers_counts} fetch workers, "
+            f"{processes_counts} processes and {options['latency_ms']}ms of latency per file"
+        )
+
+        cause = self._create_cause()
+        owner = get_user_model().objects.create_user(email=fake.unique.email(), password=None)
+
+        pdf_name: str = default_storage.save(BENCHMARK_PDF_PATH, ContentFile(self._build_sample_pdf(cause)))
+        try:
+            self._run_benchmarks(cause, owner, pdf_name, sizes, workers_counts, processes_counts, latency_seconds)
+        finally:
+            default_storage.delete(pdf_name)
+
+            Job.objects.filter(cause=cause).delete()
+            Donor.objects.filter(cause=cause).delete()
+            cause.delete()
+            cause.ngo.delete()
+            owner.delete()
+
+        self.stdout.write(self.style.SUCCESS("Done!"))
+
+    def _run_benchmarks(
+        self,
+        cause: Cause,
+        owner,
+        pdf_name: str,
+        sizes: list[int],
+        workers_counts: list[int],
+        processes_counts: list[int],
+        latency_seconds: float,
+    ):
+        created_donations: int = 0
+        for size in sorted(sizes):
+            self._create_donors(cause, pdf_name, size - created_donations)
+            created_donations = size
+
+            for processes_count in processes_counts:
+                for workers_count in workers_counts:
+                    # The first job fills the members cache and the second one copies the cached members
+                    self._clear_members_cache(cause, pdf_name)
+                    for cache_state in self._cache_states():
+                        elapsed = self._time_job(cause, owner, workers_count, processes_count, latency_seconds)
+
+                        self.stdout.write(
+                            f"{size:>7} donations | {processes_count:>3} processes | {workers_count:>3} workers | "
+                            f"{cache_state:>5} cache | {elapsed:>9.2f}s | {size / elapsed:>9.1f} donations/s"
+                        )
+
+        self._clear_members_cache(cause, pdf_name)
+
+    @staticmethod
+    def _cache_states() -> list[str]:
+        if not settings.ENABLE_FORMS_DOWNLOAD_MEMBERS_CACHE:
+            return ["no"]
+
+        return ["cold", "warm"]
+
+    @staticmethod
+    def _clear_members_cache(cause: Cause, pdf_name: str):
+        storage = Donor._meta.get_field("pdf_file").storage
+
+        for donor_pk in Donor.objects.filter(cause=cause).values_list("pk", flat=True).iterator():
+            storage.delete(archive_member_cache_path(donor_pk, pdf_name))
+
+    @staticmethod
+    def _time_job(cause: Cause, owner, workers_count: int, processes_count: int, latency_seconds: float) -> float:
+        job: Job = Job.objects.create(ngo=cause.ngo, cause=cause, owner=owner)
+
+        with (
+            override_settings(
+                FORMS_DOWNLOAD_WORKERS_COUNT=workers_count,
+                FORMS_DOWNLOAD_PROCESSES_COUNT=processes_count,
+            ),
+            mock.patch(
+                "donations.views.download_donations.pdf_fetch.open_file",
+                side_effect=_delayed_open_file(latency_seconds),
+            ),
+        ):
+            start = time.perf_counter()
+            download_donations_job(job.pk)
+            elapsed = time.perf_counter() - start
+
+        job.refresh_from_db()
+        if job.zip:
+            job.zip.delete(save=False)
+
+        return elapsed
+
+    @staticmethod
+    def _create_cause() -> Cause:
+        ngo = Ngo.objects.create(
+            name=fake.company(),
+            registration_number="".join(random.choices(string.digits, k=8)),
+            address=fake.street_address(),
+            locality=fake.city(),
+            county=random.choice(redirectioneaza.settings.locations.COUNTIES_WITH_SECTORS_LIST),
+            email=fake.email(),
+        )
+
+        return Cause.objects.create(
+            ngo=ngo,
+            is_main=True,
+            slug=f"benchmark-{ngo.pk}",
+            name=ngo.name,
+            description=fake.text(),
+            bank_account=fake.iban(),
+        )
+
+    @staticmethod
+    def _build_sample_pdf(cause: Cause) -> bytes:
+        donor = Donor(ngo=cause.ngo, cause=cause, f_name=fake.first_name(), l_name=fake.last_name())
+        donor.set_cnp(fake.ssn())
+        donor.set_address_helper(street_name=fake.street_name(), street_number=fake.building_number())
+
+        with create_full_pdf(donor) as pdf:
+            return pdf.read()
+
+    @staticmethod
+    def _create_donors(cause: Cause, pdf_name: str, count: int):
+        counties: list = redirectioneaza.settings.locations.COUNTIES_WITH_SECTORS_LIST + list(range(1, 7))
+
+        donors: list[Donor] = []
+        for _ in range(count):
+            donor = Donor(
+                ngo=cause.ngo,
+                cause=cause,
+                f_name=fake.first_name(),
+                l_name=fake.last_name(),
+                initial=random.choice(string.ascii_uppercase),
+                email=fake.email(),
+                phone=fake.phone_number(),
+                city=fake.city(),
+                county=random.choice(counties),
+                has_signed=True,
+                pdf_file=pdf_name,
+            )
+            donor.set_cnp(fake.ssn())
+            donor.set_address_helper(street_name=fake.street_name(), street_number=fake.building_number())
+
+            donors.append(donor)
+
+        Donor.objects.bulk_create(donors, batch_size=1_000)
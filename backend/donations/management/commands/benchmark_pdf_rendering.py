@@ -0,0 +1,141 @@
+import base64
+import time
+from io import BytesIO
+from typing import IO
+
+from django.core.management import BaseCommand
+from faker import Faker
+from PIL import Image, ImageDraw
+from pypdf import PdfReader
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+
+from donations.models.donors import Donor
+from donations.models.ngos import Cause, Ngo
+from donations.pdf import (
+    _add_donor_data,
+    _add_ngo_data,
+    _add_signature_to_pdf,
+    _add_year_to_pdf,
+    create_full_pdf,
+    default_font_size,
+    form_image_path,
+    get_form_template,
+)
+
+fake = Faker("ro_RO")
+
+
+class Command(BaseCommand):
+    help = "Benchmark the rendering of the redirection forms over the cached form template, against the old renderer."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--forms",
+            type=int,
+            help="The number of forms to render with each renderer",
+            default=100,
+        )
+
+    def handle(self, *args, **options):
+        forms_count: int = options["forms"]
+
+        ngo = Ngo(name=fake.company(), registration_number="".join(fake.random_choices("0123456789", length=8)))
+        cause = Cause(ngo=ngo, name=ngo.name, bank_account=fake.iban())
+        donors: list[tuple[Donor, str]] = [
+            (self._build_donor(ngo, cause), build_signature()) for _ in range(forms_count)
+        ]
+
+        # the template is built once per process, so it is not part of the timing
+        get_form_template()
+
+        results: dict[str, list[bytes]] = {}
+        for name, renderer in (("old renderer", _legacy_create_full_pdf), ("template", create_full_pdf)):
+            start = time.perf_counter()
+            results[name] = [_read(renderer(donor, signature)) for donor, signature in donors]
+            elapsed = time.perf_counter() - start
+
+            average_size: float = sum(len(form) for form in results[name]) / forms_count
+            self.stdout.write(
+                f"{name:>12} | {elapsed:>7.2f}s | {forms_count / elapsed:>7.1f} forms/s | "
+                f"{average_size / 1024:>8.1f} KiB/form"
+            )
+
+        mismatches: int = sum(
+            1
+            for old_form, new_form in zip(results["old renderer"], results["template"], strict=True)
+            if _extract_text(old_form) != _extract_text(new_form)
+        )
+        if mismatches:
+            self.stdout.write(self.style.ERROR(f"{mismatches} forms have a different text"))
+        else:
+            self.stdout.write(self.style.SUCCESS("All the forms have the same text"))
+
+    @staticmethod
+    def _build_donor(ngo: Ngo, cause: Cause) -> Donor:
+        donor = Donor(
+            ngo=ngo,
+            cause=cause,
+            f_name=fake.first_name(),
+            l_name=fake.last_name(),
+            initial=fake.random_uppercase_letter(),
+            email=fake.email(),
+            phone=fake.phone_number(),
+            city=fake.city(),
+            county=fake.state(),
+            two_years=fake.boolean(),
+            anaf_gdpr=fake.boolean(),
+        )
+        donor.set_cnp(fake.ssn())
+        donor.set_address_helper(street_name=fake.street_name(), street_number=fake.building_number())
+
+        return donor
+
+
+def build_signature() -> str:
+    image = Image.new("RGBA", (400, 120), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    draw.line([(fake.random_int(0, 400), fake.random_int(0, 120)) for _ in range(12)], fill=(0, 0, 0, 255), width=3)
+
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+
+    return "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode()
+
+
+def _read(packet: IO[bytes]) -> bytes:
+    with packet:
+        return packet.read()
+
+
+def _extract_text(form: bytes) -> str:
+    return PdfReader(BytesIO(form)).pages[0].extract_text()
+
+
+def _legacy_create_full_pdf(donor: Donor, signature: str | None = None) -> IO[bytes]:
+    """
+    The renderer used before the form template, which embeds the background image in every form
+    """
+    start_x: int = 305
+    start_y: int = 726
+
+    packet = BytesIO()
+
+    c = canvas.Canvas(packet, A4)
+    width, height = A4
+    c.drawImage(ImageReader(form_image_path), 0, 0, width=width, height=height)
+    c.setFont("OpenSans", default_font_size)
+    c.setFontSize(default_font_size)
+
+    _add_year_to_pdf(c, start_x, start_y)
+    _add_donor_data(start_y, c, donor)
+    _add_ngo_data(start_y, c, donor.cause, donor.ngo)
+
+    if signature:
+        _add_signature_to_pdf(c, signature)
+
+    c.save()
+    packet.seek(0)
+
+    return packet
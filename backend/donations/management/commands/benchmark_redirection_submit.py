@@ -0,0 +1,175 @@
+import random
+import statistics
+import string
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.core.management import BaseCommand
+from django.test import override_settings
+from django.urls import reverse
+from faker import Faker
+
+import redirectioneaza.settings.locations
+from donations.management.commands.benchmark_pdf_rendering import build_signature
+from donations.models.donors import Donor
+from donations.models.ngos import Cause, Ngo
+from redirectioneaza.common.testing.client import ApexClient
+
+fake = Faker("ro_RO")
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test the submission of the redirection form, with the PDF file and the emails handled "
+        "in the request (sync) and in the background (async), with a simulated storage latency. "
+        "The async submissions queue real tasks, which skip the benchmark donors after they are removed at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--submissions",
+            type=int,
+            help="The number of forms to submit with each processing method",
+            default=200,
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            help="The number of forms submitted at the same time",
+            default=4,
+        )
+        parser.add_argument(
+            "--methods",
+            nargs="+",
+            choices=["sync", "async"],
+            help="The processing methods to compare",
+            default=["sync", "async"],
+        )
+        parser.add_argument(
+            "--upload-latency-ms",
+            type=int,
+            help="The simulated latency of the storage for every uploaded PDF file",
+            default=150,
+        )
+
+    def handle(self, *args, **options):
+        submissions_count: int = options["submissions"]
+        concurrency: int = options["concurrency"]
+        latency_seconds: float = options["upload_latency_ms"] / 1000
+
+        cause = self._create_cause()
+        signatures: list[str] = [build_signature() for _ in range(10)]
+
+        self.stdout.write(
+            f"Submitting {submissions_count} forms, {concurrency} at a time, "
+            f"with {options['upload_latency_ms']}ms of upload latency"
+        )
+
+        try:
+            for method in options["methods"]:
+                latencies: list[float] = self._submit_forms(
+                    cause, method, signatures, submissions_count, concurrency, latency_seconds
+                )
+                self._report(method, latencies, concurrency)
+        finally:
+            for donor in Donor.objects.filter(cause=cause).iterator():
+                if donor.pdf_file:
+                    donor.pdf_file.delete(save=False)
+
+            Donor.objects.filter(cause=cause).delete()
+            cause.delete()
+            cause.ngo.delete()
+
+        self.stdout.write(self.style.SUCCESS("Done!"))
+
+    def _submit_forms(
+        self,
+        cause: Cause,
+        method: str,
+        signatures: list[str],
+        submissions_count: int,
+        concurrency: int,
+        latency_seconds: float,
+    ) -> list[float]:
+        url: str = reverse("twopercent", kwargs={"cause_slug": cause.slug})
+        success_url: str = reverse("ngo-twopercent-success", kwargs={"cause_slug": cause.slug})
+
+        storage = Donor._meta.get_field("pdf_file").storage
+        save_file = storage.save
+
+        def _delayed_save(*args, **kwargs):
+            time.sleep(latency_seconds)
+            return save_file(*args, **kwargs)
+
+        def _submit_form(index: int) -> float:
+            form_data: dict = self._build_form_data(signatures[index % len(signatures)])
+
+            start = time.perf_counter()
+            response = ApexClient().post(url, form_data)
+            elapsed = time.perf_counter() - start
+
+            if response.status_code != 302 or response.url != success_url:
+                raise ValueError(f"The form was not submitted: {response.status_code}")
+
+            return elapsed
+
+        with (
+            override_settings(
+                REDIRECTION_PROCESSING_METHOD=method,
+                RECAPTCHA_ENABLED=False,
+                EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+            ),
+            mock.patch.object(storage, "save", side_effect=_delayed_save),
+            ThreadPoolExecutor(max_workers=concurrency) as executor,
+        ):
+            return list(executor.map(_submit_form, range(submissions_count)))
+
+    def _report(self, method: str, latencies: list[float], concurrency: int):
+        percentiles: list[float] = statistics.quantiles(latencies, n=100, method="inclusive")
+
+        self.stdout.write(
+            f"{method:>5} | p50 {percentiles[49] * 1000:>8.1f}ms | p95 {percentiles[94] * 1000:>8.1f}ms | "
+            f"p99 {percentiles[98] * 1000:>8.1f}ms | {concurrency / statistics.mean(latencies):>7.1f} submits/s"
+        )
+
+    @staticmethod
+    def _build_form_data(signature: str) -> dict:
+        return {
+            "l_name": fake.last_name(),
+            "f_name": fake.first_name(),
+            "initial": random.choice(string.ascii_uppercase),
+            "cnp": fake.ssn(),
+            "email_address": fake.ascii_email(),
+            "phone_number": "0770123456",
+            "street_name": fake.street_name(),
+            "street_number": fake.building_number()[:10],
+            "county": random.choice(redirectioneaza.settings.locations.FORM_COUNTIES),
+            "locality": fake.city(),
+            "two_years": random.choice(["on", ""]),
+            "anaf_gdpr": "on",
+            "agree_terms": "on",
+            "signature": signature,
+        }
+
+    @staticmethod
+    def _create_cause() -> Cause:
+        ngo = Ngo.objects.create(
+            name=fake.company(),
+            registration_number="".join(random.choices(string.digits, k=8)),
+            address=fake.street_address(),
+            locality=fake.city(),
+            county=random.choice(redirectioneaza.settings.locations.COUNTIES_WITH_SECTORS_LIST),
+            email=fake.email(),
+            is_active=True,
+        )
+
+        return Cause.objects.create(
+            ngo=ngo,
+            is_main=True,
+            slug=f"benchmark-{ngo.pk}",
+            name=ngo.name,
+            description=fake.text(),
+            bank_account=fake.iban(),
+            notifications_email=fake.email(),
+        )
@@ -0,0 +1,195 @@
+import random
+import re
+import string
+import time
+
+from auditlog.context import disable_auditlog
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramSimilarity
+from django.core.management import BaseCommand, CommandError
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import Q, QuerySet
+from django.db.models.functions import Greatest
+from faker import Faker
+
+import redirectioneaza.settings.locations
+from donations.models.donors import Donor
+from donations.models.ngos import Cause, Ngo
+from donations.views.common.pagination import KeysetPaginator
+from donations.views.common.search import DonorSearchMixin
+
+fake = Faker("ro_RO")
+
+EXECUTION_TIME_REGEX = re.compile(r"Execution Time: ([\d.]+) ms")
+REDIRECTIONS_ORDERING = ("-date_created", "-id")
+PAGE_SIZE = 8
+
+
+def _legacy_donor_search(queryset: QuerySet[Donor], query: str) -> QuerySet[Donor]:
+    """
+    The donor search before the trigram indexes, which scores every donor of the NGO
+    """
+    search_query = SearchQuery(query, config="romanian_unaccent")
+
+    donors = queryset.annotate(
+        rank=SearchRank(SearchVector("f_name", "l_name", weight="A", config="romanian_unaccent"), search_query),
+        similarity=Greatest(TrigramSimilarity("f_name", query), TrigramSimilarity("l_name", query)),
+    ).filter(Q(rank__gte=0.3) | Q(similarity__gt=0.3))
+
+    contact_donors = (
+        queryset.annotate(
+            rank=SearchRank(SearchVector("email", "phone", weight="A", config="romanian_unaccent"), search_query),
+            similarity=Greatest(TrigramSimilarity("email", query), TrigramSimilarity("phone", query)),
+        )
+        .exclude(is_anonymous=True)
+        .filter(Q(rank__gte=0.3) | Q(similarity__gt=0.3))
+    )
+
+    return donors | contact_donors
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the redirections list of an NGO with many donors, with EXPLAIN ANALYZE: the donor search "
+        "over the trigram indexes against the legacy search, and the keyset pagination against the offset one. "
+        "The fixture NGO and its donors are removed at the end, unless they are kept for the next runs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--donors",
+            type=int,
+            help="The number of donors of the fixture NGO",
+            default=100_000,
+        )
+        parser.add_argument(
+            "--ngo",
+            type=int,
+            help="The ID of a fixture NGO kept by a previous run, instead of creating a new one",
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the fixture NGO and its donors",
+        )
+        parser.add_argument(
+            "--queries",
+            nargs="+",
+            help="The searched queries",
+            default=["popescu", "maria ionescu", "gmail.com", "0722"],
+        )
+        parser.add_argument(
+            "--pages",
+            nargs="+",
+            type=int,
+            help="The page numbers to compare the pagination at",
+            default=[1, 100, 5_000],
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("The redirections search benchmark needs a PostgreSQL database")
+
+        if options["ngo"]:
+            ngo: Ngo = Ngo.objects.get(pk=options["ngo"])
+        else:
+            self.stdout.write(f"Creating an NGO with {options['donors']} donors")
+            ngo = self._create_fixture(options["donors"])
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {Donor._meta.db_table}")
+
+            redirections: QuerySet[Donor] = ngo.donor_set.filter(is_available=True).order_by(*REDIRECTIONS_ORDERING)
+
+            for query in options["queries"]:
+                self._report(f"search {query!r}", "legacy", _legacy_donor_search(redirections, query))
+                self._report(
+                    f"search {query!r}", "indexed", DonorSearchMixin.get_search_results(redirections, query, "ro")
+                )
+
+            for page_number in options["pages"]:
+                self._compare_pagination(redirections, page_number)
+        finally:
+            if options["keep"]:
+                self.stdout.write(f"The fixture NGO #{ngo.pk} was kept")
+            elif not options["ngo"]:
+                with disable_auditlog():
+                    Donor.objects.filter(ngo=ngo).delete()
+                    ngo.delete()
+
+        self.stdout.write(self.style.SUCCESS("Done!"))
+
+    def _compare_pagination(self, redirections: QuerySet[Donor], page_number: int):
+        offset_page = Paginator(redirections, PAGE_SIZE).page(page_number)
+        self._report(f"page {page_number}", "offset", redirections[offset_page.start_index() - 1 :][:PAGE_SIZE])
+
+        # walk through the cursors up to the page before, only the requested page is measured
+        paginator = KeysetPaginator(redirections, PAGE_SIZE, REDIRECTIONS_ORDERING)
+        after_cursor: str | None = None
+        for _ in range(page_number - 1):
+            after_cursor = paginator.page(after=after_cursor).next_cursor
+
+        keyset_queryset: QuerySet[Donor] = redirections
+        if after_cursor:
+            values, _ = paginator._decode_cursor(after_cursor)
+            keyset_queryset = redirections.filter(paginator._keyset_filter(values, reverse=False))
+
+        self._report(f"page {page_number}", "keyset", keyset_queryset[: PAGE_SIZE + 1])
+
+    def _report(self, benchmark: str, method: str, queryset: QuerySet):
+        start = time.perf_counter()
+        results_count: int = len(queryset)
+        elapsed = time.perf_counter() - start
+
+        plan: str = queryset.explain(analyze=True)
+        execution_time_match = EXECUTION_TIME_REGEX.search(plan)
+        execution_ms: float = float(execution_time_match.group(1)) if execution_time_match else 0
+
+        sequential_scans: list[str] = sorted(set(re.findall(r"Seq Scan on (\w+)", plan)))
+
+        self.stdout.write(
+            f"{benchmark[:28]:>28} | {method:>7} | {results_count:>6} results | "
+            f"execution {execution_ms:>9.2f}ms | total {elapsed * 1000:>9.2f}ms | "
+            f"seq scans: {', '.join(sequential_scans) or '-'}"
+        )
+
+    @staticmethod
+    def _create_fixture(donors_count: int) -> Ngo:
+        ngo = Ngo.objects.create(
+            name=fake.company(),
+            registration_number="".join(random.choices(string.digits, k=8)),
+            address=fake.street_address(),
+            county=random.choice(redirectioneaza.settings.locations.COUNTIES_WITH_SECTORS_LIST),
+            email=fake.email(),
+            is_active=True,
+        )
+        cause = Cause.objects.create(
+            ngo=ngo,
+            is_main=True,
+            slug=f"benchmark-{ngo.pk}",
+            name=ngo.name,
+            description=fake.text(),
+            bank_account=fake.iban(),
+        )
+
+        counties: list = redirectioneaza.settings.locations.COUNTIES_WITH_SECTORS_LIST
+        batch_size: int = 5_000
+        for batch_start in range(0, donors_count, batch_size):
+            Donor.objects.bulk_create(
+                Donor(
+                    ngo=ngo,
+                    cause=cause,
+                    f_name=fake.first_name(),
+                    l_name=fake.last_name(),
+                    email=fake.email(),
+                    phone=fake.phone_number(),
+                    city=fake.city(),
+                    county=random.choice(counties),
+                    is_anonymous=random.random() < 0.5,
+                    has_signed=True,
+                )
+                for _ in range(min(batch_size, donors_count - batch_start))
+            )
+
+        return ngo
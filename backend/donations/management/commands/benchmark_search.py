@@ -0,0 +1,183 @@
+import random
+import re
+import time
+
+from auditlog.context import disable_auditlog
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramSimilarity
+from django.core.management import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Q, QuerySet
+from faker import Faker
+
+import redirectioneaza.settings.locations
+from donations.models.ngos import Cause, Ngo
+from donations.views.common.search import CauseSearchMixin, NgoCauseMixedSearchMixin, NgoSearchMixin
+
+fake = Faker("ro_RO")
+
+NAME_PREFIXES = ["Asociația", "Fundația", "Clubul Sportiv", "Federația", "Centrul", "Societatea"]
+NAME_FOCUSES = ["Copiilor", "Animalelor", "Educației", "Sănătății", "Comunității", "Vârstnicilor", "Mediului"]
+
+EXECUTION_TIME_REGEX = re.compile(r"Execution Time: ([\d.]+) ms")
+
+
+def _legacy_cause_search(queryset: QuerySet[Cause], query: str) -> QuerySet[Cause]:
+    """
+    The cause search before the stored search vectors, which ranks every row when the request is made
+    """
+    exact_causes: QuerySet[Cause] = queryset.filter(Q(name__icontains=query)).order_by("id").distinct("id")
+    if exact_causes.count():
+        return exact_causes
+
+    return (
+        queryset.annotate(
+            rank=SearchRank(
+                SearchVector("name", weight="A", config="romanian_unaccent"),
+                SearchQuery(query, config="romanian_unaccent"),
+            ),
+            similarity=TrigramSimilarity("name", query),
+        )
+        .filter(Q(rank__gte=0.3) | Q(similarity__gt=0.3))
+        .order_by("id")
+        .distinct("id")
+    )
+
+
+def _legacy_mixed_search(queryset: QuerySet[Cause], query: str) -> QuerySet[Cause]:
+    ngos: QuerySet[Ngo] = (
+        Ngo.active.annotate(
+            rank=SearchRank(
+                SearchVector("name", "registration_number", weight="A", config="romanian_unaccent"),
+                SearchQuery(query, config="romanian_unaccent"),
+            ),
+            similarity=TrigramSimilarity("name", query),
+        )
+        .filter(Q(rank__gte=0.3) | Q(similarity__gt=0.3))
+        .order_by("name")
+        .distinct("name")
+    )
+    ngos_causes = Cause.public_active.filter(ngo__in=ngos).distinct("name")
+
+    return _legacy_cause_search(queryset, query) | ngos_causes
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the public search of the causes and NGOs with EXPLAIN ANALYZE, comparing the queries "
+        "over the stored search vectors and trigram indexes with the legacy queries, which compute the "
+        "search vectors and similarities of every row. The benchmark data is removed at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--causes",
+            type=int,
+            help="The number of causes (and NGOs) to create",
+            default=50_000,
+        )
+        parser.add_argument(
+            "--queries",
+            nargs="+",
+            help="The searched queries",
+            default=["copii", "fundatia animalelor", "educatie", "popescu", "asociatia sportiva"],
+        )
+        parser.add_argument(
+            "--show-plans",
+            action="store_true",
+            help="Print the query plans as well",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("The search benchmark needs a PostgreSQL database")
+
+        causes_count: int = options["causes"]
+        queries: list[str] = options["queries"]
+
+        self.stdout.write(f"Creating {causes_count} causes")
+        ngo_ids: list[int] = self._create_causes(causes_count)
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {Ngo._meta.db_table}, {Cause._meta.db_table}")
+
+            for query in queries:
+                for search_name, search in self._searches().items():
+                    self._report(query, search_name, search(Cause.public_active, query), options["show_plans"])
+        finally:
+            with disable_auditlog():
+                Ngo.objects.filter(pk__in=ngo_ids).delete()
+
+        self.stdout.write(self.style.SUCCESS("Done!"))
+
+    @staticmethod
+    def _searches() -> dict:
+        return {
+            "legacy cause": _legacy_cause_search,
+            "indexed cause": lambda queryset, query: CauseSearchMixin.get_search_results(queryset, query, "ro"),
+            "legacy mixed": _legacy_mixed_search,
+            "indexed mixed": lambda queryset, query: NgoCauseMixedSearchMixin.get_search_results(queryset, query, "ro"),
+            "indexed ngo": lambda _, query: NgoSearchMixin.get_search_results(Ngo.active, query, "ro"),
+        }
+
+    def _report(self, query: str, search_name: str, queryset: QuerySet, show_plans: bool):
+        start = time.perf_counter()
+        results_count: int = len(queryset)
+        elapsed = time.perf_counter() - start
+
+        plan: str = queryset.explain(analyze=True)
+        execution_time_match = EXECUTION_TIME_REGEX.search(plan)
+        execution_ms: float = float(execution_time_match.group(1)) if execution_time_match else 0
+
+        sequential_scans: list[str] = sorted(set(re.findall(r"Seq Scan on (\w+)", plan)))
+
+        self.stdout.write(
+            f"{query[:24]:>24} | {search_name:>13} | {results_count:>6} results | "
+            f"execution {execution_ms:>9.2f}ms | total {elapsed * 1000:>9.2f}ms | "
+            f"seq scans: {', '.join(sequential_scans) or '-'}"
+        )
+
+        if show_plans:
+            self.stdout.write(plan)
+
+    @staticmethod
+    def _create_causes(causes_count: int) -> list[int]:
+        registration_number_start: int = random.randint(100_000_000, 800_000_000)
+        counties: list[str] = redirectioneaza.settings.locations.COUNTIES_WITH_SECTORS_LIST
+
+        ngo_ids: list[int] = []
+        batch_size: int = 2_000
+        for batch_start in range(0, causes_count, batch_size):
+            ngos: list[Ngo] = []
+            for index in range(batch_start, min(batch_start + batch_size, causes_count)):
+                name_parts: list[str] = [random.choice(NAME_PREFIXES), random.choice(NAME_FOCUSES)]
+                if random.random() < 0.5:
+                    name_parts.append(fake.last_name())
+
+                ngos.append(
+                    Ngo(
+                        name=" ".join(name_parts),
+                        registration_number=str(registration_number_start + index),
+                        address=fake.street_address(),
+                        county=random.choice(counties),
+                        email=fake.email(),
+                        is_active=True,
+                    )
+                )
+
+            ngos = Ngo.objects.bulk_create(ngos)
+            ngo_ids.extend(ngo.pk for ngo in ngos)
+
+            Cause.objects.bulk_create(
+                Cause(
+                    ngo=ngo,
+                    is_main=True,
+                    slug=f"benchmark-search-{ngo.registration_number}",
+                    name=ngo.name,
+                    description="",
+                    bank_account=fake.iban(),
+                )
+                for ngo in ngos
+            )
+
+        return ngo_ids
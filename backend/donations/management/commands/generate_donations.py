@@ -1,26 +1,19 @@
 import random
 import string
 
+from django.conf import settings
 from django.core.management import BaseCommand
-from django.db.models import QuerySet
-from django_q.tasks import async_task
 from faker import Faker
 
 import redirectioneaza.settings.locations
 from donations.models import Cause
 from donations.models.donors import Donor
 from donations.models.ngos import Ngo
-from donations.pdf import create_full_pdf
+from donations.workers.render_forms import RenderingReport, render_donor_forms
 
 fake = Faker("ro_RO")
 
 
-def _generate_pdf_for_donor(donor_pk: int):
-    selected_donor: Donor = Donor.objects.get(pk=donor_pk)
-    selected_donor.pdf_file = create_full_pdf(selected_donor)
-    selected_donor.save()
-
-
 class Command(BaseCommand):
     help = "Generate fake donation forms"
 
@@ -49,28 +42,26 @@ class Command(BaseCommand):
             help="Only generate PDFs for donations without PDFs",
             default=False,
         )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            help="How many processes render the PDFs",
+            default=settings.FORMS_RENDERING_PROCESSES_COUNT,
+        )
 
     def handle(self, *args, **options):
-        def _generate_pdfs_for_donations(new_donors: QuerySet[Donor]):
-            generated_pdfs: int = 0
-            self.stdout.write(f"Queuing PDF generation for {new_donors.count()} new donors...")
-            for new_donor in new_donors:
-                generated_pdfs += 1
-                async_task(
-                    _generate_pdf_for_donor,
-                    new_donor.pk,
-                )
+        def _generate_pdfs_for_donations():
+            donor_ids: list[int] = list(Donor.objects.filter(pdf_file="").order_by("pk").values_list("pk", flat=True))
+            self.stdout.write(f"Generating PDFs for {len(donor_ids)} donations without PDFs...")
 
-                if generated_pdfs % 50 == 0:
-                    self.stdout.write(f"Queued {generated_pdfs} / {new_donors.count()} PDFs...")
+            report: RenderingReport = render_donor_forms(donor_ids, processes_count=options["processes"])
+            self.stdout.write(str(report))
 
         batch_size = 200
 
         pdf_only = options["pdf_only"]
         if pdf_only:
-            donors_without_pdfs: QuerySet[Donor] = Donor.objects.filter(pdf_file="")
-            self.stdout.write(f"Generating PDFs for {donors_without_pdfs.count()} donations without PDFs...")
-            _generate_pdfs_for_donations(donors_without_pdfs)
+            _generate_pdfs_for_donations()
             self.stdout.write(self.style.SUCCESS("Done!"))
             return
 
@@ -147,9 +138,6 @@ class Command(BaseCommand):
                 )
                 generated_donations = []
 
-                if create_pdf:
-                    _generate_pdfs_for_donations(Donor.objects.filter(pdf_file=""))
-
         self.stdout.write(
             self.style.SUCCESS(f"Writing the last {len(generated_donations)} donations to the database...")
         )
@@ -158,4 +146,7 @@ class Command(BaseCommand):
             ignore_conflicts=True,
         )
 
+        if create_pdf:
+            _generate_pdfs_for_donations()
+
         self.stdout.write(self.style.SUCCESS("Done!"))
@@ -1,55 +1,55 @@
 import logging
-from datetime import date
+from datetime import datetime, timedelta
 
 from django.core.management import BaseCommand
-from django.utils.timezone import now
-from django_q.tasks import async_task
 
-from donations.models import Donor
-from donations.models.stat_configs import StatsChoices, create_stat
-from stats.models import Stat
+from donations.models.stat_configs import (
+    StatsChoices,
+    create_stat,
+    last_redirections_stats_update,
+    reconcile_live_counters,
+)
 
 logger = logging.getLogger(__name__)
 
+# The donors saved while the previous run was counting them are counted again by the next run
+INCREMENTAL_OVERLAP = timedelta(minutes=10)
+
 
 class Command(BaseCommand):
-    help = "Run a task that generates redirection statistics for all donors."
+    help = "Generate the redirection statistics of the days whose donors changed since the last run."
 
     def add_arguments(self, parser):
         parser.add_argument(
             "--force",
             action="store_true",
-            help="Force regeneration of stats even if they already exist for certain dates.",
+            help="Force regeneration of stats for every day, not only for the days whose donors changed.",
             default=False,
         )
 
     def handle(self, *args, **kwargs):
         """
-        Generate redirection statistics for donors.
-        `force` argument forces regeneration of stats even if they already exist.
-        If the `force` argument is not provided, the command will only generate stats for dates
-        that do not already have stats recorded and expired stats will be cleaned up first.
+        Generate redirection statistics for donors, with one grouped query and one bulk upsert.
+        `force` argument forces regeneration of the stats of every day, which also covers the deleted donors.
+        If the `force` argument is not provided, the command will only generate stats for the days
+        with donors changed since the last run and for the expired stats.
+        The live counters are reconciled with the generated stats afterward.
         """
         force: bool = kwargs.get("force", False)
 
-        target_set: set[date] = {
-            dt.date() for dt in (Donor.available.all().values_list("date_created", flat=True).distinct())
-        }
-
+        changed_since: datetime | None = None
         if not force:
-            # Get existing stats dates that are not expired
-            existing_stats_dates: set[date] = set(
-                Stat.objects.filter(name=StatsChoices.REDIRECTIONS_PER_DAY)
-                .exclude(expires_at__lte=now())
-                .values_list("date", flat=True)
-                .distinct()
-            )
-
-            target_set: set[date] = target_set - existing_stats_dates
-
-        for single_date in target_set:
-            async_task(
-                create_stat,
-                stat_choice=StatsChoices.REDIRECTIONS_PER_DAY,
-                for_date=single_date,
-            )
+            last_update: datetime | None = last_redirections_stats_update()
+            if last_update is not None:
+                changed_since = last_update - INCREMENTAL_OVERLAP
+
+        logger.info("Generating the redirection statistics of the days changed since %s", changed_since or "ever")
+
+        create_stat(
+            stat_choice=StatsChoices.REDIRECTIONS_PER_DAY,
+            bulk=True,
+            changed_since=changed_since,
+        )
+
+        # the drift of the live counters is corrected with the statistics which were just generated
+        reconcile_live_counters()
@@ -0,0 +1,52 @@
+from django.contrib.postgres.search import SearchVector
+from django.core.management import BaseCommand
+from django.db.models import Model
+
+from donations.models.ngos import CAUSE_SEARCH_VECTOR, NGO_SEARCH_VECTOR, Cause, Ngo
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the stored search vectors of the NGOs and of the causes, in batches. "
+        "The vectors are kept up to date by database triggers, so this is only needed after the search "
+        "configuration changes or when the vectors are missing."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="The number of rows updated at once",
+            default=5_000,
+        )
+        parser.add_argument(
+            "--missing-only",
+            action="store_true",
+            help="Only build the search vectors which are missing",
+        )
+
+    def handle(self, *args, **options):
+        batch_size: int = options["batch_size"]
+        missing_only: bool = options["missing_only"]
+
+        for model, search_vector in ((Ngo, NGO_SEARCH_VECTOR), (Cause, CAUSE_SEARCH_VECTOR)):
+            updated_count: int = self._rebuild(model, search_vector, batch_size, missing_only)
+
+            self.stdout.write(
+                self.style.SUCCESS(f"Rebuilt the search vectors of {updated_count} {model._meta.verbose_name_plural}.")
+            )
+
+    @staticmethod
+    def _rebuild(model: type[Model], search_vector: SearchVector, batch_size: int, missing_only: bool) -> int:
+        queryset = model.objects.order_by("pk")
+        if missing_only:
+            queryset = queryset.filter(search_vector__isnull=True)
+
+        updated_count: int = 0
+        last_pk: int = 0
+        # every batch is a separate, short, update, so that the rows are not locked for the whole rebuild
+        while batch_pks := list(queryset.filter(pk__gt=last_pk).values_list("pk", flat=True)[:batch_size]):
+            updated_count += model.objects.filter(pk__in=batch_pks).update(search_vector=search_vector)
+            last_pk = batch_pks[-1]
+
+        return updated_count
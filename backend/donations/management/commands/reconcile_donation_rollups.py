@@ -0,0 +1,25 @@
+from django.core.management import BaseCommand
+
+from donations.workers.rollups import reconcile_donation_rollups
+
+
+class Command(BaseCommand):
+    help = "Count the available donations again and fix the donation rollups read by the dashboards."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--ngo",
+            nargs="+",
+            type=int,
+            help="The IDs of the NGOs to reconcile, instead of all of them",
+        )
+
+    def handle(self, *args, **options):
+        summary: dict[str, int] = reconcile_donation_rollups(ngo_ids=options["ngo"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Reconciled the rollups of {summary['ngos']} NGOs: "
+                f"{summary['changed']} changed and {summary['deleted']} deleted"
+            )
+        )
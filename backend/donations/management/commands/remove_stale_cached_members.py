@@ -0,0 +1,14 @@
+from django.core.management import BaseCommand
+
+from donations.views.download_donations.members_cache import remove_stale_cached_members
+
+
+class Command(BaseCommand):
+    help = "Delete the expired cached PDF files of the archives and the ones which no longer belong to a donor."
+
+    def handle(self, *args, **options):
+        summary: dict[str, int] = remove_stale_cached_members()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {summary['deleted']} of the {summary['checked']} cached PDF files")
+        )
@@ -0,0 +1,17 @@
+from django.core.management import BaseCommand
+
+from donations.workers.redirections import render_missing_redirection_forms
+
+
+class Command(BaseCommand):
+    help = "Create the PDF files of the new redirections whose tasks failed to create them."
+
+    def handle(self, *args, **options):
+        summary: dict = render_missing_redirection_forms()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Queued {summary['requeued']} failed redirections again and rendered {summary['rendered']} "
+                f"unsigned forms, {len(summary['failed'])} failed"
+            )
+        )
@@ -0,0 +1,30 @@
+import logging
+from datetime import datetime, timedelta
+
+from django.utils import timezone
+from django_q.models import Schedule
+
+from utils.common.commands import SchedulerCommand
+
+logger = logging.getLogger(__name__)
+
+
+def _next_night() -> datetime:
+    next_run: datetime = timezone.localtime().replace(hour=3, minute=30, second=0, microsecond=0)
+    if next_run <= timezone.localtime():
+        next_run += timedelta(days=1)
+
+    return next_run
+
+
+class Command(SchedulerCommand):
+    help = "Schedule the reconciliation of the donation rollups to run every night"
+
+    command_name = "reconcile_donation_rollups"
+
+    schedule_name = "RECONCILE_DONATION_ROLLUPS"
+    schedule_details = {
+        "schedule_type": Schedule.DAILY,
+        "repeats": -1,
+        "next_run": _next_night(),
+    }
@@ -0,0 +1,24 @@
+import logging
+from datetime import timedelta
+from random import randint
+
+from django.utils import timezone
+from django_q.models import Schedule
+
+from utils.common.commands import SchedulerCommand
+
+logger = logging.getLogger(__name__)
+
+
+class Command(SchedulerCommand):
+    help = "Schedule a recurring task to create the PDF files which the new redirections are missing."
+
+    command_name: str = "render_missing_redirection_forms"
+
+    schedule_name: str = "RENDER_MISSING_REDIRECTION_FORMS"
+    schedule_details = {
+        "schedule_type": Schedule.MINUTES,
+        "minutes": 10,
+        "repeats": -1,
+        "next_run": timezone.now() + timedelta(seconds=randint(0, 3 * 60)),
+    }
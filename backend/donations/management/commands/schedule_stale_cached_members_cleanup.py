@@ -0,0 +1,22 @@
+import logging
+from datetime import timedelta
+
+from django.utils import timezone
+from django_q.models import Schedule
+
+from utils.common.commands import SchedulerCommand
+
+logger = logging.getLogger(__name__)
+
+
+class Command(SchedulerCommand):
+    help = "Schedule the clean-up of the stale cached PDF files of the archives to run once a day"
+
+    command_name: str = "remove_stale_cached_members"
+
+    schedule_name = "REMOVE_STALE_CACHED_MEMBERS"
+    schedule_details = {
+        "schedule_type": Schedule.DAILY,
+        "repeats": -1,
+        "next_run": timezone.now() + timedelta(minutes=50),
+    }
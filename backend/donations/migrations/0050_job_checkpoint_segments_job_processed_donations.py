@@ -0,0 +1,23 @@
+# Generated by Django 5.2.12 on 2026-10-18 10:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0049_alter_ngo_registration_number_valid'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='checkpoint_segments',
+            field=models.JSONField(blank=True, default=list, editable=False, verbose_name='checkpoint segments'),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='processed_donations',
+            field=models.IntegerField(default=0, verbose_name='processed donations'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.12 on 2026-10-18 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0050_job_checkpoint_segments_job_processed_donations'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='donor',
+            name='notifications_sent_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='date notifications sent'),
+        ),
+    ]
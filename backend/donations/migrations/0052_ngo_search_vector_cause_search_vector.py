@@ -0,0 +1,95 @@
+# Generated by Django 5.2.12 on 2026-10-18 15:20
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.functions.text
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0051_donor_notifications_sent_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ngo',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='cause',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        # The search vectors are filled in by triggers, so that they also follow the bulk creates and updates.
+        # Keep them in sync with NGO_SEARCH_VECTOR & CAUSE_SEARCH_VECTOR, used by the rebuild_search_index command.
+        migrations.RunSQL(
+            sql="""
+            CREATE FUNCTION donations_ngo_search_vector_trigger() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := to_tsvector(
+                    'romanian_unaccent', COALESCE(NEW.name, '') || ' ' || COALESCE(NEW.registration_number, '')
+                );
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql;
+
+            CREATE TRIGGER donations_ngo_search_vector_update
+            BEFORE INSERT OR UPDATE OF name, registration_number ON donations_ngo
+            FOR EACH ROW EXECUTE FUNCTION donations_ngo_search_vector_trigger();
+
+            CREATE FUNCTION donations_cause_search_vector_trigger() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := to_tsvector('romanian_unaccent', COALESCE(NEW.name, ''));
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql;
+
+            CREATE TRIGGER donations_cause_search_vector_update
+            BEFORE INSERT OR UPDATE OF name ON donations_cause
+            FOR EACH ROW EXECUTE FUNCTION donations_cause_search_vector_trigger();
+
+            UPDATE donations_ngo SET search_vector = to_tsvector(
+                'romanian_unaccent', COALESCE(name, '') || ' ' || COALESCE(registration_number, '')
+            );
+            UPDATE donations_cause SET search_vector = to_tsvector('romanian_unaccent', COALESCE(name, ''));
+            """,
+            reverse_sql="""
+            DROP TRIGGER donations_cause_search_vector_update ON donations_cause;
+            DROP FUNCTION donations_cause_search_vector_trigger();
+            DROP TRIGGER donations_ngo_search_vector_update ON donations_ngo;
+            DROP FUNCTION donations_ngo_search_vector_trigger();
+            """,
+        ),
+        migrations.AddIndex(
+            model_name='ngo',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='ngo_search_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ngo',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass('name', name='gin_trgm_ops'), name='ngo_name_trgm_idx'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='cause',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='cause_search_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cause',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass('name', name='gin_trgm_ops'), name='cause_name_trgm_idx'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='cause',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'
+                ),
+                name='cause_name_upper_trgm_idx',
+            ),
+        ),
+    ]
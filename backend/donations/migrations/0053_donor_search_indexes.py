@@ -0,0 +1,39 @@
+# Generated by Django 5.2.12 on 2026-10-18 16:10
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import BtreeGinExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0052_ngo_search_vector_cause_search_vector'),
+    ]
+
+    operations = [
+        # the NGO column of the GIN indexes
+        BtreeGinExtension(),
+        migrations.AddIndex(
+            model_name='donor',
+            index=models.Index(fields=['ngo', '-date_created', '-id'], name='donor_ngo_date_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donor',
+            index=django.contrib.postgres.indexes.GinIndex(
+                models.F('ngo'),
+                django.contrib.postgres.indexes.OpClass('f_name', name='gin_trgm_ops'),
+                django.contrib.postgres.indexes.OpClass('l_name', name='gin_trgm_ops'),
+                name='donor_ngo_name_trgm_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='donor',
+            index=django.contrib.postgres.indexes.GinIndex(
+                models.F('ngo'),
+                django.contrib.postgres.indexes.OpClass('email', name='gin_trgm_ops'),
+                django.contrib.postgres.indexes.OpClass('phone', name='gin_trgm_ops'),
+                name='donor_ngo_contact_trgm_idx',
+            ),
+        ),
+    ]
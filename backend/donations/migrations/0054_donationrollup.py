@@ -0,0 +1,48 @@
+# Generated by Django 5.2.12 on 2026-10-18 17:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def fill_donation_rollups(apps, schema_editor):
+    Donor = apps.get_model('donations', 'Donor')
+    DonationRollup = apps.get_model('donations', 'DonationRollup')
+
+    rows = (
+        Donor.objects.filter(is_available=True, ngo__isnull=False)
+        .annotate(day=TruncDate('date_created'))
+        .values('ngo_id', 'cause_id', 'day', 'county')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+
+    DonationRollup.objects.bulk_create((DonationRollup(**row) for row in rows.iterator()), batch_size=5_000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0053_donor_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DonationRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='day')),
+                ('county', models.CharField(blank=True, default='', max_length=100, verbose_name='county')),
+                ('count', models.IntegerField(default=0, verbose_name='count')),
+                ('cause', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='donation_rollups', to='donations.cause', verbose_name='cause')),
+                ('ngo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='donation_rollups', to='donations.ngo', verbose_name='NGO')),
+            ],
+            options={
+                'verbose_name': 'donations rollup',
+                'verbose_name_plural': 'donations rollups',
+                'constraints': [models.UniqueConstraint(fields=('ngo', 'cause', 'day', 'county'), name='unique_donation_rollup', nulls_distinct=False)],
+            },
+        ),
+        migrations.RunPython(fill_donation_rollups, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.12 on 2026-10-18 18:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0054_donationrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='donor',
+            name='date_updated',
+            field=models.DateTimeField(auto_now=True, db_index=True, default=django.utils.timezone.now, verbose_name='date updated'),
+            preserve_default=False,
+        ),
+    ]
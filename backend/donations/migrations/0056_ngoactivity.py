@@ -0,0 +1,45 @@
+# Generated by Django 5.2.12 on 2026-10-18 19:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Sum
+from django.db.models.functions import ExtractYear
+
+
+def fill_ngo_activities(apps, schema_editor):
+    DonationRollup = apps.get_model('donations', 'DonationRollup')
+    NgoActivity = apps.get_model('donations', 'NgoActivity')
+
+    rows = (
+        DonationRollup.objects.annotate(year=ExtractYear('day'))
+        .values('ngo_id', 'year')
+        .annotate(count=Sum('count'))
+        .order_by()
+    )
+
+    NgoActivity.objects.bulk_create((NgoActivity(**row) for row in rows.iterator()), batch_size=5_000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0055_donor_date_updated'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NgoActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField(verbose_name='year')),
+                ('count', models.IntegerField(default=0, verbose_name='count')),
+                ('ngo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activities', to='donations.ngo', verbose_name='NGO')),
+            ],
+            options={
+                'verbose_name': 'NGO activity',
+                'verbose_name_plural': 'NGO activities',
+                'constraints': [models.UniqueConstraint(fields=('year', 'ngo'), name='unique_ngo_activity')],
+            },
+        ),
+        migrations.RunPython(fill_ngo_activities, reverse_code=migrations.RunPython.noop),
+    ]
@@ -3,12 +3,15 @@ from .donors import Donor
 from .downloads import RedirectionsDownloadJob
 from .jobs import Job
 from .ngos import Cause, Ngo
+from .rollups import DonationRollup, NgoActivity
 
 __all__ = [
     Cause,
+    DonationRollup,
     Donor,
     Job,
     Ngo,
+    NgoActivity,
     OwnFormsUpload,
     RedirectionsDownloadJob,
 ]
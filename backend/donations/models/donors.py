@@ -1,13 +1,25 @@
+import hashlib
 import json
 import logging
+import math
+import multiprocessing
+from collections.abc import Iterable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from functools import partial
+from itertools import chain
 
-from django.db import models
+import django
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import models, transaction
+from django.db.models import F, QuerySet
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from donations.models.rollups import RollupKey, update_donation_rollups
+from redirectioneaza.common.processes import can_use_processes
 from utils.common.crypto_helper import decrypt_data, encrypt_data
 from utils.models_hashing import hash_id_secret
 
@@ -35,6 +47,44 @@ def year_ngo_donor_directory_path(subdir: str, instance: "Donor", filename: str)
     )
 
 
+ARCHIVE_MEMBERS_CACHE_DIR = "donation-zips/members"
+
+
+def archive_member_cache_path(donor_pk: int, pdf_file_name: str) -> str:
+    """
+    The compressed PDF file of a donor, as added to the archives, is cached at
+    MEDIA_ROOT/donation-zips/members/<pk // 1000>/<pk>_<file name hash>.zip
+    """
+    file_name_hash = hashlib.sha256(pdf_file_name.encode()).hexdigest()[:16]
+
+    return "/".join(
+        [
+            ARCHIVE_MEMBERS_CACHE_DIR,
+            f"{donor_pk // 1000:05d}",
+            f"{donor_pk}_{file_name_hash}.zip",
+        ]
+    )
+
+
+# The smallest number of donors decrypted by a pool worker at once
+DECRYPTION_BATCH_SIZE = 1_000
+
+
+@dataclass(slots=True)
+class DecryptedDonorData:
+    """
+    The decrypted personal data of a donor
+    """
+
+    pk: int | None
+    cnp: str
+    address: dict[str, str]
+
+
+# The fields which place a donor in the rollups of the dashboards
+ROLLUP_FIELDS = ("is_available", "ngo_id", "cause_id", "date_created", "county")
+
+
 class DonorAvailableManager(models.Manager):
     def get_queryset(self):
         return super().get_queryset().filter(is_available=True)
@@ -161,6 +211,16 @@ class Donor(models.Model):
         db_index=True,
         auto_now_add=True,
     )
+    # the statistics of the days whose donors changed are generated again
+    date_updated = models.DateTimeField(verbose_name=_("date updated"), db_index=True, auto_now=True)
+
+    # set by the background processing of the redirection, so that the emails are only sent once
+    notifications_sent_at = models.DateTimeField(
+        verbose_name=_("date notifications sent"),
+        blank=True,
+        null=True,
+        editable=False,
+    )
 
     # personal data removal information
     personal_data_removal_started_at = models.DateTimeField(
@@ -185,10 +245,72 @@ class Donor(models.Model):
     class Meta:
         verbose_name = _("donor")
         verbose_name_plural = _("donors")
+        indexes = [
+            # the redirections of an NGO, newest first, read one page at a time
+            models.Index(fields=["ngo", "-date_created", "-id"], name="donor_ngo_date_created_idx"),
+            # the search of the donors of an NGO
+            GinIndex(
+                F("ngo"),
+                OpClass("f_name", name="gin_trgm_ops"),
+                OpClass("l_name", name="gin_trgm_ops"),
+                name="donor_ngo_name_trgm_idx",
+            ),
+            GinIndex(
+                F("ngo"),
+                OpClass("email", name="gin_trgm_ops"),
+                OpClass("phone", name="gin_trgm_ops"),
+                name="donor_ngo_contact_trgm_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.cause} {self.date_created} {self.email}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+
+        # the rollup of the donor, as it is in the database, unless some of its fields were not loaded
+        if instance.get_deferred_fields().isdisjoint(ROLLUP_FIELDS):
+            instance._loaded_rollup_key = instance.rollup_key()
+
+        # the cached archive member of the PDF file is removed when the file changes
+        if "pdf_file" not in instance.get_deferred_fields():
+            instance._loaded_pdf_file_name = instance.pdf_file.name
+
+        return instance
+
+    def rollup_key(self) -> RollupKey | None:
+        """
+        The rollup which counts the donor, or None if the donor is not counted
+        """
+        if not self.is_available or not self.ngo_id or not self.date_created:
+            return None
+
+        return self.ngo_id, self.cause_id, timezone.localdate(self.date_created), self.county
+
+    def save(self, *args, **kwargs):
+        is_new: bool = self._state.adding
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+            if is_new or hasattr(self, "_loaded_rollup_key"):
+                current_rollup_key: RollupKey | None = self.rollup_key()
+                update_donation_rollups(None if is_new else self._loaded_rollup_key, current_rollup_key)
+
+                self._loaded_rollup_key = current_rollup_key
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            deleted = super().delete(*args, **kwargs)
+
+            if hasattr(self, "_loaded_rollup_key"):
+                update_donation_rollups(self._loaded_rollup_key, None)
+                del self._loaded_rollup_key
+
+        return deleted
+
     def disable(self, commit: bool = True):
         self.is_available = False
 
@@ -213,6 +335,7 @@ class Donor(models.Model):
 
         if self.pdf_file and self.pdf_file.name:
             try:
+                self.pdf_file.storage.delete(archive_member_cache_path(self.pk, self.pdf_file.name))
                 self.pdf_file.delete()
             except Exception as e:
                 logging.exception("Error deleting donor pdf file for donor id %s: %s", self.pk, e)
@@ -227,10 +350,72 @@ class Donor(models.Model):
         self.encrypted_cnp = self.encrypt_cnp(cnp)
 
     def get_cnp(self) -> str:
-        if not self.encrypted_cnp:
-            return ""
-
-        return self.decrypt_cnp(self.encrypted_cnp)
+        return self.get_decrypted_data().cnp
+
+    def get_decrypted_data(self) -> DecryptedDonorData:
+        """
+        The decrypted personal data, which is decrypted again only if the encrypted fields change
+        """
+        decrypted_data: DecryptedDonorData | None = self._get_memoized_decrypted_data()
+        if decrypted_data is None:
+            decrypted_data = decrypt_donor_rows([(self.pk, self.encrypted_cnp, self.encrypted_address)])[0]
+            self._memoize_decrypted_data(decrypted_data)
+
+        return decrypted_data
+
+    @classmethod
+    def decrypt_many(
+        cls,
+        donors: "QuerySet[Donor] | Iterable[Donor] | Iterable[tuple[int, str, str]]",
+        *,
+        workers_count: int = 1,
+        use_processes: bool = False,
+    ) -> list[DecryptedDonorData]:
+        """
+        Decrypt the personal data of many donors at once, returned in the order of the donors.
+
+        Donor instances remember their decrypted data, so they are never decrypted twice.
+        A queryset, or (pk, encrypted CNP, encrypted address) rows, are decrypted without loading the donors.
+        The work can be split between `workers_count` threads, or processes if `use_processes` is set.
+        """
+        if isinstance(donors, QuerySet):
+            donors = donors.values_list("pk", "encrypted_cnp", "encrypted_address")
+
+        items: list[Donor | tuple[int, str, str]] = list(donors)
+        results: list[DecryptedDonorData | None] = [None] * len(items)
+
+        rows: list[tuple[int | None, str, str]] = []
+        rows_positions: list[int] = []
+        for position, item in enumerate(items):
+            if isinstance(item, Donor):
+                if (decrypted_data := item._get_memoized_decrypted_data()) is not None:
+                    results[position] = decrypted_data
+                    continue
+
+                rows.append((item.pk, item.encrypted_cnp, item.encrypted_address))
+            else:
+                rows.append(tuple(item))
+
+            rows_positions.append(position)
+
+        decrypted_rows = _decrypt_donor_rows_in_pool(rows, workers_count, use_processes)
+        for position, decrypted_data in zip(rows_positions, decrypted_rows, strict=True):
+            results[position] = decrypted_data
+
+            if isinstance(items[position], Donor):
+                items[position]._memoize_decrypted_data(decrypted_data)
+
+        return results
+
+    def _get_memoized_decrypted_data(self) -> DecryptedDonorData | None:
+        memoized = self.__dict__.get("_decrypted_data")
+        if memoized is None or memoized[0] != (self.encrypted_cnp, self.encrypted_address):
+            return None
+
+        return memoized[1]
+
+    def _memoize_decrypted_data(self, decrypted_data: DecryptedDonorData):
+        self._decrypted_data = ((self.encrypted_cnp, self.encrypted_address), decrypted_data)
 
     def set_address_helper(
         self,
@@ -261,7 +446,8 @@ class Donor(models.Model):
         self.encrypted_address = self.encrypt_address(address)
 
     def get_address(self, *, include_full: bool = False) -> dict:
-        address: dict = self.decrypt_address(self.encrypted_address)
+        # a copy, so that the callers can't change the memoized address
+        address: dict = dict(self.get_decrypted_data().address)
         if not include_full:
             return address
 
@@ -347,3 +533,42 @@ class Donor(models.Model):
             return {}
 
         return json.loads(decrypt_data(address.encode()))
+
+
+def decrypt_donor_rows(rows: list[tuple[int | None, str, str]]) -> list[DecryptedDonorData]:
+    """
+    Decrypt the (pk, encrypted CNP, encrypted address) rows of some donors
+    """
+    return [
+        DecryptedDonorData(
+            pk=pk,
+            cnp=Donor.decrypt_cnp(encrypted_cnp or ""),
+            address=Donor.decrypt_address(encrypted_address),
+        )
+        for pk, encrypted_cnp, encrypted_address in rows
+    ]
+
+
+def _decrypt_donor_rows_in_pool(
+    rows: list[tuple[int | None, str, str]],
+    workers_count: int,
+    use_processes: bool,
+) -> list[DecryptedDonorData]:
+    if workers_count <= 1 or len(rows) <= DECRYPTION_BATCH_SIZE:
+        return decrypt_donor_rows(rows)
+
+    batch_size: int = max(DECRYPTION_BATCH_SIZE, math.ceil(len(rows) / workers_count))
+    batches = [rows[start : start + batch_size] for start in range(0, len(rows), batch_size)]
+
+    executor: Executor
+    if use_processes and can_use_processes(workers_count):
+        executor = ProcessPoolExecutor(
+            max_workers=workers_count,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=django.setup,
+        )
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers_count, thread_name_prefix="rdr_decrypt")
+
+    with executor:
+        return list(chain.from_iterable(executor.map(decrypt_donor_rows, batches)))
@@ -32,8 +32,14 @@ class Job(AsyncJob):
     )
 
     number_of_donations = models.IntegerField(verbose_name=_("donations count"), default=-1)
+    processed_donations = models.IntegerField(verbose_name=_("processed donations"), default=0)
     zip = models.FileField(verbose_name=_("ZIP"), upload_to="donation-zips/%Y/%m/%d/", blank=True, null=True)
 
+    # The storage names of the partial archives saved while the job is running, used to resume it after a crash
+    checkpoint_segments = models.JSONField(
+        verbose_name=_("checkpoint segments"), editable=False, default=list, blank=True
+    )
+
     def __str__(self):
         return f"{self.cause} {self.status}"
 
@@ -6,12 +6,14 @@ from typing import TYPE_CHECKING, Any
 from auditlog.registry import auditlog
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.core.files.storage import storages
 from django.db import models
 from django.db.models import Q
-from django.db.models.functions import Lower
+from django.db.models.functions import Lower, Upper
 from django.db.models.query_utils import DeferredAttribute
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
@@ -19,6 +21,7 @@ from django.utils.translation import gettext_lazy as _
 from donations.models.common import CommonFilenameCacheModel
 from donations.models.donors import Donor
 from editions.calendar import january_first
+from redirectioneaza.common.cache import invalidate_cache_version
 from utils.models_hashing import hash_id_secret
 from utils.text.registration_number import (
     REGISTRATION_NUMBER_REGEX_WITH_VAT,
@@ -35,10 +38,26 @@ ALL_NGO_IDS_CACHE_KEY = "ALL_NGO_IDS"
 FRONTPAGE_NGOS_KEY = "FRONTPAGE_NGOS"
 FRONTPAGE_STATS_KEY = "FRONTPAGE_NGOS_STATS"
 NGO_CAUSES_QUERY_CACHE_KEY = "NGO_CAUSES_{ngo.pk}"
+CAUSES_AUTOCOMPLETE_VERSION_KEY = "CAUSES_AUTOCOMPLETE_VERSION"
+
+# The attribute holding the main cause of an NGO, either prefetched or cached on the first read
+MAIN_CAUSE_ATTR = "main_cause_list"
+
+# The text search configuration of the stored search vectors, which are filled in by the database triggers
+SEARCH_VECTOR_CONFIG = "romanian_unaccent"
+NGO_SEARCH_VECTOR = SearchVector("name", "registration_number", config=SEARCH_VECTOR_CONFIG)
+CAUSE_SEARCH_VECTOR = SearchVector("name", config=SEARCH_VECTOR_CONFIG)
 
 logger = logging.getLogger(__name__)
 
 
+def invalidate_causes_autocomplete():
+    """
+    Let the processes know that their autocomplete index of the public causes is outdated
+    """
+    invalidate_cache_version(CAUSES_AUTOCOMPLETE_VERSION_KEY)
+
+
 def select_public_storage():
     return storages["public"]
 
@@ -107,7 +126,21 @@ def ngo_slug_validator(value):
         raise ValidationError(error_message)
 
 
-class NgoActiveManager(models.Manager):
+class NgoQuerySet(models.QuerySet):
+    def with_main_cause(self):
+        """
+        Prefetch the main cause of the NGOs, which is read by `slug`, `logo`, `bank_account` and the other properties
+        """
+        return self.prefetch_related(
+            models.Prefetch("causes", queryset=Cause.objects.filter(is_main=True), to_attr=MAIN_CAUSE_ATTR)
+        )
+
+
+class NgoManager(models.Manager.from_queryset(NgoQuerySet)):
+    pass
+
+
+class NgoActiveManager(NgoManager):
     def get_queryset(self):
         return (
             super()
@@ -164,20 +197,20 @@ class CauseOtherManager(CauseActiveManager):
         return super().get_queryset().filter(is_main=False)
 
 
-class NgoHubManager(models.Manager):
+class NgoHubManager(NgoManager):
     def get_queryset(self):
         return super().get_queryset().filter(is_active=True, ngohub_org_id__isnull=False)
 
 
-class NgoWithFormsManager(models.Manager):
+class NgoWithFormsManager(NgoManager):
     def get_queryset(self):
         return super().get_queryset().filter(is_active=True, has_online_tax_account=True)
 
 
-class NgoWithFormsThisYearManager(models.Manager):
+class NgoWithFormsThisYearManager(NgoManager):
     def get_queryset(self):
-        donations_ngos = Donor.available.filter(date_created__year=timezone.now().year).values("ngo_id").distinct()
-        return super().get_queryset().filter(pk__in=donations_ngos)
+        # the activity of an NGO in a year is unique, so the NGOs are not duplicated
+        return super().get_queryset().filter(activities__year=timezone.localdate().year, activities__count__gt=0)
 
 
 class Ngo(CommonFilenameCacheModel):
@@ -285,6 +318,9 @@ class Ngo(CommonFilenameCacheModel):
     date_created = models.DateTimeField(verbose_name=_("date created"), db_index=True, auto_now_add=True)
     date_updated = models.DateTimeField(verbose_name=_("date updated"), db_index=True, auto_now=True)
 
+    # The search document of the name and registration number, kept up to date by a database trigger
+    search_vector = SearchVectorField(null=True, editable=False)
+
     # Type hinting for related models
     causes: "models.manager.RelatedManager[Cause]"
     partners: "models.manager.RelatedManager[Partner]"
@@ -293,7 +329,7 @@ class Ngo(CommonFilenameCacheModel):
     donor_set: "models.manager.RelatedManager[Donor]"
 
     # Model managers
-    objects = models.Manager()
+    objects = NgoManager()
     active = NgoActiveManager()
     ngo_hub = NgoHubManager()
     with_forms_this_year = NgoWithFormsThisYearManager()
@@ -305,29 +341,54 @@ class Ngo(CommonFilenameCacheModel):
         constraints = [
             models.UniqueConstraint(Lower("registration_number"), name="registration_number__unique"),
         ]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="ngo_search_vector_idx"),
+            GinIndex(OpClass("name", name="gin_trgm_ops"), name="ngo_name_trgm_idx"),
+        ]
 
     def __str__(self):
         return f"{self.name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+
+        # the live counter of the active NGOs changes when the loaded state changes
+        if "is_active" not in instance.get_deferred_fields():
+            instance._loaded_is_active = instance.is_active
+
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+
+        self.invalidate_main_cause()
+
     def save(self, *args, **kwargs):
         is_new = self.pk is None
 
-        if self.registration_number:
-            uppercase_registration_number = self.registration_number
-            if re.match(REGISTRATION_NUMBER_REGEX_WITH_VAT, uppercase_registration_number):
-                self.vat_id = uppercase_registration_number[:2]
-                self.registration_number = uppercase_registration_number[2:]
+        self.split_vat_id()
 
         if not is_new and not self.has_online_tax_account:
             old_self: Ngo = Ngo.objects.get(pk=self.pk)
             if old_self.has_online_tax_account != self.has_online_tax_account:
                 self.causes.update(allow_online_collection=False, notifications_email="")
+                self.invalidate_main_cause()
 
         super().save(*args, **kwargs)
 
         if is_new and settings.ENABLE_CACHE:
             cache.delete(ALL_NGOS_CACHE_KEY)
 
+        invalidate_causes_autocomplete()
+
+    def split_vat_id(self):
+        if self.registration_number:
+            uppercase_registration_number = self.registration_number
+            if re.match(REGISTRATION_NUMBER_REGEX_WITH_VAT, uppercase_registration_number):
+                self.vat_id = uppercase_registration_number[:2]
+                self.registration_number = uppercase_registration_number[2:]
+
     def get_full_form_url(self):
         if self.slug:
             return f"redirectioneaza.ro/{self.slug}"
@@ -357,7 +418,15 @@ class Ngo(CommonFilenameCacheModel):
         if not self.pk:
             return None
 
-        return self.causes.filter(is_main=True).first()
+        if MAIN_CAUSE_ATTR not in self.__dict__:
+            setattr(self, MAIN_CAUSE_ATTR, list(self.causes.filter(is_main=True)[:1]))
+
+        main_causes: list[Cause] = getattr(self, MAIN_CAUSE_ATTR)
+
+        return main_causes[0] if main_causes else None
+
+    def invalidate_main_cause(self):
+        self.__dict__.pop(MAIN_CAUSE_ATTR, None)
 
     @property
     def slug(self):
@@ -584,6 +653,9 @@ class Cause(CommonFilenameCacheModel):
     date_created = models.DateTimeField(verbose_name=_("date created"), db_index=True, auto_now_add=True)
     date_updated = models.DateTimeField(verbose_name=_("date updated"), db_index=True, auto_now=True)
 
+    # The search document of the name, kept up to date by a database trigger
+    search_vector = SearchVectorField(null=True, editable=False)
+
     # Type hinting for related models
     donor_set: "models.manager.RelatedManager[Donor]"
 
@@ -602,10 +674,37 @@ class Cause(CommonFilenameCacheModel):
             models.UniqueConstraint(fields=["ngo", "bank_account"], name="ngo_bank_account_unique"),
             models.UniqueConstraint(fields=["ngo"], condition=Q(is_main=True), name="ngo_main_cause_unique"),
         ]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="cause_search_vector_idx"),
+            # used by the similarity search
+            GinIndex(OpClass("name", name="gin_trgm_ops"), name="cause_name_trgm_idx"),
+            # used by the case-insensitive "contains" search
+            GinIndex(OpClass(Upper("name"), name="gin_trgm_ops"), name="cause_name_upper_trgm_idx"),
+        ]
 
     def __str__(self):
         return f"{self.ngo.name} - {self.name}"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+
+        self._invalidate_ngo_main_cause()
+        invalidate_causes_autocomplete()
+
+    def delete(self, *args, **kwargs):
+        self._invalidate_ngo_main_cause()
+
+        result = super().delete(*args, **kwargs)
+
+        invalidate_causes_autocomplete()
+
+        return result
+
+    def _invalidate_ngo_main_cause(self):
+        # the other loaded instances of the NGO keep their main cause until they are refreshed
+        if Cause.ngo.is_cached(self):
+            self.ngo.invalidate_main_cause()
+
     @property
     def allow_online_notifications(self):
         return bool(self.notifications_email)
@@ -672,5 +771,5 @@ class Cause(CommonFilenameCacheModel):
             self.prefilled_form.delete()
 
 
-auditlog.register(Ngo)
-auditlog.register(Cause)
+auditlog.register(Ngo, exclude_fields=["search_vector"])
+auditlog.register(Cause, exclude_fields=["search_vector"])
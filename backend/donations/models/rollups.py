@@ -0,0 +1,136 @@
+from datetime import date
+
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.dispatch import Signal
+from django.utils.translation import gettext_lazy as _
+
+# The NGO ID, the cause ID, the day and the county of an available donation
+RollupKey = tuple[int, int | None, date, str]
+
+# Sent with the previous and the current rollup key of a donor, when the donor is counted differently
+donation_rollup_changed = Signal()
+
+
+class DonationRollup(models.Model):
+    """
+    The number of available donations by NGO, cause, day and county, which the dashboards read
+    instead of counting the donors.
+
+    The counts are changed when a donor is saved or deleted and reconciled with the donors every night,
+    which also covers the bulk updates of the donors.
+    """
+
+    ngo = models.ForeignKey(
+        "Ngo",
+        verbose_name=_("NGO"),
+        on_delete=models.CASCADE,
+        related_name="donation_rollups",
+    )
+    cause = models.ForeignKey(
+        "Cause",
+        verbose_name=_("cause"),
+        on_delete=models.CASCADE,
+        null=True,
+        related_name="donation_rollups",
+    )
+    day = models.DateField(verbose_name=_("day"))
+    county = models.CharField(verbose_name=_("county"), blank=True, null=False, default="", max_length=100)
+
+    count = models.IntegerField(verbose_name=_("count"), default=0)
+
+    class Meta:
+        verbose_name = _("donations rollup")
+        verbose_name_plural = _("donations rollups")
+
+        constraints = [
+            # also the index of the dashboards, which read the rollups of an NGO
+            models.UniqueConstraint(
+                fields=["ngo", "cause", "day", "county"],
+                name="unique_donation_rollup",
+                nulls_distinct=False,
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.ngo_id} {self.cause_id} {self.day} {self.county}: {self.count}"
+
+
+class NgoActivity(models.Model):
+    """
+    The number of available donations of an NGO in a year, so that the NGOs active in a year are an indexed lookup.
+
+    The counts are kept together with the donation rollups and reconciled with them.
+    """
+
+    ngo = models.ForeignKey(
+        "Ngo",
+        verbose_name=_("NGO"),
+        on_delete=models.CASCADE,
+        related_name="activities",
+    )
+    year = models.PositiveSmallIntegerField(verbose_name=_("year"))
+
+    count = models.IntegerField(verbose_name=_("count"), default=0)
+
+    class Meta:
+        verbose_name = _("NGO activity")
+        verbose_name_plural = _("NGO activities")
+
+        constraints = [
+            # also the index of the NGOs active in a year
+            models.UniqueConstraint(fields=["year", "ngo"], name="unique_ngo_activity"),
+        ]
+
+    def __str__(self):
+        return f"{self.ngo_id} {self.year}: {self.count}"
+
+
+def _add_to_count(model: type[models.Model], count_filter: dict, delta: int):
+    if model.objects.filter(**count_filter).update(count=F("count") + delta):
+        return
+
+    try:
+        with transaction.atomic():
+            model.objects.create(**count_filter, count=delta)
+    except IntegrityError:
+        # the row was created by a concurrent donor
+        model.objects.filter(**count_filter).update(count=F("count") + delta)
+
+
+def _add_to_rollup(key: RollupKey, delta: int):
+    ngo_id, cause_id, day, county = key
+
+    _add_to_count(DonationRollup, {"ngo_id": ngo_id, "cause_id": cause_id, "day": day, "county": county}, delta)
+
+
+def _activity_key(key: RollupKey | None) -> tuple[int, int] | None:
+    if key is None:
+        return None
+
+    ngo_id, _, day, _ = key
+    return ngo_id, day.year
+
+
+def update_donation_rollups(previous_key: RollupKey | None, current_key: RollupKey | None):
+    """
+    Move a donor from the rollup, and the NGO activity, of its previous key to the ones of its current key,
+    where a None key means that the donor is not counted, e.g. it is new, disabled or deleted
+    """
+    if previous_key == current_key:
+        return
+
+    if previous_key is not None:
+        _add_to_rollup(previous_key, -1)
+
+    if current_key is not None:
+        _add_to_rollup(current_key, 1)
+
+    previous_activity, current_activity = _activity_key(previous_key), _activity_key(current_key)
+    if previous_activity != current_activity:
+        if previous_activity is not None:
+            _add_to_count(NgoActivity, {"ngo_id": previous_activity[0], "year": previous_activity[1]}, -1)
+        if current_activity is not None:
+            _add_to_count(NgoActivity, {"ngo_id": current_activity[0], "year": current_activity[1]}, 1)
+
+    donation_rollup_changed.send(sender=DonationRollup, previous_key=previous_key, current_key=current_key)
@@ -1,11 +1,19 @@
 from datetime import date, datetime, timedelta
 from decimal import Decimal
 
-from django.db import models
-from django.utils.timezone import now
+from django.db import models, transaction
+from django.db.models import Count, Max
+from django.db.models.functions import TruncDate
+from django.utils.timezone import localdate, make_aware, now
 
-from donations.models import Donor, Ngo
-from stats.models import Stat
+from donations.models import Donor, Ngo, NgoActivity
+from stats.api import get_counter, get_stats_total_between_dates, set_counters
+from stats.models import Counter, Stat
+
+# The live counters, changed by the donors and the NGOs as they are saved and reconciled with the statistics
+DONATIONS_PER_DAY_COUNTER = "donations_day_{day}"
+DONATIONS_PER_YEAR_COUNTER = "donations_year_{year}"
+NGOS_ACTIVE_COUNTER = "ngos_active"
 
 
 class StatsChoices(models.TextChoices):
@@ -55,6 +63,77 @@ def _create_stat_redirections_per_day(for_date: date):
     _save_stat(name=StatsChoices.REDIRECTIONS_PER_DAY, metric=metric, expiration=expiration, for_date=for_date)
 
 
+def _create_stats_redirections_per_day(*, changed_since: datetime | None = None) -> int:
+    """
+    Counts the donors of every day, or of the days with donors changed since a moment, with one grouped query
+    and saves the statistics of those days at once. Returns the number of saved statistics.
+    """
+    with transaction.atomic():
+        if changed_since is None:
+            # the days which lost all their donors are set to zero
+            days: set[date] = set(
+                Stat.objects.filter(name=StatsChoices.REDIRECTIONS_PER_DAY, date__isnull=False)
+                .values_list("date", flat=True)
+                .order_by()
+            )
+        else:
+            # the disabled donors are counted out of their days as well
+            days: set[date] = set(
+                Donor.objects.filter(date_updated__gte=changed_since)
+                .annotate(day=TruncDate("date_created"))
+                .values_list("day", flat=True)
+                .distinct()
+            )
+            days |= set(
+                Stat.objects.filter(name=StatsChoices.REDIRECTIONS_PER_DAY, expires_at__lte=now())
+                .values_list("date", flat=True)
+                .order_by()
+            )
+
+            if not days:
+                return 0
+
+        donors_per_day = Donor.available.annotate(day=TruncDate("date_created")).values("day")
+        if changed_since is not None:
+            # the range of the days lets the query use the index of the creation dates
+            donors_per_day = donors_per_day.filter(
+                date_created__gte=make_aware(datetime.combine(min(days), datetime.min.time())),
+                date_created__lt=make_aware(datetime.combine(max(days) + timedelta(days=1), datetime.min.time())),
+                day__in=days,
+            )
+
+        metrics: dict[date, int] = {
+            row["day"]: row["count"] for row in donors_per_day.annotate(count=Count("id")).order_by()
+        }
+        days |= metrics.keys()
+
+        Stat.objects.bulk_create(
+            [
+                Stat(
+                    name=StatsChoices.REDIRECTIONS_PER_DAY,
+                    date=day,
+                    value=Decimal(metrics.get(day, 0)),
+                    expires_at=_calculate_expiration(delta={"minutes": 5}, for_date=day),
+                )
+                for day in sorted(days)
+            ],
+            update_conflicts=True,
+            unique_fields=["name", "date"],
+            update_fields=["value", "expires_at", "updated_at"],
+        )
+
+    return len(days)
+
+
+def last_redirections_stats_update() -> datetime | None:
+    """
+    The moment when the statistics of the donations per day were last saved, if ever
+    """
+    return Stat.objects.filter(name=StatsChoices.REDIRECTIONS_PER_DAY).aggregate(last_update=Max("updated_at"))[
+        "last_update"
+    ]
+
+
 def _create_stat_ngos_registered():
     metric: Decimal = Decimal(Ngo.objects.count())
     expiration: datetime | None = _calculate_expiration(delta={"minutes": 5})
@@ -77,9 +156,7 @@ def _create_stat_ngos_active():
 
 
 def _create_stat_ngos_active_yearly(*, for_date: date):
-    metric: Decimal = Decimal(
-        len((Donor.available.filter(date_created__year=for_date.year).values("ngo_id").distinct()))
-    )
+    metric: Decimal = Decimal(NgoActivity.objects.filter(year=for_date.year, count__gt=0).count())
     expiration: datetime | None = _calculate_expiration(delta={"minutes": 15}, for_date=for_date)
 
     _save_stat(name=StatsChoices.NGOS_ACTIVE_PER_YEAR, metric=metric, expiration=expiration, for_date=for_date)
@@ -99,7 +176,24 @@ def _create_stat_ngos_with_ngohub_yearly(*, for_date: date):
     _save_stat(name=StatsChoices.NGOS_WITH_NGOHUB_PER_YEAR, metric=metric, expiration=expiration, for_date=for_date)
 
 
-def create_stat(*, stat_choice: StatsChoices, for_date: date | None = None) -> None:
+def create_stat(
+    *,
+    stat_choice: StatsChoices,
+    for_date: date | None = None,
+    bulk: bool = False,
+    changed_since: datetime | None = None,
+) -> None:
+    """
+    Generates a statistic, or, in bulk mode, the donations of every day at once;
+    with changed_since, the bulk mode only generates the days with donors changed since then.
+    """
+    if bulk:
+        if stat_choice != StatsChoices.REDIRECTIONS_PER_DAY:
+            raise ValueError("Only the redirections per day statistics can be generated in bulk.")
+
+        _create_stats_redirections_per_day(changed_since=changed_since)
+        return
+
     if stat_choice in (
         StatsChoices.REDIRECTIONS_PER_DAY,
         StatsChoices.NGOS_REGISTERED_PER_YEAR,
@@ -123,3 +217,72 @@ def create_stat(*, stat_choice: StatsChoices, for_date: date | None = None) -> N
         _create_stat_ngos_active()
     elif stat_choice == StatsChoices.NGOS_WITH_NGOHUB:
         _create_stat_ngos_with_ngohub()
+
+
+def _donations_on_day(day: date) -> int:
+    return int(get_stats_total_between_dates(key_name=StatsChoices.REDIRECTIONS_PER_DAY, from_date=day, to_date=day))
+
+
+def _donations_in_year(year: int) -> int:
+    return int(
+        get_stats_total_between_dates(
+            key_name=StatsChoices.REDIRECTIONS_PER_DAY,
+            from_date=date(year=year, month=1, day=1),
+            to_date=date(year=year, month=12, day=31),
+        )
+    )
+
+
+def _ngos_active() -> int:
+    return Ngo.objects.filter(is_active=True).count()
+
+
+# The missing counters are counted from the donors, since the statistics are only generated from time to time
+
+
+def _count_donations_on_day(day: date) -> int:
+    return Donor.available.filter(date_created__date=day).count()
+
+
+def _count_donations_in_year(year: int) -> int:
+    return Donor.available.filter(date_created__year=year).count()
+
+
+def donations_day_counter(day: date) -> int:
+    return get_counter(name=DONATIONS_PER_DAY_COUNTER.format(day=day), default=lambda: _count_donations_on_day(day))
+
+
+def donations_year_counter(year: int) -> int:
+    return get_counter(
+        name=DONATIONS_PER_YEAR_COUNTER.format(year=year), default=lambda: _count_donations_in_year(year)
+    )
+
+
+def ngos_active_counter() -> int:
+    return get_counter(name=NGOS_ACTIVE_COUNTER, default=_ngos_active)
+
+
+def reconcile_live_counters() -> None:
+    """
+    Sets the live counters of the current day and year to the statistics, which should have just been generated,
+    and deletes the counters of the previous days and years
+    """
+    today: date = localdate()
+    today_counter: str = DONATIONS_PER_DAY_COUNTER.format(day=today)
+    year_counter: str = DONATIONS_PER_YEAR_COUNTER.format(year=today.year)
+
+    with transaction.atomic():
+        set_counters(
+            {
+                today_counter: _donations_on_day(today),
+                year_counter: _donations_in_year(today.year),
+                NGOS_ACTIVE_COUNTER: _ngos_active(),
+            }
+        )
+
+        Counter.objects.filter(name__startswith=DONATIONS_PER_DAY_COUNTER.format(day="")).exclude(
+            name=today_counter
+        ).delete()
+        Counter.objects.filter(name__startswith=DONATIONS_PER_YEAR_COUNTER.format(year="")).exclude(
+            name=year_counter
+        ).delete()
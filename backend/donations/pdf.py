@@ -1,12 +1,16 @@
 import base64
 import os
 from datetime import datetime
+from functools import cache
 from io import BytesIO
 from tempfile import TemporaryFile
 
+from pypdf import PageObject, PdfReader, PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject, NumberObject, StreamObject
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.utils import ImageReader
 from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.pdfutils import readJPEGInfo
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen import canvas
 from reportlab.pdfgen.canvas import Canvas
@@ -22,6 +26,9 @@ pdfmetrics.registerFont(TTFont("OpenSans", font_path))
 default_font_size = 15
 form_image_path = abs_path + "/static_extras/images/formular-2025.jpg"
 
+# The PDF color spaces of the JPEG images, by their number of color components
+JPEG_COLOR_SPACES = {1: "/DeviceGray", 3: "/DeviceRGB"}
+
 
 def _format_bank_account(bank_account: str):
     # remove spaces from the bank account number
@@ -215,18 +222,80 @@ def _add_signature_to_pdf(c: Canvas, raw_signature: str, new_height: int = 30):
 
 def _initialize_pdf_canvas(packet):
     c: Canvas = canvas.Canvas(packet, A4)
-    width, height = A4
-
-    # add the image as a background
-    background: ImageReader = ImageReader(form_image_path)
 
-    c.drawImage(background, 0, 0, width=width, height=height)
+    # the background is not drawn here, the canvas is merged over the form template
     c.setFont("OpenSans", default_font_size)
     c.setFontSize(default_font_size)
 
     return c
 
 
+@cache
+def get_form_template() -> PageObject:
+    """
+    The empty form page, built once per process.
+
+    The background image is embedded as it is, instead of being encoded again for every form,
+    and every form only draws its own data over this page.
+    """
+    width, height = A4
+
+    with open(form_image_path, "rb") as image_file:
+        # newer versions of reportlab also return the resolution of the image
+        image_width, image_height, color_components = readJPEGInfo(image_file)[:3]
+        image_file.seek(0)
+        image_data: bytes = image_file.read()
+
+    writer = PdfWriter()
+    page: PageObject = writer.add_blank_page(width, height)
+
+    image = StreamObject()
+    image.set_data(image_data)
+    image.update(
+        {
+            NameObject("/Type"): NameObject("/XObject"),
+            NameObject("/Subtype"): NameObject("/Image"),
+            NameObject("/Width"): NumberObject(image_width),
+            NameObject("/Height"): NumberObject(image_height),
+            NameObject("/ColorSpace"): NameObject(JPEG_COLOR_SPACES.get(color_components, "/DeviceCMYK")),
+            NameObject("/BitsPerComponent"): NumberObject(8),
+            NameObject("/Filter"): NameObject("/DCTDecode"),
+        }
+    )
+
+    page[NameObject("/Resources")] = DictionaryObject(
+        {NameObject("/XObject"): DictionaryObject({NameObject("/Background"): writer._add_object(image)})}
+    )
+
+    # draw the image over the whole page
+    content = DecodedStreamObject()
+    content.set_data(f"q {width:.2f} 0 0 {height:.2f} 0 0 cm /Background Do Q".encode())
+    page[NameObject("/Contents")] = writer._add_object(content)
+
+    template = BytesIO()
+    writer.write(template)
+    template.seek(0)
+
+    return PdfReader(template).pages[0]
+
+
+def _save_over_form_template(c: Canvas, overlay_packet: BytesIO):
+    c.save()
+    overlay_packet.seek(0)
+
+    writer = PdfWriter()
+    page: PageObject = writer.add_page(get_form_template())
+    page.merge_page(PdfReader(overlay_packet).pages[0])
+
+    packet = TemporaryFile(mode="w+b")
+    writer.write(packet)
+
+    # go to the beginning of the file
+    packet.seek(0)
+
+    return packet
+
+
 def _add_year_to_pdf(c: Canvas, start_x: int, start_y: int):
     # the year
     # this is the previous year
@@ -240,9 +309,8 @@ def create_cause_pdf(cause: Cause | None, ngo: Ngo):
     start_x: int = 305
     start_y: int = 726
 
-    # packet = StringIO()
-    # we could also use StringIO
-    packet = TemporaryFile(mode="w+b")
+    # only the data is drawn here, the form itself comes from the template
+    packet = BytesIO()
 
     c: Canvas = _initialize_pdf_canvas(packet)
 
@@ -250,12 +318,7 @@ def create_cause_pdf(cause: Cause | None, ngo: Ngo):
 
     _add_ngo_data(start_y, c, cause, ngo)
 
-    c.save()
-
-    # go to the beginning of the file
-    packet.seek(0)
-
-    return packet
+    return _save_over_form_template(c, packet)
 
 
 def create_full_pdf(donor: Donor, signature: str | None = None):
@@ -268,9 +331,8 @@ def create_full_pdf(donor: Donor, signature: str | None = None):
     start_x: int = 305
     start_y: int = 726
 
-    # packet = StringIO()
-    # we could also use StringIO
-    packet = TemporaryFile(mode="w+b")
+    # only the data is drawn here, the form itself comes from the template
+    packet = BytesIO()
 
     c: Canvas = _initialize_pdf_canvas(packet)
 
@@ -287,9 +349,4 @@ def create_full_pdf(donor: Donor, signature: str | None = None):
     if signature:
         _add_signature_to_pdf(c, signature)
 
-    c.save()
-
-    # go to the beginning of the file
-    packet.seek(0)
-
-    return packet
+    return _save_over_form_template(c, packet)
@@ -0,0 +1,85 @@
+import logging
+from collections import Counter
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from donations.models.donors import Donor, archive_member_cache_path
+from donations.models.ngos import Ngo
+from donations.models.rollups import DonationRollup, RollupKey, donation_rollup_changed
+from donations.models.stat_configs import DONATIONS_PER_DAY_COUNTER, DONATIONS_PER_YEAR_COUNTER, NGOS_ACTIVE_COUNTER
+from stats.api import increment_counters
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(donation_rollup_changed, sender=DonationRollup)
+def count_donation(sender, previous_key: RollupKey | None, current_key: RollupKey | None, **kwargs):
+    deltas: Counter[str] = Counter()
+
+    for key, delta in ((previous_key, -1), (current_key, 1)):
+        if key is None:
+            continue
+
+        day = key[2]
+        deltas[DONATIONS_PER_DAY_COUNTER.format(day=day)] += delta
+        deltas[DONATIONS_PER_YEAR_COUNTER.format(year=day.year)] += delta
+
+    _increment_counters_on_commit(deltas)
+
+
+@receiver(post_save, sender=Ngo)
+def count_saved_ngo(sender, instance: Ngo, created: bool, update_fields: frozenset[str] | None, **kwargs):
+    if update_fields is not None and "is_active" not in update_fields:
+        return
+
+    was_active: bool = False if created else getattr(instance, "_loaded_is_active", instance.is_active)
+    instance._loaded_is_active = instance.is_active
+
+    if was_active != instance.is_active:
+        _increment_counters_on_commit({NGOS_ACTIVE_COUNTER: 1 if instance.is_active else -1})
+
+
+@receiver(post_delete, sender=Ngo)
+def count_deleted_ngo(sender, instance: Ngo, **kwargs):
+    if getattr(instance, "_loaded_is_active", instance.is_active):
+        _increment_counters_on_commit({NGOS_ACTIVE_COUNTER: -1})
+
+
+@receiver(post_save, sender=Donor)
+def remove_replaced_cached_member(
+    sender, instance: Donor, created: bool, update_fields: frozenset[str] | None, **kwargs
+):
+    if update_fields is not None and "pdf_file" not in update_fields:
+        return
+
+    loaded_pdf_file_name: str = "" if created else getattr(instance, "_loaded_pdf_file_name", "")
+    instance._loaded_pdf_file_name = instance.pdf_file.name
+
+    if loaded_pdf_file_name and loaded_pdf_file_name != instance.pdf_file.name:
+        _delete_cached_member_on_commit(instance.pk, loaded_pdf_file_name)
+
+
+@receiver(post_delete, sender=Donor)
+def remove_deleted_cached_member(sender, instance: Donor, **kwargs):
+    if instance.pdf_file.name:
+        _delete_cached_member_on_commit(instance.pk, instance.pdf_file.name)
+
+
+def _delete_cached_member_on_commit(donor_pk: int, pdf_file_name: str):
+    # the cached archive members are copies of the personal data in the PDF files
+    def _delete_cached_member():
+        try:
+            Donor._meta.get_field("pdf_file").storage.delete(archive_member_cache_path(donor_pk, pdf_file_name))
+        except Exception as e:
+            logger.warning("Could not delete the cached PDF file of donor #%d: %s", donor_pk, e)
+
+    transaction.on_commit(_delete_cached_member)
+
+
+def _increment_counters_on_commit(deltas: dict[str, int]):
+    # the counter rows are shared by every donation, so they are only locked for the short update transactions
+    # after the commit, not for the whole transactions of the donors
+    transaction.on_commit(partial(increment_counters, dict(deltas)))
@@ -0,0 +1,85 @@
+import json
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from faker import Faker
+
+from donations.models import Cause, Ngo
+from donations.views.common import autocomplete
+from donations.views.common.autocomplete import CausesAutocompleteIndex, causes_autocomplete_index
+from donations.views.common.misc import get_cause_response_item
+from redirectioneaza.common.testing.client import ApexClient
+
+faker = Faker("ro_RO")
+
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+class CausesAutocompleteTests(TestCase):
+    def setUp(self):
+        self.ngo = Ngo.objects.create(
+            name="Fundația Pădurea Verde",
+            registration_number="12345678",
+            address="123 Test St, Test City",
+            is_active=True,
+        )
+        self.main_cause = self._create_cause("Tabăra copiilor din Pădurea Verde", is_main=True)
+        self.other_cause = self._create_cause("Școala de vară")
+
+    def _create_cause(self, name: str, is_main: bool = False) -> Cause:
+        return Cause.objects.create(
+            ngo=self.ngo,
+            is_main=is_main,
+            slug=faker.unique.slug(),
+            name=name,
+            description="A cause for testing purposes.",
+            bank_account=faker.iban(),
+        )
+
+    def _search(self, query: str) -> list[dict]:
+        return json.loads(CausesAutocompleteIndex.build().search_json(query))
+
+    def test_the_names_are_matched_without_diacritics(self):
+        self.assertEqual(self._search("SCOALA DE"), [get_cause_response_item(self.other_cause)])
+        self.assertEqual(self._search("padurea verde"), [get_cause_response_item(self.main_cause)])
+
+    def test_the_main_cause_is_matched_by_the_registration_number(self):
+        self.assertEqual(self._search("RO12345678"), [get_cause_response_item(self.main_cause)])
+
+    def test_similar_names_and_word_prefixes_are_matched(self):
+        self.assertEqual(self._search("scoli vara"), [get_cause_response_item(self.other_cause)])
+        self.assertEqual(self._search("tabara copii"), [get_cause_response_item(self.main_cause)])
+        self.assertEqual(self._search("trotinete"), [])
+
+    def test_short_queries_return_all_the_causes(self):
+        self.assertEqual(
+            self._search("ab"),
+            [get_cause_response_item(self.main_cause), get_cause_response_item(self.other_cause)],
+        )
+
+    @override_settings(ENABLE_CACHE=True, CACHES=LOCMEM_CACHES)
+    def test_the_index_is_built_again_when_the_causes_change(self):
+        with mock.patch.object(autocomplete, "_index", None):
+            index = causes_autocomplete_index()
+            self.assertIs(causes_autocomplete_index(), index)
+
+            self.other_cause.name = "Școala de iarnă"
+            self.other_cause.save()
+
+            with mock.patch.object(autocomplete, "AUTOCOMPLETE_VERSION_CHECK_SECONDS", 0):
+                rebuilt_index = causes_autocomplete_index()
+
+            self.assertIsNot(rebuilt_index, index)
+            self.assertEqual(json.loads(rebuilt_index.search_json("iarna"))[0]["name"], "Școala de iarnă")
+
+    def test_the_search_api_uses_the_index(self):
+        with mock.patch.object(autocomplete, "_index", None):
+            # only the first request builds the index
+            ApexClient().get(reverse("api-search-ngos"), {"q": "tabara"})
+
+            with self.assertNumQueries(0):
+                response = ApexClient().get(reverse("api-search-ngos"), {"q": "scoala"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [get_cause_response_item(self.other_cause)])
@@ -0,0 +1,130 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from donations.models.donors import Donor
+from donations.models.ngos import Cause, Ngo
+from donations.models.rollups import DonationRollup, NgoActivity
+from donations.models.stat_configs import StatsChoices, create_stat
+from donations.views.dashboard import ngo_dashboard
+from donations.workers.rollups import reconcile_donation_rollups
+from stats.models import Stat
+
+
+class DonationRollupsTestCase(TestCase):
+    def setUp(self):
+        self.ngo = Ngo.objects.create(name="Test NGO", registration_number="6859662", email="ngo@example.com")
+        self.cause = Cause.objects.create(
+            ngo=self.ngo,
+            name="Test Cause",
+            slug="test-cause",
+            bank_account="RO25RZBR6782146545912934",
+            is_main=True,
+        )
+
+    def _create_donor(self, county: str = "Cluj") -> Donor:
+        return Donor.objects.create(ngo=self.ngo, cause=self.cause, f_name="Ion", l_name="Popescu", county=county)
+
+    def _counts(self) -> dict[str, int]:
+        return {rollup.county: rollup.count for rollup in DonationRollup.objects.filter(ngo=self.ngo)}
+
+
+class DonationRollupsUpdateTests(DonationRollupsTestCase):
+    def test_the_rollups_follow_the_donors(self):
+        first_donor = self._create_donor()
+        second_donor = self._create_donor()
+        self._create_donor(county="Iași")
+        self.assertEqual(self._counts(), {"Cluj": 2, "Iași": 1})
+
+        first_donor.disable()
+        self.assertEqual(self._counts(), {"Cluj": 1, "Iași": 1})
+
+        # a donor loaded from the database, e.g. by the anonymization task, stays in its rollup
+        Donor.objects.get(pk=second_donor.pk).remove_personal_data()
+        self.assertEqual(self._counts(), {"Cluj": 1, "Iași": 1})
+
+        moved_donor = Donor.objects.get(pk=second_donor.pk)
+        moved_donor.county = "Iași"
+        moved_donor.save()
+        self.assertEqual(self._counts(), {"Cluj": 0, "Iași": 2})
+
+        moved_donor.delete()
+        self.assertEqual(self._counts(), {"Cluj": 0, "Iași": 1})
+
+    def test_the_reconciliation_fixes_the_bulk_changes(self):
+        donor = self._create_donor()
+        self._create_donor(county="Iași")
+
+        Donor.objects.filter(pk=donor.pk).update(county="Alba")
+        Donor.objects.filter(county="Iași").update(is_available=False)
+
+        summary = reconcile_donation_rollups()
+
+        self.assertEqual(self._counts(), {"Alba": 1})
+        self.assertEqual(summary, {"ngos": 1, "changed": 1, "deleted": 2})
+        self.assertEqual(reconcile_donation_rollups(), {"ngos": 1, "changed": 0, "deleted": 0})
+
+
+class NgoActivityTests(DonationRollupsTestCase):
+    def _activities(self) -> dict[int, int]:
+        return dict(NgoActivity.objects.filter(ngo=self.ngo).values_list("year", "count"))
+
+    def test_the_active_ngos_are_read_from_the_activities(self):
+        current_year: int = timezone.localdate().year
+        other_ngo = Ngo.objects.create(name="Other NGO", registration_number="33140406", email="other@example.com")
+
+        first_donor = self._create_donor()
+        second_donor = self._create_donor(county="Iași")
+        self.assertEqual(self._activities(), {current_year: 2})
+
+        # a change of the county does not change the activity
+        second_donor.county = "Cluj"
+        second_donor.save()
+        self.assertEqual(self._activities(), {current_year: 2})
+
+        with self.assertNumQueries(1):
+            self.assertEqual(list(Ngo.with_forms_this_year.all()), [self.ngo])
+
+        create_stat(stat_choice=StatsChoices.NGOS_ACTIVE_PER_YEAR, for_date=timezone.localdate())
+        self.assertEqual(Stat.objects.get(name=StatsChoices.NGOS_ACTIVE_PER_YEAR).value, 1)
+
+        first_donor.disable()
+        second_donor.delete()
+        self.assertEqual(self._activities(), {current_year: 0})
+        self.assertFalse(Ngo.with_forms_this_year.exists())
+        self.assertFalse(NgoActivity.objects.filter(ngo=other_ngo).exists())
+
+    def test_the_reconciliation_rebuilds_the_activities(self):
+        current_year: int = timezone.localdate().year
+        donor = self._create_donor()
+        self._create_donor()
+
+        Donor.objects.filter(pk=donor.pk).update(date_created=timezone.now() - timedelta(days=366))
+        NgoActivity.objects.all().delete()
+
+        reconcile_donation_rollups()
+
+        self.assertEqual(self._activities(), {current_year - 1: 1, current_year: 1})
+
+
+class NgoDashboardTests(DonationRollupsTestCase):
+    def test_the_widgets_read_the_rollups(self):
+        for county in ("Cluj", "Cluj", "Iași"):
+            self._create_donor(county=county)
+        last_year_donor = self._create_donor(county="Iași")
+        Donor.objects.filter(pk=last_year_donor.pk).update(date_created=timezone.now() - timedelta(days=366))
+        reconcile_donation_rollups()
+
+        request = RequestFactory().get("/")
+        request.user = get_user_model().objects.create_user(email="user@example.com", ngo=self.ngo)
+
+        with self.assertNumQueries(2):
+            context = ngo_dashboard.callback(request, {})
+
+        self.assertEqual(context["table_stats"]["data"]["rows"], [[1, "Cluj", 2], [2, "Iași", 2]])
+
+        current_year: int = timezone.now().year
+        header_metrics = {stat["title"]: stat["metric"] for row in context["header_stats"] for stat in row}
+        self.assertEqual(header_metrics[f"Donations in {current_year}"], 3)
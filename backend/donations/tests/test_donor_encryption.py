@@ -1,3 +1,5 @@
+from unittest import mock
+
 from django.test import TestCase
 from faker import Faker
 
@@ -30,3 +32,64 @@ class DonorEncryptionTests(TestCase):
         decrypted_cnp = Donor.decrypt_cnp(encrypted_cnp)
 
         self.assertEqual(decrypted_cnp, fake_cnp)
+
+
+class DonorBatchDecryptionTests(TestCase):
+    def setUp(self):
+        self.faker = Faker("ro_RO")
+
+        self.donors: list[Donor] = []
+        for _ in range(5):
+            donor = Donor()
+            donor.set_cnp(self.faker.unique.ssn())
+            donor.set_address_helper(street_name=self.faker.street_name(), street_number=self.faker.building_number())
+            donor.save()
+
+            self.donors.append(donor)
+
+        self.expected = [
+            (donor.pk, Donor.decrypt_cnp(donor.encrypted_cnp), Donor.decrypt_address(donor.encrypted_address))
+            for donor in self.donors
+        ]
+
+    @staticmethod
+    def _as_tuples(decrypted_donors) -> list[tuple[int, str, dict]]:
+        return [(data.pk, data.cnp, data.address) for data in decrypted_donors]
+
+    def test_instances_querysets_and_rows_are_decrypted(self):
+        rows = [(donor.pk, donor.encrypted_cnp, donor.encrypted_address) for donor in self.donors]
+
+        self.assertEqual(self._as_tuples(Donor.decrypt_many(self.donors)), self.expected)
+        self.assertEqual(self._as_tuples(Donor.decrypt_many(Donor.objects.order_by("pk"))), self.expected)
+        self.assertEqual(self._as_tuples(Donor.decrypt_many(rows)), self.expected)
+
+    def test_instances_are_decrypted_once(self):
+        Donor.decrypt_many(self.donors)
+
+        with mock.patch("donations.models.donors.decrypt_data") as decrypt_mock:
+            decrypted = Donor.decrypt_many(self.donors)
+            cnps = [donor.get_cnp() for donor in self.donors]
+            addresses = [donor.get_address() for donor in self.donors]
+
+        decrypt_mock.assert_not_called()
+        self.assertEqual(self._as_tuples(decrypted), self.expected)
+        self.assertEqual(cnps, [cnp for _, cnp, _ in self.expected])
+        self.assertEqual(addresses, [address for _, _, address in self.expected])
+
+    def test_changed_data_is_decrypted_again(self):
+        donor: Donor = self.donors[0]
+        self.assertEqual(donor.get_cnp(), self.expected[0][1])
+
+        new_cnp: str = self.faker.unique.ssn()
+        donor.set_cnp(new_cnp)
+        self.assertEqual(donor.get_cnp(), new_cnp)
+
+        # the callers can't change the remembered address
+        donor.get_address()["str"] = "changed"
+        self.assertEqual(donor.get_address(), self.expected[0][2])
+
+    def test_rows_are_decrypted_in_a_pool(self):
+        with mock.patch("donations.models.donors.DECRYPTION_BATCH_SIZE", 2):
+            decrypted = Donor.decrypt_many(self.donors, workers_count=3)
+
+        self.assertEqual(self._as_tuples(decrypted), self.expected)
@@ -0,0 +1,141 @@
+from unittest import mock
+from zipfile import ZipFile
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from faker import Faker
+
+from donations.models import Cause, Donor, Ngo
+from donations.models.common import JobStatusChoices
+from donations.models.jobs import Job
+from donations.tests.builder import DonorTestBuilder
+from donations.tests.test_download_donations_partitions import _InlineExecutor
+from donations.views.download_donations import pdf_fetch
+from donations.views.download_donations.main import download_donations_job
+
+faker = Faker("ro_RO")
+
+
+class _WorkerKilled(BaseException):
+    """
+    Stop the job the way a timeout of the worker does, without the job handling the error.
+    """
+
+
+@override_settings(FORMS_DOWNLOAD_CHECKPOINT_COUNT=2, FORMS_DOWNLOAD_WORKERS_COUNT=1, DONATIONS_XML_LIMIT_PER_FILE=2)
+class CheckpointedArchiveJobTests(TestCase):
+    def setUp(self):
+        self.ngo = Ngo.objects.create(
+            name="Test NGO",
+            registration_number=faker.vat_id(),
+            address="123 Test St, Test City",
+        )
+        self.cause = Cause.objects.create(ngo=self.ngo, name="Test Cause", description="A cause for testing purposes.")
+        self.user = get_user_model().objects.create_user(
+            username="test_user",
+            password="test_password",
+            email="testuser@example.com",
+            ngo=self.ngo,
+        )
+
+        for county in ["Cluj", "Alba", "Cluj", "Cluj", "Iași", "Alba", "Cluj", "Alba"]:
+            DonorTestBuilder(cause=self.cause).with_all_fields().with_county(county).with_misc(has_signed=True).build()
+
+        # a donation without a PDF file is still included in the XML files
+        Donor.objects.filter(pk=Donor.objects.order_by("pk").values_list("pk", flat=True)[2]).update(pdf_file="")
+
+    def _run_job(self, job: Job) -> None:
+        with mock.patch("donations.views.download_donations.main.send_email"):
+            download_donations_job(job.pk)
+
+        job.refresh_from_db()
+
+    def _crash_job(self, opened_files_limit: int) -> Job:
+        job = Job.objects.create(ngo=self.ngo, cause=self.cause, owner=self.user)
+        opened_files: list[str] = []
+        open_file = pdf_fetch.open_file
+
+        def _open_file_until_killed(donation):
+            if len(opened_files) >= opened_files_limit:
+                raise _WorkerKilled()
+
+            opened_files.append(donation.pdf_file_name)
+            return open_file(donation)
+
+        with (
+            mock.patch("donations.views.download_donations.pdf_fetch.open_file", side_effect=_open_file_until_killed),
+            self.assertRaises(_WorkerKilled),
+        ):
+            self._run_job(job)
+
+        job.refresh_from_db()
+
+        return job
+
+    @staticmethod
+    def _read_archive(job: Job) -> dict[str, bytes]:
+        with job.zip.open("rb") as zip_file, ZipFile(zip_file) as zip_archive:
+            return {
+                name: zip_archive.read(name)
+                for name in zip_archive.namelist()
+                if name.startswith("pdf/") or name == "index.csv"
+            }
+
+    def _build_uninterrupted_archive(self) -> dict[str, bytes]:
+        job = Job.objects.create(ngo=self.ngo, cause=self.cause, owner=self.user)
+        self._run_job(job)
+
+        return self._read_archive(job)
+
+    def test_crashed_job_keeps_its_checkpoint(self):
+        job = self._crash_job(opened_files_limit=4)
+
+        self.assertEqual(job.status, JobStatusChoices.NEW)
+        self.assertEqual(job.number_of_donations, 8)
+        self.assertEqual(len(job.checkpoint_segments), 2)
+        self.assertGreater(job.processed_donations, 0)
+        self.assertLess(job.processed_donations, job.number_of_donations)
+
+        storage = Job._meta.get_field("zip").storage
+        for segment_name in job.checkpoint_segments:
+            self.assertTrue(storage.exists(segment_name))
+
+    def test_resumed_job_fetches_only_the_remaining_files(self):
+        job = self._crash_job(opened_files_limit=4)
+        segment_names: list[str] = list(job.checkpoint_segments)
+
+        with mock.patch(
+            "donations.views.download_donations.pdf_fetch.open_file", wraps=pdf_fetch.open_file
+        ) as open_file_mock:
+            self._run_job(job)
+
+        # 7 of the donations have a PDF file, and 4 of them were saved before the crash
+        self.assertEqual(open_file_mock.call_count, 3)
+
+        self.assertEqual(job.status, JobStatusChoices.DONE)
+        self.assertEqual(job.processed_donations, 8)
+        self.assertEqual(job.checkpoint_segments, [])
+
+        storage = Job._meta.get_field("zip").storage
+        for segment_name in segment_names:
+            self.assertFalse(storage.exists(segment_name))
+
+        resumed_archive = self._read_archive(job)
+        self.assertEqual(len([name for name in resumed_archive if name.startswith("pdf/")]), 7)
+        self.assertEqual(resumed_archive, self._build_uninterrupted_archive())
+
+    def test_resumed_job_in_processes_reuses_the_checkpoint(self):
+        job = self._crash_job(opened_files_limit=4)
+
+        with (
+            override_settings(FORMS_DOWNLOAD_PROCESSES_COUNT=4),
+            mock.patch("donations.views.download_donations.partitions.ProcessPoolExecutor", _InlineExecutor),
+            mock.patch(
+                "donations.views.download_donations.pdf_fetch.open_file", wraps=pdf_fetch.open_file
+            ) as open_file_mock,
+        ):
+            self._run_job(job)
+
+        self.assertEqual(open_file_mock.call_count, 3)
+        self.assertEqual(job.status, JobStatusChoices.DONE)
+        self.assertEqual(self._read_archive(job), self._build_uninterrupted_archive())
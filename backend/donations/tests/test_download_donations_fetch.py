@@ -0,0 +1,72 @@
+import io
+import time
+from unittest import mock
+from zipfile import ZipFile
+
+from django.core.files import File
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from donations.models.common import JobDownloadError
+from donations.views.download_donations.pdf_fetch import copy_file_to_zip, fetch_donation_pdfs
+from donations.views.download_donations.records import DonationRecord
+from donations.views.download_donations.zip_members import ZipArchiveWriter
+
+
+def _fake_open_file(donation: DonationRecord) -> File:
+    # make the earlier files finish last, to check that the original order is kept
+    time.sleep((20 - donation.pk) / 1000)
+
+    if donation.pk % 5 == 0:
+        raise JobDownloadError
+
+    return File(io.BytesIO(f"pdf-{donation.pk}".encode()))
+
+
+class FetchDonationPdfsTests(SimpleTestCase):
+    def setUp(self):
+        self.donations = [
+            DonationRecord(pk=pk, date_created=timezone.now(), pdf_file_name=f"forms/{pk}.pdf") for pk in range(1, 20)
+        ]
+
+    def _fetch(self, workers_count: int) -> list[tuple[int, bytes]]:
+        with mock.patch("donations.views.download_donations.pdf_fetch.open_file", side_effect=_fake_open_file):
+            return [
+                (donation.pk, pdf_file.read())
+                for donation, pdf_file in fetch_donation_pdfs(self.donations, workers_count=workers_count)
+            ]
+
+    def test_files_are_yielded_in_the_donations_order(self):
+        expected = [(pk, f"pdf-{pk}".encode()) for pk in range(1, 20) if pk % 5 != 0]
+
+        self.assertEqual(self._fetch(workers_count=4), expected)
+        self.assertEqual(self._fetch(workers_count=1), expected)
+
+    def test_donations_without_pdf_are_skipped(self):
+        self.donations[0].pdf_file_name = ""
+
+        fetched_pks = [pk for pk, _ in self._fetch(workers_count=2)]
+
+        self.assertNotIn(1, fetched_pks)
+        self.assertIn(2, fetched_pks)
+
+    def test_failed_reads_are_retried(self):
+        with mock.patch(
+            "donations.views.download_donations.pdf_fetch.open_file",
+            side_effect=[JobDownloadError, File(io.BytesIO(b"pdf"))],
+        ) as open_mock:
+            result = [(donation, pdf_file.read()) for donation, pdf_file in fetch_donation_pdfs(self.donations[:1])]
+
+        self.assertEqual(open_mock.call_count, 2)
+        self.assertEqual(result, [(self.donations[0], b"pdf")])
+
+    def test_copy_file_to_zip(self):
+        content = b"%PDF" * 100_000
+
+        archive_buffer = io.BytesIO()
+        with ZipArchiveWriter(archive_buffer) as zip_archive:
+            copy_file_to_zip(io.BytesIO(content), zip_archive, "pdf/form.pdf")
+
+        with ZipFile(archive_buffer) as zip_archive:
+            self.assertIsNone(zip_archive.testzip())
+            self.assertEqual(zip_archive.read("pdf/form.pdf"), content)
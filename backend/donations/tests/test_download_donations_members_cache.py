@@ -0,0 +1,194 @@
+import io
+from datetime import timedelta
+from unittest import mock
+from zipfile import ZIP_DEFLATED, ZipFile
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from faker import Faker
+
+from donations.models import Cause, Donor, Ngo
+from donations.models.common import JobStatusChoices
+from donations.models.donors import archive_member_cache_path
+from donations.models.jobs import Job
+from donations.tests.builder import DonorTestBuilder
+from donations.views.download_donations import members_cache, pdf_fetch
+from donations.views.download_donations.main import download_donations_job
+from donations.views.download_donations.members_cache import compress_file, remove_stale_cached_members
+from donations.views.download_donations.zip_members import ZipArchiveWriter, write_compressed_member
+
+faker = Faker("ro_RO")
+
+
+class CompressFileTests(SimpleTestCase):
+    def test_compressed_file_is_a_valid_member(self):
+        content: bytes = b"%PDF-1.7" + bytes(range(256)) * 1_000
+
+        member = compress_file(io.BytesIO(content), "pdf/form.pdf")
+
+        buffer = io.BytesIO()
+        with ZipArchiveWriter(buffer) as zip_archive:
+            write_compressed_member(zip_archive, member)
+
+        with ZipFile(buffer) as zip_archive:
+            self.assertIsNone(zip_archive.testzip())
+            self.assertEqual(zip_archive.getinfo("pdf/form.pdf").compress_type, ZIP_DEFLATED)
+            self.assertEqual(zip_archive.read("pdf/form.pdf"), content)
+
+        self.assertLess(member.compress_size, member.file_size)
+        member.close()
+
+
+@override_settings(ENABLE_FORMS_DOWNLOAD_MEMBERS_CACHE=True, FORMS_DOWNLOAD_CHECKPOINT_COUNT=0)
+class MembersCacheTests(TestCase):
+    def setUp(self):
+        self.ngo = Ngo.objects.create(
+            name="Test NGO",
+            registration_number=faker.vat_id(),
+            address="123 Test St, Test City",
+        )
+        self.cause = Cause.objects.create(ngo=self.ngo, name="Test Cause", description="A cause for testing purposes.")
+        self.user = get_user_model().objects.create_user(
+            username="test_user",
+            password="test_password",
+            email="testuser@example.com",
+            ngo=self.ngo,
+        )
+
+        self.donors: list[Donor] = [
+            DonorTestBuilder(cause=self.cause).with_all_fields().with_misc(has_signed=True).build() for _ in range(4)
+        ]
+        self.storage = Donor._meta.get_field("pdf_file").storage
+
+    def _build_archive(self) -> tuple[dict[str, bytes], int]:
+        job = Job.objects.create(ngo=self.ngo, cause=self.cause, owner=self.user)
+
+        with (
+            mock.patch("donations.views.download_donations.main.send_email"),
+            mock.patch(
+                "donations.views.download_donations.pdf_fetch.open_file", wraps=pdf_fetch.open_file
+            ) as open_file_mock,
+        ):
+            download_donations_job(job.pk)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, JobStatusChoices.DONE)
+
+        with job.zip.open("rb") as zip_file, ZipFile(zip_file) as zip_archive:
+            pdf_files = {name: zip_archive.read(name) for name in zip_archive.namelist() if name.startswith("pdf/")}
+
+        return pdf_files, open_file_mock.call_count
+
+    def test_later_archives_use_the_cached_members(self):
+        first_archive, first_opened_files = self._build_archive()
+
+        self.assertEqual(first_opened_files, 4)
+        for donor in self.donors:
+            self.assertTrue(self.storage.exists(archive_member_cache_path(donor.pk, donor.pdf_file.name)))
+
+        new_donor = DonorTestBuilder(cause=self.cause).with_all_fields().with_misc(has_signed=True).build()
+
+        second_archive, second_opened_files = self._build_archive()
+
+        # only the new donation is downloaded and compressed
+        self.assertEqual(second_opened_files, 1)
+        self.assertEqual(len(second_archive), 5)
+        for name, content in first_archive.items():
+            self.assertEqual(second_archive[name], content)
+
+        with new_donor.pdf_file.open("rb") as pdf_file:
+            self.assertIn(pdf_file.read(), second_archive.values())
+
+    def test_cached_member_is_removed_with_the_personal_data(self):
+        self._build_archive()
+
+        donor: Donor = self.donors[0]
+        cache_path: str = archive_member_cache_path(donor.pk, donor.pdf_file.name)
+        self.assertTrue(self.storage.exists(cache_path))
+
+        donor.remove_personal_data()
+
+        self.assertFalse(self.storage.exists(cache_path))
+
+    def test_cached_member_is_removed_with_the_donor(self):
+        self._build_archive()
+
+        donor: Donor = self.donors[0]
+        cache_path: str = archive_member_cache_path(donor.pk, donor.pdf_file.name)
+        self.assertTrue(self.storage.exists(cache_path))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            donor.delete()
+
+        self.assertFalse(self.storage.exists(cache_path))
+
+    def test_cached_member_is_removed_with_the_replaced_pdf_file(self):
+        self._build_archive()
+
+        donor: Donor = Donor.objects.get(pk=self.donors[0].pk)
+        cache_path: str = archive_member_cache_path(donor.pk, donor.pdf_file.name)
+        self.assertTrue(self.storage.exists(cache_path))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            donor.pdf_file.save("formular.pdf", ContentFile(b"%PDF-1.7 replaced"))
+
+        self.assertFalse(self.storage.exists(cache_path))
+
+    def test_stale_cached_members_are_removed(self):
+        self._build_archive()
+
+        (orphaned_donor, expired_donor, *current_donors) = self.donors
+        orphaned_path: str = archive_member_cache_path(orphaned_donor.pk, orphaned_donor.pdf_file.name)
+        expired_path: str = archive_member_cache_path(expired_donor.pk, expired_donor.pdf_file.name)
+
+        # the file is replaced without the signals of the donor, e.g. in bulk
+        Donor.objects.filter(pk=orphaned_donor.pk).update(pdf_file="donation-forms/other.pdf")
+
+        storage_modified_time = self.storage.get_modified_time
+
+        def _get_modified_time(name: str):
+            if name == expired_path:
+                return timezone.now() - timedelta(days=365)
+            return storage_modified_time(name)
+
+        with mock.patch.object(self.storage, "get_modified_time", side_effect=_get_modified_time):
+            summary: dict[str, int] = remove_stale_cached_members()
+
+        self.assertGreaterEqual(summary["deleted"], 2)
+        self.assertFalse(self.storage.exists(orphaned_path))
+        self.assertFalse(self.storage.exists(expired_path))
+        for donor in current_donors:
+            self.assertTrue(self.storage.exists(archive_member_cache_path(donor.pk, donor.pdf_file.name)))
+
+    def test_an_invalid_cached_member_is_replaced(self):
+        self._build_archive()
+
+        donor: Donor = self.donors[0]
+        cache_path: str = archive_member_cache_path(donor.pk, donor.pdf_file.name)
+        self.storage.delete(cache_path)
+        self.storage.save(cache_path, ContentFile(b"truncated"))
+
+        archive, opened_files = self._build_archive()
+
+        self.assertEqual((len(archive), opened_files), (4, 1))
+        with self.storage.open(cache_path, "rb") as cached_file, ZipFile(cached_file) as cached_archive:
+            self.assertIsNone(cached_archive.testzip())
+
+        # no copy with a generated name is left behind
+        cache_dir, cache_name = cache_path.rsplit("/", 1)
+        copies_prefix: str = cache_name.removesuffix(".zip") + "_"
+        self.assertFalse([name for name in self.storage.listdir(cache_dir)[1] if name.startswith(copies_prefix)])
+
+    @override_settings(ENABLE_FORMS_DOWNLOAD_MEMBERS_CACHE=False, FORMS_DOWNLOAD_CHECKPOINT_COUNT=2)
+    def test_the_files_are_streamed_into_the_archive_without_the_cache(self):
+        with mock.patch.object(members_cache, "compress_file") as compress_file_mock:
+            archive, opened_files = self._build_archive()
+
+        compress_file_mock.assert_not_called()
+        self.assertEqual(opened_files, 4)
+        for donor in self.donors:
+            self.assertFalse(self.storage.exists(archive_member_cache_path(donor.pk, donor.pdf_file.name)))
+            with donor.pdf_file.open("rb") as pdf_file:
+                self.assertIn(pdf_file.read(), archive.values())
@@ -0,0 +1,191 @@
+import io
+import os
+import tempfile
+import zlib
+from concurrent.futures import Future
+from unittest import mock
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from faker import Faker
+
+from donations.models import Cause, Donor, Ngo
+from donations.tests.builder import DonorTestBuilder
+from donations.views.download_donations.main import _package_donations
+from donations.views.download_donations.members_cache import compress_file
+from donations.views.download_donations.partitions import ArchivePartition, zip_partition
+from donations.views.download_donations.zip_members import (
+    ZIP_FILECOUNT_LIMIT,
+    ZipArchiveWriter,
+    read_compressed_member,
+    write_compressed_member,
+)
+
+faker = Faker("ro_RO")
+
+
+class _InlineExecutor:
+    """
+    Run the partitions in the test process, where the test database is visible.
+    """
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self) -> "_InlineExecutor":
+        return self
+
+    def __exit__(self, *args) -> None:
+        pass
+
+    @staticmethod
+    def submit(function, *args) -> Future:
+        future = Future()
+        future.set_result(function(*args))
+
+        return future
+
+
+class CompressedMemberTests(SimpleTestCase):
+    def test_members_are_copied_without_recompressing(self):
+        source_buffer = io.BytesIO()
+        with ZipFile(source_buffer, mode="w", compression=ZIP_DEFLATED) as source_archive:
+            source_archive.writestr("form.pdf", b"%PDF" * 10_000)
+            source_archive.writestr("stored.txt", b"stored", compress_type=ZIP_STORED)
+
+        target_buffer = io.BytesIO()
+        with (
+            ZipFile(source_buffer) as source_archive,
+            ZipArchiveWriter(target_buffer) as target_archive,
+        ):
+            with target_archive.open("first.txt") as handler:
+                handler.write(b"first")
+
+            deflated_member = read_compressed_member(source_archive, "form.pdf")
+            write_compressed_member(target_archive, deflated_member, "pdf/form.pdf")
+            write_compressed_member(target_archive, read_compressed_member(source_archive, "stored.txt"))
+
+            with target_archive.open("last.txt", force_zip64=True) as handler:
+                handler.write(b"last")
+
+            # the members written so far can be read back while the archive is written
+            self.assertEqual(target_archive.read_compressed_member("pdf/form.pdf").data, deflated_member.data)
+
+        self.assertLess(deflated_member.compress_size, deflated_member.file_size)
+
+        with ZipFile(target_buffer) as target_archive:
+            self.assertIsNone(target_archive.testzip())
+            self.assertEqual(
+                target_archive.namelist(),
+                ["first.txt", "pdf/form.pdf", "stored.txt", "last.txt"],
+            )
+            self.assertEqual(target_archive.read("pdf/form.pdf"), b"%PDF" * 10_000)
+            self.assertEqual(target_archive.read("stored.txt"), b"stored")
+            self.assertEqual(target_archive.read("last.txt"), b"last")
+
+    def test_archives_with_many_members_use_the_zip64_records(self):
+        member = compress_file(io.BytesIO(b"%PDF"), "form.pdf")
+
+        buffer = io.BytesIO()
+        with ZipArchiveWriter(buffer) as zip_archive:
+            for index in range(ZIP_FILECOUNT_LIMIT + 1):
+                write_compressed_member(zip_archive, member, f"pdf/{index:06d}.pdf")
+
+        with ZipFile(buffer) as zip_archive:
+            self.assertEqual(len(zip_archive.namelist()), ZIP_FILECOUNT_LIMIT + 1)
+            self.assertEqual(zip_archive.read(f"pdf/{ZIP_FILECOUNT_LIMIT:06d}.pdf"), b"%PDF")
+
+        member.close()
+
+    def test_unicode_names_are_kept(self):
+        buffer = io.BytesIO()
+        with ZipArchiveWriter(buffer) as zip_archive, zip_archive.open("pdf/Ștefan Iași.pdf") as handler:
+            handler.write(b"%PDF")
+
+        with ZipFile(buffer) as zip_archive:
+            self.assertEqual(zip_archive.namelist(), ["pdf/Ștefan Iași.pdf"])
+            self.assertEqual(zip_archive.read("pdf/Ștefan Iași.pdf"), b"%PDF")
+
+
+@override_settings(DONATIONS_XML_LIMIT_PER_FILE=2)
+class PartitionedArchiveTests(TestCase):
+    def setUp(self):
+        ngo = Ngo.objects.create(
+            name="Test NGO",
+            registration_number=faker.vat_id(),
+            address="123 Test St, Test City",
+        )
+        self.cause = Cause.objects.create(ngo=ngo, name="Test Cause", description="A cause for testing purposes.")
+
+        for county in ["Cluj", "Alba", "Cluj", "Cluj", "Iași", "Alba", "Cluj", "Alba"]:
+            DonorTestBuilder(cause=self.cause).with_all_fields().with_county(county).with_misc(has_signed=True).build()
+
+        # a donation without a PDF file is still included in the XML files
+        Donor.objects.filter(pk=Donor.objects.order_by("pk").values_list("pk", flat=True)[2]).update(pdf_file="")
+
+    def _build_archive(self, processes_count: int) -> dict[str, bytes]:
+        donations = Donor.current_year_signed.filter(cause=self.cause).order_by("-date_created")
+
+        with (
+            tempfile.TemporaryDirectory() as tmp_dir_name,
+            override_settings(FORMS_DOWNLOAD_PROCESSES_COUNT=processes_count),
+            mock.patch("donations.views.download_donations.partitions.ProcessPoolExecutor", _InlineExecutor),
+        ):
+            zip_path = _package_donations(tmp_dir_name, donations, donations.count(), self.cause, "archive.zip")
+
+            self.assertEqual(os.listdir(tmp_dir_name), ["archive.zip"])
+
+            with ZipFile(zip_path) as zip_archive:
+                return {name: zip_archive.read(name) for name in zip_archive.namelist()}
+
+    def test_partitioned_archive_has_the_same_content(self):
+        single_process_archive = self._build_archive(processes_count=1)
+
+        with mock.patch(
+            "donations.views.download_donations.partitions.zip_partition", wraps=zip_partition
+        ) as zip_partition_mock:
+            partitioned_archive = self._build_archive(processes_count=4)
+
+        # the counties are split in partitions of at most DONATIONS_XML_LIMIT_PER_FILE donations
+        self.assertEqual(zip_partition_mock.call_count, 5)
+
+        self.assertEqual(list(partitioned_archive), list(single_process_archive))
+        self.assertEqual(partitioned_archive, single_process_archive)
+        self.assertEqual(len([name for name in partitioned_archive if name.startswith("pdf/")]), 7)
+
+    def test_daemonic_processes_build_the_archive_in_one_process(self):
+        with (
+            mock.patch("redirectioneaza.common.processes.multiprocessing.current_process") as current_process_mock,
+            mock.patch(
+                "donations.views.download_donations.partitions.zip_partition", wraps=zip_partition
+            ) as zip_partition_mock,
+        ):
+            current_process_mock.return_value.daemon = True
+            archive = self._build_archive(processes_count=4)
+
+        zip_partition_mock.assert_not_called()
+        self.assertEqual(len([name for name in archive if name.startswith("pdf/")]), 7)
+
+    def test_partition_archive_is_valid(self):
+        donors: list[Donor] = list(Donor.objects.exclude(pdf_file="").order_by("pk"))
+
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            partition = ArchivePartition(
+                index=0, county="Cluj", tmp_dir_name=tmp_dir_name, pks=[donor.pk for donor in donors]
+            )
+            self.assertEqual(zip_partition(partition), len(donors))
+
+            with ZipFile(partition.zip_path) as zip_archive:
+                self.assertIsNone(zip_archive.testzip())
+                self.assertEqual(len(zip_archive.infolist()), len(donors))
+
+                contents: set[bytes] = set()
+                for info in zip_archive.infolist():
+                    content: bytes = zip_archive.read(info)
+                    self.assertEqual(zlib.crc32(content), info.CRC)
+                    self.assertEqual(len(content), info.file_size)
+                    contents.add(content)
+
+        for donor in donors:
+            with donor.pdf_file.open("rb") as pdf_file:
+                self.assertIn(pdf_file.read(), contents)
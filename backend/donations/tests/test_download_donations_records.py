@@ -0,0 +1,36 @@
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from donations.views.download_donations.records import CountyPartitioner, DonationRecord
+
+
+def _build_records(counties: list[str]) -> list[DonationRecord]:
+    return [
+        DonationRecord(pk=pk, date_created=timezone.now(), county=county) for pk, county in enumerate(counties, start=1)
+    ]
+
+
+class CountyPartitionerTests(SimpleTestCase):
+    def test_few_records_are_not_partitioned(self):
+        records = _build_records(["Cluj", "Alba", "Cluj"])
+
+        with CountyPartitioner(single_file_limit=4) as partitioner:
+            for record in records:
+                partitioner.add(record)
+
+            self.assertFalse(partitioner.is_partitioned)
+            self.assertEqual(list(partitioner.records), records)
+            self.assertEqual(partitioner.counties(), [])
+
+    def test_records_are_partitioned_by_county(self):
+        records = _build_records(["Cluj", "Alba", "Cluj", "Iași", "Cluj", "Alba"])
+
+        with CountyPartitioner(single_file_limit=4) as partitioner:
+            for record in records:
+                partitioner.add(record)
+
+            self.assertTrue(partitioner.is_partitioned)
+            self.assertEqual(
+                [(county, [record.pk for record in spool]) for county, spool in partitioner.counties()],
+                [("Iași", [4]), ("Alba", [2, 6]), ("Cluj", [1, 3, 5])],
+            )
@@ -0,0 +1,139 @@
+import copy
+import io
+import random
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any
+from xml.etree import ElementTree
+
+from django.test import SimpleTestCase
+from faker import Faker
+
+from donations.models.ngos import Cause, Ngo
+from donations.views.download_donations.build_xml import build_xml, write_xml
+from donations.views.download_donations.records import DonationRecord
+
+faker = Faker("ro_RO")
+
+VALID_CNPS = ["1800101221144", "2901015221138", "5010203123454"]
+
+
+def _build_record(pk: int, **kwargs) -> DonationRecord:
+    record_data: dict[str, Any] = {
+        "pk": pk,
+        "date_created": datetime(2025, 4, 1, 12, 30),
+        "last_name": "Popescu",
+        "first_name": "Ana-Maria",
+        "initial": "I",
+        "cnp": VALID_CNPS[0],
+        "phone": "0722 123 456",
+        "email": "ana.popescu@example.com",
+        "county": "Cluj",
+        "city": "Cluj-Napoca",
+        "address": {"full_address": "Str. Memorandumului nr. 1, Cluj-Napoca, Cluj"},
+        "ngo_registration_number": "RO12345678",
+        "ngo_name": "Asociația Exemplu",
+        "bank_account": "RO49AAAA1B31007593840000",
+    }
+    record_data.update(kwargs)
+
+    return DonationRecord(**record_data)
+
+
+class WriteXmlTests(SimpleTestCase):
+    def setUp(self):
+        ngo = Ngo(
+            name="Asociația „Exemplu” & Co.",
+            registration_number="RO12345678",
+            address="Str. Lungă nr. 2",
+            locality="Iași",
+            county="Iași",
+        )
+        self.cause = Cause(ngo=ngo, name="Exemplu", bank_account="RO49 AAAA 1B31 0075 9384 0000")
+        self.timestamp = datetime(2025, 5, 1, 10, 0)
+
+    def _old_xml(self, records: list[DonationRecord], cnp_idx: dict[str, dict[str, Any]]) -> bytes:
+        output = io.BytesIO()
+        build_xml(
+            xml_index=3,
+            cause=self.cause,
+            redirections=records,
+            cnp_idx=copy.deepcopy(cnp_idx),
+            timestamp=self.timestamp,
+        ).write(output, encoding="utf-8", xml_declaration=True, method="xml")
+
+        return output.getvalue()
+
+    def _new_xml(self, records: Iterable[DonationRecord], cnp_idx: dict[str, dict[str, Any]]) -> bytes:
+        output = io.BytesIO()
+        write_xml(
+            output,
+            xml_index=3,
+            cause=self.cause,
+            redirections=records,
+            cnp_idx=copy.deepcopy(cnp_idx),
+            timestamp=self.timestamp,
+        )
+
+        return output.getvalue()
+
+    def assertSameXml(self, records: list[DonationRecord], cnp_idx: dict[str, dict[str, Any]] | None = None):
+        cnp_idx = cnp_idx or {}
+
+        self.assertEqual(self._new_xml(records, cnp_idx), self._old_xml(records, cnp_idx))
+
+    def test_without_donations(self):
+        self.assertSameXml([])
+
+    def test_single_donation(self):
+        self.assertSameXml([_build_record(1)])
+
+    def test_special_characters_and_empty_fields(self):
+        self.assertSameXml(
+            [
+                _build_record(1, last_name="Țăranu & <Fiii>", first_name='Ștefan "Ștefi"', initial=""),
+                _build_record(2, last_name="", first_name="", phone="", email="", address={}),
+                _build_record(3, email="a+b&c@exemplu.ro", address={"full_address": "Bl. 5 <sc. A> & ap. 7 — ‘x’"}),
+                _build_record(4, two_years=True, anaf_gdpr=True, cnp="not a CNP"),
+            ]
+        )
+
+    def test_duplicate_cnps_are_skipped_in_both_writers(self):
+        records = [_build_record(pk, cnp=VALID_CNPS[pk % 2]) for pk in range(1, 6)]
+        cnp_idx = {
+            VALID_CNPS[0]: {"index": 2, "has_duplicate": True},
+            VALID_CNPS[1]: {"index": 1, "has_duplicate": True},
+        }
+
+        new_xml = self._new_xml(records, cnp_idx)
+
+        self.assertEqual(new_xml, self._old_xml(records, cnp_idx))
+        self.assertEqual(len(ElementTree.fromstring(new_xml).findall("contrib")), 2)
+
+    def test_generated_donations(self):
+        random.seed(230)
+        Faker.seed(230)
+
+        records = [
+            _build_record(
+                pk,
+                last_name=faker.last_name(),
+                first_name=faker.first_name(),
+                initial=faker.random_uppercase_letter(),
+                cnp=random.choice(VALID_CNPS + [faker.ssn()]),
+                phone=faker.phone_number(),
+                email=faker.email(),
+                address={"full_address": faker.address()},
+                two_years=random.random() < 0.5,
+                anaf_gdpr=random.random() < 0.5,
+            )
+            for pk in range(1, 501)
+        ]
+        cnp_idx = {cnp: {"index": 1, "has_duplicate": True} for cnp in VALID_CNPS}
+
+        self.assertSameXml(records, cnp_idx)
+
+    def test_donations_are_read_once(self):
+        records = [_build_record(pk) for pk in range(1, 4)]
+
+        self.assertEqual(self._new_xml(iter(records), {}), self._old_xml(records, {}))
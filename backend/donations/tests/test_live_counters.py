@@ -0,0 +1,109 @@
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from donations.models.donors import Donor
+from donations.models.ngos import Cause, Ngo
+from donations.models.stat_configs import (
+    donations_day_counter,
+    donations_year_counter,
+    ngos_active_counter,
+)
+from donations.views.site import HomePage
+from stats.models import Counter
+
+
+class LiveCountersTests(TestCase):
+    def setUp(self):
+        self.ngo = Ngo.objects.create(name="Test NGO", registration_number="6859662", email="ngo@example.com")
+        self.today = timezone.localdate()
+
+    def _create_donor(self) -> Donor:
+        with self.captureOnCommitCallbacks(execute=True):
+            return Donor.objects.create(ngo=self.ngo, f_name="Ion", l_name="Popescu")
+
+    def _counters(self) -> tuple[int, int]:
+        return donations_day_counter(self.today), donations_year_counter(self.today.year)
+
+    def test_the_donation_counters_follow_the_donors(self):
+        # the counters are counted from the donors the first time they are read
+        self.assertEqual(self._counters(), (0, 0))
+
+        first_donor = self._create_donor()
+        second_donor = self._create_donor()
+        self._create_donor()
+        self.assertEqual(self._counters(), (3, 3))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first_donor.disable()
+        self.assertEqual(self._counters(), (2, 2))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second_donor.delete()
+        self.assertEqual(self._counters(), (1, 1))
+
+        # the bulk updates are not counted until the counters are reconciled with the statistics
+        Donor.objects.update(is_available=True)
+        self.assertEqual(self._counters(), (1, 1))
+
+        Counter.objects.create(name=f"donations_day_{self.today - timedelta(days=1)}", value=5)
+        call_command("generate_redirections_stats", "--force")
+
+        self.assertEqual(self._counters(), (2, 2))
+        self.assertFalse(Counter.objects.filter(name=f"donations_day_{self.today - timedelta(days=1)}").exists())
+
+    def test_the_missing_counters_are_counted_from_the_donors(self):
+        # the donors created while the counters are missing are not counted by the statistics yet
+        for _ in range(2):
+            self._create_donor()
+
+        self.assertEqual(self._counters(), (2, 2))
+
+    def test_the_counters_change_after_the_commit(self):
+        self.assertEqual(self._counters(), (0, 0))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Donor.objects.create(ngo=self.ngo, f_name="Ion", l_name="Popescu")
+            self.assertEqual(self._counters(), (0, 0))
+
+        self.assertEqual(self._counters(), (1, 1))
+
+    def test_the_active_ngos_counter_follows_the_activation(self):
+        self.assertEqual(ngos_active_counter(), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            other_ngo = Ngo.objects.create(name="Other NGO", registration_number="33140406", email="other@example.com")
+        self.assertEqual(ngos_active_counter(), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            other_ngo.deactivate()
+        self.assertEqual(ngos_active_counter(), 1)
+
+        other_ngo = Ngo.objects.get(pk=other_ngo.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            other_ngo.activate()
+        self.assertEqual(ngos_active_counter(), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            other_ngo.delete()
+        self.assertEqual(ngos_active_counter(), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ngo.is_active = False
+            self.ngo.save(update_fields=["name"])
+        self.assertEqual(ngos_active_counter(), 1)
+
+    def test_the_front_page_stats_do_not_count_the_donors(self):
+        for _ in range(3):
+            self._create_donor()
+        call_command("generate_redirections_stats")
+
+        with CaptureQueriesContext(connection) as queries:
+            stats = HomePage()._get_stats(self.today.year, Cause.public_active)
+
+        self.assertEqual(stats[1]["value"], 3)
+        self.assertFalse(any("donations_donor" in query["sql"] for query in queries.captured_queries))
@@ -0,0 +1,76 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from donations.models.ngos import Cause, Ngo
+
+
+class NgoMainCauseTests(TestCase):
+    def setUp(self):
+        self.ngos: list[Ngo] = [
+            Ngo.objects.create(name=f"NGO {index}", registration_number=registration_number, is_active=True)
+            for index, registration_number in enumerate(["6859662", "33140406", "36316436"])
+        ]
+        for index, ngo in enumerate(self.ngos[:2]):
+            Cause.objects.create(
+                ngo=ngo,
+                is_main=True,
+                name=f"Cause {index}",
+                slug=f"cause-{index}",
+                description="Description",
+                bank_account=f"RO25RZBR678214654591293{index}",
+            )
+
+    def test_the_main_cause_is_read_once_per_instance(self):
+        ngo: Ngo = Ngo.objects.get(pk=self.ngos[0].pk)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(ngo.slug, "cause-0")
+            self.assertEqual(ngo.bank_account, "RO25RZBR6782146545912930")
+            self.assertEqual(ngo.description, "Description")
+            self.assertFalse(ngo.prefilled_form)
+            self.assertTrue(ngo.can_receive_redirections)
+
+    def test_the_main_causes_are_prefetched(self):
+        with self.assertNumQueries(2):
+            slugs = {ngo.name: ngo.slug for ngo in Ngo.active.with_main_cause().order_by("pk")}
+            self.assertEqual(slugs, {"NGO 0": "cause-0", "NGO 1": "cause-1", "NGO 2": None})
+
+        with self.assertNumQueries(2):
+            ngos: list[Ngo] = list(Ngo.objects.with_main_cause().filter(pk__in=[ngo.pk for ngo in self.ngos]))
+            self.assertEqual(sum(ngo.can_receive_redirections for ngo in ngos), 2)
+
+    def test_the_ngo_account_reads_the_main_cause_once(self):
+        user = get_user_model().objects.create_user(email="user@example.com", ngo=self.ngos[0])
+        user = get_user_model().objects.get(pk=user.pk)
+
+        # the NGO of the user is loaded once per request, together with its main cause
+        with self.assertNumQueries(2):
+            self.assertTrue(user.ngo.can_receive_redirections)
+            self.assertEqual(user.ngo.slug, "cause-0")
+            self.assertEqual(user.ngo.get_full_form_url(), "redirectioneaza.ro/cause-0")
+
+    def test_the_main_cause_is_read_again_when_the_causes_change(self):
+        ngo: Ngo = self.ngos[2]
+        self.assertIsNone(ngo.slug)
+
+        cause = Cause.objects.create(
+            ngo=ngo, is_main=True, name="Cause 2", slug="cause-2", bank_account="RO25RZBR6782146545912932"
+        )
+        self.assertEqual(ngo.slug, "cause-2")
+
+        cause = Cause.objects.get(pk=cause.pk)
+        cause.ngo = ngo
+        cause.slug = "new-cause-2"
+        cause.save()
+        self.assertEqual(ngo.slug, "new-cause-2")
+
+        cause.delete()
+        self.assertIsNone(ngo.slug)
+
+        # the instances which did not save the cause are refreshed explicitly
+        other_ngo: Ngo = Ngo.objects.with_main_cause().get(pk=self.ngos[0].pk)
+        Cause.objects.filter(ngo=other_ngo).update(slug="renamed")
+        self.assertEqual(other_ngo.slug, "cause-0")
+
+        other_ngo.refresh_from_db()
+        self.assertEqual(other_ngo.slug, "renamed")
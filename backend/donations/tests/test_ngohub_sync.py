@@ -0,0 +1,306 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from auditlog.models import LogEntry
+from django.db import DatabaseError
+from django.test import TestCase
+
+from donations.models.ngos import Cause, Ngo
+from donations.workers.update_organization import sync_organizations
+
+CREATED_ON = "2024-01-01T00:00:00"
+COUNTY = {"id": 1, "name": "Cluj", "abbreviation": "CJ", "regionId": 1, "createdOn": CREATED_ON}
+CITY = {"id": 1, "name": "Cluj-Napoca", "countyId": 1, "createdOn": CREATED_ON}
+
+
+def _organization_payload(organization_id: int, name: str, cui: str, logo_url: str) -> dict:
+    return {
+        "id": organization_id,
+        "createdOn": CREATED_ON,
+        "updatedOn": CREATED_ON,
+        "status": "active",
+        "organizationGeneral": {
+            "id": organization_id,
+            "createdOn": CREATED_ON,
+            "updatedOn": CREATED_ON,
+            "name": name,
+            "alias": "",
+            "type": "association",
+            "email": "contact@example.com",
+            "phone": "0712345678",
+            "yearCreated": "2010",
+            "cui": cui,
+            "associationRegistryNumber": "",
+            "associationRegistryPart": "",
+            "associationRegistrySection": "",
+            "associationRegistryIssuerId": "",
+            "nationalRegistryNumber": "",
+            "rafNumber": "",
+            "shortDescription": "",
+            "description": "The description",
+            "address": "Strada Exemplului 1",
+            "logo": logo_url,
+            "website": "example.com",
+            "facebook": "",
+            "instagram": "",
+            "twitter": "",
+            "linkedin": "",
+            "tiktok": "",
+            "donationWebsite": "",
+            "redirectLink": "",
+            "donationSms": "",
+            "donationKeyword": "",
+            "contact": {"email": "contact@example.com", "phone": "0712345678", "fullName": "Ion Popescu"},
+            "organizationAddress": "",
+            "city": CITY,
+            "county": COUNTY,
+            "organizationCity": None,
+            "organizationCounty": None,
+            "associationRegistryIssuer": None,
+        },
+        "organizationActivity": {
+            "id": organization_id,
+            "createdOn": CREATED_ON,
+            "updatedOn": CREATED_ON,
+            "area": "National",
+            "isPartOfFederation": False,
+            "isPartOfCoalition": False,
+            "isPartOfInternationalOrganization": False,
+            "internationalOrganizationName": "",
+            "isSocialServiceViable": True,
+            "offersGrants": False,
+            "isPublicIntrestOrganization": False,
+            "hasBranches": False,
+            "federations": [],
+            "coalitions": [],
+            "domains": [],
+            "cities": [],
+            "branches": [],
+            "regions": [],
+        },
+        "organizationLegal": {
+            "id": organization_id,
+            "createdOn": CREATED_ON,
+            "updatedOn": CREATED_ON,
+            "others": "",
+            "organizationStatute": "",
+            "nonPoliticalAffiliationFile": "",
+            "balanceSheetFile": "",
+            "legalReprezentative": {
+                "id": 1,
+                "createdOn": CREATED_ON,
+                "updatedOn": CREATED_ON,
+                "fullName": "Ion Popescu",
+                "email": "ion@example.com",
+                "phone": "0712345678",
+                "role": "president",
+            },
+            "directors": [],
+        },
+        "organizationFinancial": [],
+        "organizationReport": {
+            "id": organization_id,
+            "createdOn": CREATED_ON,
+            "updatedOn": CREATED_ON,
+            "reports": [],
+            "partners": [],
+            "investors": [],
+        },
+    }
+
+
+class FakeNgoHub(ThreadingHTTPServer):
+    """
+    A local NGO Hub serving the organization profiles and the logos
+    """
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeNgoHubHandler)
+
+        self.organizations: dict[str, dict] = {}
+        self.requested_paths: list[str] = []
+        # the logos whose responses are cut short
+        self.broken_logos: set[str] = set()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}/"
+
+    def add_organization(self, organization_id: int, name: str, cui: str, logo: str = ""):
+        logo_url: str = f"{self.base_url}logos/{logo}?X-Amz-Signature=signature" if logo else ""
+        self.organizations[f"/organization/{organization_id}/"] = _organization_payload(
+            organization_id, name, cui, logo_url
+        )
+
+
+class FakeNgoHubHandler(BaseHTTPRequestHandler):
+    server: FakeNgoHub
+
+    def do_GET(self):
+        path: str = self.path.split("?")[0]
+        self.server.requested_paths.append(path)
+
+        if path.removeprefix("/logos/") in self.server.broken_logos:
+            self.send_response(200)
+            self.send_header("Content-Length", "1024")
+            self.end_headers()
+            self.wfile.write(b"logo")
+        elif path.startswith("/logos/"):
+            self._respond(b"logo", "image/png")
+        elif self.headers.get("Authorization") != "Bearer token":
+            self._respond(b"", "application/json", status=401)
+        elif path in self.server.organizations:
+            self._respond(json.dumps(self.server.organizations[path]).encode(), "application/json")
+        else:
+            self._respond(b"", "application/json", status=404)
+
+    def _respond(self, content: bytes, content_type: str, status: int = 200):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+class NgoHubSyncTests(TestCase):
+    def setUp(self):
+        self.hub = FakeNgoHub()
+        threading.Thread(target=self.hub.serve_forever, daemon=True).start()
+        self.addCleanup(self.hub.server_close)
+        self.addCleanup(self.hub.shutdown)
+
+        self.ngos: list[Ngo] = []
+        for index, registration_number in enumerate(["6859662", "36317167"]):
+            ngo = Ngo.objects.create(
+                name=f"NGO {index}",
+                registration_number=registration_number,
+                registration_number_valid=True,
+                ngohub_org_id=index + 1,
+            )
+            Cause.objects.create(
+                ngo=ngo,
+                is_main=True,
+                name=f"Cause {index}",
+                slug=f"cause-{index}",
+                bank_account=f"RO25RZBR678214654591293{index}",
+            )
+            self.hub.add_organization(
+                index + 1, f"Hub NGO {index}", f"RO{registration_number}", logo=f"logo-{index}.png"
+            )
+            self.ngos.append(ngo)
+
+    def _sync(self, ngo_ids: list[int]):
+        return sync_organizations(ngo_ids, workers_count=2, api_base_url=self.hub.base_url, token="token")
+
+    def test_the_organizations_are_updated_in_bulk(self):
+        ngo_without_hub = Ngo.objects.create(name="Local NGO", registration_number="36316436")
+
+        report = self._sync([ngo.pk for ngo in self.ngos] + [ngo_without_hub.pk, 0])
+
+        self.assertEqual(report.updated_count, 2)
+        self.assertEqual(report.downloaded_logos_count, 2)
+        self.assertEqual(
+            report.errors,
+            {
+                0: ["This NGO does not exist"],
+                self.ngos[0].pk: [],
+                self.ngos[1].pk: [],
+                ngo_without_hub.pk: ["This NGO has no NGO Hub ID"],
+            },
+        )
+
+        ngo: Ngo = Ngo.objects.get(pk=self.ngos[1].pk)
+        self.assertEqual((ngo.name, ngo.vat_id, ngo.registration_number), ("Hub NGO 1", "RO", "36317167"))
+        self.assertEqual(ngo.website, "https://example.com")
+        self.assertTrue(ngo.is_social_service_viable)
+        self.assertIsNotNone(ngo.ngohub_last_update_ended)
+
+        cause: Cause = ngo.main_cause
+        self.assertEqual(cause.filename_cache, {"display_image": "logo-1.png"})
+        with cause.display_image.open("rb") as logo:
+            self.assertEqual(logo.read(), b"logo")
+
+        # the changes are recorded in the audit log
+        ngo_changes: dict = LogEntry.objects.get_for_object(ngo).latest("pk").changes_dict
+        self.assertEqual(ngo_changes["name"], ["NGO 1", "Hub NGO 1"])
+        cause_changes: dict = LogEntry.objects.get_for_object(cause).latest("pk").changes_dict
+        self.assertIn("display_image", cause_changes)
+
+        # the unchanged logos are not downloaded again
+        self.hub.requested_paths.clear()
+        report = self._sync([ngo.pk for ngo in self.ngos])
+
+        self.assertEqual((report.updated_count, report.unchanged_logos_count), (2, 2))
+        self.assertEqual(sorted(self.hub.requested_paths), ["/organization/1/", "/organization/2/"])
+
+    def test_the_errors_are_reported_per_ngo(self):
+        ngo_without_cause = Ngo.objects.create(
+            name="NGO 2", registration_number="4218680819", registration_number_valid=True, ngohub_org_id=3
+        )
+        self.hub.add_organization(3, "Hub NGO 2", "4218680819", logo="logo-2.png")
+        del self.hub.organizations["/organization/2/"]
+
+        report = self._sync([self.ngos[0].pk, self.ngos[1].pk, ngo_without_cause.pk])
+
+        self.assertEqual(report.updated_count, 2)
+        self.assertEqual(report.errors[self.ngos[0].pk], [])
+        self.assertIn("Error while fetching NGO Hub data for NGO ID 2", report.errors[self.ngos[1].pk][0])
+        self.assertEqual(Ngo.objects.get(pk=self.ngos[1].pk).name, "NGO 1")
+
+        # the main cause of a new NGO is created from its profile
+        main_cause: Cause = Cause.objects.get(ngo=ngo_without_cause, is_main=True)
+        self.assertEqual((main_cause.slug, main_cause.description), ("hub-ngo-2", "The description"))
+        self.assertEqual(main_cause.filename_cache, {"display_image": "logo-2.png"})
+
+    def test_a_failed_logo_does_not_stop_the_other_ngos(self):
+        self.hub.broken_logos.add("logo-0.png")
+
+        report = self._sync([ngo.pk for ngo in self.ngos])
+
+        self.assertEqual((report.updated_count, report.downloaded_logos_count), (2, 1))
+        self.assertIn("Error while fetching the logo of NGO", report.errors[self.ngos[0].pk][0])
+        self.assertEqual(report.errors[self.ngos[1].pk], [])
+
+        # the NGO is updated without its logo
+        ngo: Ngo = Ngo.objects.get(pk=self.ngos[0].pk)
+        self.assertEqual(ngo.name, "Hub NGO 0")
+        self.assertFalse(ngo.main_cause.display_image)
+
+        ngo = Ngo.objects.get(pk=self.ngos[1].pk)
+        self.assertEqual(ngo.name, "Hub NGO 1")
+        self.assertEqual(ngo.main_cause.filename_cache, {"display_image": "logo-1.png"})
+
+    def test_a_failed_save_does_not_stop_the_other_ngos(self):
+        failed_ngo: Ngo = self.ngos[0]
+        ngo_save = Ngo.save
+
+        def _save(ngo: Ngo, *args, **kwargs):
+            if ngo.pk == failed_ngo.pk:
+                raise DatabaseError("The database is unavailable")
+            return ngo_save(ngo, *args, **kwargs)
+
+        storage = Cause._meta.get_field("display_image").storage
+        with (
+            mock.patch.object(Ngo, "save", _save),
+            mock.patch.object(storage, "delete", wraps=storage.delete) as delete_mock,
+        ):
+            report = self._sync([ngo.pk for ngo in self.ngos])
+
+        self.assertEqual(report.updated_count, 1)
+        self.assertIn("Database error while saving NGO", report.errors[failed_ngo.pk][0])
+        self.assertEqual(report.errors[self.ngos[1].pk], [])
+
+        # the cause of the failed NGO is rolled back, and its new logo is removed
+        cause: Cause = Cause.objects.get(ngo=failed_ngo, is_main=True)
+        self.assertFalse(cause.display_image)
+        self.assertEqual(cause.filename_cache, {})
+        delete_mock.assert_called_once()
+        self.assertFalse(storage.exists(delete_mock.call_args.args[0]))
+
+        self.assertEqual(Ngo.objects.get(pk=failed_ngo.pk).name, "NGO 0")
+        self.assertEqual(Ngo.objects.get(pk=self.ngos[1].pk).name, "Hub NGO 1")
@@ -0,0 +1,43 @@
+from django.test import TestCase
+from faker import Faker
+from pypdf import PdfReader
+
+from donations.models import Cause, Ngo
+from donations.pdf import create_cause_pdf, create_full_pdf, get_form_template
+from donations.tests.builder import DonorTestBuilder
+
+faker = Faker("ro_RO")
+
+
+class FormTemplateTests(TestCase):
+    def setUp(self):
+        self.ngo = Ngo.objects.create(
+            name="Test NGO",
+            registration_number=faker.vat_id(),
+            address="123 Test St, Test City",
+        )
+        self.cause = Cause.objects.create(ngo=self.ngo, name="Test Cause", description="A cause for testing purposes.")
+
+    def test_full_form_is_drawn_over_the_template(self):
+        donor = DonorTestBuilder(cause=self.cause).with_all_fields().build()
+
+        with create_full_pdf(donor) as packet:
+            form = PdfReader(packet)
+
+            self.assertEqual(len(form.pages), 1)
+
+            background = form.pages[0]["/Resources"]["/XObject"]["/Background"].get_object()
+            self.assertEqual(background["/Filter"], "/DCTDecode")
+
+            text: str = form.pages[0].extract_text()
+            self.assertIn(donor.l_name, text)
+            self.assertIn(donor.get_cnp()[0], text)
+
+    def test_template_is_built_once(self):
+        get_form_template.cache_clear()
+
+        create_cause_pdf(self.cause, self.ngo).close()
+        create_cause_pdf(self.cause, self.ngo).close()
+
+        self.assertEqual(get_form_template.cache_info().misses, 1)
+        self.assertEqual(get_form_template.cache_info().hits, 1)
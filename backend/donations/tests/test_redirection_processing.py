@@ -0,0 +1,257 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django_q.models import Failure
+from django_q.utils import get_func_repr
+from faker import Faker
+
+from donations.models import Cause, Donor, Ngo
+from donations.pdf import create_full_pdf
+from donations.tests.builder import DonorTestBuilder
+from donations.tests.test_redirection_form_signature import SIGNATURE_TEST_STRING
+from donations.workers.redirections import (
+    MissingRedirectionForm,
+    process_redirection,
+    render_missing_redirection_forms,
+    render_redirection_pdf,
+    render_redirection_pdf_and_queue_emails,
+    send_redirection_emails,
+)
+from redirectioneaza.common.testing.client import ApexClient
+from utils.common.crypto_helper import encrypt_data
+
+faker = Faker("ro_RO")
+
+
+@override_settings(EMAIL_SEND_METHOD="sync")
+class RedirectionProcessingTests(TestCase):
+    def setUp(self):
+        self.ngo = Ngo.objects.create(
+            name="Test NGO",
+            registration_number=faker.vat_id(),
+            address="123 Test St, Test City",
+            is_active=True,
+        )
+        self.cause = Cause.objects.create(
+            ngo=self.ngo,
+            name="Test Cause",
+            slug="test-cause",
+            description="A cause for testing purposes.",
+            bank_account="RO25RZBR6782146545912934",
+            notifications_email="ngo@example.com",
+        )
+
+        self.donor: Donor = DonorTestBuilder(cause=self.cause).with_all_fields().with_misc(has_signed=True).build()
+
+        # the donor is saved by the request, before its PDF file is created
+        self.donor.pdf_file.delete(save=False)
+        Donor.objects.filter(pk=self.donor.pk).update(pdf_file="")
+        self.donor.refresh_from_db()
+
+        self.mail_context = {"action_url": f"https://example.com{self.donor.form_url}"}
+        self.cause_url = "https://example.com/test-cause/"
+
+    def test_pdf_file_is_created_once(self):
+        encrypted_signature: str = encrypt_data(SIGNATURE_TEST_STRING.encode())
+
+        self.assertTrue(render_redirection_pdf(self.donor.pk, encrypted_signature))
+
+        self.donor.refresh_from_db()
+        pdf_file_name: str = self.donor.pdf_file.name
+        self.assertTrue(self.donor.pdf_file.storage.exists(pdf_file_name))
+
+        self.assertFalse(render_redirection_pdf(self.donor.pk, encrypted_signature))
+
+        self.donor.refresh_from_db()
+        self.assertEqual(self.donor.pdf_file.name, pdf_file_name)
+
+    def test_pdf_file_uploaded_by_another_task_is_kept(self):
+        def _render_while_another_task_finishes(*args):
+            Donor.objects.filter(pk=self.donor.pk).update(pdf_file="donation-forms/other.pdf")
+            return create_full_pdf(*args)
+
+        with mock.patch(
+            "donations.workers.redirections.create_full_pdf", side_effect=_render_while_another_task_finishes
+        ):
+            self.assertFalse(render_redirection_pdf(self.donor.pk))
+
+        self.donor.refresh_from_db()
+        self.assertEqual(self.donor.pdf_file.name, "donation-forms/other.pdf")
+
+    def test_emails_are_sent_once(self):
+        render_redirection_pdf(self.donor.pk)
+
+        self.assertTrue(send_redirection_emails(self.donor.pk, self.mail_context, self.cause_url))
+        self.assertFalse(send_redirection_emails(self.donor.pk, self.mail_context, self.cause_url))
+
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox), sorted(["ngo@example.com", self.donor.email])
+        )
+
+        self.donor.refresh_from_db()
+        self.assertIsNotNone(self.donor.notifications_sent_at)
+
+    def test_failed_emails_are_sent_on_retry(self):
+        render_redirection_pdf(self.donor.pk)
+
+        with (
+            mock.patch("donations.workers.redirections.send_email", side_effect=ConnectionError),
+            self.assertRaises(ConnectionError),
+        ):
+            send_redirection_emails(self.donor.pk, self.mail_context, self.cause_url)
+
+        self.donor.refresh_from_db()
+        self.assertIsNone(self.donor.notifications_sent_at)
+
+        self.assertTrue(send_redirection_emails(self.donor.pk, self.mail_context, self.cause_url))
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_emails_wait_for_the_pdf_file(self):
+        with self.assertRaises(MissingRedirectionForm):
+            send_redirection_emails(self.donor.pk, self.mail_context, self.cause_url)
+
+        self.assertEqual(len(mail.outbox), 0)
+        self.donor.refresh_from_db()
+        self.assertIsNone(self.donor.notifications_sent_at)
+
+    def test_async_processing_queues_the_pdf_task(self):
+        with mock.patch("donations.workers.redirections.async_task") as async_task_mock:
+            process_redirection(
+                self.donor, SIGNATURE_TEST_STRING, self.mail_context, self.cause_url, run_method="async"
+            )
+
+        async_task_mock.assert_called_once()
+        pdf_call = async_task_mock.call_args
+        self.assertEqual(pdf_call.args[0], render_redirection_pdf_and_queue_emails)
+        self.assertEqual(pdf_call.kwargs["task_name"], f"redirection-{self.donor.pk}-pdf")
+        self.assertEqual(pdf_call.kwargs["group"], f"redirection-{self.donor.pk}")
+
+        # the signature is not sent to the task queue as it is
+        self.assertNotIn(SIGNATURE_TEST_STRING, pdf_call.args)
+
+        # nothing is done in the request
+        self.assertEqual(len(mail.outbox), 0)
+        self.donor.refresh_from_db()
+        self.assertFalse(self.donor.pdf_file)
+
+    def test_pdf_task_queues_the_emails(self):
+        encrypted_signature: str = encrypt_data(SIGNATURE_TEST_STRING.encode())
+
+        with mock.patch("donations.workers.redirections.async_task") as async_task_mock:
+            self.assertTrue(
+                render_redirection_pdf_and_queue_emails(
+                    self.donor.pk, encrypted_signature, self.mail_context, self.cause_url
+                )
+            )
+
+        async_task_mock.assert_called_once_with(
+            send_redirection_emails,
+            self.donor.pk,
+            self.mail_context,
+            self.cause_url,
+            task_name=f"redirection-{self.donor.pk}-emails",
+            group=f"redirection-{self.donor.pk}",
+        )
+
+        self.donor.refresh_from_db()
+        self.assertTrue(self.donor.pdf_file)
+
+    def test_failed_pdf_task_does_not_send_the_emails(self):
+        with (
+            mock.patch("donations.workers.redirections.create_full_pdf", side_effect=RuntimeError),
+            mock.patch("donations.workers.redirections.async_task") as async_task_mock,
+            self.assertRaises(RuntimeError),
+        ):
+            render_redirection_pdf_and_queue_emails(self.donor.pk, "", self.mail_context, self.cause_url)
+
+        async_task_mock.assert_not_called()
+        self.assertEqual(len(mail.outbox), 0)
+
+        self.donor.refresh_from_db()
+        self.assertFalse(self.donor.pdf_file)
+        self.assertIsNone(self.donor.notifications_sent_at)
+
+    def test_failed_sync_processing_does_not_send_the_emails(self):
+        with (
+            mock.patch("donations.workers.redirections.create_full_pdf", side_effect=RuntimeError),
+            self.assertRaises(RuntimeError),
+        ):
+            process_redirection(self.donor, SIGNATURE_TEST_STRING, self.mail_context, self.cause_url, run_method="sync")
+
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_failed_pdf_tasks_are_queued_again(self):
+        Donor.objects.filter(pk=self.donor.pk).update(date_created=timezone.now() - timedelta(minutes=20))
+
+        task_args = (self.donor.pk, encrypt_data(SIGNATURE_TEST_STRING.encode()), self.mail_context, self.cause_url)
+        Failure.objects.create(
+            id="failed-redirection-task",
+            name=f"redirection-{self.donor.pk}-pdf",
+            func=get_func_repr(render_redirection_pdf_and_queue_emails),
+            args=task_args,
+            started=timezone.now() - timedelta(minutes=15),
+            stopped=timezone.now() - timedelta(minutes=15),
+            success=False,
+        )
+
+        unsigned_donor: Donor = DonorTestBuilder(cause=self.cause).with_all_fields().with_misc(has_signed=False).build()
+        unsigned_donor.pdf_file.delete(save=False)
+        Donor.objects.filter(pk=unsigned_donor.pk).update(pdf_file="", date_created=timezone.now() - timedelta(hours=1))
+
+        with mock.patch("donations.workers.redirections.async_task") as async_task_mock:
+            summary: dict = render_missing_redirection_forms()
+
+        async_task_mock.assert_called_once_with(
+            render_redirection_pdf_and_queue_emails,
+            *task_args,
+            task_name=f"redirection-{self.donor.pk}-pdf",
+            group=f"redirection-{self.donor.pk}",
+        )
+        self.assertFalse(Failure.objects.exists())
+
+        self.assertEqual(summary["requeued"], 1)
+        self.assertEqual(summary["rendered"], 1)
+
+        unsigned_donor.refresh_from_db()
+        self.assertTrue(unsigned_donor.pdf_file)
+
+    def test_new_redirections_are_left_to_their_tasks(self):
+        with mock.patch("donations.workers.redirections.async_task") as async_task_mock:
+            summary: dict = render_missing_redirection_forms()
+
+        async_task_mock.assert_not_called()
+        self.assertEqual(summary, {"requeued": 0, "rendered": 0, "failed": []})
+
+    def test_download_link_waits_for_the_pdf_file(self):
+        client = ApexClient()
+        url: str = self.donor.form_url
+
+        response = client.get(url)
+        self.assertEqual(response.status_code, 202)
+        self.assertTemplateUsed(response, "form/download-pending.html")
+
+        render_redirection_pdf(self.donor.pk)
+
+        response = client.get(url)
+        self.assertEqual(response.status_code, 302)
+
+    def test_download_link_of_a_missing_pdf_file(self):
+        Donor.objects.filter(pk=self.donor.pk).update(date_created=self.donor.date_created - timedelta(hours=1))
+        self.donor.refresh_from_db()
+
+        response = ApexClient().get(self.donor.form_url)
+        self.assertEqual(response.status_code, 404)
+
+    def test_success_page_shows_the_pending_pdf_file(self):
+        client = ApexClient()
+        session = client.session
+        session["donor_id"] = str(self.donor.pk)
+        session.save()
+
+        response = client.get(reverse("ngo-twopercent-success", kwargs={"cause_slug": "test-cause"}))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context["pdf_pending"])
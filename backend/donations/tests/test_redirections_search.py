@@ -0,0 +1,112 @@
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from donations.models.donors import Donor
+from donations.models.ngos import Cause, Ngo
+from donations.views.common.pagination import KeysetPaginator
+from donations.views.common.search import DonorSearchMixin
+from redirectioneaza.common.testing.client import ApexClient
+
+
+class RedirectionsListTestCase(TestCase):
+    def setUp(self):
+        self.ngo = Ngo.objects.create(
+            name="Test NGO",
+            registration_number="6859662",
+            email="ngo@example.com",
+            has_online_tax_account=True,
+        )
+        self.cause = Cause.objects.create(
+            ngo=self.ngo,
+            name="Test Cause",
+            description="Test Cause description",
+            slug="test-cause",
+            bank_account="RO25RZBR6782146545912934",
+            is_main=True,
+        )
+
+        # a few donors share the same creation date, so that the pages are split between them
+        now = timezone.now()
+        self.donors: list[Donor] = []
+        for index in range(20):
+            donor = Donor.objects.create(
+                ngo=self.ngo,
+                cause=self.cause,
+                f_name=f"Donor{index}",
+                l_name="Popescu",
+                email=f"contact{index}@example.com",
+            )
+            Donor.objects.filter(pk=donor.pk).update(date_created=now - timedelta(days=index // 3))
+            self.donors.append(donor)
+
+        self.ordered_pks: list[int] = list(Donor.objects.order_by("-date_created", "-id").values_list("pk", flat=True))
+
+
+class KeysetPaginatorTests(RedirectionsListTestCase):
+    def _paginator(self) -> KeysetPaginator:
+        return KeysetPaginator(Donor.objects.values("id", "date_created"), 8, ("-date_created", "-id"))
+
+    def test_the_pages_are_read_forward_and_backward(self):
+        paginator = self._paginator()
+
+        first_page = paginator.page()
+        second_page = paginator.page(after=first_page.next_cursor)
+        last_page = paginator.page(after=second_page.next_cursor)
+
+        self.assertEqual([row["id"] for row in first_page], self.ordered_pks[:8])
+        self.assertEqual([row["id"] for row in second_page], self.ordered_pks[8:16])
+        self.assertEqual([row["id"] for row in last_page], self.ordered_pks[16:])
+        self.assertEqual((last_page.start_index(), last_page.end_index()), (17, 20))
+        self.assertFalse(first_page.has_previous())
+        self.assertFalse(last_page.has_next())
+
+        previous_page = paginator.page(before=last_page.previous_cursor)
+        self.assertEqual([row["id"] for row in previous_page], self.ordered_pks[8:16])
+        self.assertEqual(previous_page.start_index(), 9)
+        self.assertTrue(previous_page.has_previous())
+        self.assertTrue(previous_page.has_next())
+
+    def test_an_invalid_cursor_shows_the_first_page(self):
+        page = self._paginator().page(after="not-a-cursor")
+
+        self.assertEqual([row["id"] for row in page], self.ordered_pks[:8])
+
+
+class NgoRedirectionsViewTests(RedirectionsListTestCase):
+    def test_the_redirections_are_paginated_by_cursor(self):
+        client = ApexClient()
+        client.force_login(get_user_model().objects.create_user(email="user@example.com", ngo=self.ngo))
+
+        url: str = reverse("my-organization:redirections")
+        first_response = client.get(url)
+        self.assertEqual(first_response.context["page_obj"].paginator.count, 20)
+
+        next_cursor: str = first_response.context["page_obj"].next_cursor
+        self.assertContains(first_response, f"?after={next_cursor}")
+
+        second_response = client.get(url, {"after": next_cursor})
+        self.assertEqual([row["id"] for row in second_response.context["redirections"]], self.ordered_pks[8:16])
+
+
+@skipUnless(connection.vendor == "postgresql", "The donors are searched with the PostgreSQL trigram operators")
+class DonorSearchTests(RedirectionsListTestCase):
+    def _search(self, query: str) -> set[int]:
+        return set(DonorSearchMixin.get_search_results(Donor.objects.all(), query, "ro").values_list("pk", flat=True))
+
+    def test_the_contact_details_of_anonymous_donors_are_not_searched(self):
+        Donor.objects.filter(pk=self.donors[0].pk).update(is_anonymous=False)
+
+        self.assertEqual(self._search("contact0@example.com"), {self.donors[0].pk})
+
+        Donor.objects.filter(pk=self.donors[0].pk).update(is_anonymous=True)
+
+        self.assertEqual(self._search("contact0@example.com"), set())
+
+    def test_the_names_are_searched(self):
+        self.assertEqual(self._search("Popescu"), {donor.pk for donor in self.donors})
@@ -0,0 +1,62 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from donations.models.donors import Donor
+from donations.models.ngos import Ngo
+from donations.models.stat_configs import StatsChoices, create_stat
+from stats.models import Stat
+
+
+class RedirectionsStatsTests(TestCase):
+    def setUp(self):
+        self.ngo = Ngo.objects.create(name="Test NGO", registration_number="6859662", email="ngo@example.com")
+        self.today: date = timezone.localdate()
+
+        self.donors: list[Donor] = []
+        for days_ago in (0, 0, 1, 3, 3, 3):
+            donor = Donor.objects.create(ngo=self.ngo, f_name="Ion", l_name="Popescu")
+            Donor.objects.filter(pk=donor.pk).update(date_created=timezone.now() - timedelta(days=days_ago))
+            self.donors.append(donor)
+
+    def _stats(self) -> dict[date, Decimal]:
+        return dict(Stat.objects.filter(name=StatsChoices.REDIRECTIONS_PER_DAY).values_list("date", "value"))
+
+    def _days_ago(self, days: int) -> date:
+        return self.today - timedelta(days=days)
+
+    def test_the_stats_of_every_day_are_generated_at_once(self):
+        # the days of the existing stats, the donors per day and the upsert, within a savepoint
+        with self.assertNumQueries(5):
+            create_stat(stat_choice=StatsChoices.REDIRECTIONS_PER_DAY, bulk=True)
+
+        self.assertEqual(self._stats(), {self.today: 2, self._days_ago(1): 1, self._days_ago(3): 3})
+
+        # the days without donors are set to zero, and the existing stats are updated in place
+        Donor.objects.filter(pk__in=[donor.pk for donor in self.donors[3:]]).delete()
+        create_stat(stat_choice=StatsChoices.REDIRECTIONS_PER_DAY, bulk=True)
+
+        self.assertEqual(self._stats(), {self.today: 2, self._days_ago(1): 1, self._days_ago(3): 0})
+        self.assertEqual(Stat.objects.count(), 3)
+
+        with self.assertRaises(ValueError):
+            create_stat(stat_choice=StatsChoices.NGOS_ACTIVE, bulk=True)
+
+    def test_the_incremental_run_only_touches_the_changed_days(self):
+        call_command("generate_redirections_stats")
+        self.assertEqual(self._stats(), {self.today: 2, self._days_ago(1): 1, self._days_ago(3): 3})
+
+        # the stats of the past days are not expired, so only the days of the changed donors are generated
+        last_run = timezone.now() - timedelta(days=1)
+        Donor.objects.update(date_updated=last_run - timedelta(hours=1))
+        Stat.objects.update(updated_at=last_run, value=Decimal(99), expires_at=None)
+
+        Donor.objects.get(pk=self.donors[4].pk).disable()
+        call_command("generate_redirections_stats")
+        self.assertEqual(self._stats(), {self.today: 99, self._days_ago(1): 99, self._days_ago(3): 2})
+
+        call_command("generate_redirections_stats", "--force")
+        self.assertEqual(self._stats(), {self.today: 2, self._days_ago(1): 1, self._days_ago(3): 2})
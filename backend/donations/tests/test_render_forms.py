@@ -0,0 +1,92 @@
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.test import TestCase
+from faker import Faker
+from pypdf import PdfReader
+
+from donations.models import Cause, Donor, Ngo
+from donations.models.ngos import CAUSES_AUTOCOMPLETE_VERSION_KEY
+from donations.tests.builder import DonorTestBuilder
+from donations.tests.test_download_donations_partitions import _InlineExecutor
+from donations.workers.render_forms import render_cause_forms, render_donor_forms
+
+faker = Faker("ro_RO")
+
+
+class RenderFormsTests(TestCase):
+    def setUp(self):
+        self.ngo = Ngo.objects.create(
+            name="Test NGO",
+            registration_number=faker.vat_id(),
+            address="123 Test St, Test City",
+        )
+        self.cause = Cause.objects.create(
+            ngo=self.ngo,
+            name="Test Cause",
+            description="A cause for testing purposes.",
+            bank_account="RO25RZBR6782146545912934",
+        )
+
+        self.donors: list[Donor] = [DonorTestBuilder(cause=self.cause).with_all_fields().build() for _ in range(5)]
+
+        # only the first donor keeps its PDF file
+        for donor in self.donors[1:]:
+            donor.pdf_file.delete()
+
+    def _assert_has_form(self, donor: Donor):
+        donor.refresh_from_db()
+
+        with donor.pdf_file.open("rb") as pdf_file:
+            self.assertIn(donor.l_name, PdfReader(pdf_file).pages[0].extract_text())
+
+    def test_only_the_missing_donor_forms_are_rendered(self):
+        existing_name: str = self.donors[0].pdf_file.name
+
+        report = render_donor_forms([donor.pk for donor in self.donors])
+
+        self.assertEqual(report.rendered_count, 4)
+        self.assertEqual(report.failed_ids, [])
+        self.assertGreater(report.rendered_bytes, 0)
+
+        self.donors[0].refresh_from_db()
+        self.assertEqual(self.donors[0].pdf_file.name, existing_name)
+
+        for donor in self.donors[1:]:
+            self._assert_has_form(donor)
+
+    def test_donor_forms_are_rendered_in_processes(self):
+        with (
+            mock.patch("donations.workers.render_forms.ProcessPoolExecutor", _InlineExecutor),
+            mock.patch("donations.workers.render_forms.RENDERING_CHUNK_SIZE", 1),
+        ):
+            report = render_donor_forms([donor.pk for donor in self.donors], processes_count=2)
+
+        self.assertEqual(report.rendered_count, 4)
+        for donor in self.donors[1:]:
+            self._assert_has_form(donor)
+
+    def test_failed_forms_are_reported(self):
+        with mock.patch("donations.workers.render_forms.create_full_pdf", side_effect=ValueError):
+            report = render_donor_forms([donor.pk for donor in self.donors])
+
+        self.assertEqual(report.rendered_count, 0)
+        self.assertEqual(sorted(report.failed_ids), sorted(donor.pk for donor in self.donors[1:]))
+
+    def test_prefilled_forms_are_replaced(self):
+        self.cause.prefilled_form.save("formular_donatie.pdf", ContentFile(b"%PDF-1.4 old form"))
+        old_name: str = self.cause.prefilled_form.name
+
+        with mock.patch("donations.models.ngos.invalidate_cache_version") as invalidate_mock:
+            report = render_cause_forms([self.cause.pk])
+
+        self.assertEqual(report.rendered_count, 1)
+        # the causes are updated in bulk, so their cached copies are outdated explicitly
+        invalidate_mock.assert_called_once_with(CAUSES_AUTOCOMPLETE_VERSION_KEY)
+
+        self.cause.refresh_from_db()
+        self.assertNotEqual(self.cause.prefilled_form.name, old_name)
+        self.assertFalse(self.cause.prefilled_form.storage.exists(old_name))
+
+        with self.cause.prefilled_form.open("rb") as pdf_file:
+            self.assertEqual(len(PdfReader(pdf_file).pages), 1)
@@ -0,0 +1,71 @@
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from faker import Faker
+
+from donations.models import Cause, Ngo
+from donations.views.common.search import CauseSearchMixin, NgoCauseMixedSearchMixin
+
+faker = Faker("ro_RO")
+
+
+@skipUnless(connection.vendor == "postgresql", "The search index is built with PostgreSQL triggers")
+class SearchIndexTests(TestCase):
+    def setUp(self):
+        self.ngo = Ngo.objects.create(
+            name="Fundația Pădurea Verde",
+            registration_number=faker.vat_id(),
+            address="123 Test St, Test City",
+            is_active=True,
+        )
+        self.cause = Cause.objects.create(
+            ngo=self.ngo,
+            is_main=True,
+            slug="padurea-verde",
+            name="Tabăra copiilor",
+            description="A cause for testing purposes.",
+            bank_account="RO25RZBR6782146545912934",
+        )
+
+    def _search_causes(self, query: str) -> list[Cause]:
+        return list(CauseSearchMixin.get_search_results(Cause.public_active, query, "ro"))
+
+    def test_the_search_vector_follows_the_name(self):
+        self.assertEqual(self._search_causes("copii"), [self.cause])
+
+        self.cause.name = "Școala de vară"
+        self.cause.save()
+
+        self.assertEqual(self._search_causes("copii"), [])
+        self.assertEqual(self._search_causes("scoala"), [self.cause])
+
+    def test_the_causes_are_found_by_their_ngo(self):
+        causes = list(NgoCauseMixedSearchMixin.get_search_results(Cause.public_active, "padure", "ro"))
+
+        self.assertEqual(causes, [self.cause])
+
+    def test_the_missing_search_vectors_are_rebuilt(self):
+        self.cause.name = "Școala de vară"
+        self.cause.save()
+
+        Cause.objects.filter(pk=self.cause.pk).update(search_vector=None)
+        self.assertEqual(self._search_causes("scoala"), [])
+
+        call_command("rebuild_search_index", "--missing-only", stdout=StringIO())
+
+        self.assertEqual(self._search_causes("scoala"), [self.cause])
+
+    @override_settings(ENABLE_CAUSE_SEARCH_EXACT_MATCH=False)
+    def test_the_similarity_thresholds_do_not_depend_on_the_connection(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET pg_trgm.similarity_threshold = 0.1")
+            cursor.execute("SET pg_trgm.word_similarity_threshold = 0.9")
+
+        self.assertEqual(self._search_causes("Tabara copiii"), [self.cause])
+        self.assertEqual(self._search_causes("Zarzavat"), [])
+
+        with override_settings(ENABLE_CAUSE_SEARCH_WORD_SIMILARITY=True):
+            self.assertEqual(self._search_causes("Tabra"), [self.cause])
@@ -9,7 +9,7 @@ from django.core.exceptions import SuspiciousOperation
 from django.core.files import File
 from django.core.management import call_command
 from django.db import DatabaseError
-from django.http import Http404, JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import redirect
 from django.urls import reverse, reverse_lazy
 from django.utils.decorators import method_decorator
@@ -22,6 +22,7 @@ from ..models.ngos import NGO_CAUSES_QUERY_CACHE_KEY, Cause, CauseVisibilityChoi
 from ..pdf import create_cause_pdf
 from ..workers.update_organization import update_organization
 from .base import BaseTemplateView
+from .common.autocomplete import causes_autocomplete_index
 from .common.misc import (
     get_cause_response_item,
     has_archive_generation_deadline_passed,
@@ -53,6 +54,11 @@ class SearchCausesApi(TemplateView, CauseSearchMixin):
     queryset = Cause.public_active
 
     def get(self, request, *args, **kwargs):
+        if settings.ENABLE_CAUSE_SEARCH_AUTOCOMPLETE_INDEX:
+            causes_json: str = causes_autocomplete_index().search_json(self._search_query())
+
+            return HttpResponse(causes_json, content_type="application/json")
+
         causes = self.search()
 
         response: list[dict] = []
@@ -0,0 +1,225 @@
+import bisect
+import json
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from donations.models.ngos import CAUSES_AUTOCOMPLETE_VERSION_KEY, Cause
+from donations.views.common.misc import get_cause_response_item
+from donations.views.common.search import SIMILARITY_THRESHOLD, WORD_SIMILARITY_THRESHOLD
+from redirectioneaza.common.cache import get_cache_version
+from utils.text.registration_number import probable_registration_number
+
+logger = logging.getLogger(__name__)
+
+# How often a process checks if the causes changed, since every check reads the shared cache
+AUTOCOMPLETE_VERSION_CHECK_SECONDS = 5
+
+WORD_REGEX = re.compile(r"\w+")
+
+# The shorter query words are mostly stop words, which the full-text search ignores
+PREFIX_MIN_LENGTH = 3
+
+
+def fold_text(text: str) -> str:
+    """
+    Lowercase the text and remove its diacritics, e.g. "Școala" becomes "scoala"
+    """
+    decomposed_text: str = unicodedata.normalize("NFKD", text.casefold())
+
+    return "".join(character for character in decomposed_text if not unicodedata.combining(character))
+
+
+def _word_trigrams(word: str) -> set[str]:
+    # the words are padded the same way as by pg_trgm
+    padded_word = f"  {word} "
+
+    return {padded_word[index : index + 3] for index in range(len(padded_word) - 2)}
+
+
+def _text_trigrams(words: list[str]) -> frozenset[str]:
+    trigrams: set[str] = set()
+    for word in words:
+        trigrams |= _word_trigrams(word)
+
+    return frozenset(trigrams)
+
+
+@dataclass(slots=True)
+class CausesAutocompleteIndex:
+    """
+    An in-memory index of the public causes, which answers the search API without any database queries.
+
+    The causes are kept in the order of their IDs, with their folded names, the trigrams of their names,
+    a sorted array of their words (for the prefix search) and their responses, already serialized as JSON.
+    The matching mirrors CauseSearchMixin: the causes which contain the query (or are the main causes of the
+    registration number) if there are any, otherwise the causes with similar names or with words starting
+    with the words of the query.
+    """
+
+    version: int | None = None
+    names: list[str] = field(default_factory=list)
+    fragments: list[str] = field(default_factory=list)
+    trigrams: list[frozenset[str]] = field(default_factory=list)
+    trigram_positions: dict[str, list[int]] = field(default_factory=dict)
+    sorted_words: list[tuple[str, int]] = field(default_factory=list)
+    registration_numbers: dict[str, list[int]] = field(default_factory=dict)
+    all_causes_json: str = "[]"
+
+    built_at: float = field(default_factory=time.monotonic)
+    checked_at: float = field(default_factory=time.monotonic)
+
+    @classmethod
+    def build(cls) -> "CausesAutocompleteIndex":
+        # read the version first, so that the causes changed during the build trigger another one
+        index = cls(version=get_cache_version(CAUSES_AUTOCOMPLETE_VERSION_KEY))
+
+        causes = Cause.public_active.select_related("ngo").order_by("pk")
+        for cause in causes.iterator(chunk_size=1_000):
+            if not cause.slug:
+                continue
+
+            position: int = len(index.names)
+            name: str = fold_text(cause.name)
+            words: list[str] = WORD_REGEX.findall(name)
+            name_trigrams: frozenset[str] = _text_trigrams(words)
+
+            index.names.append(name)
+            index.fragments.append(json.dumps(get_cause_response_item(cause), cls=DjangoJSONEncoder))
+            index.trigrams.append(name_trigrams)
+
+            for trigram in name_trigrams:
+                index.trigram_positions.setdefault(trigram, []).append(position)
+
+            index.sorted_words.extend((word, position) for word in set(words))
+
+            if cause.is_main:
+                index.registration_numbers.setdefault(cause.ngo.registration_number, []).append(position)
+
+        index.sorted_words.sort()
+        index.all_causes_json = index._to_json(range(len(index.names)))
+
+        logger.info("Built the autocomplete index of %d causes", len(index.names))
+
+        return index
+
+    def is_fresh(self) -> bool:
+        now: float = time.monotonic()
+        if now - self.built_at > settings.TIMEOUT_CACHE_SHORT:
+            return False
+
+        if now - self.checked_at < AUTOCOMPLETE_VERSION_CHECK_SECONDS:
+            return True
+
+        self.checked_at = now
+
+        return get_cache_version(CAUSES_AUTOCOMPLETE_VERSION_KEY) == self.version
+
+    def search_json(self, query: str) -> str:
+        """
+        Return the JSON list of the causes matching the query, or of all the causes for an empty query
+        """
+        if not query or len(query) < settings.SEARCH_QUERY_MIN_LENGTH:
+            return self.all_causes_json
+
+        folded_query: str = fold_text(query)
+        query_words: list[str] = WORD_REGEX.findall(folded_query)
+
+        if settings.ENABLE_CAUSE_SEARCH_EXACT_MATCH:
+            if exact_positions := self._exact_positions(query, folded_query, query_words):
+                return self._to_json(exact_positions)
+
+        return self._to_json(self._fuzzy_positions(query_words))
+
+    def _exact_positions(self, query: str, folded_query: str, query_words: list[str]) -> list[int]:
+        # every cause which contains the query also has the trigrams from inside its words
+        inner_trigrams: set[str] = {word[index : index + 3] for word in query_words for index in range(len(word) - 2)}
+        if inner_trigrams:
+            candidates = set.intersection(*(set(self.trigram_positions.get(trigram, ())) for trigram in inner_trigrams))
+        else:
+            candidates = set(range(len(self.names)))
+
+        positions: set[int] = {position for position in candidates if folded_query in self.names[position]}
+
+        if registration_number := probable_registration_number(query):
+            positions.update(self.registration_numbers.get(registration_number, ()))
+
+        return sorted(positions)
+
+    def _fuzzy_positions(self, query_words: list[str]) -> list[int]:
+        positions: set[int] = set()
+
+        query_trigrams: frozenset[str] = _text_trigrams(query_words)
+        if query_trigrams:
+            shared_counts: Counter[int] = Counter()
+            for trigram in query_trigrams:
+                shared_counts.update(self.trigram_positions.get(trigram, ()))
+
+            use_word_similarity: bool = settings.ENABLE_CAUSE_SEARCH_WORD_SIMILARITY
+            for position, shared_count in shared_counts.items():
+                if use_word_similarity:
+                    # the share of the query found in the name, like pg_trgm's word_similarity
+                    similarity = shared_count / len(query_trigrams)
+                    threshold = WORD_SIMILARITY_THRESHOLD
+                else:
+                    similarity = shared_count / (len(query_trigrams) + len(self.trigrams[position]) - shared_count)
+                    threshold = SIMILARITY_THRESHOLD
+
+                if similarity > threshold:
+                    positions.add(position)
+
+        # like the full-text search, every word of the query has to start a word of the name
+        prefix_words: list[str] = [word for word in query_words if len(word) >= PREFIX_MIN_LENGTH]
+        if prefix_words:
+            positions |= set.intersection(*(self._prefix_positions(word) for word in prefix_words))
+
+        return sorted(positions)
+
+    def _prefix_positions(self, prefix: str) -> set[int]:
+        start: int = bisect.bisect_left(self.sorted_words, (prefix,))
+
+        positions: set[int] = set()
+        for word, position in self.sorted_words[start:]:
+            if not word.startswith(prefix):
+                break
+            positions.add(position)
+
+        return positions
+
+    def _to_json(self, positions) -> str:
+        return f"[{', '.join(self.fragments[position] for position in positions)}]"
+
+
+_index: CausesAutocompleteIndex | None = None
+_index_lock = threading.Lock()
+
+
+def causes_autocomplete_index() -> CausesAutocompleteIndex:
+    """
+    The autocomplete index of this process, which is built again when the causes change
+    """
+    global _index
+
+    index = _index
+    if index is not None and index.is_fresh():
+        return index
+
+    # while a thread builds the new index, the other ones keep using the outdated index, if there is one
+    if not _index_lock.acquire(blocking=index is None):
+        return index
+
+    try:
+        # another thread might have built it in the meantime
+        if _index is None or _index is index:
+            _index = CausesAutocompleteIndex.build()
+
+        return _index
+    finally:
+        _index_lock.release()
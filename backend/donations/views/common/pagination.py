@@ -0,0 +1,172 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from functools import cached_property, reduce
+from operator import or_
+from typing import Any
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q, QuerySet
+
+
+def _encode_cursor(values: list[Any], position: int) -> str:
+    # the values are kept as strings, e.g. the dates with their microseconds, and parsed by their fields
+    payload: str = json.dumps({"values": values, "position": position}, default=str)
+
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+@dataclass(slots=True)
+class KeysetPage:
+    object_list: list
+    paginator: "KeysetPaginator"
+    # the 1-based index of the first object in the page, so that the rows can still be numbered
+    first_index: int
+    next_cursor: str | None = None
+    previous_cursor: str | None = None
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+    def start_index(self) -> int:
+        return self.first_index if self.object_list else 0
+
+    def end_index(self) -> int:
+        return self.first_index + len(self.object_list) - 1 if self.object_list else 0
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by the values of its ordering fields, instead of an offset.
+
+    The next page starts after the last object of the current one, so every page is read from an index
+    in the same time, no matter how deep it is. The ordering has to be unique, e.g. end with the ID.
+    The pages are not numbered, they are reached through the cursors of the previous and the next pages.
+    """
+
+    def __init__(self, object_list: QuerySet, per_page: int, ordering: tuple[str, ...]):
+        self.object_list: QuerySet = object_list
+        self.per_page: int = per_page
+        self.ordering: tuple[str, ...] = ordering
+
+    @cached_property
+    def count(self) -> int:
+        return self.object_list.count()
+
+    def page(self, *, after: str | None = None, before: str | None = None) -> KeysetPage:
+        if before and (cursor := self._decode_cursor(before)):
+            values, position = cursor
+            # the previous page is read backwards, from the first object of the current page
+            previous_objects: QuerySet = self.object_list.order_by(*self._reversed_ordering()).filter(
+                self._keyset_filter(values, reverse=True)
+            )
+            objects: list = list(previous_objects[: self.per_page + 1])
+
+            has_previous: bool = len(objects) > self.per_page
+            objects = objects[: self.per_page][::-1]
+            first_index: int = max(position - len(objects), 1)
+
+            return self._build_page(objects, first_index, has_next=True, has_previous=has_previous)
+
+        first_index = 1
+        queryset: QuerySet = self.object_list.order_by(*self.ordering)
+        if after and (cursor := self._decode_cursor(after)):
+            values, position = cursor
+            queryset = queryset.filter(self._keyset_filter(values, reverse=False))
+            first_index = position + 1
+
+        objects = list(queryset[: self.per_page + 1])
+        has_next: bool = len(objects) > self.per_page
+
+        return self._build_page(objects[: self.per_page], first_index, has_next=has_next, has_previous=first_index > 1)
+
+    def _build_page(self, objects: list, first_index: int, *, has_next: bool, has_previous: bool) -> KeysetPage:
+        page = KeysetPage(object_list=objects, paginator=self, first_index=first_index)
+
+        if objects and has_next:
+            page.next_cursor = _encode_cursor(self._values(objects[-1]), first_index + len(objects) - 1)
+        if objects and has_previous:
+            page.previous_cursor = _encode_cursor(self._values(objects[0]), first_index)
+
+        return page
+
+    def _field_names(self) -> list[str]:
+        return [field_name.removeprefix("-") for field_name in self.ordering]
+
+    def _reversed_ordering(self) -> list[str]:
+        return [
+            field_name.removeprefix("-") if field_name.startswith("-") else f"-{field_name}"
+            for field_name in self.ordering
+        ]
+
+    def _values(self, obj) -> list[Any]:
+        if isinstance(obj, dict):
+            return [obj[field_name] for field_name in self._field_names()]
+
+        return [getattr(obj, field_name) for field_name in self._field_names()]
+
+    def _keyset_filter(self, values: list[Any], *, reverse: bool) -> Q:
+        """
+        The objects which come after (or before) the given values, in the order of the paginator, e.g.
+        (a < x) OR (a = x AND b < y) for the ("-a", "-b") ordering
+        """
+        alternatives: list[Q] = []
+        for index, field_name in enumerate(self.ordering):
+            descending: bool = field_name.startswith("-")
+            lookup: str = "lt" if descending != reverse else "gt"
+
+            conditions: dict[str, Any] = {
+                name: value for name, value in zip(self._field_names()[:index], values[:index], strict=True)
+            }
+            conditions[f"{field_name.removeprefix('-')}__{lookup}"] = values[index]
+
+            alternatives.append(Q(**conditions))
+
+        return reduce(or_, alternatives)
+
+    def _decode_cursor(self, cursor: str) -> tuple[list[Any], int] | None:
+        # an invalid cursor shows the first page
+        try:
+            payload: dict = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            raw_values: list = payload["values"]
+            position = int(payload["position"])
+
+            model_meta = self.object_list.model._meta
+            values: list[Any] = [
+                model_meta.get_field(field_name).to_python(raw_value)
+                for field_name, raw_value in zip(self._field_names(), raw_values, strict=True)
+            ]
+        except (binascii.Error, ValueError, TypeError, KeyError, FieldDoesNotExist, ValidationError):
+            return None
+
+        if position < 1:
+            return None
+
+        return values, position
+
+
+class KeysetPaginationMixin:
+    """
+    Paginate a ListView with a KeysetPaginator, through the "after" and "before" request parameters
+    """
+
+    keyset_ordering: tuple[str, ...] = ("-id",)
+
+    def paginate_queryset(self, queryset: QuerySet, page_size: int) -> tuple[KeysetPaginator, KeysetPage, list, bool]:
+        paginator = KeysetPaginator(queryset, page_size, self.keyset_ordering)
+        page: KeysetPage = paginator.page(after=self.request.GET.get("after"), before=self.request.GET.get("before"))
+
+        return paginator, page, page.object_list, page.has_other_pages()
@@ -9,14 +9,33 @@ from django.contrib.postgres.search import (
     TrigramWordSimilarity,
 )
 from django.db.models import Q, QuerySet
-from django.db.models.functions import Greatest
+from django.db.models.lookups import GreaterThanOrEqual
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import ListView
 
 from donations.models.donors import Donor
-from donations.models.ngos import Cause, Ngo
+from donations.models.ngos import SEARCH_VECTOR_CONFIG, Cause, Ngo
 from utils.text.registration_number import probable_registration_number
 
+# The trigram similarity thresholds of the search, which are compared in the queries rather than set on the
+# database connections, since these are shared between the clients by PgBouncer
+SIMILARITY_THRESHOLD = 0.3
+WORD_SIMILARITY_THRESHOLD = 0.4
+
+
+def name_similarity_filter(query: str, word_similarity: bool) -> Q:
+    """
+    Match the names similar to the query, or containing a word similar to it
+    """
+    if word_similarity:
+        return Q(GreaterThanOrEqual(TrigramWordSimilarity(query, "name"), WORD_SIMILARITY_THRESHOLD))
+
+    # the % operator uses the trigram index of the name, with the default threshold of pg_trgm (0.3),
+    # and the explicit comparison keeps the threshold of the search whatever the server configuration
+    return Q(name__trigram_similar=query) & Q(
+        GreaterThanOrEqual(TrigramSimilarity("name", query), SIMILARITY_THRESHOLD)
+    )
+
 
 class ConfigureSearch:
     @staticmethod
@@ -26,6 +45,11 @@ class ConfigureSearch:
 
         return SearchQuery(query)
 
+    @staticmethod
+    def indexed_query(query: str) -> SearchQuery:
+        # the stored search vectors are built with a single configuration, whatever the language of the request
+        return SearchQuery(query, config=SEARCH_VECTOR_CONFIG)
+
     @staticmethod
     def vector(search_fields: list[str], language_code: str) -> SearchVector:
         if language_code == "ro":
@@ -78,27 +102,17 @@ class CommonSearchMixin(ListView):
 
 class NgoSearchMixin(CommonSearchMixin):
     @classmethod
-    def get_search_results(cls, queryset: QuerySet, query: str, language_code: str) -> QuerySet:
-        search_fields = ("name", "registration_number")
-        search_vector: SearchVector = ConfigureSearch.vector(search_fields, language_code)
-        search_query: SearchQuery = ConfigureSearch.query(query, language_code)
+    def search_filter(cls, query: str) -> Q:
+        """
+        Match the stored search vector or the trigram similarity of the name, which are both indexed
+        """
+        similarity_filter = name_similarity_filter(query, settings.ENABLE_NGO_SEARCH_WORD_SIMILARITY)
 
-        if settings.ENABLE_NGO_SEARCH_WORD_SIMILARITY:
-            trigram_similarity = TrigramWordSimilarity(query, "name")
-            similarity_threshold = 0.4
-        else:
-            trigram_similarity = TrigramSimilarity("name", query)
-            similarity_threshold = 0.3
+        return Q(search_vector=ConfigureSearch.indexed_query(query)) | similarity_filter
 
-        ngos: QuerySet[Ngo] = (
-            queryset.annotate(
-                rank=SearchRank(search_vector, search_query),
-                similarity=trigram_similarity,
-            )
-            .filter(Q(rank__gte=0.3) | Q(similarity__gt=similarity_threshold))
-            .order_by("name")
-            .distinct("name")
-        )
+    @classmethod
+    def get_search_results(cls, queryset: QuerySet, query: str, language_code: str) -> QuerySet:
+        ngos: QuerySet[Ngo] = queryset.filter(cls.search_filter(query)).order_by("name").distinct("name")
 
         return ngos
 
@@ -112,10 +126,10 @@ class DeprecatedCauseSearchMixin(CommonSearchMixin):
 
         if settings.ENABLE_CAUSE_SEARCH_WORD_SIMILARITY:
             trigram_similarity = TrigramWordSimilarity(query, "name")
-            similarity_threshold = 0.4
+            similarity_threshold = WORD_SIMILARITY_THRESHOLD
         else:
             trigram_similarity = TrigramSimilarity("name", query)
-            similarity_threshold = 0.3
+            similarity_threshold = SIMILARITY_THRESHOLD
 
         causes: QuerySet[Cause] = (
             queryset.annotate(
@@ -132,76 +146,55 @@ class DeprecatedCauseSearchMixin(CommonSearchMixin):
 
 class CauseSearchMixin(CommonSearchMixin):
     @classmethod
-    def get_search_results(cls, queryset: QuerySet, query: str, language_code: str) -> QuerySet[Cause]:
+    def search_filter(cls, queryset: QuerySet[Cause], query: str) -> Q:
+        """
+        Match the exact name (or registration number) of the causes, if any of them has it,
+        otherwise match the stored search vector or the trigram similarity of the name, which are all indexed
+        """
         if settings.ENABLE_CAUSE_SEARCH_EXACT_MATCH:
-            query_filter = Q(name__icontains=query)
+            exact_filter = Q(name__icontains=query)
             # If the query looks like a registration number then also try to find the main causes owned by
             # organisations which have that registration number
             registration_number = probable_registration_number(query)
             if registration_number:
-                query_filter = query_filter | (Q(ngo__registration_number=registration_number) & Q(is_main=True))
+                exact_filter = exact_filter | (Q(ngo__registration_number=registration_number) & Q(is_main=True))
 
-            exact_causes: QuerySet[Cause] = queryset.filter(query_filter).order_by("id").distinct("id")
-            if exact_causes.count():
-                return exact_causes
+            if queryset.filter(exact_filter).exists():
+                return exact_filter
 
-        search_vector: SearchVector = ConfigureSearch.vector(("name",), language_code)
-        search_query: SearchQuery = ConfigureSearch.query(query, language_code)
+        similarity_filter = name_similarity_filter(query, settings.ENABLE_CAUSE_SEARCH_WORD_SIMILARITY)
 
-        if settings.ENABLE_CAUSE_SEARCH_WORD_SIMILARITY:
-            trigram_similarity = TrigramWordSimilarity(query, "name")
-            similarity_threshold = 0.4
-        else:
-            trigram_similarity = TrigramSimilarity("name", query)
-            similarity_threshold = 0.3
+        return Q(search_vector=ConfigureSearch.indexed_query(query)) | similarity_filter
 
-        fuzzy_causes: QuerySet[Cause] = (
-            queryset.annotate(
-                rank=SearchRank(search_vector, search_query),
-                similarity=trigram_similarity,
-            )
-            .filter(Q(rank__gte=0.3) | Q(similarity__gt=similarity_threshold))
-            .order_by("id")
-            .distinct("id")
-        )
+    @classmethod
+    def get_search_results(cls, queryset: QuerySet, query: str, language_code: str) -> QuerySet[Cause]:
+        causes: QuerySet[Cause] = queryset.filter(cls.search_filter(queryset, query)).order_by("id")
 
-        return fuzzy_causes
+        return causes
 
 
 class NgoCauseMixedSearchMixin(CommonSearchMixin):
     @classmethod
     def get_search_results(cls, queryset: QuerySet, query: str, language_code: str) -> QuerySet[Cause]:
-        ngos = NgoSearchMixin.get_search_results(Ngo.active, query, language_code)
-        ngos_causes = Cause.public_active.filter(ngo__in=ngos).distinct("name")
+        # a single query, where the causes and their NGOs are matched by their own indexes
+        ngos: QuerySet[Ngo] = Ngo.active.filter(NgoSearchMixin.search_filter(query)).values("pk")
+        causes_filter: Q = CauseSearchMixin.search_filter(queryset, query)
 
-        searched_causes = CauseSearchMixin.get_search_results(queryset, query, language_code)
+        causes: QuerySet[Cause] = queryset.filter(causes_filter | Q(ngo__in=ngos)).order_by("id")
 
-        return searched_causes | ngos_causes
+        return causes
 
 
 class DonorSearchMixin(CommonSearchMixin):
     @classmethod
     def get_search_results(cls, queryset: QuerySet[Donor], query: str, language_code: str) -> QuerySet:
-        search_fields = ("f_name", "l_name")
-        name_search_vector: SearchVector = ConfigureSearch.vector(search_fields, language_code)
-        name_search_query: SearchQuery = ConfigureSearch.query(query, language_code)
+        """
+        Match the names, or the contact details of the donors who are not anonymous, by their trigram similarity,
+        in a single query over the trigram indexes of the donors of every NGO
+        """
+        name_filter = Q(f_name__trigram_similar=query) | Q(l_name__trigram_similar=query)
+        contact_filter = Q(email__trigram_similar=query) | Q(phone__trigram_similar=query)
 
-        contact_search_fields = ("email", "phone")
-        contact_search_vector: SearchVector = ConfigureSearch.vector(contact_search_fields, language_code)
-        contact_search_query: SearchQuery = ConfigureSearch.query(query, language_code)
-
-        donors: QuerySet = queryset.annotate(
-            rank=SearchRank(name_search_vector, name_search_query),
-            similarity=Greatest(TrigramSimilarity("f_name", query), TrigramSimilarity("l_name", query)),
-        ).filter(Q(rank__gte=0.3) | Q(similarity__gt=0.3))
-
-        contact_donors = (
-            queryset.annotate(
-                rank=SearchRank(contact_search_vector, contact_search_query),
-                similarity=Greatest(TrigramSimilarity("email", query), TrigramSimilarity("phone", query)),
-            )
-            .exclude(is_anonymous=True)
-            .filter(Q(rank__gte=0.3) | Q(similarity__gt=0.3))
-        )
+        donors: QuerySet = queryset.filter(name_filter | (Q(is_anonymous=False) & contact_filter))
 
-        return donors | contact_donors
+        return donors
@@ -2,25 +2,26 @@ from datetime import datetime, tzinfo
 
 from django.conf import settings
 from django.urls import reverse
-from django.utils.timezone import now
+from django.utils.timezone import localdate, now
 from django.utils.translation import gettext_lazy as _
 
 from donations.views.dashboard.stats_helpers.metrics import (
+    all_active_ngos,
     all_redirections,
-    all_registered_ngos,
     current_year_redirections,
     ngos_active_in_current_year,
     ngos_with_ngo_hub,
+    today_redirections,
 )
-from donations.views.dashboard.stats_helpers.yearly import get_stats_for_year
+from donations.views.dashboard.stats_helpers.yearly import get_stats_for_years
 from editions.calendar import edition_deadline, get_current_year_range
-from redirectioneaza.common.cache import cache_decorator
+from redirectioneaza.common.cache import cache_decorator, get_cache_statistics
 
 from .helpers import (
     generate_donations_per_month_chart,
     get_encoded_current_year_range,
 )
-from .stats_helpers.chart import donors_for_month
+from .stats_helpers.chart import donors_per_month
 from .stats_helpers.utils import format_stat_link, format_yearly_stats
 
 ADMIN_DASHBOARD_HEADER_CACHE_KEY = "ADMIN_DASHBOARD_HEADER"
@@ -30,6 +31,10 @@ ADMIN_DASHBOARD_YEARLY_CACHE_KEY = "ADMIN_DASHBOARD_YEARLY"
 
 def callback(request, context) -> dict:
     context.update(_get_admin_stats())
+
+    if request.user.is_superuser:
+        context["table_stats"] = _get_cache_stats()
+
     return context
 
 
@@ -60,6 +65,15 @@ def _get_header_stats() -> list[list[dict[str, str | int | datetime]]]:
 
     return [
         [
+            {
+                "title": f"{_('Donations')} {_('today')}",
+                "icon": "edit_document",
+                "metric": today_redirections(),
+                "footer": format_stat_link(
+                    url=f"{reverse('admin:donations_donor_changelist')}?date_created__gte={localdate().isoformat()}",
+                    text=_("View all"),
+                ),
+            },
             {
                 "title": f"{_('Donations')} {_('this year')}",
                 "icon": "edit_document",
@@ -79,9 +93,9 @@ def _get_header_stats() -> list[list[dict[str, str | int | datetime]]]:
                 ),
             },
             {
-                "title": _("NGOs registered"),
+                "title": _("Active NGOs"),
                 "icon": "foundation",
-                "metric": all_registered_ngos(),
+                "metric": all_active_ngos(),
                 "footer": format_stat_link(
                     url=f"{reverse('admin:donations_ngo_changelist')}?is_active=1",
                     text=_("View all"),
@@ -109,23 +123,44 @@ def _get_header_stats() -> list[list[dict[str, str | int | datetime]]]:
     ]
 
 
+def _get_cache_stats() -> dict | None:
+    cache_statistics: list[dict[str, str | int | float]] = get_cache_statistics()
+    if not cache_statistics:
+        return None
+
+    return {
+        "title": _("Cache statistics"),
+        "data": {
+            "headers": [_("Cache key"), _("Hits"), _("Stale hits"), _("Misses"), _("Hit rate")],
+            "rows": [
+                [
+                    statistic["prefix"],
+                    statistic["hits"],
+                    statistic["stale_hits"],
+                    statistic["misses"],
+                    f"{statistic['hit_rate']:.1%}",
+                ]
+                for statistic in cache_statistics
+            ],
+        },
+    }
+
+
 @cache_decorator(timeout=settings.TIMEOUT_CACHE_SHORT, cache_key=ADMIN_DASHBOARD_CHART_CACHE_KEY)
 def _create_chart_statistics() -> dict[str, str]:
     default_border_width: int = 3
     year_range_ascending = get_current_year_range()
 
-    donations_per_year: dict[int, list[int]] = {}
-    for year in year_range_ascending:
-        donations_per_year[year] = [
-            int(donors_for_month(month=month, year=year)) for month in range(1, edition_deadline().month + 1)
-        ]
+    donations_per_year: dict[int, list[int]] = donors_per_month(
+        year_range_ascending, last_month=edition_deadline().month
+    )
 
     return generate_donations_per_month_chart(default_border_width, donations_per_year)
 
 
 @cache_decorator(timeout=settings.TIMEOUT_CACHE_SHORT, cache_key=ADMIN_DASHBOARD_YEARLY_CACHE_KEY)
 def _get_yearly_stats(years_range_ascending) -> list[dict[str, int | list[dict]]]:
-    statistics = [get_stats_for_year(year) for year in years_range_ascending]
+    statistics = get_stats_for_years(years_range_ascending)
 
     for index, statistic in enumerate(statistics):
         if index == 0:
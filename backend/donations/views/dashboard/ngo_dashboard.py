@@ -1,4 +1,6 @@
 from django.contrib.auth import get_user_model
+from django.db.models import Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
 from django.utils.translation import gettext_lazy as _
 
 from donations.models.ngos import Ngo
@@ -6,7 +8,7 @@ from editions.calendar import edition_deadline, get_current_year_range
 from redirectioneaza import settings
 from redirectioneaza.common.cache import cache_decorator
 
-from ...models.donors import Donor
+from ...models.rollups import DonationRollup
 from .helpers import generate_donations_per_month_chart
 
 UserModel = get_user_model()
@@ -21,9 +23,12 @@ def callback(request, context) -> dict:
 
     user_ngo = user.ngo
 
-    header_stats = _get_header_stats(user_ngo)
+    # the widgets read the donation rollups of the NGO, with one query for the months and one for the counties
+    monthly_donations: dict[tuple[int, int], int] = _get_monthly_donations(user_ngo)
+
+    header_stats = _get_header_stats(user_ngo, monthly_donations)
     table_stats = _get_donations_per_county(user_ngo)
-    forms_per_month_chart: dict[str, str] = _create_chart_statistics(user_ngo)
+    forms_per_month_chart: dict[str, str] = _create_chart_statistics(monthly_donations)
 
     context.update(
         {
@@ -36,16 +41,26 @@ def callback(request, context) -> dict:
     return context
 
 
-@cache_decorator(timeout=settings.TIMEOUT_CACHE_NORMAL, cache_key_custom="NGO_DONATIONS_PER_MONTH_CHART_{ngo.pk}")
-def _create_chart_statistics(ngo: Ngo) -> dict[str, str]:
+def _get_monthly_donations(ngo: Ngo) -> dict[tuple[int, int], int]:
+    monthly_rollups = (
+        DonationRollup.objects.filter(ngo=ngo)
+        .annotate(year=ExtractYear("day"), month=ExtractMonth("day"))
+        .values("year", "month")
+        .annotate(total=Sum("count"))
+        .order_by()
+    )
+
+    return {(rollup["year"], rollup["month"]): rollup["total"] for rollup in monthly_rollups}
+
+
+def _create_chart_statistics(monthly_donations: dict[tuple[int, int], int]) -> dict[str, str]:
     default_border_width: int = 3
     year_range_ascending = get_current_year_range()
 
     donations_per_year: dict[int, list[int]] = {}
     for year in year_range_ascending:
         donations_per_month: list[int] = [
-            Donor.available.filter(date_created__year=year, date_created__month=month, ngo=ngo).count()
-            for month in range(1, edition_deadline().month + 1)
+            monthly_donations.get((year, month), 0) for month in range(1, edition_deadline().month + 1)
         ]
         donations_per_year[year] = donations_per_month
 
@@ -59,17 +74,16 @@ def _get_donations_per_county(user_ngo):
         _("Number of donations"),
     ]
 
-    counties = Donor.available.filter(ngo=user_ngo).values_list("county", flat=True).distinct()
+    county_rollups = (
+        DonationRollup.objects.filter(ngo=user_ngo)
+        .values("county")
+        .annotate(total=Sum("count"))
+        .filter(total__gt=0)
+        # sort by number of donations
+        .order_by("-total", "county")
+    )
 
-    rows = [
-        [
-            county,
-            Donor.available.filter(ngo=user_ngo, county=county).count(),
-        ]
-        for county in counties
-    ]
-    # sort by number of donations
-    rows = sorted(rows, key=lambda x: x[1], reverse=True)
+    rows = [[county_rollup["county"], county_rollup["total"]] for county_rollup in county_rollups]
 
     # add the row index
     rows = [[index + 1] + row for index, row in enumerate(rows)]
@@ -83,9 +97,13 @@ def _get_donations_per_county(user_ngo):
     }
 
 
-def _get_header_stats(ngo: Ngo) -> list[list[dict[str, str | int]]]:
+def _get_header_stats(ngo: Ngo, monthly_donations: dict[tuple[int, int], int]) -> list[list[dict[str, str | int]]]:
     organization_year_range = _get_ngo_year_range(ngo)
 
+    yearly_donations: dict[int, int] = {}
+    for (year, _month), total in monthly_donations.items():
+        yearly_donations[year] = yearly_donations.get(year, 0) + total
+
     years_per_row = 4
     year_rows = [
         organization_year_range[i : i + years_per_row][::-1]
@@ -97,7 +115,7 @@ def _get_header_stats(ngo: Ngo) -> list[list[dict[str, str | int]]]:
             {
                 "title": _("Donations in %d") % year,
                 "icon": "edit_document",
-                "metric": Donor.available.filter(date_created__year=year).count(),
+                "metric": yearly_donations.get(year, 0),
             }
             for year in year_row
         ]
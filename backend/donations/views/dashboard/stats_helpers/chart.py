@@ -5,7 +5,7 @@ from decimal import Decimal
 from django.utils.timezone import now
 
 from donations.models.stat_configs import StatsChoices
-from stats.api import get_stats_total_between_dates
+from stats.api import get_series, get_stats_total_between_dates
 
 STATS_FOR_MONTH_CACHE_PREFIX = "STATS_FOR_MONTH_"
 
@@ -52,3 +52,33 @@ def _update_stats_for_month(month: int, year: int) -> Decimal:
     )
 
     return donors_in_month
+
+
+def donors_per_month(years: list[int], last_month: int = 12) -> dict[int, list[int]]:
+    """
+    Determines the number of donors for each month of several years, with a single query.
+
+    Parameters:
+        years (list[int]): The years for which donor statistics are requested.
+        last_month (int): The last month of each year to return, e.g. the month of the deadline.
+
+    Returns:
+        dict[int, list[int]]: The number of donors for each month, from January to the last month, by year.
+    """
+    if not years:
+        return {}
+
+    monthly_donors: dict[date, Decimal] = get_series(
+        key_names=[StatsChoices.REDIRECTIONS_PER_DAY],
+        from_date=date(year=min(years), month=1, day=1),
+        to_date=date(year=max(years), month=12, day=31),
+        granularity="month",
+    )[StatsChoices.REDIRECTIONS_PER_DAY]
+
+    return {
+        year: [
+            int(monthly_donors.get(date(year=year, month=month, day=1), Decimal(0)))
+            for month in range(1, last_month + 1)
+        ]
+        for year in years
+    }
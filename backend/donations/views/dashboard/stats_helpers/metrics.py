@@ -2,9 +2,14 @@ from datetime import date
 from decimal import Decimal
 
 from django.conf import settings
-from django.utils.timezone import now
-
-from donations.models.stat_configs import StatsChoices
+from django.utils.timezone import localdate, now
+
+from donations.models.stat_configs import (
+    StatsChoices,
+    donations_day_counter,
+    donations_year_counter,
+    ngos_active_counter,
+)
 from editions.calendar import edition_deadline
 from stats.api import get_single_total_stat, get_stats_total_between_dates
 
@@ -24,23 +29,24 @@ def _get_end_date() -> date:
     return date(year=year, month=month, day=day)
 
 
-def current_year_redirections() -> int:
+def today_redirections() -> int:
     """
-    Returns the number of redirections (donations) for the current year.
+    Returns the number of redirections (donations) made today, from the live counter.
 
     Returns:
-        int: The number of redirections for the current year.
+        int: The number of redirections made today.
     """
-    stats_key: str = str(StatsChoices.REDIRECTIONS_PER_DAY.value)
+    return donations_day_counter(localdate())
 
-    end_date: date = _get_end_date()
-    stats: Decimal = get_stats_total_between_dates(
-        key_name=stats_key,
-        from_date=date(year=end_date.year, month=1, day=1),
-        to_date=end_date,
-    )
 
-    return int(stats)
+def current_year_redirections() -> int:
+    """
+    Returns the number of redirections (donations) for the current year, from the live counter.
+
+    Returns:
+        int: The number of redirections for the current year.
+    """
+    return donations_year_counter(_get_end_date().year)
 
 
 def all_redirections() -> int:
@@ -64,17 +70,14 @@ def all_redirections() -> int:
     return int(stats)
 
 
-def all_registered_ngos() -> int:
+def all_active_ngos() -> int:
     """
-    Returns the total number of registered and valid NGOs.
+    Returns the total number of active NGOs, from the live counter.
 
     Returns:
-        int: The number of registered NGOs.
+        int: The number of active NGOs.
     """
-    stats_key = str(StatsChoices.NGOS_REGISTERED.value)
-
-    stats: Decimal = get_single_total_stat(key_name=stats_key)
-    return int(stats)
+    return ngos_active_counter()
 
 
 def ngos_active_in_current_year() -> int:
@@ -5,7 +5,7 @@ from typing import Any
 from django.utils.timezone import now
 
 from donations.models.stat_configs import StatsChoices
-from stats.api import get_stat_for_year, get_stats_total_between_dates
+from stats.api import get_series, get_stat_for_year, get_stats_total_between_dates
 
 STATS_FOR_YEAR_CACHE_PREFIX = "STATS_FOR_YEAR_"
 
@@ -70,3 +70,45 @@ def _update_stats_for_year(year: int) -> dict[str, Any]:
     }
 
     return statistic
+
+
+def get_stats_for_years(years: list[int]) -> list[dict[str, Any]]:
+    """
+    Fetches and returns the statistics of several years, with a single query.
+
+    Parameters:
+        years (list[int]): The years for which to retrieve statistics.
+
+    Returns:
+        list[dict[str, Any]]: The statistics of each year, in the order of the years,
+        with the same keys as get_stats_for_year.
+    """
+    if not years:
+        return []
+
+    current_time: datetime = now()
+
+    yearly_stats: dict[str, dict[date, Decimal]] = get_series(
+        key_names=[
+            StatsChoices.REDIRECTIONS_PER_DAY,
+            StatsChoices.NGOS_REGISTERED_PER_YEAR,
+            StatsChoices.NGOS_ACTIVE_PER_YEAR,
+        ],
+        from_date=date(year=min(years), month=1, day=1),
+        to_date=date(year=max(years), month=12, day=31),
+        granularity="year",
+    )
+
+    def _total(key_name: str, year: int) -> int:
+        return int(yearly_stats[key_name].get(date(year=year, month=1, day=1), Decimal(0)))
+
+    return [
+        {
+            "year": year,
+            "donations": _total(StatsChoices.REDIRECTIONS_PER_DAY, year),
+            "ngos_registered": _total(StatsChoices.NGOS_REGISTERED_PER_YEAR, year),
+            "ngos_with_forms": _total(StatsChoices.NGOS_ACTIVE_PER_YEAR, year),
+            "timestamp": current_time,
+        }
+        for year in years
+    ]
@@ -1,14 +1,12 @@
 import os
+from collections.abc import Iterable
 from datetime import datetime
-from typing import Any
-from xml.etree.ElementTree import Element, ElementTree
-from zipfile import ZipFile
+from typing import IO, Any
+from xml.etree.ElementTree import Element, ElementTree, tostring
 
 from django.core.exceptions import ValidationError
-from django.db.models import QuerySet
 from localflavor.ro.forms import ROCNPField
 
-from donations.models.donors import Donor
 from donations.models.ngos import Cause
 from donations.views.download_donations.common import (
     XMLNS_DETAILS,
@@ -19,13 +17,19 @@ from donations.views.download_donations.common import (
     build_imp,
     new_xml_element,
 )
+from donations.views.download_donations.records import DonationRecord
+from donations.views.download_donations.zip_members import ZipArchiveWriter
 
 # Repurposed from localflavor.ro.forms.ROCNPField
 CNP_FIELD = ROCNPField()
 
+# The declaration written by ElementTree.write(encoding="utf-8", xml_declaration=True)
+XML_DECLARATION = b"<?xml version='1.0' encoding='utf-8'?>\n"
+XML_ROOT_TAG = "form1"
 
-def _redirection_has_duplicate_cnp(redirection: Donor, cnp_idx: dict[str, dict[str, Any]]) -> bool:
-    cnp = redirection.get_cnp()
+
+def _redirection_has_duplicate_cnp(redirection: DonationRecord, cnp_idx: dict[str, dict[str, Any]]) -> bool:
+    cnp = redirection.cnp
 
     try:
         CNP_FIELD.clean(cnp)
@@ -43,47 +47,66 @@ def _redirection_has_duplicate_cnp(redirection: Donor, cnp_idx: dict[str, dict[s
 
 def add_xml_to_zip(
     cause: Cause,
-    donations_batch: QuerySet[Donor],
+    donations_batch: Iterable[DonationRecord],
     batch_count: int,
     xml_name: str,
     cnp_idx: dict[str, dict[str, Any]],
     zip_timestamp: datetime,
-    zip_archive: ZipFile,
+    zip_archive: ZipArchiveWriter,
     zip_64_flag: bool,
 ):
-    xml_element_tree: ElementTree = build_xml(
-        xml_index=batch_count,
-        cause=cause,
-        redirections=donations_batch,
-        cnp_idx=cnp_idx,
-        timestamp=zip_timestamp,
-    )
-
     with zip_archive.open(os.path.join("xml", xml_name), mode="w", force_zip64=zip_64_flag) as handler:
-        xml_element_tree.write(handler, encoding="utf-8", xml_declaration=True, method="xml")
+        write_xml(
+            handler,
+            xml_index=batch_count,
+            cause=cause,
+            redirections=donations_batch,
+            cnp_idx=cnp_idx,
+            timestamp=zip_timestamp,
+        )
+
+
+def write_xml(
+    handler: IO[bytes],
+    xml_index: int,
+    cause: Cause,
+    redirections: Iterable[DonationRecord],
+    cnp_idx: dict[str, dict[str, Any]],
+    timestamp: datetime,
+) -> None:
+    """
+    Write the XML file one element at a time, so only a single donor is kept in memory.
+    The output is byte-identical to writing the tree returned by `build_xml`.
+    """
+
+    handler.write(XML_DECLARATION)
+    handler.write(f"<{XML_ROOT_TAG}>".encode())
+
+    for element in _build_xml_header(xml_index, cause, timestamp):
+        handler.write(tostring(element, encoding="utf-8", xml_declaration=False))
+
+    for index, redirection in enumerate(redirections):
+        if _redirection_has_duplicate_cnp(redirection, cnp_idx):
+            continue
+
+        handler.write(tostring(build_donor(index, redirection), encoding="utf-8", xml_declaration=False))
+
+    handler.write(f"</{XML_ROOT_TAG}>".encode())
 
 
 def build_xml(
     xml_index: int,
     cause: Cause,
-    redirections: QuerySet[Donor],
+    redirections: Iterable[DonationRecord],
     cnp_idx: dict[str, dict[str, Any]],
     timestamp: datetime,
 ) -> ElementTree:
-    xml = Element("form1")
+    """
+    Build the whole XML file in memory; `write_xml` should be used for writing the files.
+    """
 
-    xml.append(build_btn_doc())
-    xml.append(Element("semnatura", XMLNS_DETAILS))
-    xml.append(Element("Title", XMLNS_DETAILS))
-    xml.append(build_id_doc_from_raw(cause.ngo.registration_number, timestamp))
-    xml.append(build_imp())
-
-    xml.append(new_xml_element(tag="z_tipPersoana", text="Rad2"))
-    xml.append(new_xml_element(tag="z_denEntitate", text=cause.ngo.name, clean="alnums"))
-    xml.append(new_xml_element(tag="z_cifEntitate", text=cause.ngo.registration_number, clean="numbers"))
-    xml.append(new_xml_element(tag="z_ibanEntitate", text=cause.bank_account, clean="alnum"))
-
-    xml.append(build_borderou_data(xml_index, timestamp, cause))
+    xml = Element(XML_ROOT_TAG)
+    xml.extend(_build_xml_header(xml_index, cause, timestamp))
 
     for index, redirection in enumerate(redirections):
         if _redirection_has_duplicate_cnp(redirection, cnp_idx):
@@ -92,3 +115,18 @@ def build_xml(
         xml.append(build_donor(index, redirection))
 
     return ElementTree(xml)
+
+
+def _build_xml_header(xml_index: int, cause: Cause, timestamp: datetime) -> list[Element]:
+    return [
+        build_btn_doc(),
+        Element("semnatura", XMLNS_DETAILS),
+        Element("Title", XMLNS_DETAILS),
+        build_id_doc_from_raw(cause.ngo.registration_number, timestamp),
+        build_imp(),
+        new_xml_element(tag="z_tipPersoana", text="Rad2"),
+        new_xml_element(tag="z_denEntitate", text=cause.ngo.name, clean="alnums"),
+        new_xml_element(tag="z_cifEntitate", text=cause.ngo.registration_number, clean="numbers"),
+        new_xml_element(tag="z_ibanEntitate", text=cause.bank_account, clean="alnum"),
+        build_borderou_data(xml_index, timestamp, cause),
+    ]
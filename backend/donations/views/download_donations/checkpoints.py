@@ -0,0 +1,165 @@
+import logging
+import os
+import shutil
+from zipfile import BadZipFile, ZipFile
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import Storage
+
+from donations.models.jobs import Job
+from donations.views.download_donations.pdf_fetch import COPY_CHUNK_SIZE
+from donations.views.download_donations.zip_members import (
+    CompressedMember,
+    ZipArchiveWriter,
+    read_compressed_member,
+    write_compressed_member,
+)
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINTS_PATH = "donation-zips/checkpoints"
+
+# How often the progress of a job is saved, in processed donations, when there is no segment to save
+PROGRESS_UPDATE_COUNT = 200
+
+
+class ArchiveCheckpoint:
+    """
+    Save the PDF files compressed by an archive job in the storage, so that a retry of the job
+    copies them into the new archive instead of downloading and compressing them again.
+
+    The files are saved in segments of `segment_size` files, each segment being a partial archive,
+    and the storage names of the segments are kept on the job, together with its progress.
+    """
+
+    def __init__(self, job: Job, tmp_dir_name: str, segment_size: int | None = None):
+        if segment_size is None:
+            segment_size = settings.FORMS_DOWNLOAD_CHECKPOINT_COUNT
+
+        self.job: Job = job
+        self.segment_size: int = segment_size
+        self.tmp_dir_name: str = os.path.join(tmp_dir_name, "checkpoint")
+        self.storage: Storage = Job._meta.get_field("zip").storage
+
+        # The members saved by the previous runs of the job and the local copies of their segments
+        self.saved_members: dict[str, str] = {}
+        self._saved_archives: dict[str, ZipFile] = {}
+
+        self._segment: ZipArchiveWriter | None = None
+        self._segment_members_count: int = 0
+        self._last_progress: int = 0
+
+    def __enter__(self) -> "ArchiveCheckpoint":
+        return self
+
+    def __exit__(self, *args) -> None:
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+
+        for saved_archive in self._saved_archives.values():
+            saved_archive.close()
+        self._saved_archives = {}
+
+    @property
+    def is_enabled(self) -> bool:
+        return self.segment_size > 0
+
+    def restore(self) -> int:
+        """
+        Download the segments saved by the previous runs of the job.
+
+        Returns the number of PDF files which don't need to be compressed again.
+        """
+
+        os.makedirs(self.tmp_dir_name, exist_ok=True)
+
+        for index, segment_name in enumerate(self.job.checkpoint_segments):
+            local_path: str = os.path.join(self.tmp_dir_name, f"saved_{index:05d}.zip")
+
+            try:
+                with self.storage.open(segment_name, "rb") as source, open(local_path, "wb") as target:
+                    shutil.copyfileobj(source, target, COPY_CHUNK_SIZE)
+
+                saved_archive = ZipFile(local_path)
+            except (OSError, BadZipFile) as e:
+                logger.warning("Skipping the checkpoint segment '%s' of job %d: %s", segment_name, self.job.pk, e)
+                continue
+
+            self._saved_archives[local_path] = saved_archive
+            for name in saved_archive.namelist():
+                self.saved_members[name] = local_path
+
+        if self.saved_members:
+            logger.info("Resuming job %d with %d saved PDF files", self.job.pk, len(self.saved_members))
+
+        return len(self.saved_members)
+
+    def read_saved_member(self, name: str) -> CompressedMember:
+        return read_compressed_member(self._saved_archives[self.saved_members[name]], name)
+
+    def add_member(self, member: CompressedMember) -> None:
+        """
+        Add a compressed PDF file to the current segment; the segment is saved by `report_progress`.
+        """
+
+        if not self.is_enabled or member.name in self.saved_members:
+            return
+
+        if self._segment is None:
+            os.makedirs(self.tmp_dir_name, exist_ok=True)
+            self._segment = ZipArchiveWriter(self._segment_path)
+            self._segment_members_count = 0
+
+        write_compressed_member(self._segment, member)
+        self._segment_members_count += 1
+
+    def report_progress(self, processed_donations: int) -> None:
+        if self._segment is not None and self._segment_members_count >= self.segment_size:
+            self.save(processed_donations)
+        elif processed_donations - self._last_progress >= PROGRESS_UPDATE_COUNT:
+            self._save_progress(processed_donations)
+
+    def save(self, processed_donations: int) -> None:
+        """
+        Upload the current segment to the storage and record it on the job, together with the progress.
+        """
+
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+
+            segment_name: str = (
+                f"{CHECKPOINTS_PATH}/{self.job.pk:06d}/segment_{len(self.job.checkpoint_segments):05d}.zip"
+            )
+            with open(self._segment_path, "rb") as segment_file:
+                segment_name = self.storage.save(segment_name, File(segment_file))
+            os.remove(self._segment_path)
+
+            self.job.checkpoint_segments.append(segment_name)
+
+        self._save_progress(processed_donations)
+
+    def clear(self) -> None:
+        """
+        Remove the saved segments from the storage, once the job doesn't need them anymore.
+        """
+
+        for segment_name in self.job.checkpoint_segments:
+            try:
+                self.storage.delete(segment_name)
+            except OSError as e:
+                logger.warning("Could not delete the checkpoint segment '%s': %s", segment_name, e)
+
+        self.job.checkpoint_segments = []
+
+    @property
+    def _segment_path(self) -> str:
+        return os.path.join(self.tmp_dir_name, "segment.zip")
+
+    def _save_progress(self, processed_donations: int) -> None:
+        self._last_progress = processed_donations
+
+        self.job.processed_donations = processed_donations
+        self.job.save(update_fields=["processed_donations", "checkpoint_segments"])
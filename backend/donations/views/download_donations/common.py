@@ -1,46 +1,20 @@
 from datetime import datetime
 from xml.etree.ElementTree import Element
 
-from donations.models.donors import Donor
 from donations.models.ngos import Cause
-from utils.text.cleanup import (
-    clean_text_alnum,
-    clean_text_alphabet,
-    clean_text_custom,
-    clean_text_email,
-    clean_text_numbers,
-    duration_flag_to_int,
-    unicode_to_ascii,
-)
+from donations.views.download_donations.records import DonationRecord
+from utils.text.cleanup import clean_anaf_text, clean_record, duration_flag_to_int
 from utils.text.phone_number import clean_phone_number
 
 XMLNS_DETAILS = {"xmlns:xfa": "http://www.xfa.org/schema/xfa-data/1.0/", "xfa:dataNode": "dataGroup"}
 ANAF_FORM_VERSION = "B230_A1.0.9"
-CLEAN_TEXT_CHOICES = {
-    "alphabet": lambda text: clean_text_alphabet(text),
-    "alphabets": lambda text: clean_text_alphabet(text, allow_spaces=True),
-    "alnum": lambda text: clean_text_alnum(text),
-    "alnums": lambda text: clean_text_alnum(text, allow_spaces=True),
-    "numbers": lambda text: clean_text_numbers(text),
-    "email": lambda text: clean_text_email(text),
-    "custom": lambda text: clean_text_custom(text),
-}
 
 
 def new_xml_element(tag: str, text: str | None = None, clean: str = "") -> Element:
     element = Element(tag)
 
     if text:
-        # ANAF has a limit of 75 to 250 characters for each field
-        text = text[:250]
-
-        if clean:
-            text = unicode_to_ascii(text.strip())
-            text = CLEAN_TEXT_CHOICES.get(clean)(text)
-            text = " ".join(text.split())
-            text = text.upper()
-
-        element.text = text
+        element.text = clean_anaf_text(text, clean)
 
     return element
 
@@ -130,17 +104,17 @@ def build_borderou_data_from_raw(
     return element
 
 
-def build_donor(index: int, donor: Donor) -> Element:
+def build_donor(index: int, donor: DonationRecord) -> Element:
     return build_donor_raw(
         index=index,
-        ngo_cui=donor.ngo.registration_number,
-        ngo_name=donor.ngo.name,
-        bank_account=donor.cause.bank_account,
-        donor_cnp=donor.get_cnp(),
-        donor_last_name=donor.l_name,
-        donor_first_name=donor.f_name,
+        ngo_cui=donor.ngo_registration_number,
+        ngo_name=donor.ngo_name,
+        bank_account=donor.bank_account,
+        donor_cnp=donor.cnp,
+        donor_last_name=donor.last_name,
+        donor_first_name=donor.first_name,
         donor_initial=donor.initial,
-        donor_address=donor.get_address(include_full=True)["full_address"],
+        donor_address=donor.full_address,
         donor_phone=donor.phone,
         donor_email=donor.email,
         donor_anaf_gdpr="1" if donor.anaf_gdpr else "0",
@@ -170,21 +144,23 @@ def build_donor_raw(
     nrCrt.append(new_xml_element("nV", str(index + 1)))
     element.append(nrCrt)
 
-    contributor_identity = Element("idCnt")
-    contributor_identity.append(
-        new_xml_element(tag="nume", text=donor_last_name.upper() if donor_last_name else "", clean="alphabets")
-    )
-    contributor_identity.append(
-        new_xml_element(tag="init", text=donor_initial.upper() if donor_initial else "", clean="alphabet")
+    # the fields are already clean, so the elements only need the text
+    identity_fields: dict[str, str] = clean_record(
+        {
+            "nume": (donor_last_name.upper() if donor_last_name else "", "alphabets"),
+            "init": (donor_initial.upper() if donor_initial else "", "alphabet"),
+            "pren": (donor_first_name.upper() if donor_first_name else "", "alphabets"),
+            "cif_c": (donor_cnp, "numbers"),
+            "adresa": (donor_address, "custom"),
+            "telefon": (clean_phone_number(donor_phone), "numbers"),
+            "fax": (None, ""),
+            "email": (donor_email, "email"),
+        }
     )
-    contributor_identity.append(
-        new_xml_element(tag="pren", text=donor_first_name.upper() if donor_first_name else "", clean="alphabets")
-    )
-    contributor_identity.append(new_xml_element(tag="cif_c", text=donor_cnp, clean="numbers"))
-    contributor_identity.append(new_xml_element(tag="adresa", text=donor_address, clean="custom"))
-    contributor_identity.append(new_xml_element(tag="telefon", text=clean_phone_number(donor_phone), clean="numbers"))
-    contributor_identity.append(new_xml_element(tag="fax"))
-    contributor_identity.append(new_xml_element(tag="email", text=donor_email, clean="email"))
+
+    contributor_identity = Element("idCnt")
+    for tag, text in identity_fields.items():
+        contributor_identity.append(new_xml_element(tag=tag, text=text))
     element.append(contributor_identity)
 
     s15 = Element("s15")
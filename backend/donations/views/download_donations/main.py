@@ -1,32 +1,39 @@
 import codecs
 import csv
 import io
+import itertools
 import logging
 import math
 import os
 import tempfile
+from collections import deque
+from collections.abc import Iterator
 from datetime import datetime
 from typing import Any
-from zipfile import ZIP_DEFLATED, ZipFile
 
-import requests
 from django.conf import settings
 from django.core.files import File
-from django.db.models import Count, QuerySet
+from django.db.models import QuerySet
 from django.template.loader import render_to_string
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from requests.exceptions import Timeout
 
 import redirectioneaza.settings.locations
-from donations.models.common import JobDownloadError, JobStatusChoices
+from donations.models.common import JobStatusChoices
 from donations.models.donors import Donor
 from donations.models.jobs import Job
 from donations.models.ngos import Cause
 from donations.views.download_donations.build_xml import add_xml_to_zip
+from donations.views.download_donations.checkpoints import ArchiveCheckpoint
+from donations.views.download_donations.members_cache import PdfMember, fetch_pdf_members, write_pdf_member
+from donations.views.download_donations.partitions import zip_pdfs_in_processes
+from donations.views.download_donations.pdf_fetch import copy_file_to_zip
+from donations.views.download_donations.records import CountyPartitioner, DonationRecord, iter_donation_records
+from donations.views.download_donations.zip_members import CompressedMember, ZipArchiveWriter, write_compressed_member
 from redirectioneaza.common.app_url import build_uri
 from redirectioneaza.common.messaging import extend_email_context, send_email
+from redirectioneaza.common.processes import can_use_processes
 from utils.text.cleanup import anaf_gdpr_flag_to_int, duration_flag_to_int, normalize_text_alnum
 from utils.text.phone_number import clean_phone_number
 
@@ -47,7 +54,7 @@ def download_donations_job(job_id: int = 0):
         return
 
     timestamp: datetime = timezone.now()
-    donations: QuerySet[Donor] = Donor.current_year_signed.filter(cause=cause).order_by("-date_created").all()
+    donations: QuerySet[Donor] = Donor.current_year_signed.filter(cause=cause).order_by("-date_created")
 
     number_of_donations = donations.count()
     job.number_of_donations = number_of_donations
@@ -60,18 +67,32 @@ def download_donations_job(job_id: int = 0):
 
     file_name = f"n{cause.pk:06d}__{datetime.strftime(timestamp, '%Y%m%d_%H%M')}.zip"
 
-    with tempfile.TemporaryDirectory(prefix=f"rdr_zip_{job_id:06d}_") as tmp_dir_name:
+    # Show the size of the job while it is running
+    job.save(update_fields=["number_of_donations"])
+
+    with (
+        tempfile.TemporaryDirectory(prefix=f"rdr_zip_{job_id:06d}_") as tmp_dir_name,
+        ArchiveCheckpoint(job, tmp_dir_name) as checkpoint,
+    ):
         logger.info("Created temporary directory '%s'", tmp_dir_name)
         try:
-            zip_path = _package_donations(tmp_dir_name, donations, cause, file_name)
+            # A job retried after a crash continues from the PDF files saved by the previous run
+            checkpoint.restore()
+
+            zip_path = _package_donations(tmp_dir_name, donations, number_of_donations, cause, file_name, checkpoint)
             with open(zip_path, "rb") as f:
                 job.zip.save(file_name, File(f), save=False)
+            job.processed_donations = number_of_donations
             job.status = JobStatusChoices.DONE
-            job.save()
         except Exception as e:
             logger.error("Error processing job %d: %s", job_id, e)
             job.status = JobStatusChoices.ERROR
-            job.save()
+
+        # A finished job, or one which failed without crashing, is not retried
+        checkpoint.clear()
+        job.save()
+
+        if job.status == JobStatusChoices.ERROR:
             return
 
     mail_context = {
@@ -89,228 +110,211 @@ def download_donations_job(job_id: int = 0):
     )
 
 
-def _package_donations(tmp_dir_name: str, donations: QuerySet[Donor], cause: Cause, zip_name: str) -> str:
-    logger.info("Processing %d donations for '%s'", len(donations), cause.name)
+def _package_donations(
+    tmp_dir_name: str,
+    donations: QuerySet[Donor],
+    number_of_donations: int,
+    cause: Cause,
+    zip_name: str,
+    checkpoint: ArchiveCheckpoint | None = None,
+) -> str:
+    logger.info("Processing %d donations for '%s'", number_of_donations, cause.name)
 
     zip_timestamp: datetime = timezone.now()
     zip_path: str = os.path.join(tmp_dir_name, zip_name)
 
-    zip_64_flag: bool = len(donations) > 4000
+    zip_64_flag: bool = number_of_donations > 4000
 
     zipped_files: int = 0
 
+    # record a CNP first appearance 1-based-index in the data list of donations
     cnp_idx: dict[str, dict[str, Any]] = {}
-    with ZipFile(zip_path, mode="w", compression=ZIP_DEFLATED, compresslevel=1) as zip_archive:
+    with (
+        ZipArchiveWriter(zip_path) as zip_archive,
+        CountyPartitioner(2 * settings.DONATIONS_XML_LIMIT_PER_FILE, tmp_dir_name) as xml_partitioner,
+        tempfile.TemporaryFile(dir=tmp_dir_name) as csv_file,
+    ):
         # Attach a TXT help file
         logger.info("Attaching the TXT help file to the ZIP")
         with zip_archive.open("DESCRIERE.html", mode="w", force_zip64=zip_64_flag) as handler:
             help_text = render_to_string("DESCRIERE.html", context={})
             handler.write(help_text.encode())
 
-        # record a CNP first appearance 1-based-index in the data list of donations
-        donations_data: list[dict] = []
-
-        donation_object: Donor
-        for donation_object in donations:
-            source_url = _get_pdf_url(donation_object)
-
-            if not source_url:
-                continue
-
-            donation_timestamp: datetime = donation_object.date_created
-            filename = f"{datetime.strftime(donation_timestamp, '%Y%m%d_%H%M')}__d{donation_object.pk:06d}.pdf"
-
-            retries_left = 2
-            while retries_left > 0:
-                try:
-                    file_data = _download_file(source_url)
-                except JobDownloadError:
-                    retries_left -= 1
-                    logger.error(
-                        "Could not download '%s'. Retries left %d.",
-                        source_url,
-                        retries_left,
-                    )
-                except Exception as e:
-                    retries_left = 0
-                    logger.error("Could not download '%s'. Exception %s", source_url, e)
-                else:
-                    with zip_archive.open(os.path.join("pdf", filename), mode="w", force_zip64=zip_64_flag) as handler:
-                        handler.write(file_data)
-
-                    zipped_files += 1
-                    retries_left = 0
-
-                    phone = clean_phone_number(donation_object.phone)
-
-                    donation_cnp: str = donation_object.get_cnp()
-                    duplicate_cnp_idx: int = cnp_idx.get(donation_cnp, {}).get("index", 0)
-                    if duplicate_cnp_idx == 0:
-                        cnp_idx[donation_cnp] = {
-                            "index": len(donations_data) + 1,
-                            "has_duplicate": False,
-                        }
-                    else:
-                        cnp_idx[donation_cnp]["has_duplicate"] = True
-
-                    detailed_address: dict = donation_object.get_address(include_full=True)
-                    county = (
-                        donation_object.county
-                        if len(str(donation_object.county)) > 1
-                        else f"Sector {donation_object.county}"
-                    )
-                    donations_data.append(
-                        {
-                            "last_name": donation_object.l_name,
-                            "first_name": donation_object.f_name,
-                            "initial": donation_object.initial,
-                            "phone": phone,
-                            "email": donation_object.email,
-                            "cnp": donation_cnp,
-                            "duplicate": duplicate_cnp_idx,
-                            "county": county,
-                            "city": donation_object.city,
-                            "full_address": detailed_address.get("full_address", ""),
-                            "str": detailed_address.get("str", ""),
-                            "nr": detailed_address.get("nr", ""),
-                            "bl": detailed_address.get("bl", ""),
-                            "sc": detailed_address.get("sc", ""),
-                            "et": detailed_address.get("et", ""),
-                            "ap": detailed_address.get("ap", ""),
-                            "filename": filename,
-                            "date": donation_object.date_created,
-                            "duration": duration_flag_to_int(donation_object.two_years),
-                            "anaf_gdpr": anaf_gdpr_flag_to_int(donation_object.anaf_gdpr),
-                        }
-                    )
-
-        csv_output = io.StringIO()
-        csv_writer = csv.writer(csv_output, dialect=csv.excel)
-        csv_writer.writerow(
-            [
-                _("no."),
-                _("last name"),
-                _("first name"),
-                _("initial"),
-                _("CNP"),
-                _("duplicate"),
-                _("phone"),
-                _("email"),
-                _("county"),
-                _("city"),
-                _("full address"),
-                _("street name"),
-                _("street number"),
-                _("building"),
-                _("entrance"),
-                _("floor"),
-                _("apartment"),
-                _("filename"),
-                _("date"),
-                _("duration"),
-                _("anaf gdpr"),
-            ]
-        )
-        for index, donation_csv in enumerate(donations_data):
-            csv_writer.writerow(
-                [
-                    index + 1,
-                    donation_csv["last_name"],
-                    donation_csv["first_name"],
-                    donation_csv["initial"],
-                    donation_csv["cnp"],
-                    donation_csv["duplicate"],
-                    donation_csv["phone"],
-                    donation_csv["email"],
-                    donation_csv["county"],
-                    donation_csv["city"],
-                    donation_csv["full_address"],
-                    donation_csv["str"],
-                    donation_csv["nr"],
-                    donation_csv["bl"],
-                    donation_csv["sc"],
-                    donation_csv["et"],
-                    donation_csv["ap"],
-                    donation_csv["filename"],
-                    donation_csv["date"],
-                    donation_csv["duration"],
-                    donation_csv["anaf_gdpr"],
-                ]
+        # The CSV index is written to a temporary file while the PDFs are added to the ZIP
+        csv_file.write(codecs.BOM_UTF8)
+        csv_stream = io.TextIOWrapper(csv_file, encoding="utf-8", newline="")
+        csv_writer = csv.writer(csv_stream, dialect=csv.excel)
+        csv_writer.writerow(CSV_INDEX_HEADER)
+
+        zipped_records: Iterator[tuple[DonationRecord, str]]
+        processes_count: int = settings.FORMS_DOWNLOAD_PROCESSES_COUNT
+        if xml_partitioner.single_file_limit <= number_of_donations and can_use_processes(processes_count):
+            zipped_records = zip_pdfs_in_processes(
+                donations,
+                zip_archive,
+                tmp_dir_name,
+                xml_partitioner,
+                processes_count=processes_count,
+                partition_size=settings.DONATIONS_XML_LIMIT_PER_FILE,
+                checkpoint=checkpoint,
             )
+        else:
+            zipped_records = _zip_pdfs(donations, zip_archive, xml_partitioner, checkpoint)
 
-        # Create the CSV file as a temporary file
-        with tempfile.TemporaryFile() as fp:
-            fp.write(codecs.BOM_UTF8)
-            fp.write(csv_output.getvalue().encode())
-
-            # Attach a CSV file with all donor data
-            logger.info("Attaching the CSV to the ZIP")
-            with zip_archive.open("index.csv", mode="w", force_zip64=zip_64_flag) as handler:
-                fp.seek(0)
-                handler.write(fp.read())
-
-        _generate_xml_files(cause, zip_archive, zip_64_flag, zip_timestamp, cnp_idx)
-
-    logger.info("Creating ZIP file for %d donations", zipped_files)
-
-    return zip_path
-
+        record: DonationRecord
+        filename: str
+        for record, filename in zipped_records:
+            zipped_files += 1
 
-def _get_pdf_url(donation: Donor) -> str:
-    if donation.pdf_file:
-        source_url = donation.pdf_file.url
-    else:
-        source_url = ""
+            duplicate_cnp_idx: int = cnp_idx.get(record.cnp, {}).get("index", 0)
+            if duplicate_cnp_idx == 0:
+                cnp_idx[record.cnp] = {
+                    "index": zipped_files,
+                    "has_duplicate": False,
+                }
+            else:
+                cnp_idx[record.cnp]["has_duplicate"] = True
 
-    if not source_url:
-        logger.info("Donation #%d has no PDF URL", donation.pk)
-    else:
-        logger.debug("Donation #%d PDF URL: '%s'", donation.pk, source_url)
+            csv_writer.writerow(_build_csv_index_row(zipped_files, record, duplicate_cnp_idx, filename))
 
-    return source_url
+        # Attach a CSV file with all donor data
+        logger.info("Attaching the CSV to the ZIP")
+        csv_stream.flush()
+        csv_stream.detach()
 
+        csv_file.seek(0)
+        copy_file_to_zip(csv_file, zip_archive, "index.csv", force_zip64=zip_64_flag)
 
-def _download_file(source_url: str) -> bytes:
-    if not source_url.startswith("https://"):
-        media_root = "/".join(settings.MEDIA_ROOT.split("/")[:-1])
-        with open(media_root + source_url, "rb") as f:
-            return f.read()
+        _generate_xml_files(cause, zip_archive, zip_64_flag, zip_timestamp, cnp_idx, xml_partitioner)
 
-    if not source_url:
-        raise ValueError("source_url is empty")
+    logger.info("Creating ZIP file for %d donations", zipped_files)
 
-    try:
-        response = requests.get(source_url, timeout=20)
-    except Timeout:
-        logger.warning("Timed out while downloading redirection form file")
-        raise JobDownloadError
+    return zip_path
 
-    if response.status_code != 200:
-        logger.warning("Status code %d while downloading redirection form file", response.status_code)
-        raise JobDownloadError
 
-    return response.content
+def _zip_pdfs(
+    donations: QuerySet[Donor],
+    zip_archive: ZipArchiveWriter,
+    xml_partitioner: CountyPartitioner,
+    checkpoint: ArchiveCheckpoint | None = None,
+) -> Iterator[tuple[DonationRecord, str]]:
+    saved_members: dict[str, str] = checkpoint.saved_members if checkpoint else {}
+
+    # The donations read from the database and not yielded yet, in order
+    pending: deque[DonationRecord] = deque()
+
+    def _records_to_fetch() -> Iterator[DonationRecord]:
+        # Every donation goes to the XML files, even if its PDF is missing
+        for donation_record in iter_donation_records(donations):
+            xml_partitioner.add(donation_record)
+            pending.append(donation_record)
+
+            if donation_record.archive_member_name not in saved_members:
+                yield donation_record
+
+    def _copy_saved_members_until(fetched_record: DonationRecord | None) -> Iterator[tuple[DonationRecord, str]]:
+        # The PDF files saved by a previous run are copied as they are, in the order of the donations
+        while pending:
+            pending_record = pending.popleft()
+            if pending_record is fetched_record:
+                return
+
+            if pending_record.archive_member_name in saved_members:
+                write_compressed_member(zip_archive, checkpoint.read_saved_member(pending_record.archive_member_name))
+
+                yield pending_record, pending_record.archive_file_name
+
+    record: DonationRecord
+    pdf_member: PdfMember
+    for record, pdf_member in fetch_pdf_members(_records_to_fetch()):
+        yield from _copy_saved_members_until(record)
+
+        write_pdf_member(zip_archive, pdf_member, record.archive_member_name)
+
+        if checkpoint:
+            if checkpoint.is_enabled and not isinstance(pdf_member, CompressedMember):
+                # the file was compressed while it was copied, so its compressed data is read back from the archive
+                pdf_member = zip_archive.read_compressed_member(record.archive_member_name)
+
+            checkpoint.add_member(pdf_member)
+            checkpoint.report_progress(xml_partitioner.count - len(pending))
+
+        yield record, record.archive_file_name
+
+    yield from _copy_saved_members_until(None)
+
+
+CSV_INDEX_HEADER = [
+    _("no."),
+    _("last name"),
+    _("first name"),
+    _("initial"),
+    _("CNP"),
+    _("duplicate"),
+    _("phone"),
+    _("email"),
+    _("county"),
+    _("city"),
+    _("full address"),
+    _("street name"),
+    _("street number"),
+    _("building"),
+    _("entrance"),
+    _("floor"),
+    _("apartment"),
+    _("filename"),
+    _("date"),
+    _("duration"),
+    _("anaf gdpr"),
+]
+
+
+def _build_csv_index_row(index: int, record: DonationRecord, duplicate_cnp_idx: int, filename: str) -> list[Any]:
+    county = record.county if len(str(record.county)) > 1 else f"Sector {record.county}"
+
+    return [
+        index,
+        record.last_name,
+        record.first_name,
+        record.initial,
+        record.cnp,
+        duplicate_cnp_idx,
+        clean_phone_number(record.phone),
+        record.email,
+        county,
+        record.city,
+        record.full_address,
+        record.address.get("str", ""),
+        record.address.get("nr", ""),
+        record.address.get("bl", ""),
+        record.address.get("sc", ""),
+        record.address.get("et", ""),
+        record.address.get("ap", ""),
+        filename,
+        record.date_created,
+        duration_flag_to_int(record.two_years),
+        anaf_gdpr_flag_to_int(record.anaf_gdpr),
+    ]
 
 
 def _generate_xml_files(
     cause: Cause,
-    zip_archive: ZipFile,
+    zip_archive: ZipArchiveWriter,
     zip_64_flag: bool,
     zip_timestamp: datetime,
     cnp_idx: dict[str, dict[str, Any]],
+    xml_partitioner: CountyPartitioner,
 ):
     if not cnp_idx or not cause or not zip_archive:
         return
 
-    ngo_donations: QuerySet[Donor] = Donor.current_year_signed.filter(cause=cause).order_by("-date_created")
-
     # if there are less than 2 * settings.DONATIONS_XML_LIMIT_PER_FILE donations
     # create a single XML file
-    if ngo_donations.count() < 2 * settings.DONATIONS_XML_LIMIT_PER_FILE:
+    if not xml_partitioner.is_partitioned:
         xml_name: str = "d230.xml"
         add_xml_to_zip(
             cause,
-            ngo_donations,
+            xml_partitioner.records,
             1,
             xml_name,
             cnp_idx,
@@ -321,18 +325,23 @@ def _generate_xml_files(
 
         return
 
-    _generate_donations_by_county(cnp_idx, cause, ngo_donations, zip_64_flag, zip_archive, zip_timestamp)
+    _generate_donations_by_county(cnp_idx, cause, xml_partitioner, zip_64_flag, zip_archive, zip_timestamp)
 
 
-def _generate_donations_by_county(cnp_idx, cause: Cause, ngo_donations, zip_64_flag, zip_archive, zip_timestamp):
+def _generate_donations_by_county(
+    cnp_idx: dict[str, dict[str, Any]],
+    cause: Cause,
+    xml_partitioner: CountyPartitioner,
+    zip_64_flag: bool,
+    zip_archive: ZipArchiveWriter,
+    zip_timestamp: datetime,
+):
     donations_limit: int = settings.DONATIONS_XML_LIMIT_PER_FILE
 
-    number_of_donations_by_county: QuerySet[tuple[str, int]] = (
-        ngo_donations.values("county").annotate(count=Count("county")).order_by("count").values_list("county", "count")
-    )
-
     xml_count: int = 1
-    for current_county, current_county_count in number_of_donations_by_county:
+    for current_county, county_donations in xml_partitioner.counties():
+        current_county_count: int = len(county_donations)
+
         # if there are more than donations_limit donations for a county, split them into multiple files
         clean_county_name = normalize_text_alnum(current_county)
         county_code = redirectioneaza.settings.locations.COUNTIES_CHOICES_WITH_SECTORS_REVERSED_CLEAN.get(
@@ -343,7 +352,6 @@ def _generate_donations_by_county(cnp_idx, cause: Cause, ngo_donations, zip_64_f
         if current_county_count <= donations_limit:
             xml_name: str = f"d230_{county_code}.xml"
 
-            county_donations: QuerySet[Donor] = ngo_donations.filter(county=current_county)
             add_xml_to_zip(
                 cause,
                 county_donations,
@@ -356,15 +364,13 @@ def _generate_donations_by_county(cnp_idx, cause: Cause, ngo_donations, zip_64_f
             )
             xml_count += 1
         else:
-            for i in range(math.ceil(current_county_count / donations_limit)):
+            county_records: Iterator[DonationRecord] = iter(county_donations)
+            for _i in range(math.ceil(current_county_count / donations_limit)):
                 xml_name: str = f"d230_{county_code}_{xml_count:04}.xml"
 
-                county_donations: QuerySet[Donor] = ngo_donations.filter(county=current_county)[
-                    i * donations_limit : (i + 1) * donations_limit
-                ]
                 add_xml_to_zip(
                     cause,
-                    county_donations,
+                    itertools.islice(county_records, donations_limit),
                     xml_count,
                     xml_name,
                     cnp_idx,
@@ -0,0 +1,232 @@
+import logging
+import shutil
+import tempfile
+import time
+import zlib
+from collections.abc import Iterable, Iterator
+from datetime import timedelta
+from typing import IO
+from zipfile import ZIP_DEFLATED, ZipFile
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import Storage
+from django.utils import timezone
+
+from donations.models.donors import ARCHIVE_MEMBERS_CACHE_DIR, Donor, archive_member_cache_path
+from donations.views.download_donations.pdf_fetch import (
+    COPY_CHUNK_SIZE,
+    copy_file_to_zip,
+    load_in_order,
+    open_file_with_retries,
+)
+from donations.views.download_donations.records import DonationRecord
+from donations.views.download_donations.zip_members import (
+    ARCHIVE_COMPRESSLEVEL,
+    CompressedMember,
+    ZipArchiveWriter,
+    read_compressed_member,
+    write_compressed_member,
+)
+from utils.constants.memory import KIBIBYTE
+
+logger = logging.getLogger(__name__)
+
+# The name of the single member of every cached file
+CACHED_MEMBER_NAME = "form.pdf"
+
+# The size up to which a compressed PDF file is kept in memory, instead of a temporary file
+MEMBER_SPOOL_MAX_SIZE = 256 * KIBIBYTE
+
+# How long a cached member is kept, since it is a copy of the personal data in the PDF file
+CACHED_MEMBER_MAX_AGE = timedelta(days=60)
+
+# A PDF file loaded for an archive: either already compressed, or opened from the storage
+PdfMember = CompressedMember | File
+
+
+def fetch_pdf_members(
+    donations: Iterable[DonationRecord],
+    *,
+    workers_count: int | None = None,
+) -> Iterator[tuple[DonationRecord, PdfMember]]:
+    """
+    Load the PDF files of the donations using a bounded pool of threads, in the order of the donations.
+
+    When the members cache is enabled, the files are taken from the cache when possible, and the other ones are
+    compressed in the worker threads and added to the cache. Otherwise, the opened files are yielded as they are,
+    to be compressed while they are copied into the archive by `write_pdf_member`.
+    Donations without a PDF file and files which could not be read are skipped.
+    Each file is closed once the caller asks for the next one.
+    """
+
+    pdf_member: PdfMember
+    for donation, pdf_member in load_in_order(
+        donations, load_pdf_member, workers_count=workers_count, release=close_pdf_member
+    ):
+        try:
+            yield donation, pdf_member
+        finally:
+            close_pdf_member(pdf_member)
+
+
+def load_pdf_member(donation: DonationRecord) -> PdfMember | None:
+    if settings.ENABLE_FORMS_DOWNLOAD_MEMBERS_CACHE:
+        cached_member: CompressedMember | None = load_cached_member(donation)
+        if cached_member is not None:
+            return cached_member
+
+    pdf_file: File | None = open_file_with_retries(donation)
+    if pdf_file is None or not settings.ENABLE_FORMS_DOWNLOAD_MEMBERS_CACHE:
+        return pdf_file
+
+    with pdf_file:
+        member: CompressedMember = compress_file(pdf_file, donation.archive_member_name)
+
+    save_cached_member(donation, member)
+
+    return member
+
+
+def write_pdf_member(zip_archive: ZipArchiveWriter, pdf_member: PdfMember, name: str) -> None:
+    if isinstance(pdf_member, CompressedMember):
+        write_compressed_member(zip_archive, pdf_member, name)
+    else:
+        copy_file_to_zip(pdf_member, zip_archive, name)
+
+
+def close_pdf_member(pdf_member: PdfMember) -> None:
+    pdf_member.close()
+
+
+def compress_file(source: IO[bytes], name: str) -> CompressedMember:
+    """
+    Deflate a file the same way ZipFile does it, without writing it to an archive.
+
+    The compressed data is kept in a temporary file, which stays in memory only while it is small.
+    """
+
+    compressor = zlib.compressobj(ARCHIVE_COMPRESSLEVEL, zlib.DEFLATED, -15)
+    compressed_file = tempfile.SpooledTemporaryFile(max_size=MEMBER_SPOOL_MAX_SIZE)
+
+    crc: int = 0
+    file_size: int = 0
+    while chunk := source.read(COPY_CHUNK_SIZE):
+        crc = zlib.crc32(chunk, crc)
+        file_size += len(chunk)
+        compressed_file.write(compressor.compress(chunk))
+    compressed_file.write(compressor.flush())
+
+    return CompressedMember(
+        name=name,
+        date_time=time.localtime(time.time())[:6],
+        compress_type=ZIP_DEFLATED,
+        crc=crc,
+        file_size=file_size,
+        compress_size=compressed_file.tell(),
+        data=compressed_file,
+    )
+
+
+def load_cached_member(donation: DonationRecord) -> CompressedMember | None:
+    cache_path: str = archive_member_cache_path(donation.pk, donation.pdf_file_name)
+
+    with tempfile.SpooledTemporaryFile(max_size=MEMBER_SPOOL_MAX_SIZE) as cached_content:
+        try:
+            with _cache_storage().open(cache_path, "rb") as cached_file:
+                shutil.copyfileobj(cached_file, cached_content, COPY_CHUNK_SIZE)
+        except Exception:
+            # Most of the time, the file was not cached yet
+            return None
+
+        member_data = tempfile.SpooledTemporaryFile(max_size=MEMBER_SPOOL_MAX_SIZE)
+        try:
+            cached_content.seek(0)
+            with ZipFile(cached_content) as cached_archive:
+                member: CompressedMember = read_compressed_member(cached_archive, CACHED_MEMBER_NAME, member_data)
+        except Exception as e:
+            member_data.close()
+            logger.warning("Ignoring the invalid cached PDF file of donation #%d: %s", donation.pk, e)
+            return None
+
+    member.name = donation.archive_member_name
+
+    return member
+
+
+def save_cached_member(donation: DonationRecord, member: CompressedMember) -> None:
+    cache_path: str = archive_member_cache_path(donation.pk, donation.pdf_file_name)
+    storage: Storage = _cache_storage()
+
+    with tempfile.TemporaryFile() as cached_content:
+        with ZipArchiveWriter(cached_content) as cached_archive:
+            write_compressed_member(cached_archive, member, CACHED_MEMBER_NAME)
+        cached_content.seek(0)
+
+        try:
+            # The storage never overwrites a file, so an invalid cached file is removed first
+            storage.delete(cache_path)
+            saved_path: str = storage.save(cache_path, File(cached_content))
+        except Exception as e:
+            logger.warning("Could not cache the PDF file of donation #%d: %s", donation.pk, e)
+            return
+
+    if saved_path != cache_path:
+        # Another job cached the same file in the meantime, so this copy got a generated name nothing refers to
+        logger.info("The PDF file of donation #%d was already cached", donation.pk)
+        storage.delete(saved_path)
+
+
+def remove_stale_cached_members() -> dict[str, int]:
+    """
+    Delete the cached members which are expired, or which no longer belong to the current PDF file of a donor,
+    e.g. because the donor was deleted or its file was replaced.
+    """
+    storage: Storage = _cache_storage()
+    expiry_time = timezone.now() - CACHED_MEMBER_MAX_AGE
+
+    try:
+        cache_dirs: list[str] = storage.listdir(ARCHIVE_MEMBERS_CACHE_DIR)[0]
+    except FileNotFoundError:
+        # nothing was cached yet
+        cache_dirs = []
+
+    checked_count: int = 0
+    deleted_count: int = 0
+    for cache_dir in cache_dirs:
+        cache_paths: dict[str, int | None] = {}
+        for cache_name in storage.listdir(f"{ARCHIVE_MEMBERS_CACHE_DIR}/{cache_dir}")[1]:
+            donor_pk: str = cache_name.split("_", 1)[0]
+            cache_paths[f"{ARCHIVE_MEMBERS_CACHE_DIR}/{cache_dir}/{cache_name}"] = (
+                int(donor_pk) if donor_pk.isdigit() else None
+            )
+
+        current_paths: set[str] = {
+            archive_member_cache_path(donor_pk, pdf_file_name)
+            for donor_pk, pdf_file_name in Donor.objects.filter(
+                pk__in={donor_pk for donor_pk in cache_paths.values() if donor_pk is not None},
+                personal_data_removed_at__isnull=True,
+            )
+            .exclude(pdf_file="")
+            .values_list("pk", "pdf_file")
+        }
+
+        for cache_path in cache_paths:
+            checked_count += 1
+            try:
+                if cache_path in current_paths and storage.get_modified_time(cache_path) >= expiry_time:
+                    continue
+
+                storage.delete(cache_path)
+            except Exception as e:
+                logger.warning("Could not remove the stale cached file %s: %s", cache_path, e)
+                continue
+
+            deleted_count += 1
+
+    return {"checked": checked_count, "deleted": deleted_count}
+
+
+def _cache_storage() -> Storage:
+    # The cached files hold personal data, so they are kept next to the original ones
+    return Donor._meta.get_field("pdf_file").storage
@@ -0,0 +1,256 @@
+import logging
+import multiprocessing
+import os
+import pickle
+from array import array
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import IO
+from zipfile import ZipFile
+
+import django
+from django.db.models import QuerySet
+
+from donations.models.donors import Donor
+from donations.views.download_donations.checkpoints import ArchiveCheckpoint
+from donations.views.download_donations.members_cache import fetch_pdf_members, write_pdf_member
+from donations.views.download_donations.records import (
+    DONATIONS_QUERY_CHUNK_SIZE,
+    CountyPartitioner,
+    DonationRecord,
+    iter_donation_records,
+)
+from donations.views.download_donations.zip_members import (
+    ZipArchiveWriter,
+    read_compressed_member,
+    write_compressed_member,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class ArchivePartition:
+    """
+    The donations of a county, or a part of them, which are processed in a separate process.
+    """
+
+    index: int
+    county: str
+    tmp_dir_name: str
+    pks: list[int] = field(default_factory=list)
+
+    # The PDF files of the partition saved by a previous run of the job, and the local paths of their segments
+    saved_members: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def zip_path(self) -> str:
+        return os.path.join(self.tmp_dir_name, f"partition_{self.index:05d}.zip")
+
+    @property
+    def records_path(self) -> str:
+        return os.path.join(self.tmp_dir_name, f"partition_{self.index:05d}.records")
+
+
+def plan_partitions(
+    donations: QuerySet[Donor],
+    tmp_dir_name: str,
+    partition_size: int,
+    saved_members: dict[str, str] | None = None,
+) -> tuple[list[ArchivePartition], array]:
+    """
+    Split the donations by county, in partitions of at most `partition_size` donations.
+
+    Returns the partitions, in the order of their first donation, and the partition of every donation,
+    in the order of the donations.
+    """
+
+    partitions: list[ArchivePartition] = []
+    open_partitions: dict[str, ArchivePartition] = {}
+    donations_partitions = array("I")
+
+    donations_values = donations.values_list("pk", "county", "date_created")
+    for pk, county, date_created in donations_values.iterator(chunk_size=DONATIONS_QUERY_CHUNK_SIZE):
+        partition: ArchivePartition | None = open_partitions.get(county)
+
+        if partition is None or len(partition.pks) >= partition_size:
+            partition = ArchivePartition(index=len(partitions), county=county, tmp_dir_name=tmp_dir_name)
+
+            partitions.append(partition)
+            open_partitions[county] = partition
+
+        partition.pks.append(pk)
+        donations_partitions.append(partition.index)
+
+        if saved_members:
+            member_name: str = DonationRecord(pk=pk, date_created=date_created).archive_member_name
+            if member_name in saved_members:
+                partition.saved_members[member_name] = saved_members[member_name]
+
+    return partitions, donations_partitions
+
+
+def zip_partition(partition: ArchivePartition) -> int:
+    """
+    Decrypt the donations of a partition and compress their PDF files into a separate archive.
+    The records are saved next to the archive, each one with a flag telling if its PDF file was zipped.
+
+    Returns the number of saved records.
+    """
+
+    records_by_pk: dict[int, DonationRecord] = {
+        record.pk: record for record in iter_donation_records(Donor.objects.filter(pk__in=partition.pks))
+    }
+    # keep the order of the donations, skipping the ones removed in the meantime
+    records: list[DonationRecord] = [records_by_pk[pk] for pk in partition.pks if pk in records_by_pk]
+
+    zipped_pks: set[int] = set()
+    with ZipArchiveWriter(partition.zip_path) as archive:
+        records_to_fetch: list[DonationRecord] = _copy_saved_members(partition, records, archive, zipped_pks)
+
+        for record, pdf_member in fetch_pdf_members(records_to_fetch):
+            write_pdf_member(archive, pdf_member, record.archive_file_name)
+            zipped_pks.add(record.pk)
+
+    with open(partition.records_path, "wb") as records_file:
+        for record in records:
+            pickle.dump((record, record.pk in zipped_pks), records_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    return len(records)
+
+
+def _copy_saved_members(
+    partition: ArchivePartition,
+    records: list[DonationRecord],
+    archive: ZipArchiveWriter,
+    zipped_pks: set[int],
+) -> list[DonationRecord]:
+    """
+    Copy the PDF files saved by a previous run of the job into the partition archive.
+
+    Returns the records whose PDF files still have to be fetched.
+    """
+
+    if not partition.saved_members:
+        return records
+
+    records_to_fetch: list[DonationRecord] = []
+    saved_archives: dict[str, ZipFile] = {}
+    try:
+        for record in records:
+            saved_path: str | None = partition.saved_members.get(record.archive_member_name)
+            if saved_path is None:
+                records_to_fetch.append(record)
+                continue
+
+            if saved_path not in saved_archives:
+                saved_archives[saved_path] = ZipFile(saved_path)
+
+            compressed_member = read_compressed_member(saved_archives[saved_path], record.archive_member_name)
+            write_compressed_member(archive, compressed_member, record.archive_file_name)
+            zipped_pks.add(record.pk)
+    finally:
+        for saved_archive in saved_archives.values():
+            saved_archive.close()
+
+    return records_to_fetch
+
+
+class _PartitionReader:
+    """
+    Read the records of a zipped partition, in order, and remove its files once all of them were read.
+    """
+
+    def __init__(self, partition: ArchivePartition, records_count: int):
+        self.partition: ArchivePartition = partition
+        self.remaining: int = records_count
+
+        self.zip_archive: ZipFile = ZipFile(partition.zip_path)
+        self._records_file: IO[bytes] = open(partition.records_path, "rb")
+
+    def next_record(self) -> tuple[DonationRecord, bool] | None:
+        if self.remaining <= 0:
+            return None
+
+        self.remaining -= 1
+
+        return pickle.load(self._records_file)
+
+    def close(self) -> None:
+        self.zip_archive.close()
+        self._records_file.close()
+
+        for path in (self.partition.zip_path, self.partition.records_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def zip_pdfs_in_processes(
+    donations: QuerySet[Donor],
+    zip_archive: ZipArchiveWriter,
+    tmp_dir_name: str,
+    xml_partitioner: CountyPartitioner,
+    *,
+    processes_count: int,
+    partition_size: int,
+    checkpoint: ArchiveCheckpoint | None = None,
+) -> Iterator[tuple[DonationRecord, str]]:
+    """
+    Build the county partitions of an archive in a pool of processes and merge them into the archive.
+
+    The PDF files are copied into the archive already compressed, in the order of the donations,
+    so the result is the same as when the archive is built in a single process.
+    Every record is added to the XML partitioner, and the records with a zipped PDF file are yielded
+    together with the name of the file.
+    The merged PDF files are added to the checkpoint, if there is one.
+    """
+
+    partitions, donations_partitions = plan_partitions(
+        donations, tmp_dir_name, partition_size, checkpoint.saved_members if checkpoint else None
+    )
+    logger.info("Building %d partitions in %d processes", len(partitions), processes_count)
+
+    readers: dict[int, _PartitionReader | None] = {}
+    with ProcessPoolExecutor(
+        max_workers=processes_count,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=django.setup,
+    ) as executor:
+        futures: list[Future[int]] = [executor.submit(zip_partition, partition) for partition in partitions]
+
+        try:
+            for partition_index in donations_partitions:
+                if partition_index not in readers:
+                    readers[partition_index] = _PartitionReader(
+                        partitions[partition_index], futures[partition_index].result()
+                    )
+
+                reader: _PartitionReader | None = readers[partition_index]
+                if reader is None or (item := reader.next_record()) is None:
+                    continue
+
+                record, is_zipped = item
+                xml_partitioner.add(record)
+
+                if is_zipped:
+                    compressed_member = read_compressed_member(reader.zip_archive, record.archive_file_name)
+                    compressed_member.name = record.archive_member_name
+                    write_compressed_member(zip_archive, compressed_member)
+
+                    if checkpoint:
+                        checkpoint.add_member(compressed_member)
+                        checkpoint.report_progress(xml_partitioner.count)
+
+                    yield record, record.archive_file_name
+
+                if reader.remaining <= 0:
+                    reader.close()
+                    readers[partition_index] = None
+        finally:
+            for future in futures:
+                future.cancel()
+
+            for reader in readers.values():
+                if reader is not None:
+                    reader.close()
@@ -0,0 +1,162 @@
+import logging
+import shutil
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import IO, TYPE_CHECKING, TypeVar
+
+from django.conf import settings
+from django.core.files import File
+
+from donations.models.common import JobDownloadError
+from donations.models.donors import Donor
+from donations.views.download_donations.records import DonationRecord
+from utils.constants.memory import KIBIBYTE
+
+if TYPE_CHECKING:
+    from donations.views.download_donations.zip_members import ZipArchiveWriter
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DOWNLOAD_ATTEMPTS = 2
+
+# The size of the chunks used to copy a form from the storage into the archive
+COPY_CHUNK_SIZE = 64 * KIBIBYTE
+
+# How many files may be opened ahead of the ZIP writer, for each fetch worker
+PREFETCH_FACTOR = 2
+
+
+def fetch_donation_pdfs(
+    donations: Iterable[DonationRecord],
+    *,
+    workers_count: int | None = None,
+) -> Iterator[tuple[DonationRecord, File]]:
+    """
+    Open the PDF files of the donations from the storage using a bounded pool of threads.
+
+    The files are yielded in the same order as the donations, so the caller can write them sequentially,
+    and each one is closed once the caller asks for the next one.
+    Donations without a PDF file and files which could not be read are skipped.
+    """
+
+    pdf_file: File
+    for donation, pdf_file in load_in_order(
+        donations, open_file_with_retries, workers_count=workers_count, release=File.close
+    ):
+        with pdf_file:
+            yield donation, pdf_file
+
+
+def load_in_order(
+    donations: Iterable[DonationRecord],
+    load: Callable[[DonationRecord], T | None],
+    *,
+    workers_count: int | None = None,
+    release: Callable[[T], None] | None = None,
+) -> Iterator[tuple[DonationRecord, T]]:
+    """
+    Load the PDF files of the donations using a bounded pool of threads, keeping the order of the donations.
+
+    Donations without a PDF file and files which could not be loaded are skipped.
+    If the consumer stops early, `release` is called for the files loaded ahead.
+    """
+
+    if workers_count is None:
+        workers_count = settings.FORMS_DOWNLOAD_WORKERS_COUNT
+    workers_count = max(1, workers_count)
+
+    max_pending: int = workers_count * PREFETCH_FACTOR
+    pending: deque[tuple[DonationRecord, Future[T | None]]] = deque()
+
+    with ThreadPoolExecutor(max_workers=workers_count, thread_name_prefix="rdr_pdf_fetch") as executor:
+        try:
+            for donation in donations:
+                if not donation.pdf_file_name:
+                    logger.info("Donation #%d has no PDF file", donation.pk)
+                    continue
+
+                pending.append((donation, executor.submit(load, donation)))
+
+                if len(pending) >= max_pending:
+                    yield from _pop_loaded_file(pending)
+
+            while pending:
+                yield from _pop_loaded_file(pending)
+        finally:
+            # If the consumer stops early, release the files that nobody will read
+            for _, future in pending:
+                if not future.cancel() and (loaded_file := future.result()) is not None and release is not None:
+                    release(loaded_file)
+
+
+def _pop_loaded_file(
+    pending: deque[tuple[DonationRecord, Future[T | None]]],
+) -> Iterator[tuple[DonationRecord, T]]:
+    donation, future = pending.popleft()
+
+    loaded_file = future.result()
+    if loaded_file is not None:
+        yield donation, loaded_file
+
+
+def open_file_with_retries(donation: DonationRecord) -> File | None:
+    """
+    Open the PDF file of a donation, retrying it on storage errors.
+    Returns `None` if the file could not be opened.
+    """
+
+    file_name: str = donation.pdf_file_name
+
+    retries_left = DOWNLOAD_ATTEMPTS
+    while retries_left > 0:
+        try:
+            return open_file(donation)
+        except JobDownloadError:
+            retries_left -= 1
+            logger.error(
+                "Could not read '%s'. Retries left %d.",
+                file_name,
+                retries_left,
+            )
+        except Exception as e:
+            logger.error("Could not read '%s'. Exception %s", file_name, e)
+            return None
+
+    return None
+
+
+def open_file(donation: DonationRecord) -> File:
+    """
+    Open the PDF file of a donation directly from the configured storage.
+    """
+
+    if not donation.pdf_file_name:
+        raise ValueError("The donation has no PDF file")
+
+    storage = Donor._meta.get_field("pdf_file").storage
+    try:
+        pdf_file: File = storage.open(donation.pdf_file_name, "rb")
+
+        # Remote storages fetch the content lazily, so make sure it happens in the worker thread
+        pdf_file.read(0)
+    except FileNotFoundError:
+        raise
+    except Exception as e:
+        logger.warning("Error while reading redirection form file: %s", e)
+        raise JobDownloadError
+
+    return pdf_file
+
+
+def copy_file_to_zip(
+    source: IO[bytes], zip_archive: "ZipArchiveWriter", name: str, *, force_zip64: bool = False
+) -> None:
+    """
+    Copy a file into the archive in fixed-size chunks, without loading it into memory.
+    """
+
+    with zip_archive.open(name, mode="w", force_zip64=force_zip64) as handler:
+        shutil.copyfileobj(source, handler, COPY_CHUNK_SIZE)
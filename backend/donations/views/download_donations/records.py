@@ -0,0 +1,199 @@
+import os
+import pickle
+import tempfile
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import IO
+
+from django.db.models import QuerySet
+
+from donations.models.donors import Donor
+
+# How many donors are fetched from the database at once while building an archive
+DONATIONS_QUERY_CHUNK_SIZE = 2000
+
+
+@dataclass(slots=True)
+class DonationRecord:
+    """
+    The data of a redirection needed in an archive, with the personal data decrypted only once.
+    """
+
+    pk: int
+    date_created: datetime
+    pdf_file_name: str = ""
+
+    last_name: str = ""
+    first_name: str = ""
+    initial: str = ""
+    cnp: str = ""
+    phone: str = ""
+    email: str = ""
+
+    county: str = ""
+    city: str = ""
+    address: dict[str, str] = field(default_factory=dict)
+
+    two_years: bool = False
+    anaf_gdpr: bool = False
+
+    ngo_registration_number: str = ""
+    ngo_name: str = ""
+    bank_account: str = ""
+
+    @classmethod
+    def from_donor(cls, donor: Donor) -> "DonationRecord":
+        return cls(
+            pk=donor.pk,
+            date_created=donor.date_created,
+            pdf_file_name=donor.pdf_file.name or "",
+            last_name=donor.l_name,
+            first_name=donor.f_name,
+            initial=donor.initial,
+            cnp=donor.get_cnp(),
+            phone=donor.phone,
+            email=donor.email,
+            county=donor.county,
+            city=donor.city,
+            address=donor.get_address(include_full=True),
+            two_years=donor.two_years,
+            anaf_gdpr=donor.anaf_gdpr,
+            ngo_registration_number=donor.ngo.registration_number if donor.ngo else "",
+            ngo_name=donor.ngo.name if donor.ngo else "",
+            bank_account=donor.cause.bank_account if donor.cause else "",
+        )
+
+    @property
+    def full_address(self) -> str:
+        return self.address.get("full_address", "")
+
+    @property
+    def archive_file_name(self) -> str:
+        """
+        The name of the PDF file inside the archive
+        """
+        return f"{datetime.strftime(self.date_created, '%Y%m%d_%H%M')}__d{self.pk:06d}.pdf"
+
+    @property
+    def archive_member_name(self) -> str:
+        """
+        The path of the PDF file inside the archive
+        """
+        return os.path.join("pdf", self.archive_file_name)
+
+
+def iter_donation_records(
+    donations: QuerySet[Donor],
+    *,
+    chunk_size: int = DONATIONS_QUERY_CHUNK_SIZE,
+) -> Iterator[DonationRecord]:
+    """
+    Go through the donations with a single query, keeping at most `chunk_size` donors in memory.
+    """
+
+    donors_chunk: list[Donor] = []
+    for donor in donations.select_related("ngo", "cause").iterator(chunk_size=chunk_size):
+        donors_chunk.append(donor)
+
+        if len(donors_chunk) >= chunk_size:
+            yield from _build_records(donors_chunk)
+            donors_chunk = []
+
+    yield from _build_records(donors_chunk)
+
+
+def _build_records(donors: list[Donor]) -> Iterator[DonationRecord]:
+    # the donors remember their decrypted data, so it is decrypted in a single batch
+    Donor.decrypt_many(donors)
+
+    for donor in donors:
+        yield DonationRecord.from_donor(donor)
+
+
+class DonationRecordsSpool:
+    """
+    An append-only list of donation records kept in a temporary file instead of memory.
+    """
+
+    def __init__(self, tmp_dir_name: str | None = None):
+        self._file: IO[bytes] = tempfile.TemporaryFile(dir=tmp_dir_name)
+        self.count: int = 0
+
+    def append(self, record: DonationRecord) -> None:
+        pickle.dump(record, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.count += 1
+
+    def __iter__(self) -> Iterator[DonationRecord]:
+        self._file.seek(0)
+        for _ in range(self.count):
+            yield pickle.load(self._file)
+
+        self._file.seek(0, 2)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class CountyPartitioner:
+    """
+    Split the donation records by county, as required by the ANAF XML files.
+
+    The records are kept in memory until there are enough of them to need one XML file per county,
+    after which they are spooled to one temporary file per county.
+    """
+
+    def __init__(self, single_file_limit: int, tmp_dir_name: str | None = None):
+        self.single_file_limit: int = single_file_limit
+        self.tmp_dir_name: str | None = tmp_dir_name
+
+        self.count: int = 0
+        self._records: list[DonationRecord] = []
+        self._counties: dict[str, DonationRecordsSpool] = {}
+
+    def __enter__(self) -> "CountyPartitioner":
+        return self
+
+    def __exit__(self, *args) -> None:
+        for spool in self._counties.values():
+            spool.close()
+
+    def add(self, record: DonationRecord) -> None:
+        if self.is_partitioned:
+            self.count += 1
+            self._spool(record)
+            return
+
+        self.count += 1
+        self._records.append(record)
+
+        if self.is_partitioned:
+            for buffered_record in self._records:
+                self._spool(buffered_record)
+            self._records = []
+
+    @property
+    def is_partitioned(self) -> bool:
+        return self.count >= self.single_file_limit
+
+    @property
+    def records(self) -> Iterable[DonationRecord]:
+        """
+        All the records, when there are too few of them to be partitioned
+        """
+        return self._records
+
+    def counties(self) -> list[tuple[str, DonationRecordsSpool]]:
+        """
+        The county partitions, from the smallest to the largest one
+        """
+        return sorted(self._counties.items(), key=lambda county: len(county[1]))
+
+    def _spool(self, record: DonationRecord) -> None:
+        if record.county not in self._counties:
+            self._counties[record.county] = DonationRecordsSpool(self.tmp_dir_name)
+
+        self._counties[record.county].append(record)
@@ -0,0 +1,412 @@
+import io
+import os
+import shutil
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from typing import IO
+from zipfile import ZIP_DEFLATED, BadZipFile, LargeZipFile, ZipFile, ZipInfo
+
+from donations.views.download_donations.pdf_fetch import COPY_CHUNK_SIZE
+
+# The fixed part of a ZIP local file header, as defined in the APPNOTE.TXT specification
+LOCAL_FILE_HEADER = struct.Struct("<4s2B4HL2L2H")
+LOCAL_FILE_HEADER_SIGNATURE = b"PK\003\004"
+LOCAL_FILE_HEADER_NAME_LENGTH_INDEX = 10
+LOCAL_FILE_HEADER_EXTRA_LENGTH_INDEX = 11
+
+# The records which end an archive, as defined in the APPNOTE.TXT specification
+CENTRAL_DIRECTORY_HEADER = struct.Struct("<4s4B4HL2L5H2L")
+CENTRAL_DIRECTORY_HEADER_SIGNATURE = b"PK\001\002"
+END_OF_CENTRAL_DIRECTORY = struct.Struct("<4s4H2LH")
+END_OF_CENTRAL_DIRECTORY_SIGNATURE = b"PK\005\006"
+ZIP64_END_OF_CENTRAL_DIRECTORY = struct.Struct("<4sQ2H2L4Q")
+ZIP64_END_OF_CENTRAL_DIRECTORY_SIGNATURE = b"PK\006\006"
+ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR = struct.Struct("<4sLQL")
+ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR_SIGNATURE = b"PK\006\007"
+ZIP64_EXTRA_FIELD_ID = 1
+ZIP64_VERSION = 45
+
+# The largest values which fit in the fields of the records without the ZIP64 extensions
+ZIP64_LIMIT = (1 << 31) - 1
+ZIP_FILECOUNT_LIMIT = (1 << 16) - 1
+
+# The compression level of the archives; the PDF files are already compressed, so a higher level gains little
+ARCHIVE_COMPRESSLEVEL = 1
+
+# The permissions set by ZipFile.open(mode="w") for new members
+DEFAULT_EXTERNAL_ATTR = 0o600 << 16
+
+
+@dataclass(slots=True)
+class CompressedMember:
+    """
+    A ZIP member with its data already compressed, which can be copied into another archive as it is.
+
+    The data is either kept in memory or in a file, which is closed by `close`.
+    """
+
+    name: str
+    date_time: tuple[int, int, int, int, int, int]
+    compress_type: int
+    crc: int
+    file_size: int
+    compress_size: int
+    data: bytes | IO[bytes]
+
+    def close(self) -> None:
+        if not isinstance(self.data, bytes):
+            self.data.close()
+
+
+def read_compressed_member(zip_archive: ZipFile, name: str, target: IO[bytes] | None = None) -> CompressedMember:
+    """
+    Read the compressed data of a member, without decompressing it.
+
+    If a target file is given, the data is copied into it in chunks, instead of being read into memory.
+    """
+
+    info: ZipInfo = zip_archive.getinfo(name)
+
+    with zip_archive._lock:
+        zip_archive.fp.seek(info.header_offset)
+
+        header = LOCAL_FILE_HEADER.unpack(zip_archive.fp.read(LOCAL_FILE_HEADER.size))
+        if header[0] != LOCAL_FILE_HEADER_SIGNATURE:
+            raise BadZipFile(f"Bad local file header for '{name}'")
+
+        zip_archive.fp.seek(
+            header[LOCAL_FILE_HEADER_NAME_LENGTH_INDEX] + header[LOCAL_FILE_HEADER_EXTRA_LENGTH_INDEX],
+            1,
+        )
+        if target is None:
+            data: bytes | IO[bytes] = zip_archive.fp.read(info.compress_size)
+        else:
+            _copy_exactly(zip_archive.fp, target, info.compress_size)
+            data = target
+
+    return CompressedMember(
+        name=info.filename,
+        date_time=info.date_time,
+        compress_type=info.compress_type,
+        crc=info.CRC,
+        file_size=info.file_size,
+        compress_size=info.compress_size,
+        data=data,
+    )
+
+
+class ZipArchiveWriter:
+    """
+    A ZIP archive opened for writing, which can also take members whose data is already compressed.
+
+    ZipFile has no public API for copying compressed data, so the writer builds the local headers of the members
+    with ZipInfo and writes the central directory itself. The archives are read back with ZipFile.
+    """
+
+    def __init__(self, file: str | os.PathLike | IO[bytes], compresslevel: int = ARCHIVE_COMPRESSLEVEL):
+        self._owns_file: bool = isinstance(file, (str, os.PathLike))
+        # the file is also read, since the members already written can be read back
+        self._file: IO[bytes] = open(file, "w+b") if self._owns_file else file
+        self._compresslevel: int = compresslevel
+
+        self._members: dict[str, ZipInfo] = {}
+        # where the data of every member starts, after its local header
+        self._data_offsets: dict[str, int] = {}
+        self._open_member: "_MemberWriter | None" = None
+        self._closed: bool = False
+
+    def __enter__(self) -> "ZipArchiveWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def namelist(self) -> list[str]:
+        return list(self._members)
+
+    def open(self, name: str, mode: str = "w", *, force_zip64: bool = False) -> IO[bytes]:
+        """
+        Open a new member, whose data is compressed while it is written, the same way as ZipFile.open(mode="w").
+        """
+
+        if mode != "w":
+            raise ValueError('The members of the archive can only be opened with mode "w"')
+
+        info = ZipInfo(name, time.localtime(time.time())[:6])
+        info.compress_type = ZIP_DEFLATED
+        info.CRC = 0
+        info.external_attr = DEFAULT_EXTERNAL_ATTR
+
+        self._start_member(info)
+        self._open_member = _MemberWriter(self, info, self._file, self._compresslevel, force_zip64)
+
+        return self._open_member
+
+    def write_compressed_member(self, member: CompressedMember, name: str | None = None) -> None:
+        """
+        Append an already compressed member, skipping the compression.
+        """
+
+        info = ZipInfo(name or member.name, member.date_time)
+        info.compress_type = member.compress_type
+        info.CRC = member.crc
+        info.file_size = member.file_size
+        info.compress_size = member.compress_size
+        info.external_attr = DEFAULT_EXTERNAL_ATTR
+
+        self._start_member(info)
+        self._file.write(info.FileHeader(zip64=_requires_zip64(info)))
+        data_offset: int = self._file.tell()
+
+        if isinstance(member.data, bytes):
+            self._file.write(member.data)
+        else:
+            member.data.seek(0)
+            shutil.copyfileobj(member.data, self._file, COPY_CHUNK_SIZE)
+
+        self._add_member(info, data_offset)
+
+    def read_compressed_member(self, name: str) -> CompressedMember:
+        """
+        Read the compressed data of a member already written, without decompressing it.
+        """
+
+        if self._open_member is not None:
+            raise ValueError("Can't read a member while another one is open for writing")
+
+        info: ZipInfo = self._members[name]
+
+        end_offset: int = self._file.tell()
+        try:
+            self._file.seek(self._data_offsets[name])
+            data: bytes = self._file.read(info.compress_size)
+        finally:
+            self._file.seek(end_offset)
+
+        if len(data) != info.compress_size:
+            raise BadZipFile("Truncated member data")
+
+        return CompressedMember(
+            name=info.filename,
+            date_time=info.date_time,
+            compress_type=info.compress_type,
+            crc=info.CRC,
+            file_size=info.file_size,
+            compress_size=info.compress_size,
+            data=data,
+        )
+
+    def close(self) -> None:
+        """
+        Write the central directory and close the archive.
+        """
+
+        if self._closed:
+            return
+
+        try:
+            if self._open_member is not None:
+                raise ValueError("Can't close the archive while a member is open for writing")
+
+            self._write_central_directory()
+            self._file.flush()
+        finally:
+            self._closed = True
+            if self._owns_file:
+                self._file.close()
+
+    def _start_member(self, info: ZipInfo) -> None:
+        if self._closed:
+            raise ValueError("Can't write to a closed archive")
+        if self._open_member is not None:
+            raise ValueError("Can't write a member while another one is open for writing")
+        if info.filename in self._members:
+            raise ValueError(f"Duplicate member name '{info.filename}'")
+
+        info.header_offset = self._file.tell()
+
+    def _add_member(self, info: ZipInfo, data_offset: int) -> None:
+        self._members[info.filename] = info
+        self._data_offsets[info.filename] = data_offset
+        self._open_member = None
+
+    def _write_central_directory(self) -> None:
+        start_offset: int = self._file.tell()
+
+        for info in self._members.values():
+            self._file.write(_central_directory_header(info))
+
+        end_offset: int = self._file.tell()
+
+        members_count: int = len(self._members)
+        size: int = end_offset - start_offset
+        if members_count > ZIP_FILECOUNT_LIMIT or start_offset > ZIP64_LIMIT or size > ZIP64_LIMIT:
+            self._file.write(
+                ZIP64_END_OF_CENTRAL_DIRECTORY.pack(
+                    ZIP64_END_OF_CENTRAL_DIRECTORY_SIGNATURE,
+                    ZIP64_END_OF_CENTRAL_DIRECTORY.size - 12,
+                    ZIP64_VERSION,
+                    ZIP64_VERSION,
+                    0,
+                    0,
+                    members_count,
+                    members_count,
+                    size,
+                    start_offset,
+                )
+            )
+            self._file.write(
+                ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR.pack(
+                    ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR_SIGNATURE, 0, end_offset, 1
+                )
+            )
+
+        self._file.write(
+            END_OF_CENTRAL_DIRECTORY.pack(
+                END_OF_CENTRAL_DIRECTORY_SIGNATURE,
+                0,
+                0,
+                min(members_count, ZIP_FILECOUNT_LIMIT),
+                min(members_count, ZIP_FILECOUNT_LIMIT),
+                min(size, 0xFFFFFFFF),
+                min(start_offset, 0xFFFFFFFF),
+                0,
+            )
+        )
+
+
+class _MemberWriter(io.BufferedIOBase):
+    """
+    A member of a ZipArchiveWriter, compressed while it is written.
+
+    Its local header is written again, with the sizes and the CRC, once the member is closed.
+    """
+
+    def __init__(self, archive: ZipArchiveWriter, info: ZipInfo, file: IO[bytes], compresslevel: int, zip64: bool):
+        super().__init__()
+
+        self._archive: ZipArchiveWriter = archive
+        self._info: ZipInfo = info
+        self._file: IO[bytes] = file
+        self._zip64: bool = zip64
+        self._compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -15)
+
+        self._file.write(info.FileHeader(zip64=zip64))
+        self._data_offset: int = self._file.tell()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+
+        data = memoryview(data).cast("B")
+
+        self._info.CRC = zlib.crc32(data, self._info.CRC)
+        self._info.file_size += len(data)
+
+        compressed: bytes = self._compressor.compress(data)
+        self._info.compress_size += len(compressed)
+        self._file.write(compressed)
+
+        return len(data)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+
+        try:
+            compressed: bytes = self._compressor.flush()
+            self._info.compress_size += len(compressed)
+            self._file.write(compressed)
+
+            if not self._zip64 and _requires_zip64(self._info):
+                raise LargeZipFile("The member is too large, try using force_zip64")
+
+            # the sizes and the CRC are only known now
+            end_offset: int = self._file.tell()
+            self._file.seek(self._info.header_offset)
+            self._file.write(self._info.FileHeader(zip64=self._zip64))
+            self._file.seek(end_offset)
+
+            self._archive._add_member(self._info, self._data_offset)
+        finally:
+            super().close()
+
+
+def write_compressed_member(zip_archive: ZipArchiveWriter, member: CompressedMember, name: str | None = None) -> None:
+    """
+    Append an already compressed member to an archive opened for writing, skipping the compression.
+    """
+
+    zip_archive.write_compressed_member(member, name)
+
+
+def _requires_zip64(info: ZipInfo) -> bool:
+    return info.file_size > ZIP64_LIMIT or info.compress_size > ZIP64_LIMIT
+
+
+def _central_directory_header(info: ZipInfo) -> bytes:
+    year, month, day, hour, minute, second = info.date_time
+    dos_date: int = (year - 1980) << 9 | month << 5 | day
+    dos_time: int = hour << 11 | minute << 5 | (second // 2)
+
+    # the values which do not fit in their fields are moved to the ZIP64 extra field, in this order
+    zip64_values: list[int] = []
+    file_size, compress_size, header_offset = info.file_size, info.compress_size, info.header_offset
+    if _requires_zip64(info):
+        zip64_values += [file_size, compress_size]
+        file_size = compress_size = 0xFFFFFFFF
+    if header_offset > ZIP64_LIMIT:
+        zip64_values.append(header_offset)
+        header_offset = 0xFFFFFFFF
+
+    extra: bytes = b""
+    version: int = info.extract_version
+    if zip64_values:
+        extra = struct.pack(f"<2H{len(zip64_values)}Q", ZIP64_EXTRA_FIELD_ID, 8 * len(zip64_values), *zip64_values)
+        version = max(version, ZIP64_VERSION)
+
+    try:
+        file_name: bytes = info.filename.encode("ascii")
+        flag_bits: int = info.flag_bits
+    except UnicodeEncodeError:
+        file_name = info.filename.encode("utf-8")
+        flag_bits = info.flag_bits | 0x800
+
+    header: bytes = CENTRAL_DIRECTORY_HEADER.pack(
+        CENTRAL_DIRECTORY_HEADER_SIGNATURE,
+        max(version, info.create_version),
+        info.create_system,
+        version,
+        info.reserved,
+        flag_bits,
+        info.compress_type,
+        dos_time,
+        dos_date,
+        info.CRC,
+        compress_size,
+        file_size,
+        len(file_name),
+        len(extra),
+        0,
+        0,
+        info.internal_attr,
+        info.external_attr,
+        header_offset,
+    )
+
+    return header + file_name + extra
+
+
+def _copy_exactly(source: IO[bytes], target: IO[bytes], size: int) -> None:
+    while size > 0:
+        chunk: bytes = source.read(min(size, COPY_CHUNK_SIZE))
+        if not chunk:
+            raise BadZipFile("Truncated member data")
+
+        target.write(chunk)
+        size -= len(chunk)
@@ -19,6 +19,7 @@ from donations.models.jobs import Job
 from donations.models.ngos import NGO_CAUSES_QUERY_CACHE_KEY, Cause, Ngo
 from donations.views.base import BaseVisibleTemplateView
 from donations.views.common.misc import get_ngo_archive_download_status, get_time_between_retries
+from donations.views.common.pagination import KeysetPaginationMixin
 from donations.views.common.search import DonorSearchMixin
 from donations.views.ngo_account.common import FileDownloadProxy, NgoBaseListView
 from donations.views.ngo_account_filters import (
@@ -34,11 +35,12 @@ from users.models import User
 from utils.common.filters import QueryFilter
 
 
-class NgoRedirectionsView(NgoBaseListView, DonorSearchMixin):
+class NgoRedirectionsView(KeysetPaginationMixin, NgoBaseListView, DonorSearchMixin):
     template_name = "ngo-account/redirections/main.html"
     title = _("Redirections")
     context_object_name = "redirections"
     paginate_by = 8
+    keyset_ordering = ("-date_created", "-id")
     tab_title = "redirections"
     sidebar_item_target = "org-redirections"
 
@@ -155,7 +157,7 @@ class NgoRedirectionsView(NgoBaseListView, DonorSearchMixin):
 
         redirections = (
             ngo.donor_set.all()
-            .order_by("-date_created")
+            .order_by(*self.keyset_ordering)
             .filter(is_available=True)
             .filter(**queryset_filters)
             .values(
@@ -215,6 +217,7 @@ class NgoArchivesView(NgoBaseListView):
                     "pk",
                     "date_created",
                     "number_of_donations",
+                    "processed_donations",
                     "status",
                     "cause__name",
                 )
@@ -357,7 +360,7 @@ class RedirectionDisableLinkView(BaseVisibleTemplateView):
             raise Http404
 
         donor.is_available = False
-        donor.save(update_fields=["is_available"])
+        donor.save(update_fields=["is_available", "date_updated"])
 
         messages.success(
             request,
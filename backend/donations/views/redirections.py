@@ -4,7 +4,6 @@ from urllib.parse import urlparse
 
 from django.conf import settings
 from django.contrib import messages
-from django.core.files import File
 from django.db.models import Prefetch, QuerySet
 from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
@@ -16,17 +15,21 @@ from ipware import get_client_ip
 
 import redirectioneaza.settings.locations
 from editions.calendar import edition_deadline
-from redirectioneaza.common.messaging import extend_email_context, send_email
+from redirectioneaza.common.messaging import extend_email_context
 from users.models import User
 
 from ..forms.redirection import DonationForm
 from ..models.donors import Donor
 from ..models.ngos import Cause, CauseVisibilityChoices, Ngo
-from ..pdf import create_full_pdf
+from ..workers.redirections import process_redirection
 from .base import BaseVisibleTemplateView
 
 logger = logging.getLogger(__name__)
 
+# How long a form without a PDF file is considered to be still rendering, instead of missing
+PDF_RENDERING_TIMEOUT = timedelta(minutes=30)
+PDF_PENDING_REFRESH_SECONDS = 3
+
 
 class RedirectionSuccessHandler(BaseVisibleTemplateView):
     template_name = "form/success/main.html"
@@ -59,6 +62,7 @@ class RedirectionSuccessHandler(BaseVisibleTemplateView):
             {
                 "absolute_path": absolute_path,
                 "donor": donor,
+                "pdf_pending": donor is not None and not donor.pdf_file,
                 "limit": edition_deadline(),
             }
         )
@@ -271,67 +275,20 @@ class RedirectionHandler(TemplateView):
 
         new_donor.save()
 
-        pdf = create_full_pdf(new_donor, signature)
-        new_donor.pdf_file.save("formular.pdf", File(pdf))
-
-        # close the file after it has been uploaded
-        pdf.close()
-
-        new_donor.save()
-
         # set the donor id in cookie
         request.session["donor_id"] = str(new_donor.pk)
 
         mail_context = {"action_url": request.build_absolute_uri(new_donor.form_url)}
         mail_context.update(extend_email_context(request))
 
-        donor_email_context = mail_context.copy()
-        donor_email_context.update(
-            {
-                "cause_url": request.build_absolute_uri(reverse("twopercent", kwargs={"cause_slug": cause_slug})),
-                "ngo_name": ngo.name,
-                "donation_is_two_years": new_donor.two_years,
-            }
+        # the PDF file and the emails are handled in the background, if REDIRECTION_PROCESSING_METHOD is async
+        process_redirection(
+            new_donor,
+            signature,
+            mail_context,
+            cause_url=request.build_absolute_uri(reverse("twopercent", kwargs={"cause_slug": cause_slug})),
         )
 
-        # send and email to the donor with a link to the PDF file
-        if signature and cause:
-            if cause.notifications_email:
-                send_email(
-                    subject=_("Un nou formular de redirecționare"),
-                    to_emails=[cause.notifications_email],
-                    html_template="emails/ngo/new-form-received/main.html",
-                    text_template="emails/ngo/new-form-received/main.txt",
-                    context=mail_context,
-                )
-            send_email(
-                subject=_("Formularul tău de redirecționare"),
-                to_emails=[new_donor.email],
-                html_template="emails/donor/redirection-with-signature/main.html",
-                text_template="emails/donor/redirection-with-signature/main.txt",
-                context=donor_email_context,
-            )
-        else:
-            ngo_address = ngo.address
-            if ngo.locality:
-                ngo_address += f", {ngo.locality}"
-            if ngo.county:
-                ngo_address += f", {ngo.county}"
-
-            donor_email_context.update(
-                {
-                    "ngo_address": ngo_address,
-                    "ngo_email": ngo.email,
-                }
-            )
-            send_email(
-                subject=_("Formularul tău de redirecționare"),
-                to_emails=[new_donor.email],
-                html_template="emails/donor/redirection-sans-signature/main.html",
-                text_template="emails/donor/redirection-sans-signature/main.txt",
-                context=donor_email_context,
-            )
-
         url = reverse("ngo-twopercent-success", kwargs={"cause_slug": cause_slug})
 
         # if not an ajax request, redirect
@@ -379,11 +336,19 @@ class OwnFormDownloadLinkHandler(TemplateView):
         if donor_hash != donor.donation_hash:
             failed = True
 
-        # Check that the job has a zip file
-        if not donor.pdf_file:
-            failed = True
-
         if failed:
             raise Http404
 
+        # The PDF file of a new redirection might still be rendering in the background
+        if not donor.pdf_file:
+            if donor.personal_data_removed_at or donor.date_created < timezone.now() - PDF_RENDERING_TIMEOUT:
+                raise Http404
+
+            return render(
+                request,
+                "form/download-pending.html",
+                {"title": _("Your form is being generated"), "refresh_seconds": PDF_PENDING_REFRESH_SECONDS},
+                status=202,
+            )
+
         return redirect(donor.pdf_file.url)
@@ -13,10 +13,11 @@ from django.views.generic import TemplateView
 
 from editions.calendar import edition_deadline
 from partners.models import Partner
+from partners.registry import get_partner_causes
 from redirectioneaza.common.cache import cache_decorator
 
-from ..models.donors import Donor
 from ..models.ngos import FRONTPAGE_NGOS_KEY, FRONTPAGE_STATS_KEY, Cause
+from ..models.stat_configs import donations_year_counter
 from .base import BaseVisibleTemplateView
 from .common.search import CauseSearchMixin
 
@@ -28,18 +29,11 @@ class HomePage(BaseVisibleTemplateView):
     title = "redirectioneaza.ro"
 
     @cache_decorator(timeout=settings.TIMEOUT_CACHE_NORMAL, cache_key_prefix=FRONTPAGE_STATS_KEY)
-    def _get_stats(
-        self, now: datetime | None = None, queryset: QuerySet | None = None
-    ) -> list[dict[str, str | int | datetime]]:
-        if now is None:
-            now = timezone.now()
-
+    def _get_stats(self, year: int, queryset: QuerySet | None = None) -> list[dict[str, str | int | datetime]]:
         if queryset is None:
             queryset = Cause.public_active
 
-        start_of_year = datetime(now.year, 1, 1, 0, 0, 0, tzinfo=now.tzinfo)
-
-        forms_filled_count = Donor.available.filter(date_created__gte=start_of_year).count()
+        forms_filled_count: int = donations_year_counter(year)
         pluralized_title = ngettext_lazy(
             "form filled in",
             "forms filled in",
@@ -53,7 +47,7 @@ class HomePage(BaseVisibleTemplateView):
                 "timestamp": timezone.now(),
             },
             {
-                "title": pluralized_title + " " + str(start_of_year.year),
+                "title": pluralized_title + " " + str(year),
                 "value": forms_filled_count,
                 "timestamp": timezone.now(),
             },
@@ -74,11 +68,11 @@ class HomePage(BaseVisibleTemplateView):
             {
                 "company_name": partner.name,
                 "heading_secondary": partner.custom_cta,
-                "causes": partner.ordered_causes(),
+                "causes": get_partner_causes(partner),
             }
         )
 
-        if context["causes"].count() == 0:
+        if not context["causes"]:
             logger.error(f"Partner {partner} has no causes")
 
         return context
@@ -104,7 +98,7 @@ class HomePage(BaseVisibleTemplateView):
 
         queryset = Cause.public_active
 
-        context["stats"] = self._get_stats(now, queryset)
+        context["stats"] = self._get_stats(now.year, queryset)
         context["causes"] = self._get_random_causes(queryset, num_items=min(4, queryset.count()))
 
         return context
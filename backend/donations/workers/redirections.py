@@ -0,0 +1,247 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from django_q.models import Failure
+from django_q.tasks import async_task
+from django_q.utils import get_func_repr
+
+from donations.models.donors import Donor
+from donations.pdf import create_full_pdf
+from donations.workers.render_forms import RenderingReport, render_donor_forms
+from redirectioneaza.common.messaging import send_email
+from utils.common.crypto_helper import decrypt_data, encrypt_data
+
+logger = logging.getLogger(__name__)
+
+# How long a new redirection is left to its task before its missing PDF file is created again
+MISSING_FORMS_MIN_AGE = timedelta(minutes=5)
+# After how long the redirections without a PDF file are given up on
+MISSING_FORMS_MAX_AGE = timedelta(days=1)
+
+
+class MissingRedirectionForm(Exception):
+    """
+    The emails of a redirection cannot be sent before its PDF file is created.
+    """
+
+
+def process_redirection(
+    donor: Donor,
+    signature: str,
+    mail_context: dict,
+    cause_url: str,
+    run_method: str | None = None,
+) -> None:
+    """
+    Create the PDF file of a new redirection and send its emails, once the donor is saved.
+
+    When run asynchronously, the PDF file is created by a task which queues the emails only once the file is saved,
+    so that no email links to a form which failed to render. Such a task is not retried by the task queue,
+    it is queued again by `render_missing_redirection_forms`.
+    The signature is encrypted, the same way as the personal data, before it is sent to the task queue.
+    """
+    run_method = run_method or settings.REDIRECTION_PROCESSING_METHOD or settings.DEFAULT_RUN_METHOD
+
+    encrypted_signature: str = encrypt_data(signature.encode()) if signature else ""
+
+    if run_method != "async":
+        render_redirection_pdf(donor.pk, encrypted_signature)
+        send_redirection_emails(donor.pk, mail_context, cause_url)
+        return
+
+    # the task names are the idempotency keys of the steps, so that they can be found in the admin
+    async_task(
+        render_redirection_pdf_and_queue_emails,
+        donor.pk,
+        encrypted_signature,
+        mail_context,
+        cause_url,
+        task_name=f"redirection-{donor.pk}-pdf",
+        group=f"redirection-{donor.pk}",
+    )
+
+
+def render_redirection_pdf_and_queue_emails(
+    donor_id: int, encrypted_signature: str, mail_context: dict, cause_url: str
+) -> bool:
+    """
+    Create the PDF file of the donor and queue its emails, once the donor has the file.
+    """
+    render_redirection_pdf(donor_id, encrypted_signature)
+
+    if not Donor.objects.filter(pk=donor_id, personal_data_removed_at__isnull=True).exclude(pdf_file="").exists():
+        return False
+
+    async_task(
+        send_redirection_emails,
+        donor_id,
+        mail_context,
+        cause_url,
+        task_name=f"redirection-{donor_id}-emails",
+        group=f"redirection-{donor_id}",
+    )
+
+    return True
+
+
+def render_redirection_pdf(donor_id: int, encrypted_signature: str = "") -> bool:
+    """
+    Create and upload the PDF file of the donor, unless it already has one.
+    """
+    try:
+        donor: Donor = Donor.objects.select_related("ngo", "cause").get(pk=donor_id)
+    except Donor.DoesNotExist:
+        logger.warning("Cannot create the PDF file of the missing donor #%d", donor_id)
+        return False
+
+    if donor.pdf_file or donor.personal_data_removed_at:
+        return False
+
+    signature: str = decrypt_data(encrypted_signature.encode()) if encrypted_signature else ""
+
+    pdf = create_full_pdf(donor, signature)
+    try:
+        donor.pdf_file.save("formular.pdf", File(pdf), save=False)
+    finally:
+        # close the file after it has been uploaded
+        pdf.close()
+
+    # only the first run of the task sets the PDF file, in case another one uploaded it in the meantime
+    updated_count: int = Donor.objects.filter(pk=donor.pk, pdf_file="").update(pdf_file=donor.pdf_file.name)
+    if not updated_count:
+        donor.pdf_file.storage.delete(donor.pdf_file.name)
+        return False
+
+    return True
+
+
+def send_redirection_emails(donor_id: int, mail_context: dict, cause_url: str) -> bool:
+    """
+    Send the emails of a new redirection to the donor and to the NGO, unless they were already sent.
+
+    The emails link to the PDF file of the donor, so they are not sent before the file is created.
+    """
+    pending_donors = Donor.objects.filter(
+        pk=donor_id,
+        notifications_sent_at__isnull=True,
+        personal_data_removed_at__isnull=True,
+    )
+
+    claimed_count: int = pending_donors.exclude(pdf_file="").update(notifications_sent_at=timezone.now())
+    if not claimed_count:
+        if pending_donors.exists():
+            raise MissingRedirectionForm(f"The PDF file of the donor #{donor_id} has not been created")
+        return False
+
+    donor: Donor = Donor.objects.select_related("ngo", "cause").get(pk=donor_id)
+
+    try:
+        _send_redirection_emails(donor, mail_context, cause_url)
+    except Exception:
+        # let a retry of the task send the emails
+        Donor.objects.filter(pk=donor_id).update(notifications_sent_at=None)
+        raise
+
+    return True
+
+
+def render_missing_redirection_forms() -> dict:
+    """
+    Create the PDF files which the tasks of the new redirections failed to create.
+
+    The signature is only sent to the task, so the failed tasks of the redirections are queued again.
+    The unsigned forms without a failed task are rendered, without their emails, which are not saved anywhere.
+    """
+    now = timezone.now()
+    missing_forms = Donor.available.filter(
+        pdf_file="",
+        personal_data_removed_at__isnull=True,
+        date_created__gte=now - MISSING_FORMS_MAX_AGE,
+        date_created__lt=now - MISSING_FORMS_MIN_AGE,
+    )
+    missing_donor_ids: set[int] = set(missing_forms.values_list("pk", flat=True))
+
+    requeued_donor_ids: set[int] = set()
+    failures = Failure.objects.filter(func=get_func_repr(render_redirection_pdf_and_queue_emails))
+    # the tasks which failed only recently belong to redirections which are still too new to be checked
+    failures = failures.filter(started__gte=now - MISSING_FORMS_MAX_AGE, started__lt=now - MISSING_FORMS_MIN_AGE)
+    for failure in failures.order_by("-started"):
+        donor_id: int = failure.args[0]
+        if donor_id in missing_donor_ids and donor_id not in requeued_donor_ids:
+            async_task(
+                render_redirection_pdf_and_queue_emails,
+                *failure.args,
+                task_name=f"redirection-{donor_id}-pdf",
+                group=f"redirection-{donor_id}",
+            )
+            requeued_donor_ids.add(donor_id)
+
+        # a new failure is saved if the task fails again
+        failure.delete()
+
+    unsigned_donor_ids: list[int] = sorted(
+        missing_forms.exclude(pk__in=requeued_donor_ids).filter(has_signed=False).values_list("pk", flat=True)
+    )
+    report: RenderingReport = render_donor_forms(unsigned_donor_ids)
+
+    lost_count: int = len(missing_donor_ids) - len(requeued_donor_ids) - len(unsigned_donor_ids)
+    if lost_count:
+        logger.error("%d signed redirections have no PDF file and no failed task to queue again", lost_count)
+
+    return {"requeued": len(requeued_donor_ids), "rendered": report.rendered_count, "failed": report.failed_ids}
+
+
+def _send_redirection_emails(donor: Donor, mail_context: dict, cause_url: str) -> None:
+    ngo = donor.ngo
+    cause = donor.cause
+
+    donor_email_context = mail_context.copy()
+    donor_email_context.update(
+        {
+            "cause_url": cause_url,
+            "ngo_name": ngo.name,
+            "donation_is_two_years": donor.two_years,
+        }
+    )
+
+    # send and email to the donor with a link to the PDF file
+    if donor.has_signed and cause:
+        if cause.notifications_email:
+            send_email(
+                subject=_("Un nou formular de redirecționare"),
+                to_emails=[cause.notifications_email],
+                html_template="emails/ngo/new-form-received/main.html",
+                text_template="emails/ngo/new-form-received/main.txt",
+                context=mail_context,
+            )
+        send_email(
+            subject=_("Formularul tău de redirecționare"),
+            to_emails=[donor.email],
+            html_template="emails/donor/redirection-with-signature/main.html",
+            text_template="emails/donor/redirection-with-signature/main.txt",
+            context=donor_email_context,
+        )
+    else:
+        ngo_address = ngo.address
+        if ngo.locality:
+            ngo_address += f", {ngo.locality}"
+        if ngo.county:
+            ngo_address += f", {ngo.county}"
+
+        donor_email_context.update(
+            {
+                "ngo_address": ngo_address,
+                "ngo_email": ngo.email,
+            }
+        )
+        send_email(
+            subject=_("Formularul tău de redirecționare"),
+            to_emails=[donor.email],
+            html_template="emails/donor/redirection-sans-signature/main.html",
+            text_template="emails/donor/redirection-sans-signature/main.txt",
+            context=donor_email_context,
+        )
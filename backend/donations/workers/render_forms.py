@@ -0,0 +1,234 @@
+import logging
+import multiprocessing
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import IO
+
+import django
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db.models import Model
+
+from donations.models.donors import Donor
+from donations.models.ngos import Cause, invalidate_causes_autocomplete
+from donations.pdf import create_cause_pdf, create_full_pdf
+from redirectioneaza.common.processes import can_use_processes
+
+logger = logging.getLogger(__name__)
+
+# How many forms a process renders at once
+RENDERING_CHUNK_SIZE = 25
+# How many rendered forms are uploaded to the storage in parallel
+UPLOAD_WORKERS_COUNT = 8
+
+
+@dataclass(frozen=True, slots=True)
+class FormsField:
+    """
+    The file field where the rendered forms of a model are saved
+    """
+
+    model: type[Model]
+    field_name: str
+    file_name: str
+    # the relations used by the upload path of the files
+    related_fields: tuple[str, ...] = ()
+    # whether the existing files are replaced, or only the missing ones are created
+    replace: bool = False
+    # called once the files are saved, since they are updated in bulk, without the save hooks of the model
+    invalidate: Callable[[], None] | None = None
+
+
+DONOR_FORMS = FormsField(Donor, "pdf_file", "formular.pdf", related_fields=("cause",))
+CAUSE_FORMS = FormsField(
+    Cause, "prefilled_form", "formular_donatie.pdf", replace=True, invalidate=invalidate_causes_autocomplete
+)
+
+
+@dataclass(slots=True)
+class RenderingReport:
+    rendered_count: int = 0
+    rendered_bytes: int = 0
+    elapsed_seconds: float = 0
+    failed_ids: list[int] = field(default_factory=list)
+
+    @property
+    def forms_per_second(self) -> float:
+        return self.rendered_count / self.elapsed_seconds if self.elapsed_seconds else 0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.rendered_count} forms rendered in {self.elapsed_seconds:.2f}s "
+            f"({self.forms_per_second:.1f} forms/s, {self.rendered_bytes / max(self.rendered_count, 1) / 1024:.1f} "
+            f"KiB/form), {len(self.failed_ids)} failed"
+        )
+
+
+def render_donor_forms(donor_ids: Iterable[int], *, processes_count: int | None = None) -> RenderingReport:
+    """
+    Render the forms of the donors which do not have a PDF file yet, and upload them.
+
+    The forms are rendered in chunks, by a pool of processes which build the form template once,
+    and the files of every chunk are uploaded together.
+    """
+    return _render_forms(DONOR_FORMS, list(donor_ids), _render_donor_chunk, processes_count=processes_count)
+
+
+def render_cause_forms(cause_ids: Iterable[int], *, processes_count: int | None = None) -> RenderingReport:
+    """
+    Render the prefilled forms of the causes, replacing the existing ones, and upload them.
+    """
+    return _render_forms(CAUSE_FORMS, list(cause_ids), _render_cause_chunk, processes_count=processes_count)
+
+
+def regenerate_prefilled_forms() -> dict:
+    """
+    Render again the prefilled forms of all the active causes, e.g. after the form template changes.
+    """
+    cause_ids: list[int] = list(Cause.active.order_by("pk").values_list("pk", flat=True))
+
+    report: RenderingReport = render_cause_forms(cause_ids)
+    logger.info("Regenerated the prefilled forms: %s", report)
+
+    return {"rendered": report.rendered_count, "failed": report.failed_ids, "forms_per_second": report.forms_per_second}
+
+
+def _render_forms(
+    forms_field: FormsField,
+    object_ids: list[int],
+    render_chunk: Callable[[list[int]], list[tuple[int, bytes | None]]],
+    *,
+    processes_count: int | None,
+) -> RenderingReport:
+    report = RenderingReport()
+    start = time.perf_counter()
+
+    chunks: list[list[int]] = [
+        object_ids[index : index + RENDERING_CHUNK_SIZE] for index in range(0, len(object_ids), RENDERING_CHUNK_SIZE)
+    ]
+
+    with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS_COUNT, thread_name_prefix="rdr_forms_upload") as uploader:
+        for rendered_forms in _render_chunks(chunks, render_chunk, processes_count):
+            contents: dict[int, bytes] = {}
+            for object_id, content in rendered_forms:
+                if content is None:
+                    report.failed_ids.append(object_id)
+                else:
+                    contents[object_id] = content
+
+            _upload_forms(uploader, forms_field, contents, report)
+
+    if report.rendered_count and forms_field.invalidate:
+        forms_field.invalidate()
+
+    report.elapsed_seconds = time.perf_counter() - start
+
+    return report
+
+
+def _render_chunks(
+    chunks: list[list[int]],
+    render_chunk: Callable[[list[int]], list[tuple[int, bytes | None]]],
+    processes_count: int | None,
+) -> Iterator[list[tuple[int, bytes | None]]]:
+    processes_count = processes_count or settings.FORMS_RENDERING_PROCESSES_COUNT
+
+    if len(chunks) <= 1 or not can_use_processes(processes_count):
+        for chunk in chunks:
+            yield render_chunk(chunk)
+        return
+
+    # Every process renders many chunks, so the form template is only built once per process.
+    with ProcessPoolExecutor(
+        max_workers=processes_count,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=django.setup,
+    ) as executor:
+        # only a few chunks are rendered ahead, so that the rendered files do not pile up in memory
+        pending: deque[Future] = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(render_chunk, chunk))
+
+            if len(pending) >= 2 * processes_count:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
+def _render_donor_chunk(donor_ids: list[int]) -> list[tuple[int, bytes | None]]:
+    donors = Donor.objects.filter(pk__in=donor_ids, pdf_file="").select_related("ngo", "cause")
+
+    return [(donor.pk, _render_pdf(donor.pk, create_full_pdf, donor)) for donor in donors]
+
+
+def _render_cause_chunk(cause_ids: list[int]) -> list[tuple[int, bytes | None]]:
+    causes = Cause.objects.filter(pk__in=cause_ids).select_related("ngo")
+
+    return [(cause.pk, _render_pdf(cause.pk, create_cause_pdf, cause, cause.ngo)) for cause in causes]
+
+
+def _render_pdf(object_id: int, create_pdf: Callable[..., IO[bytes]], *args) -> bytes | None:
+    try:
+        with create_pdf(*args) as pdf:
+            return pdf.read()
+    except Exception as e:
+        logger.exception("Could not render the form of #%d: %s", object_id, e)
+        return None
+
+
+def _upload_forms(
+    uploader: ThreadPoolExecutor,
+    forms_field: FormsField,
+    contents: dict[int, bytes],
+    report: RenderingReport,
+) -> None:
+    if not contents:
+        return
+
+    field_name: str = forms_field.field_name
+    model_field = forms_field.model._meta.get_field(field_name)
+
+    instances = forms_field.model.objects.filter(pk__in=contents.keys()).select_related(*forms_field.related_fields)
+    if not forms_field.replace:
+        # the file might have been created in the meantime
+        instances = instances.filter(**{field_name: ""})
+
+    # the upload threads only use the storage, the database is only used here
+    uploads: list[tuple[Model, Future[str]]] = []
+    for instance in instances:
+        name: str = model_field.generate_filename(instance, forms_field.file_name)
+        upload: Future[str] = uploader.submit(
+            model_field.storage.save, name, ContentFile(contents[instance.pk]), max_length=model_field.max_length
+        )
+        uploads.append((instance, upload))
+
+    uploaded_instances: list[Model] = []
+    replaced_names: list[str] = []
+    for instance, upload in uploads:
+        try:
+            uploaded_name: str = upload.result()
+        except Exception as e:
+            logger.exception("Could not upload the form of #%d: %s", instance.pk, e)
+            report.failed_ids.append(instance.pk)
+            continue
+
+        if old_name := getattr(instance, field_name).name:
+            replaced_names.append(old_name)
+
+        setattr(instance, field_name, uploaded_name)
+        uploaded_instances.append(instance)
+
+        report.rendered_count += 1
+        report.rendered_bytes += len(contents[instance.pk])
+
+    forms_field.model.objects.bulk_update(uploaded_instances, [field_name])
+
+    for name in replaced_names:
+        try:
+            model_field.storage.delete(name)
+        except Exception as e:
+            logger.warning("Could not delete the replaced form %s: %s", name, e)
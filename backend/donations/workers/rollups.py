@@ -0,0 +1,111 @@
+import logging
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+from donations.models.donors import Donor
+from donations.models.rollups import DonationRollup, NgoActivity, RollupKey
+
+logger = logging.getLogger(__name__)
+
+
+def reconcile_donation_rollups(ngo_ids: list[int] | None = None) -> dict[str, int]:
+    """
+    Count the available donations again and fix the rollups, and the NGO activities, which differ,
+    one NGO at a time.
+
+    The rollups of an NGO are locked while they are fixed, so that the donors saved in the meantime
+    are added to the fixed counts.
+    """
+    if ngo_ids is None:
+        donor_ngo_ids = Donor.available.filter(ngo__isnull=False).values_list("ngo_id", flat=True).distinct()
+        rollup_ngo_ids = DonationRollup.objects.values_list("ngo_id", flat=True).distinct()
+        ngo_ids = sorted(set(donor_ngo_ids) | set(rollup_ngo_ids))
+
+    summary: dict[str, int] = {"ngos": 0, "changed": 0, "deleted": 0}
+    for ngo_id in ngo_ids:
+        try:
+            changed_count, deleted_count = _reconcile_ngo_rollups(ngo_id)
+        except IntegrityError:
+            # a donor saved in the meantime created one of the missing rollups
+            changed_count, deleted_count = _reconcile_ngo_rollups(ngo_id)
+
+        summary["ngos"] += 1
+        summary["changed"] += changed_count
+        summary["deleted"] += deleted_count
+
+    logger.info(
+        "Reconciled the donation rollups of %d NGOs: %d changed and %d deleted",
+        summary["ngos"],
+        summary["changed"],
+        summary["deleted"],
+    )
+
+    return summary
+
+
+def _reconcile_ngo_rollups(ngo_id: int) -> tuple[int, int]:
+    with transaction.atomic():
+        current_rollups: dict[RollupKey, DonationRollup] = {
+            (rollup.ngo_id, rollup.cause_id, rollup.day, rollup.county): rollup
+            for rollup in DonationRollup.objects.select_for_update().filter(ngo_id=ngo_id)
+        }
+
+        expected_counts: dict[RollupKey, int] = {
+            (row["ngo_id"], row["cause_id"], row["day"], row["county"]): row["count"]
+            for row in Donor.available.filter(ngo_id=ngo_id)
+            .annotate(day=TruncDate("date_created"))
+            .values("ngo_id", "cause_id", "day", "county")
+            .annotate(count=Count("id"))
+            .order_by()
+        }
+
+        changed_rollups: list[DonationRollup] = []
+        new_rollups: list[DonationRollup] = []
+        for key, count in expected_counts.items():
+            current_rollup: DonationRollup | None = current_rollups.get(key)
+            if current_rollup is None:
+                _, cause_id, day, county = key
+                new_rollups.append(
+                    DonationRollup(ngo_id=ngo_id, cause_id=cause_id, day=day, county=county, count=count)
+                )
+            elif current_rollup.count != count:
+                current_rollup.count = count
+                changed_rollups.append(current_rollup)
+
+        DonationRollup.objects.bulk_update(changed_rollups, ["count"])
+        DonationRollup.objects.bulk_create(new_rollups)
+
+        deleted_ids: list[int] = [rollup.pk for key, rollup in current_rollups.items() if key not in expected_counts]
+        DonationRollup.objects.filter(pk__in=deleted_ids).delete()
+
+        _reconcile_ngo_activities(ngo_id, expected_counts)
+
+    return len(changed_rollups) + len(new_rollups), len(deleted_ids)
+
+
+def _reconcile_ngo_activities(ngo_id: int, expected_counts: dict[RollupKey, int]):
+    yearly_counts: Counter[int] = Counter()
+    for (_, _, day, _), count in expected_counts.items():
+        yearly_counts[day.year] += count
+
+    activities: dict[int, NgoActivity] = {
+        activity.year: activity for activity in NgoActivity.objects.select_for_update().filter(ngo_id=ngo_id)
+    }
+
+    changed_activities: list[NgoActivity] = []
+    for year, activity in activities.items():
+        if activity.count != yearly_counts[year]:
+            activity.count = yearly_counts[year]
+            changed_activities.append(activity)
+
+    NgoActivity.objects.bulk_update(changed_activities, ["count"])
+    NgoActivity.objects.bulk_create(
+        [
+            NgoActivity(ngo_id=ngo_id, year=year, count=count)
+            for year, count in yearly_counts.items()
+            if year not in activities
+        ]
+    )
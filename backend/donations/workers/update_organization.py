@@ -2,20 +2,29 @@ import mimetypes
 import random
 import string
 import tempfile
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from urllib.parse import urljoin
 
 import requests
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.files import File
-from django.db import DatabaseError
+from django.core.files.base import ContentFile
+from django.db import DatabaseError, transaction
 from django.utils import timezone
 from django.utils.text import slugify
 from django_q.tasks import async_task
 from ngohub import NGOHub
 from ngohub.exceptions import HubHTTPException
 from ngohub.models.organization import Organization, OrganizationGeneral
+from ngohub.normalization.organization import normalize_organization_data
 from pycognito import Cognito
 from requests import Response
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ConnectionError, Timeout
 
 from donations.common.validation.validate_slug import NgoSlugValidator
@@ -26,6 +35,26 @@ from utils.helper_logging import setup_logger
 
 logger = setup_logger(__name__)
 
+NGOHUB_REQUEST_TIMEOUT = 20
+
+# The NGO fields which are written back by the bulk synchronization
+NGOHUB_SYNCED_NGO_FIELDS: tuple[str, ...] = (
+    "name",
+    "vat_id",
+    "registration_number",
+    "address",
+    "locality",
+    "county",
+    "active_region",
+    "phone",
+    "email",
+    "website",
+    "is_social_service_viable",
+    "is_verified",
+    "ngohub_last_update_ended",
+    "date_updated",
+)
+
 
 def _remove_s3_signature(s3_url: str) -> str:
     """
@@ -41,6 +70,7 @@ def _copy_file_to_object_with_filename_cache(
     target_object: CommonFilenameCacheModel,
     signed_file_url: str,
     attribute_name: str,
+    session: requests.Session | None = None,
 ):
     if not hasattr(target_object, attribute_name):
         raise AttributeError(f"Target object {target_object} has no attribute '{attribute_name}'")
@@ -61,10 +91,29 @@ def _copy_file_to_object_with_filename_cache(
         logger.info(f"{attribute_name.upper()} file is already up to date.")
         return None
 
+    r, error_message = _download_file(signed_file_url, attribute_name, session)
+    if error_message:
+        return error_message
+
+    extension: str = _get_file_extension(filename, r, attribute_name, target_object)
+
+    with tempfile.TemporaryFile() as fp:
+        fp.write(r.content)
+        fp.seek(0)
+        getattr(target_object, attribute_name).save(f"{attribute_name}{extension}", File(fp))
+
+    target_object.filename_cache[attribute_name] = filename
+
+
+def _download_file(
+    signed_file_url: str,
+    attribute_name: str,
+    session: requests.Session | None = None,
+) -> tuple[Response | None, str | None]:
     failed = False
     error_code = ""
     try:
-        r: Response = requests.get(signed_file_url, timeout=20)
+        r: Response = (session or requests).get(signed_file_url, timeout=NGOHUB_REQUEST_TIMEOUT)
     except Timeout:
         failed = True
         error_code = "Connection Timeout"
@@ -80,22 +129,23 @@ def _copy_file_to_object_with_filename_cache(
         logger.info("%s file request status = %s", attribute_name.upper(), error_code)
         error_message = f"ERROR: Could not download {attribute_name} file from NGO Hub, error status {error_code}."
         logger.warning(error_message)
-        return error_message
+        return None, error_message
 
+    return r, None
+
+
+def _get_file_extension(
+    filename: str, r: Response, attribute_name: str, target_object: CommonFilenameCacheModel
+) -> str:
     extension: str = filename.split(".")[-1]
     if not extension or len(extension) > 4:
-        extension: str = mimetypes.guess_extension(r.headers["content-type"])
+        extension: str = mimetypes.guess_extension(r.headers.get("content-type", "")) or ""
 
-        if extension == ".bin":
+        if not extension or extension == ".bin":
             logger.warning(f"Could not get extension for attribute {attribute_name.upper()} for object {target_object}")
             extension = ""
 
-    with tempfile.TemporaryFile() as fp:
-        fp.write(r.content)
-        fp.seek(0)
-        getattr(target_object, attribute_name).save(f"{attribute_name}{extension}", File(fp))
-
-    target_object.filename_cache[attribute_name] = filename
+    return extension
 
 
 @cache_decorator(timeout=settings.TIMEOUT_CACHE_NORMAL, cache_key="authenticate_with_ngohub")
@@ -134,13 +184,18 @@ def _update_main_cause_of_ngo(ngo: Ngo, ngohub_general_data: OrganizationGeneral
     return _update_main_cause(cause, ngohub_general_data)
 
 
-def _update_main_cause(cause: Cause, ngohub_general_data: OrganizationGeneral) -> list[str] | Cause:
+def _update_main_cause(
+    cause: Cause,
+    ngohub_general_data: OrganizationGeneral,
+    session: requests.Session | None = None,
+) -> list[str] | Cause:
     errors = []
 
     logo_url_error: str | None = _copy_file_to_object_with_filename_cache(
         cause,
         ngohub_general_data.logo,
         "display_image",
+        session,
     )
     if logo_url_error:
         errors.append(logo_url_error)
@@ -172,12 +227,7 @@ def _create_main_cause(ngo: Ngo, ngohub_general_data: OrganizationGeneral) -> Ca
     return cause
 
 
-def _update_local_ngo_with_ngohub_data(ngo: Ngo, ngohub_ngo: Organization) -> dict[str, int | list[str]]:
-    errors: list[str] = []
-
-    if not ngo.filename_cache:
-        ngo.filename_cache = {}
-
+def _set_ngohub_data(ngo: Ngo, ngohub_ngo: Organization):
     ngohub_general_data: OrganizationGeneral = ngohub_ngo.general_data
 
     ngo.name = ngohub_general_data.name
@@ -209,6 +259,15 @@ def _update_local_ngo_with_ngohub_data(ngo: Ngo, ngohub_ngo: Organization) -> di
     ngo.is_social_service_viable = ngohub_ngo.activity_data.is_social_service_viable
     ngo.is_verified = True
 
+
+def _update_local_ngo_with_ngohub_data(ngo: Ngo, ngohub_ngo: Organization) -> dict[str, int | list[str]]:
+    errors: list[str] = []
+
+    if not ngo.filename_cache:
+        ngo.filename_cache = {}
+
+    _set_ngohub_data(ngo, ngohub_ngo)
+
     try:
         ngo.full_clean()
         ngo.save()
@@ -227,6 +286,8 @@ def _update_local_ngo_with_ngohub_data(ngo: Ngo, ngohub_ngo: Organization) -> di
             "errors": errors,
         }
 
+    ngohub_general_data: OrganizationGeneral = ngohub_ngo.general_data
+
     if not ngo.causes.exists():
         main_cause = _create_main_cause(ngo, ngohub_general_data)
         main_cause_update_result = _update_main_cause(main_cause, ngohub_general_data)
@@ -299,6 +360,244 @@ def update_organization(organization_id: int, update_method: str | None = None,
     return task_result
 
 
+@dataclass(slots=True)
+class NgoHubSyncReport:
+    # the errors of every synchronized NGO, by NGO ID; an NGO without errors was updated successfully
+    errors: dict[int, list[str]] = field(default_factory=dict)
+    updated_count: int = 0
+    downloaded_logos_count: int = 0
+    unchanged_logos_count: int = 0
+    elapsed_seconds: float = 0
+
+    @property
+    def results(self) -> list[dict[str, int | list[str]]]:
+        return [{"ngo_id": ngo_id, "errors": errors} for ngo_id, errors in self.errors.items()]
+
+    def __str__(self) -> str:
+        return (
+            f"{self.updated_count}/{len(self.errors)} NGOs updated in {self.elapsed_seconds:.2f}s, "
+            f"{sum(1 for errors in self.errors.values() if errors)} with errors, "
+            f"{self.downloaded_logos_count} logos downloaded and {self.unchanged_logos_count} unchanged"
+        )
+
+
+@dataclass(slots=True)
+class _FetchedOrganization:
+    ngo: Ngo
+    organization: Organization | None = None
+    # the storage name of the new logo, and the NGO Hub file name kept in the filename cache
+    logo_name: str = ""
+    logo_filename: str = ""
+    logo_unchanged: bool = False
+    remove_logo: bool = False
+    errors: list[str] = field(default_factory=list)
+
+
+def sync_organizations(
+    ngo_ids: Iterable[int],
+    *,
+    workers_count: int | None = None,
+    api_base_url: str = "",
+    token: str = "",
+) -> NgoHubSyncReport:
+    """
+    Update the NGOs with the given IDs from NGO Hub.
+
+    The organization profiles and the changed logos are downloaded by a bounded pool of threads sharing one HTTP
+    session, while the database is only used by the calling thread, which saves every NGO in its own transaction.
+    """
+    report = NgoHubSyncReport()
+    start = time.perf_counter()
+
+    ngo_ids = list(ngo_ids)
+    ngos: list[Ngo] = list(Ngo.objects.filter(pk__in=ngo_ids).with_main_cause().order_by("pk"))
+
+    for missing_ngo_id in sorted(set(ngo_ids) - {ngo.pk for ngo in ngos}):
+        report.errors[missing_ngo_id] = ["This NGO does not exist"]
+
+    ngohub_ngos: list[Ngo] = []
+    for ngo in ngos:
+        if ngo.ngohub_org_id:
+            ngohub_ngos.append(ngo)
+        else:
+            report.errors[ngo.pk] = ["This NGO has no NGO Hub ID"]
+
+    if ngohub_ngos:
+        Ngo.objects.filter(pk__in=[ngo.pk for ngo in ngohub_ngos]).update(ngohub_last_update_started=timezone.now())
+
+        workers_count = max(1, workers_count or settings.NGOHUB_SYNC_WORKERS_COUNT)
+        fetch_organization = partial(
+            _fetch_organization,
+            api_base_url=api_base_url or settings.NGOHUB_API_BASE,
+            token=token or _authenticate_with_ngohub(),
+        )
+
+        with requests.Session() as session:
+            adapter = HTTPAdapter(pool_maxsize=workers_count)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+
+            with ThreadPoolExecutor(max_workers=workers_count, thread_name_prefix="rdr_ngohub_sync") as executor:
+                fetched_organizations: list[_FetchedOrganization] = list(
+                    executor.map(partial(fetch_organization, session), ngohub_ngos)
+                )
+
+            _save_fetched_organizations(fetched_organizations, session, report)
+
+    report.elapsed_seconds = time.perf_counter() - start
+    logger.info(f"Synchronized the NGOs from NGO Hub: {report}")
+
+    return report
+
+
+def _fetch_organization(
+    session: requests.Session,
+    ngo: Ngo,
+    *,
+    api_base_url: str,
+    token: str,
+) -> _FetchedOrganization:
+    fetched = _FetchedOrganization(ngo=ngo)
+
+    try:
+        response: Response = session.get(
+            urljoin(api_base_url, f"organization/{ngo.ngohub_org_id}/"),
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=NGOHUB_REQUEST_TIMEOUT,
+        )
+        response.raise_for_status()
+        fetched.organization = normalize_organization_data(response.json())
+    except Exception as e:
+        logger.exception(f"Error while fetching NGO Hub data for NGO ID {ngo.ngohub_org_id}:\n{e}")
+        fetched.errors.append(f"Error while fetching NGO Hub data for NGO ID {ngo.ngohub_org_id}:\n{e}")
+        return fetched
+
+    # the main cause is prefetched, and the new causes are created later, by the calling thread
+    if main_cause := ngo.main_cause:
+        try:
+            _fetch_logo(session, main_cause, fetched)
+        except Exception as e:
+            # the NGO is still updated, without its logo
+            logger.exception(f"Error while fetching the logo of NGO {ngo.pk}:\n{e}")
+            fetched.errors.append(f"Error while fetching the logo of NGO {ngo.pk}:\n{e}")
+
+    return fetched
+
+
+def _fetch_logo(session: requests.Session, cause: Cause, fetched: _FetchedOrganization):
+    """
+    Upload the logo of the organization to the storage, unless the file name in the filename cache is the same
+    """
+    attribute_name = "display_image"
+    signed_file_url: str = fetched.organization.general_data.logo
+
+    filename: str = _remove_s3_signature(signed_file_url)
+    if not filename:
+        if cause.display_image:
+            fetched.remove_logo = True
+            error_message = f"ERROR: {attribute_name.upper()} file URL is empty, deleting the existing file."
+        else:
+            error_message = f"ERROR: {attribute_name.upper()} file URL is empty, but is a required field."
+        logger.warning(error_message)
+        fetched.errors.append(error_message)
+        return
+
+    if filename == cause.filename_cache.get(attribute_name, ""):
+        fetched.logo_unchanged = True
+        return
+
+    r, error_message = _download_file(signed_file_url, attribute_name, session)
+    if error_message:
+        fetched.errors.append(error_message)
+        return
+
+    extension: str = _get_file_extension(filename, r, attribute_name, cause)
+
+    logo_field = Cause._meta.get_field(attribute_name)
+    fetched.logo_name = logo_field.storage.save(
+        logo_field.generate_filename(cause, f"{attribute_name}{extension}"),
+        ContentFile(r.content),
+        max_length=logo_field.max_length,
+    )
+    fetched.logo_filename = filename
+
+
+def _save_fetched_organizations(
+    fetched_organizations: list[_FetchedOrganization],
+    session: requests.Session,
+    report: NgoHubSyncReport,
+):
+    for fetched in fetched_organizations:
+        ngo: Ngo = fetched.ngo
+        report.errors[ngo.pk] = fetched.errors
+
+        if fetched.organization is None:
+            continue
+
+        if _save_fetched_organization(fetched, session, report):
+            report.updated_count += 1
+        elif fetched.logo_name:
+            Cause._meta.get_field("display_image").storage.delete(fetched.logo_name)
+
+
+def _save_fetched_organization(
+    fetched: _FetchedOrganization,
+    session: requests.Session,
+    report: NgoHubSyncReport,
+) -> bool:
+    ngo: Ngo = fetched.ngo
+    errors: list[str] = fetched.errors
+
+    _set_ngohub_data(ngo, fetched.organization)
+    ngo.split_vat_id()
+
+    try:
+        ngo.full_clean()
+    except ValidationError as e:
+        logger.exception(f"Validation error while updating NGO {ngo.pk}:\n{e}")
+        errors.append(f"Validation error while updating NGO {ngo.pk}:\n{e}")
+        return False
+
+    removed_logo_name: str = ""
+
+    # the instances are saved one by one, rather than in bulk, so that the audit log records their changes
+    # and their caches are invalidated, and every NGO is saved with its cause in its own transaction
+    try:
+        with transaction.atomic():
+            if main_cause := ngo.main_cause:
+                if fetched.logo_name:
+                    main_cause.display_image = fetched.logo_name
+                    main_cause.filename_cache["display_image"] = fetched.logo_filename
+                    main_cause.save(update_fields=["display_image", "filename_cache", "date_updated"])
+                elif fetched.remove_logo:
+                    removed_logo_name = main_cause.display_image.name
+                    main_cause.display_image = ""
+                    main_cause.save(update_fields=["display_image", "filename_cache", "date_updated"])
+            else:
+                main_cause = _create_main_cause(ngo, fetched.organization.general_data)
+                main_cause_update_result = _update_main_cause(main_cause, fetched.organization.general_data, session)
+                if isinstance(main_cause_update_result, list):
+                    errors.extend(main_cause_update_result)
+
+            ngo.ngohub_last_update_ended = timezone.now()
+            ngo.save(update_fields=NGOHUB_SYNCED_NGO_FIELDS)
+    except DatabaseError as e:
+        logger.exception(f"Database error while saving NGO {ngo.pk}:\n{e}")
+        errors.append(f"Database error while saving NGO {ngo.pk}:\n{e}")
+        return False
+
+    if fetched.logo_name:
+        report.downloaded_logos_count += 1
+    elif fetched.logo_unchanged:
+        report.unchanged_logos_count += 1
+
+    # the removed logo is only deleted once the cause no longer refers to it
+    if removed_logo_name:
+        Cause._meta.get_field("display_image").storage.delete(removed_logo_name)
+
+    return True
+
+
 def create_organization_for_user(user, ngohub_org_data: Organization) -> Ngo:
     """
     Create a blank organization for the given user.
@@ -0,0 +1,122 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from donations.models.ngos import Cause
+from partners import registry
+from partners.middleware import PartnerDomainMiddleware
+from partners.models import Partner, PartnerCause
+
+BENCHMARK_SUBDOMAIN = "benchmark-partner"
+LOCMEM_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "benchmark_partner_middleware",
+    }
+}
+
+
+class LegacyPartnerDomainMiddleware(PartnerDomainMiddleware):
+    """
+    The middleware before the partners registry, which queries the partner of every request
+    """
+
+    def _get_partner_from_subdomain(self, subdomain) -> Partner | None:
+        if not subdomain:
+            return None
+
+        try:
+            return Partner.active.get(subdomain=subdomain)
+        except Partner.DoesNotExist:
+            return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the overhead of the partner middleware per request, for the apex domain, "
+        "a partner subdomain and a subdomain without a partner, with and without the partners registry. "
+        "The benchmark partner is removed at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests",
+            type=int,
+            help="The number of requests of each host",
+            default=2_000,
+        )
+        parser.add_argument(
+            "--causes",
+            type=int,
+            help="The number of existing causes to add to the benchmark partner",
+            default=50,
+        )
+
+    def handle(self, *args, **options):
+        requests_count: int = options["requests"]
+
+        partner = Partner.objects.create(name="Benchmark partner", subdomain=BENCHMARK_SUBDOMAIN)
+        try:
+            PartnerCause.objects.bulk_create(
+                PartnerCause(partner=partner, cause=cause, display_order=index + 1)
+                for index, cause in enumerate(Cause.public_active.order_by("pk")[: options["causes"]])
+            )
+
+            hosts: dict[str, str] = {
+                "apex": settings.APEX_DOMAIN,
+                "partner": f"{BENCHMARK_SUBDOMAIN}.{settings.APEX_DOMAIN}",
+                "missing partner": f"missing-{BENCHMARK_SUBDOMAIN}.{settings.APEX_DOMAIN}",
+            }
+            middlewares: dict[str, type[PartnerDomainMiddleware]] = {
+                "legacy": LegacyPartnerDomainMiddleware,
+                "registry": PartnerDomainMiddleware,
+            }
+
+            self.stdout.write(f"{'host':>16} | {'middleware':>10} | {'p50':>10} | {'p95':>10} | {'queries':>7}")
+
+            with override_settings(ENABLE_CACHE=True, CACHES=LOCMEM_CACHES, FORCE_PARTNER=False):
+                registry._registry = None
+
+                for host_name, host in hosts.items():
+                    for middleware_name, middleware_class in middlewares.items():
+                        self._benchmark(host_name, host, middleware_name, middleware_class, requests_count)
+        finally:
+            partner.delete()
+            registry._registry = None
+
+        self.stdout.write(self.style.SUCCESS("Done!"))
+
+    def _benchmark(
+        self,
+        host_name: str,
+        host: str,
+        middleware_name: str,
+        middleware_class: type[PartnerDomainMiddleware],
+        requests_count: int,
+    ):
+        middleware = middleware_class(lambda request: HttpResponse())
+        request_factory = RequestFactory()
+
+        # the first request builds the registry
+        middleware(request_factory.get("/", HTTP_HOST=host))
+
+        latencies: list[float] = []
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(requests_count):
+                request = request_factory.get("/", HTTP_HOST=host)
+
+                start = time.perf_counter()
+                middleware(request)
+                latencies.append(time.perf_counter() - start)
+
+        percentiles: list[float] = statistics.quantiles(latencies, n=100, method="inclusive")
+        self.stdout.write(
+            f"{host_name:>16} | {middleware_name:>10} | {percentiles[49] * 1_000_000:>8.1f}µs | "
+            f"{percentiles[94] * 1_000_000:>8.1f}µs | {len(queries) / requests_count:>7.2f}"
+        )
@@ -5,6 +5,7 @@ from django.http import Http404
 from django.shortcuts import redirect
 
 from .models import Partner
+from .registry import get_first_partner, get_partner
 
 logger = logging.getLogger(__name__)
 
@@ -48,17 +49,15 @@ class PartnerDomainMiddleware:
 
     def _get_partner_from_subdomain(self, subdomain) -> Partner | None:
         if settings.FORCE_PARTNER:
-            return Partner.active.first()
+            return get_first_partner()
 
         logger.debug("Subdomain %s", subdomain or "None")
 
         if not subdomain:
             return None
 
-        try:
-            return Partner.active.get(subdomain=subdomain)
-        except Partner.DoesNotExist:
-            return None
+        # the subdomains without a partner are answered by the registry as well
+        return get_partner(subdomain)
 
     def __init__(self, get_response):
         self.get_response = get_response
@@ -88,18 +87,11 @@ class PartnerDomainMiddleware:
         # Code to be executed for each request/response after
         # the view is called.
 
-        if hasattr(response, "status_code"):
-            logger.info(
-                "Response status %s for domain %s corresponding to partner %s",
-                response.status_code,
-                request.get_host(),
-                request.partner or "None",
-            )
-        else:
-            logger.info(
-                "Response for domain %s corresponding to partner %s",
-                request.get_host(),
-                request.partner or "None",
-            )
+        logger.debug(
+            "Response status %s for domain %s corresponding to partner %s",
+            getattr(response, "status_code", None),
+            request.get_host(),
+            request.partner or "None",
+        )
 
         return response
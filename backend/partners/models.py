@@ -5,8 +5,18 @@ from django.db.models.functions import Lower
 from django.utils.translation import gettext_lazy as _
 
 from donations.models.ngos import Cause, Ngo
+from redirectioneaza.common.cache import invalidate_cache_version
 from utils.validators import url_validator
 
+PARTNERS_REGISTRY_VERSION_KEY = "PARTNERS_REGISTRY_VERSION"
+
+
+def invalidate_partners_registry():
+    """
+    Let the processes know that their registry of the partners is outdated
+    """
+    invalidate_cache_version(PARTNERS_REGISTRY_VERSION_KEY)
+
 
 class DisplayOrderingChoices(models.TextChoices):
     CUSTOM = "CST", _("Custom")
@@ -136,6 +146,15 @@ class Partner(models.Model):
         if self.display_ordering == DisplayOrderingChoices.CUSTOM:
             self.initialize_custom_display_ordering()
 
+        invalidate_partners_registry()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+
+        invalidate_partners_registry()
+
+        return result
+
 
 class PartnerNgo(models.Model):
     partner = models.ForeignKey(
@@ -204,6 +223,15 @@ class PartnerCause(models.Model):
 
         super().save(*args, **kwargs)
 
+        invalidate_partners_registry()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+
+        invalidate_partners_registry()
+
+        return result
+
 
 auditlog.register(Partner)
 auditlog.register(PartnerNgo)
@@ -0,0 +1,144 @@
+import copy
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+
+from django.conf import settings
+
+from donations.models.ngos import CAUSES_AUTOCOMPLETE_VERSION_KEY, Cause
+from redirectioneaza.common.cache import get_cache_version
+
+from .models import PARTNERS_REGISTRY_VERSION_KEY, DisplayOrderingChoices, Partner
+
+logger = logging.getLogger(__name__)
+
+# How often a process checks if the partners or the causes changed, since every check reads the shared cache
+PARTNERS_REGISTRY_VERSION_CHECK_SECONDS = 5
+
+
+@dataclass(slots=True)
+class PartnersRegistry:
+    """
+    The active partners of this process, by their lower-cased subdomains, with the causes of their landing pages.
+
+    A subdomain without a partner is answered from the registry as well, without any database queries.
+    The instances are shared by the threads, so every caller gets its own copies of them.
+    """
+
+    version: tuple[int | None, int | None] = (None, None)
+    partners: dict[str, Partner] = field(default_factory=dict)
+    first_partner: Partner | None = None
+    causes: dict[int, list[Cause]] = field(default_factory=dict)
+
+    built_at: float = field(default_factory=time.monotonic)
+    checked_at: float = field(default_factory=time.monotonic)
+
+    @staticmethod
+    def _current_version() -> tuple[int | None, int | None]:
+        return get_cache_version(PARTNERS_REGISTRY_VERSION_KEY), get_cache_version(CAUSES_AUTOCOMPLETE_VERSION_KEY)
+
+    @classmethod
+    def build(cls) -> "PartnersRegistry":
+        # read the version first, so that the partners changed during the build trigger another one
+        registry = cls(version=cls._current_version())
+
+        partners: list[Partner] = list(Partner.active.order_by("pk"))
+        registry.partners = {partner.subdomain.lower(): partner for partner in partners}
+        registry.first_partner = partners[0] if partners else None
+        registry.causes = {partner.pk: list(partner.ordered_causes()) for partner in partners}
+
+        logger.debug("Built the registry of %d partners", len(partners))
+
+        return registry
+
+    def is_fresh(self) -> bool:
+        now: float = time.monotonic()
+        if now - self.built_at > settings.TIMEOUT_CACHE_SHORT:
+            return False
+
+        if now - self.checked_at < PARTNERS_REGISTRY_VERSION_CHECK_SECONDS:
+            return True
+
+        self.checked_at = now
+
+        return self._current_version() == self.version
+
+    def get_partner(self, subdomain: str) -> Partner | None:
+        return copy.deepcopy(self.partners.get(subdomain.lower()))
+
+    def get_first_partner(self) -> Partner | None:
+        return copy.deepcopy(self.first_partner)
+
+    def get_causes(self, partner: Partner) -> list[Cause]:
+        """
+        The causes of the landing page of the partner, in their display order
+        """
+        causes: list[Cause] | None = self.causes.get(partner.pk)
+        if causes is None:
+            return list(partner.ordered_causes())
+
+        causes = copy.deepcopy(causes)
+        if partner.display_ordering == DisplayOrderingChoices.RANDOM:
+            random.shuffle(causes)
+
+        return causes
+
+
+_registry: PartnersRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def partners_registry() -> PartnersRegistry:
+    """
+    The partners registry of this process, which is built again when the partners or the causes change
+    """
+    global _registry
+
+    registry = _registry
+    if registry is not None and registry.is_fresh():
+        return registry
+
+    # while a thread builds the new registry, the other ones keep using the outdated one, if there is one
+    if not _registry_lock.acquire(blocking=registry is None):
+        return registry
+
+    try:
+        # another thread might have built it in the meantime
+        if _registry is None or _registry is registry:
+            _registry = PartnersRegistry.build()
+
+        return _registry
+    finally:
+        _registry_lock.release()
+
+
+# Without the shared cache, the processes cannot tell each other about the changes, so the partners are queried
+
+
+def get_partner(subdomain: str) -> Partner | None:
+    """
+    The active partner of a subdomain, whatever its case
+    """
+    if not settings.ENABLE_CACHE:
+        return Partner.active.filter(subdomain__iexact=subdomain).first()
+
+    return partners_registry().get_partner(subdomain)
+
+
+def get_first_partner() -> Partner | None:
+    if not settings.ENABLE_CACHE:
+        return Partner.active.order_by("pk").first()
+
+    return partners_registry().get_first_partner()
+
+
+def get_partner_causes(partner: Partner) -> list[Cause]:
+    """
+    The causes of the landing page of the partner, in their display order
+    """
+    if not settings.ENABLE_CACHE:
+        return list(partner.ordered_causes())
+
+    return partners_registry().get_causes(partner)
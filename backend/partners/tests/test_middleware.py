@@ -1,6 +1,15 @@
-from django.test import TestCase
+from unittest import mock
 
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from donations.models.ngos import Cause, Ngo
+from partners import registry
 from partners.middleware import InvalidSubdomain, PartnerDomainMiddleware
+from partners.models import DisplayOrderingChoices, Partner, PartnerCause
+from partners.registry import partners_registry
 
 
 class PartnerMiddlewareTests(TestCase):
@@ -17,3 +26,97 @@ class PartnerMiddlewareTests(TestCase):
         self.assertRaises(
             InvalidSubdomain, PartnerDomainMiddleware.extract_subdomain, "test1.example.ORG", "example.com"
         )
+
+
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "partners"}}
+
+
+@override_settings(ENABLE_CACHE=True, CACHES=LOCMEM_CACHES, FORCE_PARTNER=False)
+class PartnersRegistryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        registry._registry = None
+
+        ngo = Ngo.objects.create(name="Test NGO", registration_number="6859662", is_active=True)
+        self.causes: list[Cause] = [
+            Cause.objects.create(
+                ngo=ngo,
+                is_main=index == 0,
+                name=name,
+                slug=f"cause-{index}",
+                bank_account=f"RO25RZBR678214654591293{index}",
+            )
+            for index, name in enumerate(["Beta", "Alpha"])
+        ]
+
+        self.partner = Partner.objects.create(
+            name="Partner", subdomain="Partener", display_ordering=DisplayOrderingChoices.ALPHABETICAL
+        )
+        for cause in self.causes:
+            PartnerCause.objects.create(partner=self.partner, cause=cause)
+
+        self.middleware = PartnerDomainMiddleware(lambda request: HttpResponse())
+
+    def _request(self, subdomain: str):
+        host: str = f"{subdomain}.{settings.APEX_DOMAIN}" if subdomain else settings.APEX_DOMAIN
+        request = RequestFactory().get("/", HTTP_HOST=host)
+
+        return request, self.middleware(request)
+
+    def test_the_partners_are_resolved_without_queries(self):
+        self._request("partener")
+
+        with self.assertNumQueries(0):
+            request, response = self._request("partener")
+            self.assertEqual(request.partner, self.partner)
+            self.assertEqual(partners_registry().get_causes(request.partner), [self.causes[1], self.causes[0]])
+
+            # the subdomains without a partner are cached too
+            request, response = self._request("missing")
+            self.assertIsNone(request.partner)
+            self.assertEqual(response.status_code, 302)
+
+            request, response = self._request("")
+            self.assertIsNone(request.partner)
+            self.assertEqual(response.status_code, 200)
+
+    @mock.patch.object(registry, "PARTNERS_REGISTRY_VERSION_CHECK_SECONDS", 0)
+    def test_the_registry_is_built_again_when_the_partners_change(self):
+        self._request("partener")
+
+        self.partner.is_active = False
+        self.partner.save()
+
+        request, response = self._request("partener")
+        self.assertIsNone(request.partner)
+        self.assertEqual(response.status_code, 302)
+
+        self.partner.is_active = True
+        self.partner.display_ordering = DisplayOrderingChoices.ALPHABETICAL_REVERSE
+        self.partner.save()
+
+        request, _ = self._request("partener")
+        self.assertEqual(partners_registry().get_causes(request.partner), self.causes)
+
+    def test_every_request_gets_its_own_copies(self):
+        request, _ = self._request("partener")
+        request.partner.name = "Changed"
+
+        causes: list[Cause] = partners_registry().get_causes(request.partner)
+        causes[0].name = "Changed"
+
+        request, _ = self._request("partener")
+        self.assertEqual(request.partner.name, "Partner")
+        self.assertEqual(partners_registry().get_causes(request.partner)[0].name, "Alpha")
+
+    @override_settings(ENABLE_CACHE=False)
+    def test_the_partners_are_queried_without_the_cache(self):
+        with self.assertNumQueries(1):
+            request, _ = self._request("partener")
+            self.assertEqual(request.partner, self.partner)
+
+        with self.assertNumQueries(1):
+            request, response = self._request("missing")
+            self.assertEqual(response.status_code, 302)
+
+        self.assertIsNone(registry._registry)
@@ -1,5 +1,225 @@
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime, tzinfo
+from datetime import time as datetime_time
+from decimal import Decimal
+from functools import wraps
+from inspect import signature
+from typing import Any
+
 from django.conf import settings
 from django.core.cache import cache
+from django.core.cache.backends.base import BaseCache
+from django.core.exceptions import EmptyResultSet
+from django.db import models
+from django.db.models import QuerySet
+
+logger = logging.getLogger(__name__)
+
+# How long a caller waits for the value computed by another caller, before computing it too
+RECOMPUTE_WAIT_SECONDS = 5
+# How long a caller can recompute a value, before another caller is allowed to recompute it too
+RECOMPUTE_LOCK_SECONDS = 30
+# The waiting callers check for the value less and less often, since every check reads the shared cache
+RECOMPUTE_POLL_SECONDS = 0.05
+RECOMPUTE_POLL_MAX_SECONDS = 0.5
+# The values expire a bit earlier, at random, so that the values cached together are not recomputed together
+FRESHNESS_JITTER = 0.1
+
+# The counters are kept in each process and added to the shared ones from time to time
+CACHE_STATISTICS_FLUSH_SECONDS = 30
+CACHE_STATISTICS_KEY = "CACHE_STATISTICS__{prefix}__{event}"
+CACHE_STATISTICS_EVENTS = ("hits", "stale_hits", "misses")
+
+_statistics: Counter[tuple[str, str]] = Counter()
+_statistics_prefixes: set[str] = set()
+_statistics_lock = threading.Lock()
+_statistics_flushed_at: float = time.monotonic()
+
+
+def get_cache_version(version_key: str) -> int | None:
+    """
+    The current version of the values cached under a version key, or None with the cache disabled
+    """
+    if not settings.ENABLE_CACHE:
+        return None
+
+    return cache.get_or_set(version_key, time.time_ns, timeout=None)
+
+
+def invalidate_cache_version(version_key: str):
+    """
+    Outdate every value cached under the version key at once, instead of deleting them one by one.
+
+    The versions are timestamps, so that an old version is not reused after the cache is cleared.
+    """
+    if settings.ENABLE_CACHE:
+        cache.set(version_key, time.time_ns(), timeout=None)
+
+
+@dataclass(frozen=True, slots=True)
+class CachedValue:
+    value: Any
+    # the value is served as it is until then, and while it is recomputed afterward
+    fresh_until: float
+
+
+def stable_key_part(value: Any) -> str:
+    """
+    Serialize a function argument the same way in every process, unlike hash() or repr(), e.g. a model by its PK
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return json.dumps(value)
+
+    if isinstance(value, models.Model):
+        return f"<{value._meta.label_lower}:{value.pk}>"
+
+    if isinstance(value, models.Manager):
+        value = value.all()
+
+    if isinstance(value, QuerySet):
+        try:
+            query: str = str(value.query)
+        except EmptyResultSet:
+            query = "EMPTY"
+
+        return f"<{value.model._meta.label_lower}:{query}>"
+
+    if isinstance(value, (datetime, date, datetime_time)):
+        return value.isoformat()
+
+    if isinstance(value, (Decimal, uuid.UUID, tzinfo)):
+        return str(value)
+
+    if isinstance(value, (list, tuple)):
+        return f"[{','.join(stable_key_part(item) for item in value)}]"
+
+    if isinstance(value, (set, frozenset)):
+        return f"{{{','.join(sorted(stable_key_part(item) for item in value))}}}"
+
+    if isinstance(value, dict):
+        items: list[str] = sorted(f"{stable_key_part(key)}:{stable_key_part(item)}" for key, item in value.items())
+        return f"{{{','.join(items)}}}"
+
+    raise TypeError(f"Cannot build a cache key from a {type(value).__name__}")
+
+
+def _count(prefix: str, event: str):
+    global _statistics_flushed_at
+
+    with _statistics_lock:
+        _statistics[(prefix, event)] += 1
+
+        if time.monotonic() - _statistics_flushed_at < CACHE_STATISTICS_FLUSH_SECONDS:
+            return
+
+    flush_cache_statistics()
+
+
+def flush_cache_statistics():
+    """
+    Add the counters of this process to the shared ones.
+
+    The shared counters are read and written again, so a few events can be lost when processes flush together.
+    """
+    global _statistics_flushed_at
+
+    with _statistics_lock:
+        counters: dict[tuple[str, str], int] = dict(_statistics)
+        _statistics.clear()
+        _statistics_flushed_at = time.monotonic()
+
+    if not counters:
+        return
+
+    keys: dict[str, int] = {
+        CACHE_STATISTICS_KEY.format(prefix=prefix, event=event): count for (prefix, event), count in counters.items()
+    }
+    current_counts: dict[str, int] = cache.get_many(keys)
+    cache.set_many({key: current_counts.get(key, 0) + count for key, count in keys.items()}, timeout=None)
+
+
+def get_cache_statistics() -> list[dict[str, str | int | float]]:
+    """
+    The hits, the stale hits and the misses of the cached functions, by their key prefixes, across the processes
+    """
+    if not settings.ENABLE_CACHE:
+        return []
+
+    flush_cache_statistics()
+
+    prefixes: list[str] = sorted(_statistics_prefixes)
+    counts: dict[str, int] = cache.get_many(
+        [
+            CACHE_STATISTICS_KEY.format(prefix=prefix, event=event)
+            for prefix in prefixes
+            for event in CACHE_STATISTICS_EVENTS
+        ]
+    )
+
+    statistics: list[dict[str, str | int | float]] = []
+    for prefix in prefixes:
+        row: dict[str, str | int | float] = {"prefix": prefix}
+        for event in CACHE_STATISTICS_EVENTS:
+            row[event] = counts.get(CACHE_STATISTICS_KEY.format(prefix=prefix, event=event), 0)
+
+        calls: int = row["hits"] + row["stale_hits"] + row["misses"]
+        row["hit_rate"] = (row["hits"] + row["stale_hits"]) / calls if calls else 0.0
+
+        statistics.append(row)
+
+    return statistics
+
+
+def _shared_cache() -> BaseCache:
+    # the per-process tier of the TieredCache can still hold a value which another process replaced
+    return getattr(cache, "shared", cache)
+
+
+def _compute(cache_key: str, lock_key: str | None, timeout: int, stale_timeout: int, func, args, kwargs) -> Any:
+    try:
+        value = func(*args, **kwargs)
+
+        fresh_until: float = time.time() + timeout * (1 - random.random() * FRESHNESS_JITTER)
+        cache.set(cache_key, CachedValue(value=value, fresh_until=fresh_until), timeout=timeout + stale_timeout)
+    finally:
+        if lock_key:
+            _shared_cache().delete(lock_key)
+
+    return value
+
+
+def _get_fresh_value(cache_key: str) -> CachedValue | None:
+    cached_value = _shared_cache().get(cache_key)
+    if isinstance(cached_value, CachedValue) and time.time() < cached_value.fresh_until:
+        return cached_value
+
+    return None
+
+
+def _wait_for_value(cache_key: str, lock_key: str) -> CachedValue | None:
+    # the value is computed by another caller, unless its lock expires or is released without a value
+    poll_seconds: float = RECOMPUTE_POLL_SECONDS
+    deadline: float = time.monotonic() + RECOMPUTE_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(poll_seconds)
+        poll_seconds = min(2 * poll_seconds, RECOMPUTE_POLL_MAX_SECONDS)
+
+        values: dict[str, Any] = _shared_cache().get_many([cache_key, lock_key])
+        if isinstance(cached_value := values.get(cache_key), CachedValue):
+            return cached_value
+
+        if lock_key not in values:
+            break
+
+    return None
 
 
 def cache_decorator(
@@ -8,37 +228,83 @@ def cache_decorator(
     cache_key: str | None = None,
     cache_key_prefix: str | None = None,
     cache_key_custom: str | None = None,
+    stale_timeout: int | None = None,
 ):
+    """
+    Cache the results of a function, under a fixed key, a key formatted with the arguments (cache_key_custom)
+    or a prefix and a digest of the arguments (cache_key_prefix). The "self" or "cls" argument is left out.
+
+    Only one caller recomputes a missing or expired value, while the other ones wait for it or, for at most
+    stale_timeout seconds (by default, the timeout) after the value expired, get the expired value.
+    """
+    if not cache_key and not cache_key_prefix and not cache_key_custom:
+        raise ValueError("Either cache_key, cache_key_prefix, or cache_key_custom must be provided")
+
+    if stale_timeout is None:
+        stale_timeout = timeout
+
+    statistics_prefix: str = cache_key or cache_key_prefix or cache_key_custom.split("{")[0].rstrip("_")
+    _statistics_prefixes.add(statistics_prefix)
+
     def decorator(func):
-        def wrapper(*args, **kwargs):
-            if not cache_key and not cache_key_prefix and not cache_key_custom:
-                raise ValueError("Either cache_key, cache_key_prefix, or cache_key_custom must be provided")
+        parameters: list[str] = list(signature(func).parameters)
+        skips_first_argument: bool = bool(parameters) and parameters[0] in ("self", "cls")
+        function_name: str = f"{func.__module__}.{func.__qualname__}"
 
+        def _build_cache_key(args: tuple, kwargs: dict) -> str:
             if cache_key:
-                _cache_key: str = cache_key
-            elif cache_key_custom:
+                return cache_key
+
+            if cache_key_custom:
                 # noinspection StrFormat
-                _cache_key: str = cache_key_custom.format(*args, **kwargs)
-            else:
-                cache_suffix = (
-                    hash(f"{func.__name__}__{str(args)}_{str(kwargs)}")
-                    .to_bytes(length=8, byteorder="big", signed=True)
-                    .hex()
-                )
-                _cache_key: str = f"{cache_key_prefix}__{cache_suffix}"
-
-            if settings.ENABLE_CACHE:
-                sentinel = object()
-                cached_value = cache.get(_cache_key, sentinel)
-                if cached_value is not sentinel:
-                    return cached_value
-
-            return_value = func(*args, **kwargs)
-
-            if settings.ENABLE_CACHE:
-                cache.set(cache_key, return_value, timeout=timeout)
-
-            return return_value
+                return cache_key_custom.format(*args, **kwargs)
+
+            key_arguments: tuple = args[1:] if skips_first_argument else args
+            serialized_arguments: str = f"{function_name}|{stable_key_part(key_arguments)}|{stable_key_part(kwargs)}"
+
+            return f"{cache_key_prefix}__{hashlib.sha256(serialized_arguments.encode()).hexdigest()[:32]}"
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not settings.ENABLE_CACHE:
+                return func(*args, **kwargs)
+
+            try:
+                _cache_key: str = _build_cache_key(args, kwargs)
+            except TypeError as e:
+                # a value which cannot be keyed is a bug of the caller, but the result is still returned
+                logger.warning("Calling %s without the cache: %s", function_name, e)
+                return func(*args, **kwargs)
+
+            lock_key: str = f"{_cache_key}__lock"
+
+            cached_value = cache.get(_cache_key)
+            if isinstance(cached_value, CachedValue) and time.time() < cached_value.fresh_until:
+                _count(statistics_prefix, "hits")
+                return cached_value.value
+
+            # the lock is only kept in the shared cache, where the other processes see it
+            if _shared_cache().add(lock_key, 1, timeout=RECOMPUTE_LOCK_SECONDS):
+                # the value might have been recomputed since this process cached it
+                if fresh_value := _get_fresh_value(_cache_key):
+                    _shared_cache().delete(lock_key)
+                    _count(statistics_prefix, "hits")
+                    return fresh_value.value
+
+                _count(statistics_prefix, "misses")
+                return _compute(_cache_key, lock_key, timeout, stale_timeout, func, args, kwargs)
+
+            # another caller is already recomputing the expired value
+            if isinstance(cached_value, CachedValue):
+                _count(statistics_prefix, "stale_hits")
+                return cached_value.value
+
+            _count(statistics_prefix, "misses")
+
+            if computed_value := _wait_for_value(_cache_key, lock_key):
+                return computed_value.value
+
+            return _compute(_cache_key, None, timeout, stale_timeout, func, args, kwargs)
 
         return wrapper
 
@@ -0,0 +1,21 @@
+import logging
+import multiprocessing
+
+logger = logging.getLogger(__name__)
+
+
+def can_use_processes(processes_count: int) -> bool:
+    """
+    Check if the work can be split between `processes_count` processes.
+
+    Daemonic processes cannot have children, so the daemonized django-q workers
+    (see DJANGO_Q_DAEMONIZE_WORKERS) do the work in their own process.
+    """
+    if processes_count <= 1:
+        return False
+
+    if multiprocessing.current_process().daemon:
+        logger.warning("Daemonic processes cannot start child processes; the work is done in the same process")
+        return False
+
+    return True
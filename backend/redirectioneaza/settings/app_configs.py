@@ -20,10 +20,21 @@ DEFAULT_RUN_METHOD = env.str("DEFAULT_RUN_METHOD")
 FORMS_DOWNLOAD_METHOD = env.str("FORMS_DOWNLOAD_METHOD", DEFAULT_RUN_METHOD)
 DONATIONS_CSV_DOWNLOAD_METHOD = env.str("DONATIONS_CSV_DOWNLOAD_METHOD", DEFAULT_RUN_METHOD)
 USER_ANONYMIZATION_METHOD = env.str("USER_ANONYMIZATION_METHOD", DEFAULT_RUN_METHOD)
+# How the PDF file and the emails of a new redirection are handled after the donor is saved
+REDIRECTION_PROCESSING_METHOD = env.str("REDIRECTION_PROCESSING_METHOD", DEFAULT_RUN_METHOD)
 
 DONATIONS_XML_LIMIT_PER_FILE = env.int("DONATIONS_XML_LIMIT_PER_FILE")
 DONATIONS_CSV_LIMIT_PER_FILE = env.int("DONATIONS_CSV_LIMIT_PER_FILE")
 
+# How many redirection forms are fetched in parallel while building an archive
+FORMS_DOWNLOAD_WORKERS_COUNT = env.int("FORMS_DOWNLOAD_WORKERS_COUNT")
+# How many processes build the county partitions of a large archive; 1 builds every archive in the same process
+FORMS_DOWNLOAD_PROCESSES_COUNT = env.int("FORMS_DOWNLOAD_PROCESSES_COUNT")
+# How many compressed forms are saved in the storage at once, so that a crashed archive job can resume; 0 disables it
+FORMS_DOWNLOAD_CHECKPOINT_COUNT = env.int("FORMS_DOWNLOAD_CHECKPOINT_COUNT")
+# How many processes render the forms in bulk, e.g. when the prefilled forms are regenerated; 1 renders them in place
+FORMS_RENDERING_PROCESSES_COUNT = env.int("FORMS_RENDERING_PROCESSES_COUNT")
+
 REDIRECTIONS_LIMIT_MONTH_NAME = MONTHS[REDIRECTIONS_DEADLINE_MONTH - 1]["month"]
 
 START_YEAR = 2016
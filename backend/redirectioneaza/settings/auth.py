@@ -44,6 +44,8 @@ NGOHUB_API_HOST = env("NGOHUB_API_HOST")
 NGOHUB_API_BASE = f"https://{NGOHUB_API_HOST}/"
 NGOHUB_API_ACCOUNT = env("NGOHUB_API_ACCOUNT")
 NGOHUB_API_KEY = env("NGOHUB_API_KEY")
+# How many organization profiles are fetched from NGO Hub in parallel by the bulk synchronization
+NGOHUB_SYNC_WORKERS_COUNT = env.int("NGOHUB_SYNC_WORKERS_COUNT")
 
 # NGO Hub user roles
 NGOHUB_ROLE_SUPER_ADMIN = "super-admin"
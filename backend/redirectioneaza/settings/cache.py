@@ -7,15 +7,45 @@ TIMEOUT_CACHE_SHORT = 5 * MINUTE
 TIMEOUT_CACHE_NORMAL = 15 * MINUTE
 TIMEOUT_CACHE_LONG = 2 * HOUR
 
+# The backends of the shared cache, with their default locations;
+# "redis" and "memcached" need the redis and the pymemcache packages
+SHARED_CACHE_BACKENDS = {
+    "database": ("django.core.cache.backends.db.DatabaseCache", "redirect_cache_default"),
+    "redis": ("django.core.cache.backends.redis.RedisCache", "redis://localhost:6379/0"),
+    "memcached": ("django.core.cache.backends.memcached.PyMemcacheCache", "localhost:11211"),
+    # an in-memory stand-in for the local development, which is not shared between the processes
+    "memory": ("django.core.cache.backends.locmem.LocMemCache", "redirect_cache_shared"),
+}
+
 ENABLE_CACHE = env.bool("ENABLE_CACHE")
 if ENABLE_CACHE:
-    CACHES = {
-        "default": {
-            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
-            "LOCATION": "redirect_cache_default",
-            "TIMEOUT": TIMEOUT_CACHE_NORMAL,  # default cache timeout in seconds
-        }
+    CACHE_BACKEND = env.str("CACHE_BACKEND")
+    if CACHE_BACKEND not in SHARED_CACHE_BACKENDS:
+        raise Exception(f"CACHE_BACKEND must be one of: {', '.join(SHARED_CACHE_BACKENDS)}")
+
+    shared_cache_backend, shared_cache_location = SHARED_CACHE_BACKENDS[CACHE_BACKEND]
+    shared_cache = {
+        "BACKEND": shared_cache_backend,
+        "LOCATION": env.str("CACHE_LOCATION") or shared_cache_location,
+        "TIMEOUT": TIMEOUT_CACHE_NORMAL,  # default cache timeout in seconds
     }
+
+    if env.bool("ENABLE_CACHE_LOCAL_TIER"):
+        CACHES = {
+            "default": {
+                "BACKEND": "utils.tiered_cache.TieredCache",
+                "LOCATION": "shared",
+                "TIMEOUT": TIMEOUT_CACHE_NORMAL,
+                "OPTIONS": {
+                    # the values are kept in each process for a few seconds, in front of the shared cache
+                    "LOCAL_TIMEOUT": env.int("CACHE_LOCAL_TIMEOUT"),
+                    "MAX_ENTRIES": env.int("CACHE_LOCAL_MAX_ENTRIES"),
+                },
+            },
+            "shared": shared_cache,
+        }
+    else:
+        CACHES = {"default": shared_cache}
 else:
     CACHES = {
         "default": {
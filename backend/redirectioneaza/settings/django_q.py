@@ -9,6 +9,7 @@ Q_CLUSTER_RECYCLE: int = env.int("DJANGO_Q_RECYCLE_RATE")
 Q_CLUSTER_TIMEOUT: int = env.int("DJANGO_Q_TIMEOUT_SECONDS")
 Q_CLUSTER_RETRY: int = Q_CLUSTER_TIMEOUT + (env.int("DJANGO_Q_RETRY_AFTER_TIMEOUT_SECONDS") or 1)
 Q_CLUSTER_POLL: int = env.int("DJANGO_Q_POLL_SECONDS")
+Q_CLUSTER_DAEMONIZE_WORKERS: bool = env.bool("DJANGO_Q_DAEMONIZE_WORKERS")
 
 Q_CLUSTER = {
     "name": "redirect",
@@ -26,6 +27,7 @@ Q_CLUSTER = {
     "poll": Q_CLUSTER_POLL,
     "guard_cycle": 3,
     "catch_up": False,
+    "daemonize_workers": Q_CLUSTER_DAEMONIZE_WORKERS,
 }
 
 IMPORT_METHOD = env.str("IMPORT_METHOD")
@@ -17,6 +17,11 @@ env = environ.Env(
     ALLOW_OLD_PASSWORDS=(bool, True),
     SESSION_COOKIE_SECURE=(bool, True),
     ENABLE_CACHE=(bool, True),
+    CACHE_BACKEND=(str, "database"),
+    CACHE_LOCATION=(str, ""),
+    ENABLE_CACHE_LOCAL_TIER=(bool, True),
+    CACHE_LOCAL_TIMEOUT=(int, 5),
+    CACHE_LOCAL_MAX_ENTRIES=(int, 1000),
     IS_CONTAINERIZED=(bool, False),
     RECAPTCHA_ENABLED=(bool, True),
     FORCE_PARTNER=(bool, False),
@@ -28,6 +33,7 @@ env = environ.Env(
     FORMS_DOWNLOAD_METHOD=(str, ""),
     DONATIONS_CSV_DOWNLOAD_METHOD=(str, ""),
     USER_ANONYMIZATION_METHOD=(str, ""),
+    REDIRECTION_PROCESSING_METHOD=(str, ""),
     # Forms Download
     ENABLE_FORMS_DOWNLOAD=(bool, True),
     TIMEDELTA_FORMS_DOWNLOAD_MINUTES=(int, 6 * HOUR),
@@ -35,6 +41,11 @@ env = environ.Env(
     UNLIMITED_CURRENT_YEAR_REDIRECTIONS_DOWNLOAD=(bool, True),
     DONATIONS_XML_LIMIT_PER_FILE=(int, 100),
     DONATIONS_CSV_LIMIT_PER_FILE=(int, 1000),
+    FORMS_DOWNLOAD_WORKERS_COUNT=(int, 8),
+    FORMS_DOWNLOAD_PROCESSES_COUNT=(int, 1),
+    FORMS_DOWNLOAD_CHECKPOINT_COUNT=(int, 500),
+    ENABLE_FORMS_DOWNLOAD_MEMBERS_CACHE=(bool, False),
+    FORMS_RENDERING_PROCESSES_COUNT=(int, 1),
     # proxy headers
     USE_PROXY_FORWARDED_HOST=(bool, False),
     PROXY_SSL_HEADER=(str, "HTTP_CLOUDFRONT_FORWARDED_PROTO"),
@@ -76,6 +87,7 @@ env = environ.Env(
     DJANGO_Q_TIMEOUT_SECONDS=(int, 900),  # A task must finish in less than 15 minutes
     DJANGO_Q_RETRY_AFTER_TIMEOUT_SECONDS=(int, 300),  # Retry unfinished tasks 5 minutes after timeout
     DJANGO_Q_POLL_SECONDS=(int, 4),
+    DJANGO_Q_DAEMONIZE_WORKERS=(bool, True),
     DJANGO_Q_LOG_LEVEL=(str, None),
     IMPORT_METHOD=(str, "async"),
     IMPORT_USE_BATCHES=(bool, True),
@@ -126,6 +138,7 @@ env = environ.Env(
     NGOHUB_API_ACCOUNT=(str, ""),
     NGOHUB_API_KEY=(str, ""),
     UPDATE_ORGANIZATION_METHOD=(str, "async"),
+    NGOHUB_SYNC_WORKERS_COUNT=(int, 8),
     # sentry
     SENTRY_DSN=(str, ""),
     SENTRY_TRACES_SAMPLE_RATE=(float, 0),
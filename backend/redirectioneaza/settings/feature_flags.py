@@ -5,6 +5,8 @@ from .environment import env
 ENABLE_NGO_SEARCH_WORD_SIMILARITY = env.bool("ENABLE_NGO_SEARCH_WORD_SIMILARITY", False)
 ENABLE_CAUSE_SEARCH_WORD_SIMILARITY = env.bool("ENABLE_CAUSE_SEARCH_WORD_SIMILARITY", False)
 ENABLE_CAUSE_SEARCH_EXACT_MATCH = env.bool("ENABLE_CAUSE_SEARCH_EXACT_MATCH", True)
+# Answer the search API from an in-memory index of the public causes in every process
+ENABLE_CAUSE_SEARCH_AUTOCOMPLETE_INDEX = env.bool("ENABLE_CAUSE_SEARCH_AUTOCOMPLETE_INDEX", True)
 
 # Feature flags
 ENABLE_FLAG_CONTACT = env.bool("ENABLE_FLAG_CONTACT", False)
@@ -27,6 +29,8 @@ ENABLE_FORMS_DOWNLOAD = env.bool("ENABLE_FORMS_DOWNLOAD", True)
 TIMEDELTA_FORMS_DOWNLOAD_MINUTES = env.int("TIMEDELTA_FORMS_DOWNLOAD_MINUTES")
 TIMEDELTA_REDIRECTIONS_LIMIT_DOWNLOAD_DAYS = env.int("TIMEDELTA_REDIRECTIONS_LIMIT_DOWNLOAD_DAYS")
 UNLIMITED_CURRENT_YEAR_REDIRECTIONS_DOWNLOAD = env.bool("UNLIMITED_CURRENT_YEAR_REDIRECTIONS_DOWNLOAD")
+# Keep the compressed forms in the storage, so that the next archives copy them instead of compressing them again
+ENABLE_FORMS_DOWNLOAD_MEMBERS_CACHE = env.bool("ENABLE_FORMS_DOWNLOAD_MEMBERS_CACHE")
 
 FORCE_PARTNER = False
 if DEBUG:
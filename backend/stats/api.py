@@ -1,9 +1,19 @@
+from collections.abc import Callable, Iterable
 from datetime import date
 from decimal import Decimal
 
-from django.db.models import Sum
+from django.db.models import F, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncYear
+from django.utils.timezone import now
 
-from stats.models import Stat
+from stats.models import Counter, Stat
+
+# The periods which a series can be grouped by, each starting on the date which it is keyed by
+SERIES_GRANULARITIES = {
+    "day": TruncDay,
+    "month": TruncMonth,
+    "year": TruncYear,
+}
 
 
 def get_single_total_stat(*, key_name: str) -> Decimal:
@@ -67,3 +77,98 @@ def get_stats_total_between_dates(
     ).aggregate(total_value=Sum("value"))
 
     return returnable_stats["total_value"] or Decimal(0)
+
+
+def get_series(
+    *,
+    key_names: Iterable[str],
+    from_date: date,
+    to_date: date,
+    granularity: str = "month",
+) -> dict[str, dict[date, Decimal]]:
+    """
+    Retrieves the totals of several statistic keys, by day, month or year, with a single grouped query.
+
+    Parameters:
+        key_names (Iterable[str]): The names of the statistic keys to retrieve.
+        from_date (date): The start date for filtering the statistics.
+        to_date (date): The end date for filtering the statistics.
+        granularity (str): The period of the totals: "day", "month" or "year".
+
+    Returns:
+        dict[str, dict[date, Decimal]]: The totals of each key, by the first day of their period;
+        the periods without statistics are missing.
+    """
+    if granularity not in SERIES_GRANULARITIES:
+        raise ValueError(f"granularity must be one of: {', '.join(SERIES_GRANULARITIES)}")
+
+    key_names = [str(key_name) for key_name in key_names]
+
+    series: dict[str, dict[date, Decimal]] = {key_name: {} for key_name in key_names}
+    if not key_names:
+        return series
+
+    totals = (
+        Stat.objects.filter(
+            name__in=key_names,
+            date__gte=from_date,
+            date__lte=to_date,
+        )
+        .annotate(period=SERIES_GRANULARITIES[granularity]("date"))
+        .values("name", "period")
+        .annotate(total_value=Sum("value"))
+        .order_by()
+    )
+
+    for total in totals:
+        series[total["name"]][total["period"]] = total["total_value"] or Decimal(0)
+
+    return series
+
+
+def get_counter(*, name: str, default: Callable[[], int]) -> int:
+    """
+    Retrieves the value of a live counter, which is counted from scratch when it is missing.
+
+    Parameters:
+        name (str): The name of the counter.
+        default (Callable[[], int]): Counts the value of a missing counter.
+
+    Returns:
+        int: The value of the counter.
+    """
+    try:
+        return Counter.objects.values_list("value", flat=True).get(name=name)
+    except Counter.DoesNotExist:
+        pass
+
+    counter, _ = Counter.objects.get_or_create(name=name, defaults={"value": default()})
+
+    return counter.value
+
+
+def increment_counters(deltas: dict[str, int]) -> None:
+    """
+    Atomically adds to the live counters which exist; the missing ones are counted from scratch when read.
+
+    Parameters:
+        deltas (dict[str, int]): The amounts to add, by the names of the counters.
+    """
+    for name, delta in deltas.items():
+        if delta:
+            Counter.objects.filter(name=name).update(value=F("value") + delta, updated_at=now())
+
+
+def set_counters(values: dict[str, int]) -> None:
+    """
+    Overwrites the values of several live counters at once, e.g. with the ones reconciled with the statistics.
+
+    Parameters:
+        values (dict[str, int]): The values of the counters, by their names.
+    """
+    Counter.objects.bulk_create(
+        [Counter(name=name, value=value) for name, value in values.items()],
+        update_conflicts=True,
+        unique_fields=["name"],
+        update_fields=["value", "updated_at"],
+    )
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.12 on 2026-10-18 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stats', '0002_alter_stat_options'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='stat',
+            constraint=models.UniqueConstraint(fields=('name', 'date'), name='unique_stat_exact_name_date'),
+        ),
+    ]
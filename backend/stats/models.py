@@ -28,4 +28,28 @@ class Stat(models.Model):
                 "date",
                 name="unique_stat_name_date",
             ),
+            # the conflict target of the statistics generated in bulk
+            models.UniqueConstraint(
+                fields=["name", "date"],
+                name="unique_stat_exact_name_date",
+            ),
         ]
+
+
+class Counter(models.Model):
+    """
+    A live counter, changed by the events which it counts and reconciled with the statistics from time to time
+    """
+
+    name = models.CharField(_("name"), max_length=100, unique=True)
+
+    value = models.BigIntegerField(_("value"), default=0)
+
+    updated_at = models.DateTimeField(_("updated at"), auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+    class Meta:
+        verbose_name = _("counter")
+        verbose_name_plural = _("counters")
@@ -0,0 +1,81 @@
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+
+from donations.models.stat_configs import StatsChoices
+from donations.views.dashboard.admin_dashboard import _create_chart_statistics
+from donations.views.dashboard.stats_helpers.yearly import get_stats_for_years
+from stats.api import get_series
+from stats.models import Stat
+
+
+class SeriesTests(TestCase):
+    def setUp(self):
+        Stat.objects.bulk_create(
+            [
+                Stat(name=StatsChoices.REDIRECTIONS_PER_DAY, date=date(2023, 1, 5), value=2),
+                Stat(name=StatsChoices.REDIRECTIONS_PER_DAY, date=date(2023, 1, 20), value=3),
+                Stat(name=StatsChoices.REDIRECTIONS_PER_DAY, date=date(2023, 4, 1), value=7),
+                Stat(name=StatsChoices.REDIRECTIONS_PER_DAY, date=date(2024, 2, 29), value=11),
+                Stat(name=StatsChoices.NGOS_REGISTERED_PER_YEAR, date=date(2023, 1, 1), value=4),
+                Stat(name=StatsChoices.NGOS_ACTIVE_PER_YEAR, date=date(2024, 1, 1), value=5),
+                Stat(name=StatsChoices.NGOS_REGISTERED, date=None, value=100),
+            ]
+        )
+
+    def test_the_series_are_grouped_by_period(self):
+        with self.assertNumQueries(1):
+            series = get_series(
+                key_names=[StatsChoices.REDIRECTIONS_PER_DAY, StatsChoices.NGOS_REGISTERED_PER_YEAR],
+                from_date=date(2023, 1, 1),
+                to_date=date(2024, 12, 31),
+                granularity="month",
+            )
+
+        self.assertEqual(
+            series,
+            {
+                StatsChoices.REDIRECTIONS_PER_DAY: {
+                    date(2023, 1, 1): Decimal(5),
+                    date(2023, 4, 1): Decimal(7),
+                    date(2024, 2, 1): Decimal(11),
+                },
+                StatsChoices.NGOS_REGISTERED_PER_YEAR: {date(2023, 1, 1): Decimal(4)},
+            },
+        )
+
+        yearly_series = get_series(
+            key_names=[StatsChoices.REDIRECTIONS_PER_DAY, StatsChoices.NGOS_WITH_NGOHUB_PER_YEAR],
+            from_date=date(2023, 2, 1),
+            to_date=date(2024, 12, 31),
+            granularity="year",
+        )
+        self.assertEqual(
+            yearly_series,
+            {
+                StatsChoices.REDIRECTIONS_PER_DAY: {date(2023, 1, 1): Decimal(7), date(2024, 1, 1): Decimal(11)},
+                StatsChoices.NGOS_WITH_NGOHUB_PER_YEAR: {},
+            },
+        )
+
+        with self.assertRaises(ValueError):
+            get_series(key_names=[], from_date=date(2023, 1, 1), to_date=date(2023, 1, 1), granularity="week")
+
+    @override_settings(START_YEAR=2016, REDIRECTIONS_LIMIT_TO_CURRENT_YEAR=False, REDIRECTIONS_DEADLINE_MONTH=5)
+    def test_the_admin_dashboard_queries_do_not_grow_with_the_years(self):
+        with self.assertNumQueries(1):
+            chart: dict[str, str] = _create_chart_statistics.__wrapped__()
+        self.assertIn('"label": "2023", "data": [5, 0, 0, 7, 0]', chart["data"])
+        self.assertIn('"label": "2024", "data": [0, 11, 0, 0, 0]', chart["data"])
+
+        with self.assertNumQueries(1):
+            yearly_stats: list[dict] = get_stats_for_years(list(range(2016, 2025)))
+
+        metrics: dict[int, list[int]] = {
+            statistic["year"]: [statistic["donations"], statistic["ngos_registered"], statistic["ngos_with_forms"]]
+            for statistic in yearly_stats
+        }
+        self.assertEqual(metrics[2016], [0, 0, 0])
+        self.assertEqual(metrics[2023], [12, 4, 0])
+        self.assertEqual(metrics[2024], [11, 0, 5])
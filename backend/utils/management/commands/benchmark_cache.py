@@ -0,0 +1,129 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import BaseCommand, call_command
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+
+from redirectioneaza.common.testing.client import ApexClient
+
+BENCHMARK_CACHE_TABLE = "redirect_cache_benchmark"
+LOCAL_TIER_OPTIONS = {"LOCAL_TIMEOUT": 5, "MAX_ENTRIES": 1000}
+
+
+def _tiered(shared_cache: dict) -> dict:
+    return {
+        "default": {
+            "BACKEND": "utils.tiered_cache.TieredCache",
+            "LOCATION": "shared",
+            "TIMEOUT": settings.TIMEOUT_CACHE_NORMAL,
+            "OPTIONS": LOCAL_TIER_OPTIONS,
+        },
+        "shared": shared_cache,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the latency of the cache and of a cached view (the home page) with each cache configuration: "
+        "the shared cache alone and behind the per-process tier. "
+        "Redis and memcached are only benchmarked if their location is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests",
+            type=int,
+            help="The number of requests of the cached view for each configuration",
+            default=200,
+        )
+        parser.add_argument(
+            "--reads",
+            type=int,
+            help="The number of cache reads for each configuration",
+            default=2_000,
+        )
+        parser.add_argument(
+            "--redis",
+            help="The location of a Redis server, e.g. redis://localhost:6379/0",
+        )
+        parser.add_argument(
+            "--memcached",
+            help="The location of a memcached server, e.g. localhost:11211",
+        )
+
+    def handle(self, *args, **options):
+        shared_caches: dict[str, dict] = {
+            "database": {
+                "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+                "LOCATION": BENCHMARK_CACHE_TABLE,
+            },
+            "memory": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "redirect_cache_benchmark",
+            },
+        }
+        if options["redis"]:
+            shared_caches["redis"] = {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                "LOCATION": options["redis"],
+            }
+        if options["memcached"]:
+            shared_caches["memcached"] = {
+                "BACKEND": "django.core.cache.backends.memcached.PyMemcacheCache",
+                "LOCATION": options["memcached"],
+            }
+
+        configurations: dict[str, dict] = {
+            "disabled": {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}},
+        }
+        for name, shared_cache in shared_caches.items():
+            configurations[name] = {"default": {**shared_cache, "TIMEOUT": settings.TIMEOUT_CACHE_NORMAL}}
+            configurations[f"{name} + local"] = _tiered(shared_cache)
+
+        self.stdout.write(f"{'configuration':>18} | {'cache read':>12} | {'view p50':>10} | {'view p95':>10}")
+
+        for name, configuration in configurations.items():
+            with override_settings(ENABLE_CACHE=name != "disabled", CACHES=configuration):
+                self._benchmark(name, options["reads"], options["requests"])
+
+        self.stdout.write(self.style.SUCCESS("Done!"))
+
+    def _benchmark(self, name: str, reads_count: int, requests_count: int):
+        uses_table: bool = name.startswith("database")
+        if uses_table:
+            call_command("createcachetable", database="default")
+
+        cache = caches["default"]
+        try:
+            cache.set("benchmark_cache_key", {"value": list(range(100))})
+
+            start = time.perf_counter()
+            for _ in range(reads_count):
+                cache.get("benchmark_cache_key")
+            read_latency: float = (time.perf_counter() - start) / reads_count
+
+            client = ApexClient()
+            url: str = reverse("home")
+            # the first request fills in the cache
+            client.get(url)
+
+            latencies: list[float] = []
+            for _ in range(requests_count):
+                start = time.perf_counter()
+                client.get(url)
+                latencies.append(time.perf_counter() - start)
+        finally:
+            cache.clear()
+            if uses_table:
+                with connection.cursor() as cursor:
+                    cursor.execute(f"DROP TABLE {BENCHMARK_CACHE_TABLE}")
+
+        percentiles: list[float] = statistics.quantiles(latencies, n=100, method="inclusive")
+        self.stdout.write(
+            f"{name:>18} | {read_latency * 1_000_000:>10.1f}µs | "
+            f"{percentiles[49] * 1000:>8.2f}ms | {percentiles[94] * 1000:>8.2f}ms"
+        )
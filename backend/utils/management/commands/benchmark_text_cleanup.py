@@ -0,0 +1,151 @@
+import random
+import re
+import string
+import time
+import unicodedata
+from collections.abc import Callable
+
+from django.core.management import BaseCommand
+from faker import Faker
+
+from utils.text.cleanup import clean_record
+
+fake = Faker("ro_RO")
+
+# The cleaner used by ANAF for every field of a donor row
+ROW_CLEANERS: dict[str, str] = {
+    "nume": "alphabets",
+    "init": "alphabet",
+    "pren": "alphabets",
+    "cif_c": "numbers",
+    "adresa": "custom",
+    "telefon": "numbers",
+    "email": "email",
+    "denOJ": "alnum",
+    "ibanNp": "alnum",
+}
+
+# How many distinct values are generated for each field, before being combined into rows
+VALUES_POOL_SIZE = 2_000
+
+
+class Command(BaseCommand):
+    help = "Check and benchmark the ANAF text cleanup against the previous character by character implementation."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            help="The number of donor rows in the synthetic corpus",
+            default=100_000,
+        )
+
+    def handle(self, *args, **options):
+        rows_count: int = options["rows"]
+
+        self.stdout.write(f"Building a corpus of {rows_count} rows")
+        rows = self._build_corpus(rows_count)
+
+        legacy_rows, legacy_elapsed = self._time(_legacy_clean_rows, rows)
+        new_rows, new_elapsed = self._time(_clean_rows, rows)
+
+        mismatches: int = sum(
+            1 for legacy_row, new_row in zip(legacy_rows, new_rows, strict=True) if legacy_row != new_row
+        )
+
+        for name, elapsed in (("legacy", legacy_elapsed), ("clean_record", new_elapsed)):
+            self.stdout.write(f"{name:>12} | {elapsed:>7.2f}s | {rows_count / elapsed:>10.1f} rows/s")
+
+        self.stdout.write(f"Speedup: {legacy_elapsed / new_elapsed:.2f}x")
+
+        if mismatches:
+            self.stdout.write(self.style.ERROR(f"{mismatches} rows are cleaned differently"))
+        else:
+            self.stdout.write(self.style.SUCCESS("All the rows are cleaned identically"))
+
+    @staticmethod
+    def _time(function: Callable, rows: list[dict[str, str]]) -> tuple[list[dict[str, str]], float]:
+        start = time.perf_counter()
+        result = function(rows)
+
+        return result, time.perf_counter() - start
+
+    @staticmethod
+    def _build_corpus(rows_count: int) -> list[dict[str, str]]:
+        noise: str = "ăâîșțĂÂÎȘȚ&<>\"'½№–“” \t" + string.punctuation
+
+        def noisy(text: str) -> str:
+            if random.random() < 0.2:
+                position = random.randrange(len(text) + 1)
+                text = text[:position] + random.choice(noise) + text[position:]
+
+            return text
+
+        generators: dict[str, Callable[[], str]] = {
+            "nume": fake.last_name,
+            "init": lambda: random.choice(string.ascii_uppercase + "ȘȚ") + random.choice(["", "."]),
+            "pren": fake.first_name,
+            "cif_c": fake.ssn,
+            "adresa": fake.address,
+            "telefon": fake.phone_number,
+            "email": fake.email,
+            "denOJ": fake.company,
+            "ibanNp": fake.iban,
+        }
+        pools: dict[str, list[str]] = {
+            field: [noisy(generator()) for _ in range(VALUES_POOL_SIZE)] for field, generator in generators.items()
+        }
+
+        return [{field: random.choice(pool) for field, pool in pools.items()} for _ in range(rows_count)]
+
+
+def _clean_rows(rows: list[dict[str, str]]) -> list[dict[str, str]]:
+    return [clean_record({field: (text, ROW_CLEANERS[field]) for field, text in row.items()}) for row in rows]
+
+
+def _legacy_clean_rows(rows: list[dict[str, str]]) -> list[dict[str, str]]:
+    return [{field: _legacy_clean_text(text, ROW_CLEANERS[field]) for field, text in row.items()} for row in rows]
+
+
+def _legacy_clean_text(text: str, clean: str) -> str:
+    if not text:
+        return ""
+
+    text = text[:250]
+    text = unicodedata.normalize("NFKD", text.strip()).encode("ascii", "ignore").decode("ascii")
+    text = _LEGACY_CLEANERS[clean](text)
+    text = " ".join(text.split())
+
+    return text.upper()
+
+
+def _legacy_keep(text: str, keep: Callable[[str], bool], allow_spaces: bool) -> str:
+    new_text: str = ""
+
+    for c in text:
+        if keep(c):
+            new_text += c
+        elif allow_spaces:
+            new_text += " "
+
+    return new_text
+
+
+def _legacy_clean_email(email: str) -> str:
+    if not email or not re.match(r"^[a-zA-Z0-9_\.\-]+@[a-zA-Z0-9]+\.[a-zA-Z0-9.]+$", email):
+        return ""
+
+    return email
+
+
+_LEGACY_CLEANERS: dict[str, Callable[[str], str]] = {
+    "alphabet": lambda text: _legacy_keep(text, str.isalpha, False),
+    "alphabets": lambda text: _legacy_keep(text, str.isalpha, True),
+    "alnum": lambda text: _legacy_keep(text, str.isalnum, False),
+    "alnums": lambda text: _legacy_keep(text, str.isalnum, True),
+    "numbers": lambda text: _legacy_keep(text, str.isnumeric, False),
+    "email": _legacy_clean_email,
+    "custom": lambda text: "".join(
+        [c for c in text if c in string.ascii_letters + string.digits + "," + "." + "-" + " "]
+    ),
+}
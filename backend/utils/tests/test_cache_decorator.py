@@ -0,0 +1,126 @@
+import threading
+import time
+
+from django.core.cache import cache, caches
+from django.test import TestCase, override_settings
+
+from donations.models.ngos import Ngo
+from redirectioneaza.common.cache import (
+    CachedValue,
+    cache_decorator,
+    flush_cache_statistics,
+    get_cache_statistics,
+    stable_key_part,
+)
+from utils.tests.test_tiered_cache import TIERED_CACHES
+
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "decorator"}}
+
+
+@override_settings(ENABLE_CACHE=True, CACHES=LOCMEM_CACHES)
+class CacheDecoratorTests(TestCase):
+    def setUp(self):
+        # the counters of the other tests are flushed before the cache is cleared
+        flush_cache_statistics()
+        cache.clear()
+
+        self.calls: list[tuple] = []
+        self.ngo = Ngo.objects.create(name="Test NGO", registration_number="6859662")
+
+    def _cached_function(self, **decorator_kwargs):
+        @cache_decorator(timeout=60, **decorator_kwargs)
+        def count_calls(*args, **kwargs):
+            self.calls.append(args)
+            time.sleep(0.05)
+            return len(self.calls)
+
+        return count_calls
+
+    def test_the_prefix_keys_are_built_from_the_arguments(self):
+        count_calls = self._cached_function(cache_key_prefix="TEST_PREFIX")
+
+        self.assertEqual(count_calls(self.ngo, year=2025), 1)
+        # another instance of the same NGO, like in another process
+        self.assertEqual(count_calls(Ngo.objects.get(pk=self.ngo.pk), year=2025), 1)
+        self.assertEqual(count_calls(self.ngo, year=2026), 2)
+
+        self.assertEqual(stable_key_part(self.ngo), f"<donations.ngo:{self.ngo.pk}>")
+        self.assertEqual(len([key for key in cache._cache if "TEST_PREFIX__" in key]), 2)
+
+    def test_the_custom_keys_are_stored(self):
+        count_calls = self._cached_function(cache_key_custom="TEST_CUSTOM_{ngo.pk}")
+
+        self.assertEqual(count_calls(ngo=self.ngo), 1)
+        self.assertEqual(count_calls(ngo=self.ngo), 1)
+        self.assertIsInstance(cache.get(f"TEST_CUSTOM_{self.ngo.pk}"), CachedValue)
+
+    def test_the_arguments_without_a_stable_key_are_not_cached(self):
+        count_calls = self._cached_function(cache_key_prefix="TEST_PREFIX")
+
+        with self.assertLogs("redirectioneaza.common.cache", level="WARNING"):
+            self.assertEqual(count_calls(object()), 1)
+            self.assertEqual(count_calls(object()), 2)
+
+        with self.assertRaises(TypeError):
+            stable_key_part(object())
+
+    def test_an_expired_value_is_served_while_another_caller_recomputes_it(self):
+        count_calls = self._cached_function(cache_key="TEST_KEY")
+        cache.set("TEST_KEY", CachedValue(value="stale", fresh_until=time.time() - 1))
+
+        cache.add("TEST_KEY__lock", 1)
+        self.assertEqual(count_calls(), "stale")
+        self.assertEqual(self.calls, [])
+
+        cache.delete("TEST_KEY__lock")
+        self.assertEqual(count_calls(), 1)
+        self.assertEqual(count_calls(), 1)
+
+    def test_a_missing_value_is_computed_once_by_the_concurrent_callers(self):
+        count_calls = self._cached_function(cache_key="TEST_KEY")
+
+        results: list[int] = []
+        threads = [threading.Thread(target=lambda: results.append(count_calls())) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [1] * 6)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_the_waiting_callers_stop_when_the_lock_is_released_without_a_value(self):
+        count_calls = self._cached_function(cache_key="TEST_KEY")
+
+        cache.add("TEST_KEY__lock", 1)
+        threading.Timer(0.1, lambda: cache.delete("TEST_KEY__lock")).start()
+
+        start: float = time.monotonic()
+        self.assertEqual(count_calls(), 1)
+        self.assertLess(time.monotonic() - start, 1)
+
+    @override_settings(CACHES=TIERED_CACHES)
+    def test_the_value_recomputed_by_another_process_is_not_recomputed(self):
+        count_calls = self._cached_function(cache_key="TEST_KEY")
+        shared_cache = caches["shared"]
+
+        # the process still holds the expired value, while another process has recomputed it
+        cache.set("TEST_KEY", CachedValue(value="stale", fresh_until=time.time() - 1))
+        shared_cache.set("TEST_KEY", CachedValue(value="recomputed", fresh_until=time.time() + 60))
+
+        self.assertEqual(count_calls(), "recomputed")
+        self.assertEqual(self.calls, [])
+        self.assertFalse(shared_cache.has_key("TEST_KEY__lock"))
+
+    def test_the_hits_and_misses_are_counted_by_prefix(self):
+        count_calls = self._cached_function(cache_key_prefix="TEST_STATISTICS")
+
+        count_calls(1)
+        count_calls(1)
+        count_calls(2)
+
+        statistics = {statistic["prefix"]: statistic for statistic in get_cache_statistics()}
+        self.assertEqual(
+            statistics["TEST_STATISTICS"],
+            {"prefix": "TEST_STATISTICS", "hits": 1, "stale_hits": 0, "misses": 2, "hit_rate": 1 / 3},
+        )
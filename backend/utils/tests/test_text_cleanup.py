@@ -0,0 +1,131 @@
+import string
+import unicodedata
+
+from django.test import SimpleTestCase
+
+from utils.text.cleanup import (
+    ANAF_TEXT_CLEANERS,
+    clean_anaf_text,
+    clean_record,
+    clean_text_alnum,
+    clean_text_alphabet,
+    clean_text_custom,
+    clean_text_email,
+    clean_text_numbers,
+    normalize_text_alnum,
+    unicode_to_ascii,
+)
+
+SAMPLE_TEXTS = [
+    "",
+    " ",
+    string.printable,
+    "".join(chr(code) for code in range(128)),
+    "Ștefan-Ionuț Țăranu, str. Mărășești nr. 3½, bl. Ⅳ, ap. ٣",
+    "Ａｎａ　Ｍａｒｉａ № 7 – ‘Î’ “Â” ß ﬁ",
+    "école, naïve, coöperate",
+    "emoji 😀 and \x00 NUL\ttab\nnew line",
+    "RO49 AAAA 1B31 0075 9384 0000",
+    "+40 (721) 234-567",
+    'Mihai & Fiii <SRL> "Test"',
+]
+
+
+class CleanTextTests(SimpleTestCase):
+    """
+    The cleaners must keep the behaviour of the character by character implementations.
+    """
+
+    def test_alphabet(self):
+        for text in SAMPLE_TEXTS:
+            with self.subTest(text=text):
+                self.assertEqual(clean_text_alphabet(text), "".join(c for c in text if c.isalpha()))
+                self.assertEqual(
+                    clean_text_alphabet(text, allow_spaces=True),
+                    "".join(c if c.isalpha() else " " for c in text),
+                )
+
+    def test_numbers(self):
+        for text in SAMPLE_TEXTS:
+            with self.subTest(text=text):
+                self.assertEqual(clean_text_numbers(text), "".join(c for c in text if c.isnumeric()))
+                self.assertEqual(
+                    clean_text_numbers(text, allow_spaces=True),
+                    "".join(c if c.isnumeric() else " " for c in text),
+                )
+
+    def test_alnum(self):
+        for text in SAMPLE_TEXTS:
+            with self.subTest(text=text):
+                self.assertEqual(clean_text_alnum(text), "".join(c for c in text if c.isalnum()))
+                self.assertEqual(
+                    clean_text_alnum(text, allow_spaces=True),
+                    "".join(c if c.isalnum() else " " for c in text),
+                )
+
+    def test_custom(self):
+        allowed = string.ascii_letters + string.digits + ",.- "
+
+        for text in SAMPLE_TEXTS:
+            with self.subTest(text=text):
+                self.assertEqual(clean_text_custom(text), "".join(c for c in text if c in allowed))
+
+    def test_unicode_to_ascii(self):
+        for text in SAMPLE_TEXTS:
+            with self.subTest(text=text):
+                self.assertEqual(
+                    unicode_to_ascii(text),
+                    unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii"),
+                )
+
+    def test_normalize_text_alnum(self):
+        self.assertEqual(normalize_text_alnum("Bistrița-Năsăud"), "bistritanasaud")
+        self.assertEqual(normalize_text_alnum("Sector 1"), "sector1")
+
+    def test_email(self):
+        self.assertEqual(clean_text_email("ana.maria_1@example.ro"), "ana.maria_1@example.ro")
+        self.assertEqual(clean_text_email("ana+tag@example.ro"), "")
+        self.assertEqual(clean_text_email("ana@"), "")
+        self.assertEqual(clean_text_email(""), "")
+
+
+class CleanRecordTests(SimpleTestCase):
+    def test_clean_anaf_text(self):
+        self.assertEqual(clean_anaf_text("  Ștefan   cel  Mare ", "alphabets"), "STEFAN CEL MARE")
+        self.assertEqual(clean_anaf_text("Str. Țepeș nr. 3 & bl. 4", "custom"), "STR. TEPES NR. 3 BL. 4")
+        self.assertEqual(clean_anaf_text("0722 123 456", "numbers"), "0722123456")
+        self.assertEqual(clean_anaf_text("Ana@Example.com", "email"), "ANA@EXAMPLE.COM")
+        self.assertEqual(clean_anaf_text("  kept as it is ", ""), "  kept as it is ")
+        self.assertEqual(len(clean_anaf_text("a" * 300, "alphabet")), 250)
+
+    def test_clean_record(self):
+        cleaned = clean_record(
+            {
+                "nume": ("Popescu-Ionescu", "alphabets"),
+                "init": ("ș.", "alphabet"),
+                "cif_c": ("1800101 221144", "numbers"),
+                "fax": (None, ""),
+                "email": ("ana+tag@example.ro", "email"),
+            }
+        )
+
+        self.assertEqual(
+            cleaned,
+            {
+                "nume": "POPESCU IONESCU",
+                "init": "S",
+                "cif_c": "1800101221144",
+                "fax": "",
+                "email": "",
+            },
+        )
+
+    def test_clean_record_matches_single_fields(self):
+        fields = {
+            f"{clean}_{index}": (text, clean) for index, text in enumerate(SAMPLE_TEXTS) for clean in ANAF_TEXT_CLEANERS
+        }
+
+        self.assertEqual(
+            clean_record(fields),
+            {name: clean_anaf_text(text, clean) if text else "" for name, (text, clean) in fields.items()},
+        )
@@ -0,0 +1,71 @@
+import time
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from redirectioneaza.common.cache import get_cache_version, invalidate_cache_version
+
+TIERED_CACHES = {
+    "default": {
+        "BACKEND": "utils.tiered_cache.TieredCache",
+        "LOCATION": "shared",
+        "OPTIONS": {"LOCAL_TIMEOUT": 0.2, "MAX_ENTRIES": 3},
+    },
+    "shared": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "tiered-cache-tests"},
+}
+
+
+@override_settings(ENABLE_CACHE=True, CACHES=TIERED_CACHES)
+class TieredCacheTests(TestCase):
+    def setUp(self):
+        self.cache = caches["default"]
+        self.shared = caches["shared"]
+        self.cache.clear()
+
+    def test_the_shared_values_are_kept_in_the_process_for_a_short_time(self):
+        self.shared.set("key", "first")
+        self.assertEqual(self.cache.get("key"), "first")
+
+        self.shared.set("key", "second")
+        self.assertEqual(self.cache.get("key"), "first")
+
+        time.sleep(0.25)
+        self.assertEqual(self.cache.get("key"), "second")
+
+    def test_the_changes_of_the_process_are_seen_right_away(self):
+        self.cache.set("key", "first")
+        self.assertEqual(self.shared.get("key"), "first")
+
+        self.cache.set("key", "second")
+        self.assertEqual(self.cache.get("key"), "second")
+
+        self.cache.delete("key")
+        self.assertIsNone(self.cache.get("key"))
+        self.assertIsNone(self.shared.get("key"))
+
+    def test_the_least_recently_used_values_are_evicted_from_the_process(self):
+        for key in ("first", "second", "third"):
+            self.cache.set(key, key)
+        self.cache.get("first")
+        self.cache.set("fourth", "fourth")
+
+        self.shared.set("first", "changed")
+        self.shared.set("second", "changed")
+
+        self.assertEqual(self.cache.get_many(["first", "second"]), {"first": "first", "second": "changed"})
+
+    def test_the_readers_get_their_own_copies_of_the_values(self):
+        self.cache.set("key", {"items": [1]})
+        self.cache.get("key")["items"].append(2)
+
+        self.assertEqual(self.cache.get("key"), {"items": [1]})
+
+    def test_the_values_under_a_version_key_are_invalidated_together(self):
+        version: int = get_cache_version("VERSION_KEY")
+        self.cache.set("key", "value", version=version)
+        self.assertEqual(get_cache_version("VERSION_KEY"), version)
+
+        invalidate_cache_version("VERSION_KEY")
+
+        self.assertNotEqual(get_cache_version("VERSION_KEY"), version)
+        self.assertIsNone(self.cache.get("key", version=get_cache_version("VERSION_KEY")))
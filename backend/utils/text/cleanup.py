@@ -1,9 +1,52 @@
 import re
 import string
 import unicodedata
+from collections.abc import Callable, Mapping
+from functools import partial
 
 from django.utils.text import slugify
 
+# ANAF has a limit of 75 to 250 characters for each field
+ANAF_FIELD_MAX_LENGTH = 250
+
+# ANAF has a custom list of characters allowed in the XML: [A-Z, a-z, 0-9, ",", ".", "-", " "]
+# Note: The list sometimes includes "&" but it's not consistent, so we're not including it here.
+ANAF_CUSTOM_CHARACTERS = frozenset(string.ascii_letters + string.digits + "," + "." + "-" + " ")
+
+EMAIL_REGEX = re.compile(r"^[a-zA-Z0-9_\.\-]+@[a-zA-Z0-9]+\.[a-zA-Z0-9.]+$")
+
+
+class CharacterFilterTable(dict):
+    """
+    A `str.translate` table which keeps the characters accepted by `keep` and replaces the other ones.
+
+    The ASCII characters are computed upfront and any other character is computed once, on its first use.
+    """
+
+    def __init__(self, keep: Callable[[str], bool], replacement: str | None = None):
+        super().__init__()
+
+        self.keep = keep
+        self.replacement = replacement
+
+        for code in range(128):
+            self.__missing__(code)
+
+    def __missing__(self, code: int) -> str | None:
+        value = chr(code) if self.keep(chr(code)) else self.replacement
+        self[code] = value
+
+        return value
+
+
+ALPHABET_TABLE = CharacterFilterTable(str.isalpha)
+ALPHABET_SPACES_TABLE = CharacterFilterTable(str.isalpha, " ")
+NUMBERS_TABLE = CharacterFilterTable(str.isnumeric)
+NUMBERS_SPACES_TABLE = CharacterFilterTable(str.isnumeric, " ")
+ALNUM_TABLE = CharacterFilterTable(str.isalnum)
+ALNUM_SPACES_TABLE = CharacterFilterTable(str.isalnum, " ")
+ANAF_CUSTOM_TABLE = CharacterFilterTable(ANAF_CUSTOM_CHARACTERS.__contains__)
+
 
 def strip_accents(source: str) -> str:
     """
@@ -33,6 +76,10 @@ def unicode_to_ascii(text: str) -> str:
     Convert text with diacritics to ASCII.
     """
 
+    # ASCII text is not changed by the normalization
+    if text.isascii():
+        return text
+
     return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
 
 
@@ -58,9 +105,7 @@ def clean_text_email(email: str) -> str:
     Note: Plus-addressing and other characteristics beyond the most basic will not be supported.
     """
 
-    email_regex = r"^[a-zA-Z0-9_\.\-]+@[a-zA-Z0-9]+\.[a-zA-Z0-9.]+$"
-
-    if not email or not re.match(email_regex, email):
+    if not email or not EMAIL_REGEX.match(email):
         return ""
 
     return email
@@ -71,15 +116,7 @@ def clean_text_alphabet(text: str, *, allow_spaces: bool = False) -> str:
     Keep only alphabetic characters and, optionally spaces.
     """
 
-    new_text: str = ""
-
-    for c in text:
-        if c.isalpha():
-            new_text += c
-        elif allow_spaces:
-            new_text += " "
-
-    return new_text
+    return text.translate(ALPHABET_SPACES_TABLE if allow_spaces else ALPHABET_TABLE)
 
 
 def clean_text_numbers(text: str, *, allow_spaces: bool = False) -> str:
@@ -87,15 +124,7 @@ def clean_text_numbers(text: str, *, allow_spaces: bool = False) -> str:
     Keep only numeric characters and, optionally spaces.
     """
 
-    new_text: str = ""
-
-    for c in text:
-        if c.isnumeric():
-            new_text += c
-        elif allow_spaces:
-            new_text += " "
-
-    return new_text
+    return text.translate(NUMBERS_SPACES_TABLE if allow_spaces else NUMBERS_TABLE)
 
 
 def clean_text_alnum(text: str, *, allow_spaces: bool = False) -> str:
@@ -103,26 +132,15 @@ def clean_text_alnum(text: str, *, allow_spaces: bool = False) -> str:
     Keep only alphanumeric characters and, optionally spaces.
     """
 
-    new_text: str = ""
-
-    for c in text:
-        if c.isalnum():
-            new_text += c
-        elif allow_spaces:
-            new_text += " "
-
-    return new_text
+    return text.translate(ALNUM_SPACES_TABLE if allow_spaces else ALNUM_TABLE)
 
 
 def clean_text_custom(text: str) -> str:
     """
-    ANAF has a custom list of characters allowed in the XML: [A-Z, a-z, 0-9, ",", ".", "-", " "]
-    Note: The list sometimes includes "&" but it's not consistent, so we're not including it here.
+    Keep only the characters from the custom list allowed by ANAF in the XML.
     """
 
-    ANAF_CUSTOM_LIST = string.ascii_letters + string.digits + "," + "." + "-" + " "
-
-    return "".join([c for c in text if c in ANAF_CUSTOM_LIST])
+    return text.translate(ANAF_CUSTOM_TABLE)
 
 
 def normalize_text_alnum(text) -> str:
@@ -132,6 +150,43 @@ def normalize_text_alnum(text) -> str:
 
     text = text.lower()
     text = unicode_to_ascii(text)
-    text = "".join([c if c.isalnum() else "" for c in text])
+    text = text.translate(ALNUM_TABLE)
 
     return text
+
+
+ANAF_TEXT_CLEANERS: dict[str, Callable[[str], str]] = {
+    "alphabet": clean_text_alphabet,
+    "alphabets": partial(clean_text_alphabet, allow_spaces=True),
+    "alnum": clean_text_alnum,
+    "alnums": partial(clean_text_alnum, allow_spaces=True),
+    "numbers": clean_text_numbers,
+    "email": clean_text_email,
+    "custom": clean_text_custom,
+}
+
+
+def clean_anaf_text(text: str, clean: str = "") -> str:
+    """
+    Prepare the text of an ANAF XML field, using one of the `ANAF_TEXT_CLEANERS`.
+    """
+
+    text = text[:ANAF_FIELD_MAX_LENGTH]
+
+    if not clean:
+        return text
+
+    text = unicode_to_ascii(text.strip())
+    text = ANAF_TEXT_CLEANERS[clean](text)
+    text = " ".join(text.split())
+
+    return text.upper()
+
+
+def clean_record(fields: Mapping[str, tuple[str | None, str]]) -> dict[str, str]:
+    """
+    Prepare all the ANAF XML fields of a record in one call.
+    The fields map a name to the raw text and the name of its cleaner; empty texts are returned as empty strings.
+    """
+
+    return {name: clean_anaf_text(text, clean) if text else "" for name, (text, clean) in fields.items()}
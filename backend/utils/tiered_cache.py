@@ -0,0 +1,220 @@
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+# The local tiers of the process, by the name of their shared cache, so that every thread uses the same one
+_local_tiers: dict[str, "LocalTier"] = {}
+_local_tiers_lock = threading.Lock()
+
+_MISSING = object()
+
+
+class LocalTier:
+    """
+    A per-process LRU cache of pickled values, which expire after a few seconds
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries: int = max_entries
+        self.entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self.lock:
+            entry: tuple[float, bytes] | None = self.entries.get(key)
+            if entry is None:
+                return _MISSING
+
+            expires_at, pickled_value = entry
+            if expires_at <= time.monotonic():
+                del self.entries[key]
+                return _MISSING
+
+            self.entries.move_to_end(key)
+
+        # the values are unpickled for every reader, so that a reader cannot change them for the other ones
+        return pickle.loads(pickled_value)
+
+    def set(self, key: str, value: Any, timeout: float):
+        pickled_value: bytes = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+        with self.lock:
+            self.entries[key] = (time.monotonic() + timeout, pickled_value)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def delete(self, key: str) -> bool:
+        with self.lock:
+            return self.entries.pop(key, None) is not None
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class TieredCache(BaseCache):
+    """
+    A cache backend with a small per-process LRU cache in front of a shared cache, e.g. Redis or the database.
+
+    The LOCATION is the alias of the shared cache, from the CACHES setting. The values are kept in the
+    process for at most LOCAL_TIMEOUT seconds, so a change made by another process is seen after that,
+    while the changes made by this process are seen right away.
+
+    The backend does not lock the recomputed values; cache_decorator does, through the shared cache.
+    """
+
+    def __init__(self, location: str, params: dict):
+        super().__init__(params)
+
+        options: dict = params.get("OPTIONS", {})
+        self.shared_alias: str = location
+        self.local_timeout: float = options.get("LOCAL_TIMEOUT", 5)
+
+        with _local_tiers_lock:
+            if location not in _local_tiers:
+                _local_tiers[location] = LocalTier(max_entries=self._max_entries)
+            self.local: LocalTier = _local_tiers[location]
+
+    @property
+    def shared(self) -> BaseCache:
+        return caches[self.shared_alias]
+
+    def _local_key(self, key: str, version: int | None) -> str:
+        return self.make_and_validate_key(key, version=version)
+
+    def _local_timeout(self, timeout) -> float | None:
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+
+        if timeout is None:
+            return self.local_timeout
+        if timeout <= 0:
+            return None
+
+        return min(self.local_timeout, timeout)
+
+    def _set_local(self, key: str, value: Any, timeout, version: int | None):
+        local_key: str = self._local_key(key, version)
+
+        local_timeout: float | None = self._local_timeout(timeout)
+        if local_timeout is None:
+            self.local.delete(local_key)
+        else:
+            self.local.set(local_key, value, local_timeout)
+
+    def _shared_timeout(self, timeout):
+        return self.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+
+    def _version(self, version: int | None) -> int:
+        # the shared cache gets the same version as the local one, instead of its own default
+        return self.version if version is None else version
+
+    def get(self, key: str, default: Any = None, version: int | None = None) -> Any:
+        version = self._version(version)
+
+        value = self.local.get(self._local_key(key, version))
+        if value is not _MISSING:
+            return value
+
+        value = self.shared.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            return default
+
+        self._set_local(key, value, DEFAULT_TIMEOUT, version)
+
+        return value
+
+    def get_many(self, keys, version: int | None = None) -> dict[str, Any]:
+        version = self._version(version)
+
+        values: dict[str, Any] = {}
+        missing_keys: list[str] = []
+        for key in keys:
+            value = self.local.get(self._local_key(key, version))
+            if value is _MISSING:
+                missing_keys.append(key)
+            else:
+                values[key] = value
+
+        if missing_keys:
+            shared_values: dict[str, Any] = self.shared.get_many(missing_keys, version=version)
+            for key, value in shared_values.items():
+                self._set_local(key, value, DEFAULT_TIMEOUT, version)
+            values.update(shared_values)
+
+        return values
+
+    def set(self, key: str, value: Any, timeout=DEFAULT_TIMEOUT, version: int | None = None):
+        version = self._version(version)
+
+        self.shared.set(key, value, timeout=self._shared_timeout(timeout), version=version)
+        self._set_local(key, value, timeout, version)
+
+    def set_many(self, data: dict, timeout=DEFAULT_TIMEOUT, version: int | None = None) -> list:
+        version = self._version(version)
+
+        failed_keys: list = self.shared.set_many(data, timeout=self._shared_timeout(timeout), version=version)
+        for key, value in data.items():
+            if key not in failed_keys:
+                self._set_local(key, value, timeout, version)
+
+        return failed_keys
+
+    def add(self, key: str, value: Any, timeout=DEFAULT_TIMEOUT, version: int | None = None) -> bool:
+        version = self._version(version)
+
+        added: bool = self.shared.add(key, value, timeout=self._shared_timeout(timeout), version=version)
+        if added:
+            self._set_local(key, value, timeout, version)
+
+        return added
+
+    def touch(self, key: str, timeout=DEFAULT_TIMEOUT, version: int | None = None) -> bool:
+        version = self._version(version)
+
+        if timeout is not DEFAULT_TIMEOUT and timeout is not None and timeout <= 0:
+            self.local.delete(self._local_key(key, version))
+
+        return self.shared.touch(key, timeout=self._shared_timeout(timeout), version=version)
+
+    def delete(self, key: str, version: int | None = None) -> bool:
+        version = self._version(version)
+
+        self.local.delete(self._local_key(key, version))
+
+        return self.shared.delete(key, version=version)
+
+    def delete_many(self, keys, version: int | None = None):
+        version = self._version(version)
+
+        for key in keys:
+            self.local.delete(self._local_key(key, version))
+
+        self.shared.delete_many(keys, version=version)
+
+    def has_key(self, key: str, version: int | None = None) -> bool:
+        version = self._version(version)
+
+        if self.local.get(self._local_key(key, version)) is not _MISSING:
+            return True
+
+        return self.shared.has_key(key, version=version)
+
+    def incr(self, key: str, delta: int = 1, version: int | None = None) -> int:
+        version = self._version(version)
+
+        value: int = self.shared.incr(key, delta, version=version)
+        self._set_local(key, value, DEFAULT_TIMEOUT, version)
+
+        return value
+
+    def clear(self):
+        self.local.clear()
+        self.shared.clear()
@@ -81,6 +81,14 @@ python3 manage.py schedule_stats_generator_ngos_yearly "ngos_registered_per_year
 python3 manage.py schedule_stats_generator_ngos_yearly "ngos_active_per_year"
 python3 manage.py schedule_stats_generator_ngos_yearly "ngos_with_ngohub_per_year"
 
+# Start the donation rollups reconciliation schedule
+echo "Starting the donation rollups reconciliation schedule that runs every night"
+python3 manage.py schedule_donation_rollups_reconciliation
+
+# Start the missing redirection forms schedule
+echo "Starting the missing redirection forms schedule that runs every 10 minutes"
+python3 manage.py schedule_missing_redirection_forms
+
 # Start the NGOs check schedule
 echo "Starting the NGOs check schedule"
 python3 manage.py schedule_ngos_check
@@ -89,6 +97,10 @@ python3 manage.py schedule_ngos_check
 echo "Starting the session clean-up schedule that runs once a day"
 python3 manage.py schedule_session_cleanup
 
+# Start the stale cached PDF files clean-up schedule
+echo "Starting the stale cached PDF files clean-up schedule that runs once a day"
+python3 manage.py schedule_stale_cached_members_cleanup
+
 # Start the expired auditlog clean-up schedule
 echo "Starting the expired auditlog clean-up scheduler"
 python3 manage.py schedule_auditlog_cleanup